@@ -9,15 +9,15 @@ from .models import User
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     """Admin configuration for User model."""
-    list_display = ['email', 'first_name', 'last_name', 'role', 'is_active', 'created_at']
-    list_filter = ['role', 'is_active', 'is_staff']
+    list_display = ['email', 'first_name', 'last_name', 'role', 'shelter', 'is_head_office', 'is_active', 'created_at']
+    list_filter = ['role', 'shelter', 'is_head_office', 'is_active', 'is_staff']
     search_fields = ['email', 'first_name', 'last_name']
     ordering = ['-created_at']
 
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         ('Dane osobowe', {'fields': ('first_name', 'last_name')}),
-        ('Rola i uprawnienia', {'fields': ('role', 'is_active', 'is_staff', 'is_superuser')}),
+        ('Rola i uprawnienia', {'fields': ('role', 'shelter', 'is_head_office', 'is_active', 'is_staff', 'is_superuser')}),
         ('Daty', {'fields': ('created_at', 'updated_at')}),
     )
     readonly_fields = ['created_at', 'updated_at']
@@ -25,6 +25,6 @@ class UserAdmin(BaseUserAdmin):
     add_fieldsets = (
         (None, {
             'classes': ('wide',),
-            'fields': ('email', 'first_name', 'last_name', 'role', 'password1', 'password2'),
+            'fields': ('email', 'first_name', 'last_name', 'role', 'shelter', 'is_head_office', 'password1', 'password2'),
         }),
     )
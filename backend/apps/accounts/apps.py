@@ -5,3 +5,14 @@ class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.accounts'
     verbose_name = 'Konta użytkowników'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from oauth2_provider.models import get_access_token_model
+        from .authentication import evict_token, evict_user_tokens
+        from .models import User
+
+        access_token_model = get_access_token_model()
+        post_save.connect(evict_token, sender=access_token_model)
+        post_delete.connect(evict_token, sender=access_token_model)
+        post_save.connect(evict_user_tokens, sender=User)
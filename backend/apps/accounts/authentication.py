@@ -0,0 +1,104 @@
+"""
+OAuth2 authentication with a cache of validated access tokens.
+
+``OAuth2Authentication`` loads the ``AccessToken`` row and its user on every
+request. ``CachedOAuth2Authentication`` keeps the validated token (id, scope,
+expiry, application) and the user's fields in the ``oauth_tokens`` cache, so
+repeated requests with the same token - and permission classes reading
+``request.user.role`` - do not touch the database.
+
+Entries expire with the token or after the cache TTL, whichever is first, and
+are evicted when the token is revoked/refreshed or the user is changed. The
+default cache is per process: another worker's eviction only reaches this one
+through the TTL, so keep it short or configure a shared cache backend.
+"""
+import hashlib
+
+from django.core.cache import caches
+from django.utils import timezone
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
+from oauth2_provider.models import get_access_token_model
+
+from .models import User
+
+TOKEN_CACHE = 'oauth_tokens'
+
+USER_FIELDS = [field.attname for field in User._meta.concrete_fields if field.attname != 'password']
+
+
+def token_cache_key(token):
+    return 'oauth2:access:' + hashlib.sha256(token.encode()).hexdigest()
+
+
+def bearer_token(request):
+    """Return the bearer token from the Authorization header, or None."""
+    scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token.strip():
+        return None
+    return token.strip()
+
+
+def cache_entry(user, access_token):
+    return {
+        'user': {name: getattr(user, name) for name in USER_FIELDS},
+        'token_id': access_token.pk,
+        'application_id': access_token.application_id,
+        'scope': access_token.scope,
+        'expires': access_token.expires,
+    }
+
+
+def principal_from_entry(entry, token):
+    """Rebuild ``(user, access_token)`` from a cache entry without queries."""
+    user = User(**entry['user'])
+    user._state.adding = False
+    user._state.db = 'default'
+    access_token = get_access_token_model()(
+        id=entry['token_id'],
+        token=token,
+        user=user,
+        application_id=entry['application_id'],
+        scope=entry['scope'],
+        expires=entry['expires'],
+    )
+    access_token._state.adding = False
+    access_token._state.db = 'default'
+    return user, access_token
+
+
+class CachedOAuth2Authentication(OAuth2Authentication):
+    """``OAuth2Authentication`` serving repeated tokens from the token cache."""
+
+    def authenticate(self, request):
+        token = bearer_token(request)
+        if token is None:
+            return super().authenticate(request)
+
+        cache = caches[TOKEN_CACHE]
+        key = token_cache_key(token)
+        entry = cache.get(key)
+        if entry is not None and entry['expires'] > timezone.now():
+            return principal_from_entry(entry, token)
+
+        result = super().authenticate(request)
+        if result is not None:
+            user, access_token = result
+            remaining = (access_token.expires - timezone.now()).total_seconds()
+            timeout = min(cache.default_timeout, int(remaining))
+            if timeout > 0:
+                cache.set(key, cache_entry(user, access_token), timeout)
+        return result
+
+
+def evict_token(sender, instance, **kwargs):
+    """Drop a revoked, deleted or refreshed access token from the cache."""
+    if instance.token:
+        caches[TOKEN_CACHE].delete(token_cache_key(instance.token))
+
+
+def evict_user_tokens(sender, instance, created=False, **kwargs):
+    """Drop cached tokens of a changed user so role and status apply at once."""
+    if created:
+        return
+    tokens = get_access_token_model().objects.filter(user=instance).values_list('token', flat=True)
+    caches[TOKEN_CACHE].delete_many([token_cache_key(token) for token in tokens])
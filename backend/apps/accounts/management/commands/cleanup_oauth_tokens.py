@@ -0,0 +1,52 @@
+"""
+Management command to delete expired OAuth2 tokens and grants.
+
+Meant to run on a schedule (cron or a scheduled ECS task), e.g. hourly:
+
+    python manage.py cleanup_oauth_tokens --batch-size 1000 --max-batches 500
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.services.token_cleanup import cleanup_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete expired OAuth2 access/refresh/ID tokens and grants in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="Rows deleted per transaction")
+        parser.add_argument("--pause", type=float, default=0.0,
+                            help="Seconds to sleep between batches")
+        parser.add_argument("--max-batches", type=int, default=None,
+                            help="Stop each table after this many batches")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Only count what would be deleted")
+        parser.add_argument("--json", action="store_true",
+                            help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        report = cleanup_expired_tokens(
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            max_batches=options["max_batches"],
+            dry_run=options["dry_run"],
+        )
+
+        if options["json"]:
+            self.stdout.write(json.dumps({"dry_run": options["dry_run"], "targets": report}))
+            return
+
+        key = "candidates" if options["dry_run"] else "deleted"
+        for name, stats in report.items():
+            self.stdout.write(
+                f"{name}: {stats[key]} {key} ({stats['batches']} batches, {stats['seconds']}s)"
+            )
+        total = sum(stats[key] for stats in report.values())
+        verb = "would be deleted" if options["dry_run"] else "deleted"
+        self.stdout.write(self.style.SUCCESS(f"{total} rows {verb}"))
@@ -27,6 +27,8 @@ class Command(BaseCommand):
                 self.style.WARNING(f'Superuser already exists: {admin_email}')
             )
 
+        # The seeded animals, supplies and tasks belong to no shelter, so the
+        # demo accounts work for the head office to see them.
         users_data = [
             {
                 'email': 'pracownik@schronisko.pl',
@@ -34,6 +36,7 @@ class Command(BaseCommand):
                 'first_name': 'Jan',
                 'last_name': 'Kowalski',
                 'role': Role.EMPLOYEE,
+                'is_head_office': True,
             },
             {
                 'email': 'wolontariusz@schronisko.pl',
@@ -41,6 +44,7 @@ class Command(BaseCommand):
                 'first_name': 'Anna',
                 'last_name': 'Nowak',
                 'role': Role.VOLUNTEER,
+                'is_head_office': True,
             },
             {
                 'email': 'odwiedzajacy@schronisko.pl',
@@ -48,6 +52,7 @@ class Command(BaseCommand):
                 'first_name': 'Piotr',
                 'last_name': 'Wiśniewski',
                 'role': Role.VISITOR,
+                'is_head_office': True,
             },
             # Additional veterinarians (employees) for medical records
             {
@@ -56,6 +61,7 @@ class Command(BaseCommand):
                 'first_name': 'Maria',
                 'last_name': 'Kowalczyk',
                 'role': Role.EMPLOYEE,
+                'is_head_office': True,
             },
             {
                 'email': 'dr.zielinski@schronisko.pl',
@@ -63,6 +69,7 @@ class Command(BaseCommand):
                 'first_name': 'Tomasz',
                 'last_name': 'Zieliński',
                 'role': Role.EMPLOYEE,
+                'is_head_office': True,
             },
         ]
 
@@ -0,0 +1,49 @@
+"""
+Indexes on the expiry columns of django-oauth-toolkit tables, used by
+cleanup_oauth_tokens to find expired rows without full table scans.
+"""
+from django.db import migrations
+from oauth2_provider.settings import oauth2_settings
+
+# (model setting, column)
+EXPIRY_COLUMNS = [
+    ('ACCESS_TOKEN_MODEL', 'expires'),
+    ('REFRESH_TOKEN_MODEL', 'revoked'),
+    ('ID_TOKEN_MODEL', 'expires'),
+    ('GRANT_MODEL', 'expires'),
+]
+
+
+def _indexes(apps):
+    for setting, column in EXPIRY_COLUMNS:
+        app_label, model_name = getattr(oauth2_settings, setting).split('.')
+        table = apps.get_model(app_label, model_name)._meta.db_table
+        yield f'{table}_{column}_cleanup_idx', table, column
+
+
+def create_indexes(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name, table, column in _indexes(apps):
+        schema_editor.execute(
+            f'CREATE INDEX {concurrently}IF NOT EXISTS {schema_editor.quote_name(name)} '
+            f'ON {schema_editor.quote_name(table)} ({schema_editor.quote_name(column)})'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    for name, _, _ in _indexes(apps):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(name)}')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('oauth2_provider', '__latest__'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_oauth2_expiry_indexes"),
+        ("shelters", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="shelter",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Puste dla pracowników centrali, którzy widzą wszystkie schroniska.",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="users",
+                to="shelters.shelter",
+                verbose_name="Schronisko",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.14 on 2026-10-19 06:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def flag_head_office(apps, schema_editor):
+    # Employees left without a shelter after shelters.0002 are the head office
+    # accounts; everyone else without one now sees nothing until assigned.
+    User = apps.get_model('accounts', 'User')
+    User.objects.filter(shelter__isnull=True, role='employee').update(is_head_office=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_user_shelter"),
+        ("shelters", "0002_assign_existing_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="is_head_office",
+            field=models.BooleanField(
+                default=False,
+                help_text="Widzi wszystkie schroniska. Użytkownik bez schroniska i bez tej flagi nie widzi żadnych danych.",
+                verbose_name="Pracownik centrali",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="shelter",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Wymagane, chyba że użytkownik pracuje w centrali.",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="users",
+                to="shelters.shelter",
+                verbose_name="Schronisko",
+            ),
+        ),
+        migrations.RunPython(flag_head_office, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@
 Models for accounts app - User authentication and roles.
 """
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.core.exceptions import ValidationError
 from django.db import models
 
 
@@ -71,6 +72,20 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name='Dostęp do panelu admina',
         default=False,
     )
+    shelter = models.ForeignKey(
+        'shelters.Shelter',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='users',
+        verbose_name='Schronisko',
+        help_text='Wymagane, chyba że użytkownik pracuje w centrali.',
+    )
+    is_head_office = models.BooleanField(
+        verbose_name='Pracownik centrali',
+        default=False,
+        help_text='Widzi wszystkie schroniska. Użytkownik bez schroniska i bez tej flagi nie widzi żadnych danych.',
+    )
     created_at = models.DateTimeField(
         verbose_name='Data utworzenia',
         auto_now_add=True,
@@ -93,6 +108,13 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+    def clean(self):
+        super().clean()
+        if self.is_head_office and self.shelter_id is not None:
+            raise ValidationError({'shelter': 'Pracownik centrali nie jest przypisany do schroniska.'})
+        if not self.is_head_office and not self.is_superuser and self.shelter_id is None:
+            raise ValidationError({'shelter': 'Wybierz schronisko albo oznacz użytkownika jako pracownika centrali.'})
+
     @property
     def full_name(self):
         """Return full name of the user."""
@@ -2,6 +2,7 @@
 Custom permissions for the shelter system.
 """
 from rest_framework.permissions import BasePermission
+from apps.shelters.tenancy import sees_all_shelters
 from .models import Role
 
 
@@ -48,3 +49,20 @@ class IsEmployeeOrReadOnly(BasePermission):
             return True
 
         return request.user.role == Role.EMPLOYEE
+
+
+class IsHeadOffice(BasePermission):
+    """
+    Permission class that allows access only to head office employees
+    (employees who see every shelter, see apps.shelters.tenancy).
+    """
+    message = 'Dostęp tylko dla pracowników centrali.'
+
+    def has_permission(self, request, view):
+        return (
+            request.user and
+            request.user.is_authenticated and
+            request.user.role == Role.EMPLOYEE and
+            request.user.shelter_id is None and
+            sees_all_shelters(request.user)
+        )
@@ -50,5 +50,7 @@ class CurrentUserSerializer(serializers.ModelSerializer):
             'full_name',
             'role',
             'role_display',
+            'shelter',
+            'is_head_office',
         ]
         read_only_fields = fields
@@ -21,6 +21,7 @@ def employee_user(db):
         first_name='Jan',
         last_name='Kowalski',
         role=Role.EMPLOYEE,
+        is_head_office=True,
     )
 
 
@@ -0,0 +1,128 @@
+"""
+Tests for CachedOAuth2Authentication.
+"""
+import pytest
+from datetime import timedelta
+from django.core.cache import caches
+from django.urls import reverse
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from apps.accounts.authentication import (
+    TOKEN_CACHE, CachedOAuth2Authentication, token_cache_key,
+)
+from apps.accounts.models import Role
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    caches[TOKEN_CACHE].clear()
+    yield
+    caches[TOKEN_CACHE].clear()
+
+
+@pytest.fixture
+def access_token(employee_user):
+    """Create a valid access token for the employee."""
+    application = Application.objects.create(
+        name='Frontend',
+        client_type=Application.CLIENT_PUBLIC,
+        authorization_grant_type=Application.GRANT_PASSWORD,
+    )
+    return AccessToken.objects.create(
+        user=employee_user,
+        application=application,
+        token='token-pracownika',
+        scope='read write',
+        expires=timezone.now() + timedelta(hours=1),
+    )
+
+
+def bearer(token):
+    return {'HTTP_AUTHORIZATION': f'Bearer {token.token}'}
+
+
+@pytest.mark.django_db
+class TestCachedOAuth2Authentication:
+    """Tests for token validation caching."""
+
+    def test_cached_token_needs_no_queries(
+        self, api_client, access_token, django_assert_num_queries
+    ):
+        """Test that a repeated token is served from the cache."""
+        url = reverse('accounts:current-user')
+        assert api_client.get(url, **bearer(access_token)).status_code == 200
+
+        with django_assert_num_queries(0):
+            response = api_client.get(url, **bearer(access_token))
+
+        assert response.status_code == 200
+        assert response.data['email'] == 'pracownik@schronisko.pl'
+        assert response.data['role'] == Role.EMPLOYEE
+
+    def test_permissions_checked_from_cache(
+        self, api_client, access_token, django_assert_num_queries
+    ):
+        """Test that role based permissions use the cached principal."""
+        url = reverse('animals:veterinarian-list')
+        api_client.get(url, **bearer(access_token))
+
+        # Only the veterinarian query itself.
+        with django_assert_num_queries(1):
+            response = api_client.get(url, **bearer(access_token))
+        assert response.status_code == 200
+
+    def test_revoked_token_is_evicted(self, api_client, access_token):
+        """Test that revoking a token takes effect immediately."""
+        url = reverse('accounts:current-user')
+        api_client.get(url, **bearer(access_token))
+
+        access_token.revoke()
+
+        assert caches[TOKEN_CACHE].get(token_cache_key(access_token.token)) is None
+        assert api_client.get(url, **bearer(access_token)).status_code == 401
+
+    def test_user_change_evicts_tokens(self, api_client, access_token, employee_user):
+        """Test that a role change is visible on the next request."""
+        url = reverse('animals:veterinarian-list')
+        api_client.get(url, **bearer(access_token))
+
+        employee_user.role = Role.VOLUNTEER
+        employee_user.save()
+
+        assert api_client.get(url, **bearer(access_token)).status_code == 403
+
+    def test_expired_entry_is_not_used(self, api_client, access_token):
+        """Test that an entry past the token expiry is revalidated."""
+        url = reverse('accounts:current-user')
+        api_client.get(url, **bearer(access_token))
+
+        AccessToken.objects.filter(pk=access_token.pk).update(
+            expires=timezone.now() - timedelta(seconds=1)
+        )
+        key = token_cache_key(access_token.token)
+        entry = caches[TOKEN_CACHE].get(key)
+        entry['expires'] = timezone.now() - timedelta(seconds=1)
+        caches[TOKEN_CACHE].set(key, entry)
+
+        assert api_client.get(url, **bearer(access_token)).status_code == 401
+
+    def test_unknown_token(self, api_client):
+        """Test that invalid tokens are rejected and not cached."""
+        response = api_client.get(
+            reverse('accounts:current-user'), HTTP_AUTHORIZATION='Bearer nieznany'
+        )
+
+        assert response.status_code == 401
+        assert caches[TOKEN_CACHE].get(token_cache_key('nieznany')) is None
+
+    def test_cached_token_keeps_scopes(self, api_client, access_token):
+        """Test that request.auth is a token with the cached scopes."""
+        request = Request(APIRequestFactory().get('/', **bearer(access_token)))
+        CachedOAuth2Authentication().authenticate(request)
+        user, token = CachedOAuth2Authentication().authenticate(request)
+
+        assert user.pk == access_token.user_id
+        assert token.is_valid(['read', 'write'])
+        assert not token.is_valid(['admin'])
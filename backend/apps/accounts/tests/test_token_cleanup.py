@@ -0,0 +1,103 @@
+"""
+Tests for expired OAuth2 token cleanup.
+"""
+import json
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application, Grant, RefreshToken
+from apps.accounts.services.token_cleanup import cleanup_expired_tokens
+
+
+@pytest.fixture
+def application(db):
+    return Application.objects.create(
+        name='Frontend',
+        client_type=Application.CLIENT_PUBLIC,
+        authorization_grant_type=Application.GRANT_PASSWORD,
+    )
+
+
+@pytest.fixture
+def tokens(application, employee_user):
+    """Five expired and one valid access token, plus refresh tokens and grants."""
+    now = timezone.now()
+
+    def access_token(name, expires):
+        return AccessToken.objects.create(
+            user=employee_user, application=application, token=name, expires=expires,
+        )
+
+    for i in range(5):
+        access_token(f'expired-{i}', now - timedelta(hours=i + 1))
+    valid = access_token('valid', now + timedelta(hours=1))
+
+    # Rotated refresh token, revoked long ago, and a live one.
+    RefreshToken.objects.create(
+        user=employee_user, application=application, token='rotated',
+        revoked=now - timedelta(days=2),
+    )
+    RefreshToken.objects.create(
+        user=employee_user, application=application, token='live', access_token=valid,
+    )
+    for code, expires in (('old', now - timedelta(minutes=5)), ('new', now + timedelta(minutes=5))):
+        Grant.objects.create(
+            user=employee_user, application=application, code=code, expires=expires,
+            redirect_uri='http://localhost/',
+        )
+    return valid
+
+
+@pytest.mark.django_db
+class TestCleanupExpiredTokens:
+    """Tests for cleanup_expired_tokens."""
+
+    def test_deletes_only_expired(self, tokens):
+        report = cleanup_expired_tokens(batch_size=2)
+
+        assert report['access_tokens']['deleted'] == 5
+        assert report['access_tokens']['batches'] == 3
+        assert report['revoked_refresh_tokens']['deleted'] == 1
+        assert report['grants']['deleted'] == 1
+        assert list(AccessToken.objects.values_list('token', flat=True)) == ['valid']
+        assert list(RefreshToken.objects.values_list('token', flat=True)) == ['live']
+        assert list(Grant.objects.values_list('code', flat=True)) == ['new']
+
+    def test_dry_run_deletes_nothing(self, tokens):
+        report = cleanup_expired_tokens(dry_run=True)
+
+        assert report['access_tokens'] == {'candidates': 5, 'batches': 0, 'seconds': pytest.approx(0, abs=1)}
+        assert AccessToken.objects.count() == 6
+
+    def test_max_batches_bounds_work(self, tokens):
+        report = cleanup_expired_tokens(batch_size=2, max_batches=1)
+
+        assert report['access_tokens'] == {'deleted': 2, 'batches': 1, 'seconds': pytest.approx(0, abs=1)}
+        assert AccessToken.objects.count() == 4
+
+    def test_command_json_report(self, tokens):
+        out = StringIO()
+        call_command('cleanup_oauth_tokens', '--json', stdout=out)
+
+        report = json.loads(out.getvalue())
+        assert report['dry_run'] is False
+        assert report['targets']['access_tokens']['deleted'] == 5
+
+    def test_command_dry_run(self, tokens):
+        out = StringIO()
+        call_command('cleanup_oauth_tokens', '--dry-run', stdout=out)
+
+        assert 'access_tokens: 5 candidates' in out.getvalue()
+        assert '7 rows would be deleted' in out.getvalue()
+        assert AccessToken.objects.count() == 6
+
+    def test_expiry_index_exists(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, AccessToken._meta.db_table
+            )
+
+        assert any(c['columns'] == ['expires'] and c['index'] for c in constraints.values())
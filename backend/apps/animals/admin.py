@@ -2,7 +2,13 @@
 Admin configuration for animals app.
 """
 from django.contrib import admin
-from .models import Animal, BehavioralTag, Intake, Medication, Photo, Vaccination, MedicalProcedure
+from django.core.exceptions import ValidationError
+from django.forms.models import BaseInlineFormSet
+from .models import (
+    Animal, AnimalParent, AnimalStatusChange, BehavioralTag, Intake, Medication, Photo, ReminderDigest, Vaccination,
+    MedicalProcedure,
+)
+from .services.parents import MAX_PARENTS, validate_parents
 
 
 class MedicationInline(admin.TabularInline):
@@ -23,13 +29,40 @@ class MedicalProcedureInline(admin.TabularInline):
     readonly_fields = ['created_at']
 
 
+class AnimalParentFormSet(BaseInlineFormSet):
+    def clean(self):
+        super().clean()
+        if any(self.errors):
+            return
+        parent_ids = [
+            form.cleaned_data['parent'].animal_id
+            for form in self.forms
+            if form.cleaned_data.get('parent') and not form.cleaned_data.get('DELETE')
+        ]
+        try:
+            validate_parents(self.instance, parent_ids)
+        except ValidationError as exc:
+            raise ValidationError(exc.messages)
+
+
+class AnimalParentInline(admin.TabularInline):
+    model = AnimalParent
+    fk_name = 'child'
+    formset = AnimalParentFormSet
+    raw_id_fields = ['parent']
+    extra = 0
+    max_num = MAX_PARENTS
+    verbose_name = 'parent'
+    verbose_name_plural = 'parents'
+
+
 @admin.register(Animal)
 class AnimalAdmin(admin.ModelAdmin):
-    list_display = ['name', 'species', 'breed', 'sex', 'status']
-    list_filter = ['species', 'sex', 'status']
+    list_display = ['name', 'species', 'breed', 'sex', 'status', 'shelter']
+    list_filter = ['shelter', 'species', 'sex', 'status']
     search_fields = ['name', 'breed', 'transponder_number']
     readonly_fields = ['created_at', 'updated_at']
-    inlines = [MedicationInline, VaccinationInline, MedicalProcedureInline]
+    inlines = [AnimalParentInline, MedicationInline, VaccinationInline, MedicalProcedureInline]
 
     fieldsets = (
         ('Basic information', {
@@ -39,7 +72,7 @@ class AnimalAdmin(admin.ModelAdmin):
             'fields': ('coat_color', 'weight', 'identifying_marks', 'last_measured')
         }),
         ('Status and identification', {
-            'fields': ('status', 'transponder_number', 'microchipping_date')
+            'fields': ('shelter', 'status', 'transponder_number', 'microchipping_date')
         }),
         ('Additional information', {
             'fields': ('notes', 'created_at', 'updated_at')
@@ -47,6 +80,21 @@ class AnimalAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(AnimalStatusChange)
+class AnimalStatusChangeAdmin(admin.ModelAdmin):
+    list_display = ['animal', 'from_status', 'to_status', 'changed_at', 'changed_by']
+    list_filter = ['to_status', 'changed_at']
+    search_fields = ['animal__name', 'animal__animal_id']
+    list_select_related = ['animal', 'changed_by']
+    date_hierarchy = 'changed_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Medication)
 class MedicationAdmin(admin.ModelAdmin):
     list_display = ['medication_name', 'animal', 'dosage', 'start_date', 'end_date', 'performed_by']
@@ -63,6 +111,20 @@ class VaccinationAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at']
 
 
+@admin.register(ReminderDigest)
+class ReminderDigestAdmin(admin.ModelAdmin):
+    list_display = ['date', 'recipient', 'item_count', 'sent_at']
+    list_select_related = ['recipient']
+    search_fields = ['recipient__email']
+    date_hierarchy = 'date'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(MedicalProcedure)
 class MedicalProcedureAdmin(admin.ModelAdmin):
     list_display = ['description_short', 'animal', 'procedure_date', 'cost', 'performed_by']
@@ -5,3 +5,10 @@ class AnimalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.animals'
     verbose_name = 'Animals'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .models import Photo, refresh_animal_identification_photo
+
+        post_save.connect(refresh_animal_identification_photo, sender=Photo)
+        post_delete.connect(refresh_animal_identification_photo, sender=Photo)
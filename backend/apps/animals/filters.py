@@ -0,0 +1,18 @@
+"""
+Filters for animals app.
+"""
+import django_filters
+from .models import AnimalStatus, AnimalStatusChange
+
+
+class AnimalStatusChangeFilter(django_filters.FilterSet):
+    """Filter for the status log: transitions into a status within a time range."""
+    status = django_filters.MultipleChoiceFilter(field_name='to_status', choices=AnimalStatus.choices)
+    from_status = django_filters.MultipleChoiceFilter(choices=AnimalStatus.choices)
+    since = django_filters.DateTimeFilter(field_name='changed_at', lookup_expr='gte')
+    until = django_filters.DateTimeFilter(field_name='changed_at', lookup_expr='lt')
+    animal = django_filters.CharFilter(field_name='animal__animal_id')
+
+    class Meta:
+        model = AnimalStatusChange
+        fields = ['status', 'from_status', 'since', 'until', 'animal']
@@ -0,0 +1,36 @@
+"""
+Background jobs of the animals app (run by `manage.py run_jobs`).
+"""
+from apps.jobs.services.queue import job
+
+from .models import Intake
+from .services.intake_source_service import SourceService
+from .services.photo_pipeline import process_photo
+
+
+@job('animals.verify_intake_source')
+def verify_intake_source(intake, source_type, source_id):
+    """Unlink an intake's source that does not exist in the parties app."""
+    if not SourceService.exists(source_type, source_id):
+        Intake.objects.filter(pk=intake, source_type=source_type, source_id=source_id).update(
+            source_type=None, source_id=None,
+        )
+
+
+@job('animals.create_intake_source')
+def create_intake_source(intake, source_type, data):
+    """
+    Create the intake's source (person or institution) and link it. If the
+    job is retried after the source was created but before it was linked,
+    the source is created again.
+    """
+    if Intake.objects.filter(pk=intake, source_id__isnull=False).exists():
+        return
+    source_id = SourceService.create(source_type, data)
+    Intake.objects.filter(pk=intake).update(source_type=source_type, source_id=source_id)
+
+
+@job('animals.process_photo', max_attempts=1)
+def process_photo_job(photo_id):
+    # process_photo records failures on the photo itself
+    process_photo(photo_id)
@@ -0,0 +1,43 @@
+"""
+Management command to generate resized variants of uploaded photos.
+
+With PHOTO_PROCESSING=worker uploads are left pending and this command is
+the worker (run it in a loop or from cron); in the other modes it recovers
+photos whose processing was interrupted or failed.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.animals.models import Photo, PhotoProcessingStatus
+from apps.animals.services.photo_pipeline import process_photo
+
+
+class Command(BaseCommand):
+    help = "Generate resized variants for pending photos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retry-failed", action="store_true",
+                            help="Also reprocess photos that failed before")
+        parser.add_argument("--limit", type=int, default=None)
+        parser.add_argument("--loop", type=float, default=None, metavar="SECONDS",
+                            help="Keep polling for new photos every SECONDS")
+
+    def handle(self, *args, **options):
+        statuses = [PhotoProcessingStatus.PENDING]
+        if options["retry_failed"]:
+            statuses.append(PhotoProcessingStatus.FAILED)
+
+        while True:
+            pending = Photo.objects.filter(processing_status__in=statuses).order_by("created_at")
+            photo_ids = list(pending.values_list("pk", flat=True)[:options["limit"]])
+            for photo_id in photo_ids:
+                process_photo(photo_id)
+            if photo_ids:
+                ready = Photo.objects.filter(
+                    pk__in=photo_ids, processing_status=PhotoProcessingStatus.READY
+                ).count()
+                self.stdout.write(f"Processed {len(photo_ids)} photos ({ready} ready)")
+            if options["loop"] is None:
+                break
+            time.sleep(options["loop"])
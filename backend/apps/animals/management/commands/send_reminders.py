@@ -0,0 +1,37 @@
+"""
+Management command to e-mail the daily reminder digests.
+
+Sends each employee one message listing the vaccinations and medication
+ends they recorded that fall due within REMINDERS['DAYS_AHEAD'] days.
+Run it daily (cron or a scheduled ECS task); a second run on the same day
+only sends the digests that were not sent yet:
+
+    python manage.py send_reminders
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from apps.animals.services.reminders import send_digests
+
+
+class Command(BaseCommand):
+    help = "E-mail today's reminder digests to employees"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", type=date.fromisoformat, default=None,
+                            help="Day of the digests (YYYY-MM-DD, default: today)")
+        parser.add_argument("--days-ahead", type=int, default=None,
+                            help="Days ahead to include (default: REMINDERS['DAYS_AHEAD'])")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        digests = send_digests(options["date"], options["days_ahead"])
+        if not digests:
+            self.stdout.write("No reminders to send")
+            return
+        items = sum(digest.item_count for digest in digests)
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {len(digests)} reminder digests ({items} items) in {time.perf_counter() - started:.2f}s"
+        ))
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("animals", "0009_alter_animal_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photo",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, db_index=True, max_length=64, verbose_name="Content Hash"
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="processing_status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Pending"),
+                    ("READY", "Ready"),
+                    ("FAILED", "Failed"),
+                ],
+                default="READY",
+                max_length=20,
+                verbose_name="Processing Status",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="storage_name",
+            field=models.CharField(
+                blank=True,
+                help_text="Name of the original file in the photos storage",
+                max_length=255,
+                verbose_name="Storage Name",
+            ),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text='Resized variant URLs by name, e.g. {"thumb": "..."}',
+                verbose_name="Variants",
+            ),
+        ),
+    ]
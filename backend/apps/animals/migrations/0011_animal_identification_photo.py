@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_identification_photo(apps, schema_editor):
+    Animal = apps.get_model("animals", "Animal")
+    Photo = apps.get_model("animals", "Photo")
+    newest = Photo.objects.filter(
+        animal=models.OuterRef("pk"), is_identification_photo=True,
+    ).order_by("-created_at", "-pk").values("pk")[:1]
+    Animal.objects.update(identification_photo=models.Subquery(newest))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("animals", "0010_photo_uploads"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="animal",
+            name="identification_photo",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="animals.photo",
+                verbose_name="Identification Photo",
+            ),
+        ),
+        migrations.RunPython(backfill_identification_photo, migrations.RunPython.noop),
+    ]
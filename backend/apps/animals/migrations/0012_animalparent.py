@@ -0,0 +1,72 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Turn the auto-created Animal.parents table into the explicit AnimalParent
+    model without touching the table, then add the descendant lookup index.
+    """
+    dependencies = [
+        ("animals", "0011_animal_identification_photo"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="AnimalParent",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "child",
+                            models.ForeignKey(
+                                db_column="from_animal_id",
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="parent_links",
+                                to="animals.animal",
+                            ),
+                        ),
+                        (
+                            "parent",
+                            models.ForeignKey(
+                                db_column="to_animal_id",
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="child_links",
+                                to="animals.animal",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "animals_animal_parents",
+                        "unique_together": {("child", "parent")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="animal",
+                    name="parents",
+                    field=models.ManyToManyField(
+                        blank=True,
+                        related_name="offspring",
+                        through="animals.AnimalParent",
+                        through_fields=("child", "parent"),
+                        to="animals.animal",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="animalparent",
+            index=models.Index(
+                fields=["parent", "child"], name="animal_parent_descendants_idx"
+            ),
+        ),
+    ]
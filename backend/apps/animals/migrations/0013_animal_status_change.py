@@ -0,0 +1,117 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_status_changes(apps, schema_editor):
+    """Start every existing animal's log with its current status."""
+    Animal = apps.get_model("animals", "Animal")
+    AnimalStatusChange = apps.get_model("animals", "AnimalStatusChange")
+    animals = Animal.objects.values_list("pk", "status", "created_at").iterator(chunk_size=1000)
+    AnimalStatusChange.objects.bulk_create(
+        (
+            AnimalStatusChange(animal_id=pk, to_status=status, changed_at=created_at)
+            for pk, status, created_at in animals
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("animals", "0012_animalparent"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnimalStatusChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "from_status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("NEW_INTAKE", "Newly Intake"),
+                            ("IN_SHELTER", "In Shelter"),
+                            ("QUARANTINE", "Quarantine"),
+                            ("MEDICAL_TREATMENT", "Medical Treatment"),
+                            ("ADOPTED", "Adopted"),
+                            ("DECEASED", "Deceased"),
+                        ],
+                        max_length=20,
+                        verbose_name="Previous status",
+                    ),
+                ),
+                (
+                    "to_status",
+                    models.CharField(
+                        choices=[
+                            ("NEW_INTAKE", "Newly Intake"),
+                            ("IN_SHELTER", "In Shelter"),
+                            ("QUARANTINE", "Quarantine"),
+                            ("MEDICAL_TREATMENT", "Medical Treatment"),
+                            ("ADOPTED", "Adopted"),
+                            ("DECEASED", "Deceased"),
+                        ],
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "changed_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Changed at"
+                    ),
+                ),
+                (
+                    "animal",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="status_changes",
+                        to="animals.animal",
+                        verbose_name="Animal",
+                    ),
+                ),
+                (
+                    "changed_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Changed by",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Animal status change",
+                "verbose_name_plural": "Animal status changes",
+                "ordering": ["changed_at", "pk"],
+                "indexes": [
+                    models.Index(
+                        fields=["to_status", "changed_at"],
+                        name="animal_status_change_idx",
+                    ),
+                    models.Index(
+                        fields=["animal", "changed_at"],
+                        name="animal_status_history_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_status_changes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:21
+
+import datetime
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Copy of apps.animals.services.medication_schedule.parse_frequency as of this
+# migration: migrations must not import application code, which imports the
+# current models and may change later.
+_TIMES_A_DAY = re.compile(r"^(\d+)\s*(?:x|times?|razy?)\s*(?:a|per|na)?\s*(?:day|daily|dzie[nń]|dziennie)$")
+_EVERY_HOURS = re.compile(r"^(?:every|co)\s+(\d+)\s*(?:h|hours?|godz\w*)$")
+_EVERY_DAYS = re.compile(r"^(?:every|co)\s+(\d+)\s*(?:days?|dni)$")
+_WORDS = {
+    "once a day": 24, "once daily": 24, "daily": 24, "raz dziennie": 24, "codziennie": 24,
+    "twice a day": 12, "twice daily": 12, "dwa razy dziennie": 12,
+    "every other day": 48, "co drugi dzień": 48,
+    "once a week": 168, "weekly": 168, "raz w tygodniu": 168,
+}
+
+
+def parse_frequency(text):
+    text = " ".join((text or "").lower().split())
+    if text in _WORDS:
+        return _WORDS[text]
+    match = _TIMES_A_DAY.match(text)
+    if match and 0 < int(match.group(1)) <= 24:
+        return 24 // int(match.group(1))
+    match = _EVERY_HOURS.match(text)
+    if match and int(match.group(1)) > 0:
+        return int(match.group(1))
+    match = _EVERY_DAYS.match(text)
+    if match and int(match.group(1)) > 0:
+        return 24 * int(match.group(1))
+    return None
+
+
+def backfill_interval_hours(apps, schema_editor):
+    """Derive the dose interval from existing free-text frequencies."""
+    Medication = apps.get_model("animals", "Medication")
+    frequencies = Medication.objects.values_list("frequency", flat=True).distinct()
+    for frequency in list(frequencies):
+        interval_hours = parse_frequency(frequency)
+        if interval_hours:
+            Medication.objects.filter(frequency=frequency).update(interval_hours=interval_hours)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("animals", "0013_animal_status_change"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="medication",
+            name="first_dose_time",
+            field=models.TimeField(
+                default=datetime.time(8, 0), verbose_name="Time of first dose"
+            ),
+        ),
+        migrations.AddField(
+            model_name="medication",
+            name="interval_hours",
+            field=models.PositiveSmallIntegerField(
+                blank=True, null=True, verbose_name="Hours between doses"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="medication",
+            index=models.Index(
+                condition=models.Q(("interval_hours__isnull", False)),
+                fields=["end_date", "start_date"],
+                name="medication_schedule_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_interval_hours, migrations.RunPython.noop),
+    ]
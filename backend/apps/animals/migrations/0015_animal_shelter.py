@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("animals", "0014_medication_schedule"),
+        ("shelters", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="animal",
+            name="shelter",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="animals",
+                to="shelters.shelter",
+                verbose_name="Shelter",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="animal",
+            index=models.Index(
+                fields=["shelter", "-created_at"], name="animal_shelter_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="animal",
+            index=models.Index(
+                fields=["shelter", "status"], name="animal_shelter_status_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("animals", "0015_animal_shelter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="medication",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="vaccination",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="animal",
+            index=models.Index(fields=["updated_at"], name="animal_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="medication",
+            index=models.Index(fields=["updated_at"], name="medication_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="vaccination",
+            index=models.Index(fields=["updated_at"], name="vaccination_updated_idx"),
+        ),
+    ]
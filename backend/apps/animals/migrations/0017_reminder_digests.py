@@ -0,0 +1,69 @@
+# Generated by Django 5.0.14 on 2026-10-19 06:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("animals", "0016_updated_at_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReminderDigest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                ("item_count", models.PositiveIntegerField(verbose_name="Items")),
+                ("sent_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Reminder Digest",
+                "verbose_name_plural": "Reminder Digests",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="medication",
+            index=models.Index(
+                condition=models.Q(("end_date__isnull", False)),
+                fields=["end_date"],
+                name="medication_end_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vaccination",
+            index=models.Index(
+                condition=models.Q(("next_due_date__isnull", False)),
+                fields=["next_due_date"],
+                name="vaccination_due_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="reminderdigest",
+            name="recipient",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="reminder_digests",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Recipient",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="reminderdigest",
+            constraint=models.UniqueConstraint(
+                fields=("recipient", "date"), name="reminder_digest_once_per_day"
+            ),
+        ),
+    ]
@@ -1,12 +1,12 @@
 """
 Models for animals app - Animal management and medical records.
 """
-from datetime import date
-from django.db import models
+from datetime import date, time
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
 from decimal import Decimal
 import uuid
-from django.core.exceptions import ValidationError
 
 
 class AnimalSpecies(models.TextChoices):
@@ -65,6 +65,47 @@ class BehavioralTag(models.Model):
     def __str__(self):
         return self.behavioral_tag_name
 
+class AnimalQuerySet(models.QuerySet):
+    """Animal queryset that logs status changes made in bulk."""
+
+    def update(self, **kwargs):
+        # bulk updates skip auto_now; delta sync (apps.sync) relies on it
+        kwargs.setdefault('updated_at', timezone.now())
+        new_status = kwargs.get('status')
+        if not isinstance(new_status, str):
+            # No status change, or an expression whose result is unknown here
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            previous = list(self.exclude(status=new_status).values_list('pk', 'status'))
+            updated = super().update(**kwargs)
+            changed_at = timezone.now()
+            AnimalStatusChange.objects.using(self.db).bulk_create(
+                AnimalStatusChange(
+                    animal_id=pk, from_status=old_status, to_status=new_status, changed_at=changed_at,
+                )
+                for pk, old_status in previous
+            )
+        return updated
+
+    def bulk_create(self, objs, *args, changed_at=None, **kwargs):
+        """
+        Create ``objs`` and their first status log entries, stamped
+        ``changed_at`` if given. created_at is auto_now_add, so it cannot be
+        backdated through here; pass the intake time explicitly instead.
+        """
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            AnimalStatusChange.objects.using(self.db).bulk_create(
+                AnimalStatusChange(
+                    animal_id=obj.pk, to_status=obj.status, changed_at=changed_at or obj.created_at,
+                )
+                for obj in objs if obj.pk is not None
+            )
+        for obj in objs:
+            obj._recorded_status = obj.status
+        return objs
+
+
 class Animal(models.Model):
     """Animal in the shelter."""
     animal_id = models.CharField(
@@ -156,27 +197,98 @@ class Animal(models.Model):
 
     parents = models.ManyToManyField(
         'self',
+        through='AnimalParent',
+        through_fields=('child', 'parent'),
         symmetrical=False,
         related_name='offspring',
         blank=True,
     )
 
+    # Newest photo flagged as identification photo, maintained by
+    # refresh_identification_photos() on photo save/delete.
+    identification_photo = models.ForeignKey(
+        'Photo',
+        verbose_name='Identification Photo',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    shelter = models.ForeignKey(
+        'shelters.Shelter',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='animals',
+        verbose_name='Shelter',
+        # indexed as the leading column of the model's composite indexes
+        db_index=False,
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = AnimalQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Animal'
         verbose_name_plural = 'Animals'
         ordering = ['-created_at']
+        indexes = [
+            # a shelter's animal list (newest first) and status filters
+            models.Index(fields=['shelter', '-created_at'], name='animal_shelter_created_idx'),
+            models.Index(fields=['shelter', 'status'], name='animal_shelter_status_idx'),
+            # changes since a sync token (apps.sync)
+            models.Index(fields=['updated_at'], name='animal_updated_idx'),
+        ]
 
     def __str__(self):
         return f'{self.name} ({self.get_species_display()})'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status and shelter as stored, to detect a change on save (absent
+        # when deferred); a move is tombstoned by apps.sync
+        instance._recorded_status = instance.__dict__.get('status')
+        instance._recorded_shelter_id = instance.__dict__.get('shelter_id')
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._recorded_status = self.__dict__.get('status')
+        self._recorded_shelter_id = self.__dict__.get('shelter_id')
+
+    def save(self, *args, changed_by=None, **kwargs):
+        """Save and append to the status log when the status changed."""
+        adding = self._state.adding
+        previous = getattr(self, '_recorded_status', None)
+        update_fields = kwargs.get('update_fields')
+        changed = adding or (
+            previous is not None and previous != self.status
+            and (update_fields is None or 'status' in update_fields)
+        )
+        if not changed:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            AnimalStatusChange.objects.using(self._state.db).create(
+                animal=self,
+                from_status='' if adding else previous,
+                to_status=self.status,
+                changed_at=self.created_at if adding else timezone.now(),
+                changed_by=changed_by,
+            )
+        self._recorded_status = self.status
     
     def clean(self):
         super().clean()
-        if self.pk and self.parents.count() > 2:
-            raise ValidationError("An animal can have at most 2 parents.")
+        if self.pk:
+            from apps.animals.services.parents import check_current_parents
+            check_current_parents(self)
 
     @property
     def age_display(self):
@@ -194,6 +306,117 @@ class Animal(models.Model):
             return f'{years} years' if years != 1 else '1 year'
         return f'{months} months.' if months > 0 else 'less than one month'
 
+    @classmethod
+    def refresh_identification_photos(cls, queryset=None):
+        """Re-point identification_photo of the given animals (default: all)."""
+        newest = Photo.objects.filter(
+            animal=models.OuterRef('pk'), is_identification_photo=True,
+        ).order_by('-created_at', '-pk').values('pk')[:1]
+        queryset = cls.objects.all() if queryset is None else queryset
+        return queryset.update(identification_photo=models.Subquery(newest))
+
+
+class AnimalStatusChange(models.Model):
+    """
+    Append-only log of Animal.status transitions, written by Animal.save and
+    AnimalQuerySet.update/bulk_create. The first entry of an animal has an
+    empty ``from_status``.
+    """
+    animal = models.ForeignKey(
+        Animal,
+        on_delete=models.CASCADE,
+        related_name='status_changes',
+        verbose_name='Animal',
+    )
+    from_status = models.CharField(
+        verbose_name='Previous status',
+        max_length=20,
+        choices=AnimalStatus.choices,
+        blank=True,
+    )
+    to_status = models.CharField(
+        verbose_name='Status',
+        max_length=20,
+        choices=AnimalStatus.choices,
+    )
+    changed_at = models.DateTimeField(
+        verbose_name='Changed at',
+        default=timezone.now,
+    )
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Changed by',
+    )
+
+    class Meta:
+        verbose_name = 'Animal status change'
+        verbose_name_plural = 'Animal status changes'
+        ordering = ['changed_at', 'pk']
+        indexes = [
+            # Transitions into a status within a time range (outcomes, stays)
+            models.Index(fields=['to_status', 'changed_at'], name='animal_status_change_idx'),
+            # History of one animal
+            models.Index(fields=['animal', 'changed_at'], name='animal_status_history_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.animal_id}: {self.from_status or "-"} -> {self.to_status} ({self.changed_at})'
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Status changes are append-only.')
+        super().save(*args, **kwargs)
+
+
+class AnimalParent(models.Model):
+    """Link from an animal to one of its parents (through table of Animal.parents)."""
+    child = models.ForeignKey(
+        Animal,
+        on_delete=models.CASCADE,
+        related_name='parent_links',
+        db_column='from_animal_id',
+    )
+    parent = models.ForeignKey(
+        Animal,
+        on_delete=models.CASCADE,
+        related_name='child_links',
+        db_column='to_animal_id',
+    )
+
+    class Meta:
+        db_table = 'animals_animal_parents'
+        unique_together = [('child', 'parent')]
+        indexes = [
+            # Descendant traversal: parent -> children without touching the heap.
+            models.Index(fields=['parent', 'child'], name='animal_parent_descendants_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.child_id} -> {self.parent_id}'
+
+
+class MedicationQuerySet(models.QuerySet):
+
+    def active(self, start=None, end=None):
+        """Medications given on any day of ``start`` - ``end`` (default: today)."""
+        start = start or date.today()
+        end = end or start
+        return self.filter(
+            models.Q(end_date__isnull=True) | models.Q(end_date__gte=start), start_date__lte=end,
+        )
+
+    def with_is_active(self, on=None):
+        """Annotate ``is_active`` (not ended before ``on``, default today) in SQL."""
+        on = on or date.today()
+        return self.annotate(is_active=models.ExpressionWrapper(
+            models.Q(end_date__isnull=True) | models.Q(end_date__gte=on),
+            output_field=models.BooleanField(),
+        ))
+
 
 class Medication(models.Model):
     """Medication record for an animal."""
@@ -215,6 +438,17 @@ class Medication(models.Model):
         verbose_name='Frequency of administration',
         max_length=100,
     )
+    # Structured schedule: a dose every interval_hours, starting on start_date
+    # at first_dose_time. Null interval = as needed, not scheduled.
+    interval_hours = models.PositiveSmallIntegerField(
+        verbose_name='Hours between doses',
+        null=True,
+        blank=True,
+    )
+    first_dose_time = models.TimeField(
+        verbose_name='Time of first dose',
+        default=time(8, 0),
+    )
     start_date = models.DateField(
         verbose_name='Start Date',
     )
@@ -238,15 +472,63 @@ class Medication(models.Model):
         verbose_name='Prescribed by',
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = MedicationQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Prescribed Medication'
         verbose_name_plural = 'Prescribed Medications'
         ordering = ['-start_date']
+        indexes = [
+            # Scheduled medications running on a given day (due-dose worklist)
+            models.Index(
+                fields=['end_date', 'start_date'],
+                condition=models.Q(interval_hours__isnull=False),
+                name='medication_schedule_idx',
+            ),
+            models.Index(fields=['updated_at'], name='medication_updated_idx'),
+            # Courses ending soon (reminder digests)
+            models.Index(fields=['end_date'], condition=models.Q(end_date__isnull=False), name='medication_end_idx'),
+        ]
 
     def __str__(self):
         return f'{self.medication_name} - {self.animal.name}'
 
+    # Fields as stored, to detect a changed frequency on save
+    SCHEDULE_FIELDS = ('frequency', 'interval_hours')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._record_schedule()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._record_schedule()
+
+    def _record_schedule(self):
+        # deferred fields are left out (and never count as changed)
+        self._recorded_schedule = {name: self.__dict__[name] for name in self.SCHEDULE_FIELDS if name in self.__dict__}
+
+    def save(self, *args, **kwargs):
+        """
+        Derive ``interval_hours`` from ``frequency`` when it is missing, or when
+        the frequency changed and the interval was not set in the same write.
+        """
+        recorded = getattr(self, '_recorded_schedule', {})
+        frequency_changed = recorded.get('frequency', self.frequency) != self.frequency
+        interval_set = recorded.get('interval_hours', self.interval_hours) != self.interval_hours
+        if (frequency_changed and not interval_set) or (self.interval_hours is None and self.frequency):
+            from apps.animals.services.medication_schedule import parse_frequency
+            self.interval_hours = parse_frequency(self.frequency)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'interval_hours' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'interval_hours']
+        super().save(*args, **kwargs)
+        self._record_schedule()
+
 
 class Vaccination(models.Model):
     """Vaccination record for an animal."""
@@ -287,11 +569,19 @@ class Vaccination(models.Model):
         verbose_name='Performed by',
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'Vaccination'
         verbose_name_plural = 'Vaccinations'
         ordering = ['-vaccination_date']
+        indexes = [
+            models.Index(fields=['updated_at'], name='vaccination_updated_idx'),
+            # Vaccinations due soon (reminder digests)
+            models.Index(
+                fields=['next_due_date'], condition=models.Q(next_due_date__isnull=False), name='vaccination_due_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.vaccine_name} - {self.animal.name}'
@@ -402,6 +692,13 @@ class Intake(models.Model):
     
 
 
+class PhotoProcessingStatus(models.TextChoices):
+    """Resized variant generation state of an uploaded photo."""
+    PENDING = 'PENDING', 'Pending'
+    READY = 'READY', 'Ready'
+    FAILED = 'FAILED', 'Failed'
+
+
 class Photo(models.Model):
     """Photos for animals."""
     photo_id = models.CharField(
@@ -435,6 +732,30 @@ class Photo(models.Model):
         verbose_name='Is Identification Photo', 
         default=True,
     )
+    storage_name = models.CharField(
+        verbose_name='Storage Name',
+        max_length=255,
+        blank=True,
+        help_text='Name of the original file in the photos storage',
+    )
+    content_hash = models.CharField(
+        verbose_name='Content Hash',
+        max_length=64,
+        blank=True,
+        db_index=True,
+    )
+    variants = models.JSONField(
+        verbose_name='Variants',
+        default=dict,
+        blank=True,
+        help_text='Resized variant URLs by name, e.g. {"thumb": "..."}',
+    )
+    processing_status = models.CharField(
+        verbose_name='Processing Status',
+        max_length=20,
+        choices=PhotoProcessingStatus.choices,
+        default=PhotoProcessingStatus.READY,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -443,4 +764,40 @@ class Photo(models.Model):
         verbose_name_plural = 'Photos'
         ordering = ['-created_at']
     def __str__(self):
-        return self.photo_id
\ No newline at end of file
+        return self.photo_id
+
+
+class ReminderDigest(models.Model):
+    """
+    A day's reminder e-mail sent to an employee (services.reminders); at
+    most one per recipient and day.
+    """
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='reminder_digests',
+        verbose_name='Recipient',
+    )
+    date = models.DateField(
+        verbose_name='Date',
+    )
+    item_count = models.PositiveIntegerField(
+        verbose_name='Items',
+    )
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Reminder Digest'
+        verbose_name_plural = 'Reminder Digests'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['recipient', 'date'], name='reminder_digest_once_per_day'),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient} - {self.date}'
+
+
+def refresh_animal_identification_photo(sender, instance, **kwargs):
+    """Keep Animal.identification_photo in sync after a photo is saved or deleted."""
+    Animal.refresh_identification_photos(Animal.objects.filter(pk=instance.animal_id))
@@ -1,13 +1,43 @@
 """
 Serializers for animals app.
 """
+import os
 from datetime import date
 from time import timezone
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from rest_framework import serializers
-from .models import Animal, BehavioralTag, Intake, Medication, Photo, Vaccination, MedicalProcedure
+from .models import (
+    Animal, AnimalStatusChange, BehavioralTag, Intake, Medication, Photo, PhotoProcessingStatus,
+    Vaccination, MedicalProcedure,
+)
 from apps.accounts.serializers import UserMinimalSerializer
 import requests
-from .services.intake_source_service import SourceService
+from apps.jobs.services.queue import enqueue
+from apps.shelters.tenancy import shelter_of
+from .services.parents import validate_parents
+from .services.photo_pipeline import EXTENSIONS, image_format, photo_storage, schedule_processing, store_original
+
+
+def validate_parent_ids(animal, parent_ids, request=None):
+    """
+    Resolve and validate a parent set (one query) for a serializer field;
+    parents must be in the requesting user's shelter.
+    """
+    shelter = shelter_of(request.user) if request is not None else None
+    try:
+        return validate_parents(animal, parent_ids, shelter)
+    except DjangoValidationError as exc:
+        raise serializers.ValidationError(exc.messages)
+
+
+class ParentIdsField(serializers.ListField):
+    """Parents written and shown as a list of ``animal_id`` strings."""
+    child = serializers.CharField()
+
+    def to_representation(self, data):
+        return [parent.animal_id for parent in data.all()]
 
 class PhotoListSerializer(serializers.ModelSerializer):
     """Serializer for Animal Photo list view."""
@@ -15,9 +45,9 @@ class PhotoListSerializer(serializers.ModelSerializer):
         model = Photo
         fields = [
             'filename', 
-            'is_identification_photo', 'url'
+            'is_identification_photo', 'url', 'variants'
         ]
-        read_only_fields = ['url']   
+        read_only_fields = ['url', 'variants']
 
 class PhotoDetailSerializer(serializers.ModelSerializer):
     """Serializer for Animal Photo detail view."""
@@ -27,26 +57,80 @@ class PhotoDetailSerializer(serializers.ModelSerializer):
             'photo_id',
             'filename', 
             'url',
+            'variants',
+            'processing_status',
             'is_identification_photo',
             'upload_date',
         ]
         
 
 class PhotoCreateSerializer(serializers.ModelSerializer):
+    """
+    Create or replace a photo.
+
+    With a multipart ``file`` the image is stored in the photos storage and
+    resized variants are generated after commit; ``filename`` alone only
+    records a photo hosted elsewhere under /media/animals/.
+    """
+    file = serializers.ImageField(write_only=True, required=False)
 
     class Meta:
         model = Photo
         fields = [
             'is_identification_photo',
             'filename',
+            'file',
             'url',
+            'variants',
+            'processing_status',
             'upload_date'
         ]
-        read_only_fields = ['url', 'upload_date']
+        read_only_fields = ['url', 'variants', 'processing_status', 'upload_date']
+        extra_kwargs = {'filename': {'required': False}}
+
+    def validate_file(self, file):
+        if file.size > settings.PHOTOS['MAX_UPLOAD_BYTES']:
+            raise serializers.ValidationError(
+                f"Maximum photo size is {settings.PHOTOS['MAX_UPLOAD_BYTES'] // (1024 * 1024)} MB."
+            )
+        if image_format(file) not in EXTENSIONS:
+            raise serializers.ValidationError('Upload a JPEG, PNG, GIF or WebP image.')
+        return file
+
+    def validate(self, attrs):
+        if self.instance is None and not attrs.get('file') and not attrs.get('filename'):
+            raise serializers.ValidationError('Provide a file or a filename.')
+        return attrs
+
+    def _store_file(self, validated_data):
+        file = validated_data.pop('file', None)
+        if file is None:
+            if 'filename' in validated_data:
+                validated_data['url'] = f"/media/animals/{validated_data['filename']}"
+            return False
+        name, content_hash = store_original(file)
+        validated_data.setdefault('filename', os.path.basename(file.name)[:100])
+        validated_data.update(
+            storage_name=name,
+            content_hash=content_hash,
+            url=photo_storage().url(name),
+            variants={},
+            processing_status=PhotoProcessingStatus.PENDING,
+        )
+        return True
 
     def create(self, validated_data):
-        validated_data['url'] = f"/media/animals/{validated_data['filename']}"
+        stored = self._store_file(validated_data)
         photo = Photo.objects.create(**validated_data)
+        if stored:
+            schedule_processing(photo)
+        return photo
+
+    def update(self, instance, validated_data):
+        stored = self._store_file(validated_data)
+        photo = super().update(instance, validated_data)
+        if stored:
+            schedule_processing(photo)
         return photo
 
 
@@ -83,10 +167,15 @@ class IntakeCreateSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['intake_id', 'intake_date']
 
+    @transaction.atomic
     def create(self, validated_data):
-
+        """
+        Create the intake; the source is checked or created in the parties
+        app by a background job queued in the same transaction.
+        """
         source_data = validated_data.pop("source", None)
         source_type = validated_data.get("source_type")
+        job = None
 
         if source_data and source_type:
 
@@ -95,16 +184,16 @@ class IntakeCreateSerializer(serializers.ModelSerializer):
                 validated_data["source_type"] = None
 
             elif set(source_data.keys()) == {"id"}:
-                if SourceService.exists(source_type, source_data["id"], context=self.context):
-                    validated_data["source_id"] = source_data["id"]
-                else:
-                    validated_data["source_id"] = None
-                    validated_data["source_type"] = None
+                validated_data["source_id"] = source_data["id"]
+                job = ("animals.verify_intake_source", {"source_type": source_type, "source_id": str(source_data["id"])})
             else:
-                validated_data["source_id"] = SourceService.create(
-                    source_type, source_data["data"], context=self.context
-                )
-        return Intake.objects.create(**validated_data)
+                job = ("animals.create_intake_source", {"source_type": source_type, "data": source_data["data"]})
+
+        intake = Intake.objects.create(**validated_data)
+        if job:
+            name, payload = job
+            enqueue(name, {"intake": intake.pk, **payload})
+        return intake
 
 
 
@@ -114,15 +203,23 @@ class AnimalListSerializer(serializers.ModelSerializer):
     sex_display = serializers.CharField(source='get_sex_display', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     age_display = serializers.CharField(read_only=True)
+    thumbnail_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Animal
         fields = [
             'id', 'animal_id', 'name', 'species', 'species_display',
             'breed', 'birth_date', 'age_display', 'sex', 'sex_display',
-            'status', 'status_display', 'intake_date'
+            'status', 'status_display', 'intake_date', 'thumbnail_url', 'shelter',
         ]
 
+    def get_thumbnail_url(self, obj):
+        """Thumbnail of the identification photo (select_related by the viewset)."""
+        photo = obj.identification_photo
+        if photo is None:
+            return None
+        return photo.variants.get('thumb') or photo.url
+
 class IntakeListSerializer(serializers.ModelSerializer):
 
 
@@ -173,24 +270,26 @@ class AnimalDetailSerializer(serializers.ModelSerializer):
             'breed', 'birth_date', 'age_display', 'sex', 'sex_display',
             'coat_color', 'weight', 'identifying_marks', 'transponder_number',
             'status', 'status_display', 'notes', 'intake_date', 'microchipping_date',
-            'medications', 'vaccinations', 'medical_procedures', 'behavioral_tags', 'parents', 'photos', 'intakes', 'last_measured'
+            'medications', 'vaccinations', 'medical_procedures', 'behavioral_tags', 'parents', 'photos', 'intakes', 'last_measured',
+            'shelter',
         ]
 
     def get_medications(self, obj):
         """Get medications with is_active status."""
-        medications = obj.medications.select_related('performed_by').all()
+        medications = obj.medications.select_related('performed_by').with_is_active()
         result = []
         for med in medications:
-            is_active = med.end_date is None or med.end_date >= date.today()
             result.append({
                 'id': med.id,
                 'medication_name': med.medication_name,
                 'dosage': med.dosage,
                 'frequency': med.frequency,
+                'interval_hours': med.interval_hours,
+                'first_dose_time': med.first_dose_time,
                 'start_date': med.start_date,
                 'end_date': med.end_date,
                 'notes': med.notes,
-                'is_active': is_active,
+                'is_active': med.is_active,
                 'prescribed_by_name': med.performed_by.full_name if med.performed_by else '-',
             })
         return result
@@ -237,15 +336,7 @@ class AnimalCreateSerializer(serializers.ModelSerializer):
         required=False,
     )
 
-    parents = serializers.SlugRelatedField(
-        many=True,
-        slug_field="animal_id",      
-        queryset=Animal.objects.all(),
-        required=False,
-        error_messages={
-        "does_not_exist": "Animal with animal_id '{value}' does not exist."
-        }
-    )
+    parents = ParentIdsField(required=False)
 
 
     intakes = IntakeCreateSerializer(required=True, write_only=True)
@@ -257,7 +348,7 @@ class AnimalCreateSerializer(serializers.ModelSerializer):
             'breed', 'birth_date', 'sex',
             'coat_color', 'weight', 'identifying_marks', 'transponder_number',
             'status', 'notes', 'microchipping_date', 'last_measured',
-            'behavioral_tags','parents', 'intakes'
+            'behavioral_tags','parents', 'intakes', 'shelter',
         ]
         read_only_fields = ['animal_id', 'last_measured']
 
@@ -285,9 +376,7 @@ class AnimalCreateSerializer(serializers.ModelSerializer):
         return animal
     
     def validate_parents(self, value):
-        if len(value) > 2:
-            raise serializers.ValidationError("An animal can have at most 2 parents.")
-        return value
+        return validate_parent_ids(None, value, self.context.get('request'))
 
 
 class MedicationSerializer(serializers.ModelSerializer):
@@ -298,7 +387,7 @@ class MedicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Medication
         fields = [
-            'id', 'animal', 'medication_name', 'dosage', 'frequency',
+            'id', 'animal', 'medication_name', 'dosage', 'frequency', 'interval_hours', 'first_dose_time',
             'start_date', 'end_date', 'reason', 'notes',
             'performed_by', 'performed_by_name', 'created_at'
         ]
@@ -311,7 +400,7 @@ class MedicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Medication
         fields = [
-            'medication_name', 'dosage', 'frequency',
+            'medication_name', 'dosage', 'frequency', 'interval_hours', 'first_dose_time',
             'start_date', 'end_date', 'reason', 'notes', 'performed_by'
         ]
 
@@ -453,6 +542,7 @@ class AnimalUpdateSerializer(serializers.ModelSerializer):
             "parents",
             "parents_display",
             "status",
+            "shelter",
         ]
         extra_kwargs = {
             field: {"required": False, "allow_null": True}
@@ -467,15 +557,7 @@ class AnimalUpdateSerializer(serializers.ModelSerializer):
         """Convert list of animal_id strings to actual Animal objects"""
         if value is None:
             return []
-
-        animals = list(Animal.objects.filter(animal_id__in=value))
-
-        if len(animals) != len(value):
-            found_ids = {a.animal_id for a in animals}
-            missing = [aid for aid in value if aid not in found_ids]
-            raise serializers.ValidationError(f"Parents not found: {missing}")
-
-        return animals
+        return validate_parent_ids(self.instance, value, self.context.get('request'))
 
     def update(self, instance, validated_data):
         # Pop ManyToMany fields first
@@ -485,7 +567,8 @@ class AnimalUpdateSerializer(serializers.ModelSerializer):
         # Update normal fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        request = self.context.get("request")
+        instance.save(changed_by=request.user if request else None)
 
         # Update M2M fields properly
         if parents is not None:
@@ -495,3 +578,13 @@ class AnimalUpdateSerializer(serializers.ModelSerializer):
 
         return instance
 
+
+class AnimalStatusChangeSerializer(serializers.ModelSerializer):
+    """Serializer for an entry of the animal status log."""
+    animal_id = serializers.CharField(source='animal.animal_id', read_only=True)
+    animal_name = serializers.CharField(source='animal.name', read_only=True)
+
+    class Meta:
+        model = AnimalStatusChange
+        fields = ['animal_id', 'animal_name', 'from_status', 'to_status', 'changed_at', 'changed_by']
+        read_only_fields = fields
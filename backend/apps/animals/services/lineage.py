@@ -0,0 +1,168 @@
+"""
+Lineage queries over Animal.parents.
+
+Ancestors and descendants are collected with one recursive CTE over the
+``AnimalParent`` table (Postgres and SQLite), or level by level - one query
+per generation - on other databases. Results are returned as compact graph
+payloads: the animals as nodes with their generation distance, and the
+parent links between them as ``[child, parent]`` pairs of ``animal_id``.
+
+Nodes are read from ``animals`` (a queryset scoped to the user's shelter);
+relatives outside it, and links to them, are left out of the payload.
+"""
+from django.db import connection
+
+from apps.animals.models import Animal, AnimalParent
+
+MAX_DEPTH = 10
+
+NODE_FIELDS = ('id', 'animal_id', 'name', 'species', 'sex', 'birth_date', 'status')
+
+# {direction: (column matched against the animals reached so far,
+#              CTE column holding the newly reached animal)}
+DIRECTIONS = {
+    'ancestors': ('from_animal_id', 'parent_id'),
+    'descendants': ('to_animal_id', 'child_id'),
+}
+
+LINEAGE_SQL = """
+WITH RECURSIVE lineage(child_id, parent_id, depth) AS (
+    SELECT from_animal_id, to_animal_id, 1
+    FROM {table}
+    WHERE {start} = %s
+  UNION
+    SELECT link.from_animal_id, link.to_animal_id, lineage.depth + 1
+    FROM {table} link
+    JOIN lineage ON link.{start} = lineage.{reached}
+    WHERE lineage.depth < %s
+)
+SELECT child_id, parent_id, MIN(depth) FROM lineage GROUP BY child_id, parent_id
+"""
+
+
+def supports_recursive_cte():
+    return connection.vendor in ('postgresql', 'sqlite')
+
+
+def _links_cte(animal_pk, direction, depth):
+    start, reached = DIRECTIONS[direction]
+    sql = LINEAGE_SQL.format(
+        table=connection.ops.quote_name(AnimalParent._meta.db_table), start=start, reached=reached,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [animal_pk, depth])
+        return cursor.fetchall()
+
+
+def _links_by_level(animal_pk, direction, depth):
+    walk_from = 'child_id' if direction == 'ancestors' else 'parent_id'
+    links, seen, frontier = {}, {animal_pk}, {animal_pk}
+    for level in range(1, depth + 1):
+        if not frontier:
+            break
+        found = AnimalParent.objects.filter(**{f'{walk_from}__in': frontier}).values_list('child_id', 'parent_id')
+        frontier = set()
+        for child_id, parent_id in found:
+            links.setdefault((child_id, parent_id), level)
+            reached = parent_id if direction == 'ancestors' else child_id
+            if reached not in seen:
+                seen.add(reached)
+                frontier.add(reached)
+    return [(child_id, parent_id, level) for (child_id, parent_id), level in links.items()]
+
+
+def lineage_links(animal_pk, direction, depth):
+    """Return ``[(child_pk, parent_pk, generation)]`` reachable from ``animal_pk``."""
+    depth = max(1, min(depth, MAX_DEPTH))
+    if supports_recursive_cte():
+        return _links_cte(animal_pk, direction, depth)
+    return _links_by_level(animal_pk, direction, depth)
+
+
+def _all(animals):
+    return Animal.objects.all() if animals is None else animals
+
+
+def _graph(animal, direction, links, animals):
+    """Build the payload; also return ``{pk: animal_id}`` of its nodes."""
+    depths = {animal.pk: 0}
+    for child_pk, parent_pk, depth in links:
+        reached = parent_pk if direction == 'ancestors' else child_pk
+        depths[reached] = min(depth, depths.get(reached, depth))
+
+    nodes = list(animals.filter(pk__in=depths).values(*NODE_FIELDS))
+    animal_ids = {}
+    for node in nodes:
+        animal_ids[node['id']] = node['animal_id']
+        node['depth'] = depths[node.pop('id')]
+    nodes.sort(key=lambda node: (node['depth'], node['name']))
+    graph = {
+        'root': animal.animal_id,
+        'direction': direction,
+        'nodes': nodes,
+        'edges': sorted(
+            [animal_ids[child_pk], animal_ids[parent_pk]] for child_pk, parent_pk, _ in links
+            if child_pk in animal_ids and parent_pk in animal_ids
+        ),
+    }
+    return graph, animal_ids
+
+
+def ancestors(animal, depth=3, animals=None):
+    """
+    Ancestor graph of ``animal`` up to ``depth`` generations.
+
+    ``common_ancestors`` lists animals reachable through more than one of the
+    root's parents - an inbreeding indicator.
+    """
+    links = lineage_links(animal.pk, 'ancestors', depth)
+    graph, animal_ids = _graph(animal, 'ancestors', links, _all(animals))
+
+    parents_of = {}
+    for child_pk, parent_pk, _ in links:
+        parents_of.setdefault(child_pk, set()).add(parent_pk)
+
+    def line(pk):
+        seen, stack = {pk}, [pk]
+        while stack:
+            for parent_pk in parents_of.get(stack.pop(), ()):
+                if parent_pk not in seen:
+                    seen.add(parent_pk)
+                    stack.append(parent_pk)
+        return seen
+
+    lines = [line(pk) for pk in parents_of.get(animal.pk, ())]
+    common = set()
+    for i, first in enumerate(lines):
+        for second in lines[i + 1:]:
+            common |= first & second
+    graph['common_ancestors'] = sorted(animal_ids[pk] for pk in common if pk in animal_ids)
+    return graph
+
+
+def descendants(animal, depth=3, animals=None):
+    """Descendant graph of ``animal`` up to ``depth`` generations."""
+    graph, _ = _graph(animal, 'descendants', lineage_links(animal.pk, 'descendants', depth), _all(animals))
+    return graph
+
+
+def siblings(animal, animals=None):
+    """
+    Animals sharing at least one parent with ``animal``.
+
+    ``relation`` is ``full`` when all of the animal's parents are shared,
+    otherwise ``half``.
+    """
+    parent_pks = set(AnimalParent.objects.filter(child=animal).values_list('parent_id', flat=True))
+    shared = {}
+    links = AnimalParent.objects.filter(parent_id__in=parent_pks).exclude(child=animal)
+    for child_pk, parent_pk in links.values_list('child_id', 'parent_id'):
+        shared.setdefault(child_pk, set()).add(parent_pk)
+
+    nodes = list(_all(animals).filter(pk__in=shared).values(*NODE_FIELDS)) if shared else []
+    for node in nodes:
+        common = shared[node.pop('id')]
+        node['shared_parents'] = len(common)
+        node['relation'] = 'full' if common == parent_pks else 'half'
+    nodes.sort(key=lambda node: (node['relation'] != 'full', node['name']))
+    return {'root': animal.animal_id, 'nodes': nodes}
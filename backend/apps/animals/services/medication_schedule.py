@@ -0,0 +1,117 @@
+"""
+Medication dose schedule.
+
+A scheduled medication (``interval_hours`` set) is given every
+``interval_hours`` starting on ``start_date`` at ``first_dose_time`` (local
+time) until the end of ``end_date``. ``doses_due`` expands the medications
+running in a time window into dose occurrences for the shelter-wide worklist;
+the medications come from one query on ``medication_schedule_idx``.
+"""
+import math
+import re
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from apps.animals.models import AnimalStatus, Medication
+
+# Free-text frequencies recognised when no interval is given
+# (English and Polish, as entered in the medical record form).
+_TIMES_A_DAY = re.compile(r'^(\d+)\s*(?:x|times?|razy?)\s*(?:a|per|na)?\s*(?:day|daily|dzie[nń]|dziennie)$')
+_EVERY_HOURS = re.compile(r'^(?:every|co)\s+(\d+)\s*(?:h|hours?|godz\w*)$')
+_EVERY_DAYS = re.compile(r'^(?:every|co)\s+(\d+)\s*(?:days?|dni)$')
+_WORDS = {
+    'once a day': 24, 'once daily': 24, 'daily': 24, 'raz dziennie': 24, 'codziennie': 24,
+    'twice a day': 12, 'twice daily': 12, 'dwa razy dziennie': 12,
+    'every other day': 48, 'co drugi dzień': 48,
+    'once a week': 168, 'weekly': 168, 'raz w tygodniu': 168,
+}
+
+# Default worklist window around now: overdue doses and the next round
+WORKLIST_BEFORE = timedelta(hours=1)
+WORKLIST_AFTER = timedelta(hours=2)
+MAX_WINDOW = timedelta(days=7)
+
+WORKLIST_FIELDS = (
+    'id', 'medication_name', 'dosage', 'notes', 'interval_hours', 'first_dose_time',
+    'start_date', 'end_date', 'animal_id', 'animal__animal_id', 'animal__name',
+)
+
+
+def parse_frequency(text):
+    """Return the dose interval in hours for a free-text frequency, or None."""
+    text = ' '.join((text or '').lower().split())
+    if text in _WORDS:
+        return _WORDS[text]
+    match = _TIMES_A_DAY.match(text)
+    if match and 0 < int(match.group(1)) <= 24:
+        return 24 // int(match.group(1))
+    match = _EVERY_HOURS.match(text)
+    if match and int(match.group(1)) > 0:
+        return int(match.group(1))
+    match = _EVERY_DAYS.match(text)
+    if match and int(match.group(1)) > 0:
+        return 24 * int(match.group(1))
+    return None
+
+
+def dose_times(medication, start, end):
+    """
+    Dose times of ``medication`` (model or values dict) in ``[start, end)``.
+    """
+    if isinstance(medication, dict):
+        get = medication.get
+    else:
+        def get(name):
+            return getattr(medication, name)
+    interval_hours = get('interval_hours')
+    if not interval_hours:
+        return []
+    interval = timedelta(hours=interval_hours)
+    anchor = timezone.make_aware(datetime.combine(get('start_date'), get('first_dose_time') or time(8, 0)))
+    if get('end_date'):
+        end = min(end, timezone.make_aware(datetime.combine(get('end_date') + timedelta(days=1), time())))
+
+    first = max(0, math.ceil((start - anchor) / interval))
+    times = []
+    scheduled = anchor + first * interval
+    while scheduled < end:
+        times.append(scheduled)
+        scheduled += interval
+    return times
+
+
+def running_medications(start, end):
+    """Scheduled medications of animals in the shelter running in ``[start, end)``."""
+    last_day = timezone.localtime(end - timedelta(microseconds=1)).date()
+    return (
+        Medication.objects.active(timezone.localtime(start).date(), last_day)
+        .filter(interval_hours__isnull=False)
+        .exclude(animal__status__in=(AnimalStatus.ADOPTED, AnimalStatus.DECEASED))
+        .order_by()
+        .values(*WORKLIST_FIELDS)
+    )
+
+
+def expand(medications, start, end):
+    """Dose occurrences of ``medications`` (values dicts) in ``[start, end)``, by time."""
+    doses = []
+    for medication in medications:
+        for scheduled_at in dose_times(medication, start, end):
+            doses.append({
+                'scheduled_at': scheduled_at,
+                'medication_id': medication['id'],
+                'medication_name': medication['medication_name'],
+                'dosage': medication['dosage'],
+                'notes': medication['notes'],
+                'animal': medication['animal_id'],
+                'animal_id': medication['animal__animal_id'],
+                'animal_name': medication['animal__name'],
+            })
+    doses.sort(key=lambda dose: (dose['scheduled_at'], dose['animal_name'], dose['medication_name']))
+    return doses
+
+
+def doses_due(start, end):
+    """Shelter-wide dose worklist for ``[start, end)``."""
+    return expand(running_medications(start, end), start, end)
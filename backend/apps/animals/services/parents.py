@@ -0,0 +1,205 @@
+"""
+Parent assignment rules for Animal.parents.
+
+A parent set is valid when every parent exists, there are at most
+MAX_PARENTS of them, none repeats, the animal is not its own parent and no
+parent is one of the animal's descendants (which would create a cycle).
+
+All rules are checked with a single query per call - also for a batch of
+animals (e.g. a registered litter): the candidate parents are loaded together
+with the roots they descend from via a recursive CTE. Model validation,
+admin and serializers all go through this module.
+"""
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.animals.models import Animal, AnimalParent
+from apps.animals.services import lineage
+
+MAX_PARENTS = 2
+
+# Generation limit of the level-by-level fallback; it stops early once no new
+# animals are reached, so this only guards against runaway walks.
+UNBOUNDED_DEPTH = 10_000
+
+CANDIDATES_SQL = """
+WITH RECURSIVE descendants(root_id, animal_id) AS (
+    SELECT to_animal_id, from_animal_id FROM {links} WHERE to_animal_id IN ({roots})
+  UNION
+    SELECT descendants.root_id, link.from_animal_id
+    FROM {links} link
+    JOIN descendants ON link.to_animal_id = descendants.animal_id
+)
+SELECT animal.id, animal.animal_id, descendants.root_id
+FROM {animals} animal
+LEFT JOIN descendants ON descendants.animal_id = animal.id
+WHERE {where}
+"""
+
+
+def _load_candidates(root_pks, where, params, fallback):
+    """
+    Return ``{pk: (animal_id, {root pks it descends from})}`` for the animals
+    matching ``where`` (SQL on alias ``animal``), in one query. ``fallback``
+    is the same filter as a Q object, for databases without recursive CTEs.
+    """
+    candidates = {}
+    if lineage.supports_recursive_cte():
+        quote = connection.ops.quote_name
+        sql = CANDIDATES_SQL.format(
+            links=quote(AnimalParent._meta.db_table),
+            animals=quote(Animal._meta.db_table),
+            # Without roots (only new animals) the CTE is empty.
+            roots=', '.join(['%s'] * len(root_pks)) or 'NULL',
+            where=where,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*root_pks, *params])
+            rows = cursor.fetchall()
+        for pk, animal_id, root_pk in rows:
+            entry = candidates.setdefault(pk, (animal_id, set()))
+            if root_pk is not None:
+                entry[1].add(root_pk)
+        return candidates
+
+    for pk, animal_id in Animal.objects.filter(fallback).values_list('pk', 'animal_id'):
+        candidates[pk] = (animal_id, set())
+    for root_pk in root_pks:
+        for child_pk, _, _ in lineage._links_by_level(root_pk, 'descendants', depth=UNBOUNDED_DEPTH):
+            if child_pk in candidates:
+                candidates[child_pk][1].add(root_pk)
+    return candidates
+
+
+def _check(animal, parent_ids, by_animal_id):
+    """Return error messages for one animal's parent set."""
+    errors = []
+    duplicates = sorted({pid for pid in parent_ids if parent_ids.count(pid) > 1})
+    if duplicates:
+        errors.append(f'Duplicate parents: {duplicates}')
+    unique_ids = list(dict.fromkeys(parent_ids))
+    if len(unique_ids) > MAX_PARENTS:
+        errors.append(f'An animal can have at most {MAX_PARENTS} parents.')
+    missing = [pid for pid in unique_ids if pid not in by_animal_id]
+    if missing:
+        errors.append(f'Parents not found: {missing}')
+    if animal is not None and animal.animal_id in unique_ids:
+        errors.append('An animal cannot be its own parent.')
+    if animal is not None and animal.pk is not None:
+        descendants = [
+            pid for pid in unique_ids
+            if pid in by_animal_id and animal.pk in by_animal_id[pid][1]
+        ]
+        if descendants:
+            errors.append(f'Parents are descendants of this animal: {descendants}')
+    return errors
+
+
+def _parents(parent_ids, by_animal_id):
+    parents = []
+    for pid in dict.fromkeys(parent_ids):
+        parent = Animal(pk=by_animal_id[pid][0], animal_id=pid)
+        parent._state.adding = False
+        parent._state.db = connection.alias
+        parents.append(parent)
+    return parents
+
+
+def validate_parent_sets(assignments, shelter=None):
+    """
+    Validate ``[(animal, [parent animal_id, ...]), ...]`` with one query.
+
+    ``animal`` may be unsaved (or None) for animals being created. With a
+    ``shelter`` id, parents must belong to that shelter (others are reported
+    as not found). Returns
+    parent lists (unsaved ``Animal`` references with pk and animal_id, usable
+    with ``.parents.set()``) in the same order, or raises ValidationError
+    keyed by the animals' ``animal_id`` (or position).
+    """
+    assignments = [(animal, [str(pid) for pid in parent_ids or []]) for animal, parent_ids in assignments]
+    wanted = sorted({pid for _, parent_ids in assignments for pid in parent_ids})
+    root_pks = sorted({animal.pk for animal, _ in assignments if animal is not None and animal.pk})
+
+    by_animal_id = {}
+    if wanted:
+        where = 'animal.animal_id IN (%s)' % ', '.join(['%s'] * len(wanted))
+        params, fallback = list(wanted), Q(animal_id__in=wanted)
+        if shelter is not None:
+            where += ' AND animal.shelter_id = %s'
+            params.append(shelter)
+            fallback &= Q(shelter_id=shelter)
+        for pk, (animal_id, roots) in _load_candidates(root_pks, where, params, fallback).items():
+            by_animal_id[animal_id] = (pk, roots)
+
+    # Cycles among the proposed links themselves (A -> B and B -> A in one batch).
+    proposed = {
+        animal.animal_id: set(parent_ids)
+        for animal, parent_ids in assignments if animal is not None
+    }
+
+    errors = {}
+    for position, (animal, parent_ids) in enumerate(assignments):
+        messages = _check(animal, parent_ids, by_animal_id)
+        if animal is not None and _reaches(proposed, parent_ids, animal.animal_id):
+            messages.append('Parent assignments in this batch form a cycle.')
+        if messages:
+            key = animal.animal_id if animal is not None and animal.pk else str(position)
+            errors[key] = messages
+    if errors:
+        if len(assignments) == 1:
+            raise ValidationError(next(iter(errors.values())))
+        raise ValidationError(errors)
+    return [_parents(parent_ids, by_animal_id) for _, parent_ids in assignments]
+
+
+def _reaches(proposed, start_ids, target):
+    seen, stack = set(), list(start_ids)
+    while stack:
+        current = stack.pop()
+        if current == target:
+            return True
+        if current in seen:
+            continue
+        seen.add(current)
+        stack.extend(proposed.get(current, ()))
+    return False
+
+
+def validate_parents(animal, parent_ids, shelter=None):
+    """Validate one animal's parent set; see validate_parent_sets."""
+    return validate_parent_sets([(animal, parent_ids)], shelter)[0]
+
+
+def check_current_parents(animal):
+    """Validate the parents already stored for ``animal`` (one query)."""
+    candidates = _load_candidates(
+        [animal.pk],
+        'animal.id IN (SELECT to_animal_id FROM %s WHERE from_animal_id = %%s)'
+        % connection.ops.quote_name(AnimalParent._meta.db_table),
+        [animal.pk],
+        Q(child_links__child=animal),
+    )
+    by_animal_id = {animal_id: (pk, roots) for pk, (animal_id, roots) in candidates.items()}
+    errors = _check(animal, list(by_animal_id), by_animal_id)
+    if errors:
+        raise ValidationError(errors)
+
+
+@transaction.atomic
+def assign_parents(assignments, shelter=None):
+    """
+    Validate and store parent sets for saved animals in bulk.
+
+    Replaces the parents of every animal in ``assignments`` using one
+    validation query, one delete and one insert.
+    """
+    parent_lists = validate_parent_sets(assignments, shelter)
+    animals = [animal for animal, _ in assignments]
+    AnimalParent.objects.filter(child__in=animals).delete()
+    AnimalParent.objects.bulk_create(
+        AnimalParent(child=animal, parent_id=parent.pk)
+        for animal, parents in zip(animals, parent_lists)
+        for parent in parents
+    )
+    return dict(zip((animal.animal_id for animal in animals), parent_lists))
@@ -0,0 +1,150 @@
+"""
+Photo storage and resizing.
+
+Uploads are streamed chunk by chunk into the ``photos`` storage under a name
+derived from their SHA-256, so identical uploads share one file and every URL
+points at content that never changes (and can be cached for a year). Resized
+JPEG variants (``settings.PHOTOS['VARIANTS']``) are generated after the upload
+is committed, outside the request by default (in a thread, or by a queued
+background job with ``PROCESSING='queue'``).
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from apps.animals.models import Photo, PhotoProcessingStatus
+from apps.jobs.services.queue import enqueue
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+# Accepted upload formats and the extension their originals are stored with
+EXTENSIONS = {'JPEG': '.jpg', 'PNG': '.png', 'GIF': '.gif', 'WEBP': '.webp'}
+
+
+def photo_storage():
+    return storages['photos']
+
+
+def content_hash(file):
+    """SHA-256 of an uploaded file, read in chunks; the file is rewound."""
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def image_format(file):
+    """Format Pillow detects in an upload (e.g. ``'PNG'``), None if it is no image."""
+    image = getattr(file, 'image', None)  # left by ImageField validation
+    if image is None:
+        try:
+            with Image.open(file) as image:
+                image.verify()
+        except Exception:
+            return None
+        finally:
+            file.seek(0)
+    return image.format
+
+
+def store_original(file):
+    """
+    Save an upload under its content hash; return ``(name, hash)``.
+
+    The extension, and so the Content-Type the file is served with, comes
+    from the format Pillow detected, never from the client's file name.
+    """
+    extension = EXTENSIONS.get(image_format(file))
+    if extension is None:
+        raise ValueError(f'Unsupported photo format of {file.name!r}')
+    file_hash = content_hash(file)
+    name = f'originals/{file_hash[:2]}/{file_hash}{extension}'
+    storage = photo_storage()
+    if not storage.exists(name):
+        name = storage.save(name, file)
+    return name, file_hash
+
+
+def variant_name(file_hash, size):
+    return f'variants/{file_hash[:2]}/{file_hash}-{size}.jpg'
+
+
+def render_variant(image, size, quality):
+    """Return JPEG bytes of ``image`` scaled to fit ``size`` x ``size``."""
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.LANCZOS)
+    buffer = BytesIO()
+    variant.save(buffer, format='JPEG', quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def generate_variants(photo):
+    """Create missing variants of ``photo`` and return ``{name: url}``."""
+    storage = photo_storage()
+    config = settings.PHOTOS
+    with storage.open(photo.storage_name, 'rb') as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image = image.convert('RGB')
+
+    variants = {}
+    for variant, size in config['VARIANTS'].items():
+        name = variant_name(photo.content_hash, size)
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(render_variant(image, size, config['JPEG_QUALITY'])))
+        variants[variant] = storage.url(name)
+    return variants
+
+
+def process_photo(photo_id):
+    """Generate variants for one photo and record the outcome."""
+    photo = Photo.objects.filter(pk=photo_id).first()
+    if photo is None or not photo.storage_name:
+        return
+    try:
+        variants = generate_variants(photo)
+    except Exception:
+        logger.exception('Generating variants of photo %s failed', photo.photo_id)
+        Photo.objects.filter(pk=photo_id).update(
+            processing_status=PhotoProcessingStatus.FAILED, updated_at=timezone.now(),
+        )
+        return
+    # update() skips auto_now; delta sync (apps.sync) relies on updated_at
+    Photo.objects.filter(pk=photo_id).update(
+        variants=variants, processing_status=PhotoProcessingStatus.READY, updated_at=timezone.now(),
+    )
+
+
+def _process_in_thread(photo_id):
+    try:
+        process_photo(photo_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_processing(photo):
+    """Queue variant generation once the current transaction commits."""
+    global _executor
+
+    mode = settings.PHOTOS['PROCESSING']
+    if mode == 'worker':
+        return
+    if mode == 'sync':
+        transaction.on_commit(lambda: process_photo(photo.pk))
+        return
+    if mode == 'queue':
+        enqueue('animals.process_photo', {'photo_id': photo.pk})
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='photos')
+    transaction.on_commit(lambda: _executor.submit(_process_in_thread, photo.pk))
@@ -0,0 +1,110 @@
+"""
+Daily reminder digests of upcoming vaccinations and ending medications.
+
+Everything due in the next ``REMINDERS['DAYS_AHEAD']`` days is read in one
+query (a UNION ALL over both tables, joined with the animal and the
+employee who recorded the item), grouped per employee and sent as one
+e-mail each over a single SMTP connection. A ``ReminderDigest`` row per
+recipient and day makes a second run on the same day skip whoever already
+got theirs, so the command can be retried safely.
+"""
+import logging
+import smtplib
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import CharField, F, Value
+
+from apps.animals.models import AnimalStatus, Medication, ReminderDigest, Vaccination
+
+logger = logging.getLogger(__name__)
+
+VACCINATION = 'vaccination'
+MEDICATION_END = 'medication_end'
+
+LABELS = {VACCINATION: 'Szczepienie', MEDICATION_END: 'Koniec leczenia'}
+
+# animals that no longer need reminders
+DEPARTED = [AnimalStatus.ADOPTED, AnimalStatus.DECEASED]
+
+
+def _items(queryset, kind, due_field, name_field, today, horizon):
+    return (
+        queryset.order_by()
+        .filter(**{f'{due_field}__range': (today, horizon)}, performed_by__is_active=True)
+        .exclude(animal__status__in=DEPARTED)
+        .exclude(performed_by__reminder_digests__date=today)
+        .annotate(
+            recipient=F('performed_by'),
+            email=F('performed_by__email'),
+            first_name=F('performed_by__first_name'),
+            due=F(due_field),
+            kind=Value(kind, output_field=CharField()),
+            item=F(name_field),
+            animal_code=F('animal__animal_id'),
+            animal_name=F('animal__name'),
+        )
+        .values('recipient', 'email', 'first_name', 'due', 'kind', 'item', 'animal_code', 'animal_name')
+    )
+
+
+def due_items(today, days_ahead):
+    """
+    Items due from ``today`` to ``days_ahead`` days later for recipients
+    without a digest today, ordered by recipient and due date (one query).
+    """
+    horizon = today + timedelta(days=days_ahead)
+    vaccinations = _items(Vaccination.objects, VACCINATION, 'next_due_date', 'vaccine_name', today, horizon)
+    medications = _items(Medication.objects, MEDICATION_END, 'end_date', 'medication_name', today, horizon)
+    return vaccinations.union(medications, all=True).order_by('recipient', 'due', 'animal_name')
+
+
+def render_digest(items, today, days_ahead):
+    """The e-mail for one recipient's ``items``."""
+    first = items[0]
+    lines = [
+        f"Dzień dobry {first['first_name']},",
+        '',
+        f'terminy w najbliższych {days_ahead} dniach:',
+        '',
+    ]
+    lines.extend(
+        f"- {item['due']:%d.%m.%Y} {LABELS[item['kind']]}: {item['item']} - "
+        f"{item['animal_name']} ({item['animal_code']})"
+        for item in items
+    )
+    return EmailMessage(
+        subject=f'Przypomnienia na {today:%d.%m.%Y} ({len(items)})',
+        body='\n'.join(lines) + '\n',
+        to=[first['email']],
+    )
+
+
+def send_digests(today=None, days_ahead=None):
+    """Send today's digests not sent yet; return the ``ReminderDigest`` rows."""
+    today = today or date.today()
+    if days_ahead is None:
+        days_ahead = settings.REMINDERS['DAYS_AHEAD']
+
+    digests = defaultdict(list)
+    for item in due_items(today, days_ahead):
+        digests[item['recipient']].append(item)
+    if not digests:
+        return []
+
+    sent = []
+    try:
+        with get_connection() as connection:
+            for recipient, items in digests.items():
+                try:
+                    connection.send_messages([render_digest(items, today, days_ahead)])
+                except smtplib.SMTPRecipientsRefused:
+                    logger.warning('Reminder digest for %s refused', items[0]['email'])
+                    continue
+                sent.append(ReminderDigest(recipient_id=recipient, date=today, item_count=len(items)))
+    finally:
+        # recorded even if the connection fails halfway, so a rerun only sends the rest
+        ReminderDigest.objects.bulk_create(sent, ignore_conflicts=True)
+    return sent
@@ -0,0 +1,88 @@
+"""
+Statistics over the animal status log (``AnimalStatusChange``).
+
+Every question is a range query on the ``(to_status, changed_at)`` or
+``(animal, changed_at)`` index instead of a scan of Animal: how long an animal
+spent in each status, how many animals reached a status in a period, and how
+long animals that left the shelter in a period had stayed.
+"""
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.utils import timezone
+
+from apps.animals.models import AnimalStatus, AnimalStatusChange
+
+OUTCOME_STATUSES = (AnimalStatus.ADOPTED, AnimalStatus.DECEASED)
+
+
+def _days(delta):
+    return round(delta.total_seconds() / 86400, 2)
+
+
+def history(animal, now=None):
+    """
+    Transitions of ``animal`` and the days spent in each status; the current
+    status counts until ``now``.
+    """
+    now = now or timezone.now()
+    changes = list(
+        AnimalStatusChange.objects.filter(animal=animal)
+        .values('from_status', 'to_status', 'changed_at', 'changed_by')
+    )
+    time_in_status = {}
+    for change, following in zip(changes, changes[1:] + [None]):
+        until = following['changed_at'] if following else now
+        spent = _days(until - change['changed_at'])
+        time_in_status[change['to_status']] = round(time_in_status.get(change['to_status'], 0) + spent, 2)
+    return {
+        'animal_id': animal.animal_id,
+        'status': animal.status,
+        'transitions': changes,
+        'days_in_status': time_in_status,
+    }
+
+
+def transition_counts(since, until, statuses=None, shelter=None):
+    """Return ``{status: n}`` of transitions into each status in ``[since, until)``."""
+    changes = AnimalStatusChange.objects.filter(changed_at__gte=since, changed_at__lt=until)
+    if shelter is not None:
+        changes = changes.filter(animal__shelter=shelter)
+    if statuses:
+        changes = changes.filter(to_status__in=statuses)
+    rows = changes.values_list('to_status').annotate(n=Count('pk')).order_by()
+    return dict(rows)
+
+
+def length_of_stay(since, until, shelter=None):
+    """
+    Average days from an animal's first log entry to its outcome, for outcomes
+    (adoption, death) recorded in ``[since, until)``, overall and per outcome;
+    only animals of ``shelter`` if given.
+    """
+    arrived = (
+        AnimalStatusChange.objects.filter(animal=OuterRef('animal'))
+        .values('animal').annotate(first=Min('changed_at')).values('first')
+    )
+    outcomes = (
+        AnimalStatusChange.objects
+        .filter(to_status__in=OUTCOME_STATUSES, changed_at__gte=since, changed_at__lt=until)
+        .annotate(arrived_at=Subquery(arrived))
+        .values_list('to_status', 'changed_at', 'arrived_at')
+    )
+    if shelter is not None:
+        outcomes = outcomes.filter(animal__shelter=shelter)
+    stays = {}
+    for status, changed_at, arrived_at in outcomes:
+        stays.setdefault(status, []).append(_days(changed_at - arrived_at))
+
+    def average(values):
+        return round(sum(values) / len(values), 1) if values else None
+
+    every = [days for values in stays.values() for days in values]
+    return {
+        'count': len(every),
+        'average_days': average(every),
+        'by_outcome': {
+            status: {'count': len(values), 'average_days': average(values)}
+            for status, values in stays.items()
+        },
+    }
@@ -27,6 +27,7 @@ def employee_user(db):
         first_name='Jan',
         last_name='Kowalski',
         role=Role.EMPLOYEE,
+        is_head_office=True,
     )
 
 
@@ -39,6 +40,7 @@ def veterinarian(db):
         first_name='Maria',
         last_name='Kowalczyk',
         role=Role.EMPLOYEE,
+        is_head_office=True,
     )
 
 
@@ -51,6 +53,7 @@ def volunteer_user(db):
         first_name='Anna',
         last_name='Nowak',
         role=Role.VOLUNTEER,
+        is_head_office=True,
     )
 
 
@@ -1,6 +1,11 @@
+import uuid
 import pytest
 from unittest.mock import patch, Mock
+from django.urls import reverse
+from apps.animals.models import Intake, IntakeType
 from apps.animals.services.intake_source_service import SourceService
+from apps.jobs.models import Job
+from apps.jobs.services import queue
 
 @pytest.fixture
 def mock_context():
@@ -136,4 +141,49 @@ class TestSourceServiceCreate:
         with pytest.raises(Exception) as excinfo:
             SourceService.create('person', payload)
         
-        assert "Source creation failed" in str(excinfo.value)
\ No newline at end of file
+        assert "Source creation failed" in str(excinfo.value)
+
+
+@pytest.mark.django_db
+class TestIntakeSourceJobs:
+    """Źródło przyjęcia jest sprawdzane i tworzone w zadaniu w tle."""
+
+    def _create_intake(self, client, animal, source):
+        url = reverse('animals:animal-intakes-list', kwargs={'animal_pk': animal.pk})
+        return client.post(url, {
+            'intake_type': IntakeType.STRAY, 'location': 'Kraków', 'animal_condition': 'Dobry', 'notes': 'Znaleziony na ulicy',
+            'source_type': 'person', 'source': source,
+        }, format='json')
+
+    def _run_jobs(self):
+        return [queue.run(job_id) for job_id in queue.claim('test-worker', 10)]
+
+    @patch('apps.animals.services.intake_source_service.requests.post')
+    def test_source_is_created_by_job(self, mock_post, authenticated_employee, dog_max):
+        """Żądanie nie woła usługi; robi to zadanie, które łączy źródło."""
+        person_id = uuid.uuid4()
+        mock_post.return_value = Mock(status_code=201, json=Mock(return_value={'person_id': str(person_id)}))
+
+        response = self._create_intake(authenticated_employee, dog_max, {'data': {'first_name': 'Jan'}})
+
+        assert response.status_code == 201
+        mock_post.assert_not_called()
+        assert Job.objects.get().name == 'animals.create_intake_source'
+
+        [(_, outcome, _)] = self._run_jobs()
+
+        assert outcome == queue.DONE
+        assert Intake.objects.get(animal=dog_max).source_id == person_id
+
+    @patch('apps.animals.services.intake_source_service.requests.get')
+    def test_missing_source_is_unlinked_by_job(self, mock_get, authenticated_employee, dog_max):
+        """Nieistniejące źródło jest odłączane przez zadanie."""
+        mock_get.return_value.status_code = 404
+
+        response = self._create_intake(authenticated_employee, dog_max, {'id': str(uuid.uuid4())})
+
+        assert response.status_code == 201
+        mock_get.assert_not_called()
+        self._run_jobs()
+        intake = Intake.objects.get(animal=dog_max)
+        assert (intake.source_type, intake.source_id) == (None, None)
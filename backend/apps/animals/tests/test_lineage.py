@@ -0,0 +1,119 @@
+"""
+Tests for lineage endpoints and queries.
+"""
+import pytest
+from django.urls import reverse
+from apps.animals.models import Animal, AnimalSex, AnimalSpecies
+from apps.animals.services import lineage
+
+
+@pytest.fixture
+def family(db):
+    """
+    Three generations of dogs:
+
+        gp1 + gp2 -> mother      gp1 + gp3 -> father
+        mother + father -> pup, pup_sister
+        mother + other -> half_brother
+    """
+    def dog(name, sex=AnimalSex.UNKNOWN, *parents):
+        animal = Animal.objects.create(
+            animal_id=name.upper(), name=name, species=AnimalSpecies.DOG, sex=sex,
+        )
+        animal.parents.set(parents)
+        return animal
+
+    gp1, gp2, gp3 = dog('gp1'), dog('gp2'), dog('gp3')
+    mother = dog('mother', AnimalSex.FEMALE, gp1, gp2)
+    father = dog('father', AnimalSex.MALE, gp1, gp3)
+    other = dog('other', AnimalSex.MALE)
+    return {
+        'gp1': gp1, 'gp2': gp2, 'gp3': gp3, 'mother': mother, 'father': father, 'other': other,
+        'pup': dog('pup', AnimalSex.MALE, mother, father),
+        'pup_sister': dog('pup_sister', AnimalSex.FEMALE, mother, father),
+        'half_brother': dog('half_brother', AnimalSex.MALE, mother, other),
+    }
+
+
+def node_depths(payload):
+    return {node['animal_id']: node['depth'] for node in payload['nodes']}
+
+
+@pytest.fixture(params=[True, False], ids=['cte', 'by-level'])
+def query_mode(request, monkeypatch):
+    """Run a test with the recursive CTE and with the per-level fallback."""
+    monkeypatch.setattr(lineage, 'supports_recursive_cte', lambda: request.param)
+    return request.param
+
+
+@pytest.mark.django_db
+class TestLineageQueries:
+    """Tests for the lineage service."""
+
+    def test_ancestors(self, family, query_mode):
+        payload = lineage.ancestors(family['pup'], depth=3)
+
+        assert payload['root'] == 'PUP'
+        assert node_depths(payload) == {
+            'PUP': 0, 'MOTHER': 1, 'FATHER': 1, 'GP1': 2, 'GP2': 2, 'GP3': 2,
+        }
+        assert ['PUP', 'MOTHER'] in payload['edges']
+        assert ['FATHER', 'GP1'] in payload['edges']
+        assert len(payload['edges']) == 6
+        assert payload['common_ancestors'] == ['GP1']
+
+    def test_depth_limit(self, family, query_mode):
+        payload = lineage.ancestors(family['pup'], depth=1)
+
+        assert node_depths(payload) == {'PUP': 0, 'MOTHER': 1, 'FATHER': 1}
+        assert payload['common_ancestors'] == []
+
+    def test_descendants(self, family, query_mode):
+        payload = lineage.descendants(family['gp1'], depth=5)
+
+        assert node_depths(payload) == {
+            'GP1': 0, 'MOTHER': 1, 'FATHER': 1, 'PUP': 2, 'PUP_SISTER': 2, 'HALF_BROTHER': 2,
+        }
+        assert ['HALF_BROTHER', 'MOTHER'] in payload['edges']
+        assert ['HALF_BROTHER', 'OTHER'] not in payload['edges']
+
+    def test_cycle_terminates(self, family, query_mode):
+        family['gp1'].parents.add(family['pup'])
+
+        payload = lineage.ancestors(family['pup'], depth=10)
+
+        assert node_depths(payload)['GP1'] == 2
+
+    def test_siblings(self, family):
+        payload = lineage.siblings(family['pup'])
+
+        assert [(n['animal_id'], n['relation'], n['shared_parents']) for n in payload['nodes']] == [
+            ('PUP_SISTER', 'full', 2), ('HALF_BROTHER', 'half', 1),
+        ]
+
+    def test_no_parents(self, family):
+        assert lineage.siblings(family['gp1'])['nodes'] == []
+        assert node_depths(lineage.ancestors(family['gp1'])) == {'GP1': 0}
+
+
+@pytest.mark.django_db
+class TestLineageEndpoints:
+    """Tests for lineage actions on AnimalViewSet."""
+
+    def test_ancestors_endpoint(self, authenticated_employee, family):
+        url = reverse('animals:animal-ancestors', kwargs={'pk': family['pup'].pk})
+        response = authenticated_employee.get(url, {'depth': 1})
+
+        assert response.status_code == 200
+        assert node_depths(response.data) == {'PUP': 0, 'MOTHER': 1, 'FATHER': 1}
+
+    def test_invalid_depth(self, authenticated_employee, family):
+        url = reverse('animals:animal-descendants', kwargs={'pk': family['gp1'].pk})
+
+        for depth in ('0', '11', 'abc'):
+            response = authenticated_employee.get(url, {'depth': depth})
+            assert response.status_code == 400
+
+    def test_siblings_requires_employee(self, authenticated_volunteer, family):
+        url = reverse('animals:animal-siblings', kwargs={'pk': family['pup'].pk})
+        assert authenticated_volunteer.get(url).status_code == 403
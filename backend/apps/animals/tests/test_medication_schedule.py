@@ -0,0 +1,136 @@
+"""
+Tests for the medication dose schedule and the due-dose worklist.
+"""
+import pytest
+from datetime import datetime, time, timedelta
+from django.urls import reverse
+from django.utils import timezone
+from apps.animals.models import Animal, AnimalSpecies, AnimalStatus, Medication
+from apps.animals.services import medication_schedule
+
+
+def local(day, hour=0, minute=0):
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+@pytest.mark.parametrize('text, hours', [
+    ('2 times a day', 12),
+    ('1 time a day', 24),
+    ('3x dziennie', 8),
+    ('every 12 hours', 12),
+    ('co 8 godzin', 8),
+    ('Twice a day', 12),
+    ('every 2 days', 48),
+    ('raz w tygodniu', 168),
+    ('as needed', None),
+])
+def test_parse_frequency(text, hours):
+    assert medication_schedule.parse_frequency(text) == hours
+
+
+@pytest.fixture
+def today():
+    return timezone.localdate()
+
+
+@pytest.fixture
+def rounds(db, dog_max, veterinarian, today):
+    """Twice-daily antibiotic for Max, a weekly drug, an adopted cat's drug."""
+    cat = Animal.objects.create(name='Kicia', species=AnimalSpecies.CAT, status=AnimalStatus.ADOPTED)
+
+    def medication(animal, name, frequency, **kwargs):
+        return Medication.objects.create(
+            animal=animal, medication_name=name, dosage='1', frequency=frequency,
+            start_date=kwargs.pop('start_date', today - timedelta(days=3)),
+            reason='-', performed_by=veterinarian, **kwargs,
+        )
+
+    return {
+        'antibiotic': medication(dog_max, 'Amoxicillin', '2 times a day'),
+        'weekly': medication(dog_max, 'Drontal', 'once a week', first_dose_time=time(10, 0)),
+        'ended': medication(dog_max, 'Metacam', '1 time a day', end_date=today - timedelta(days=1)),
+        'as_needed': medication(dog_max, 'Vetoquinol', 'as needed'),
+        'adopted': medication(cat, 'Milbemax', '2 times a day'),
+    }
+
+
+@pytest.mark.django_db
+class TestDoseSchedule:
+    """Tests for expanding medications into doses."""
+
+    def test_interval_parsed_on_save(self, rounds):
+        assert rounds['antibiotic'].interval_hours == 12
+        assert rounds['as_needed'].interval_hours is None
+
+    def test_interval_follows_changed_frequency(self, rounds):
+        medication = Medication.objects.get(pk=rounds['antibiotic'].pk)
+        medication.frequency = 'co 8 godz'
+        medication.save(update_fields=['frequency'])
+        medication.refresh_from_db()
+        assert medication.interval_hours == 8
+
+        medication.frequency = 'as needed'
+        medication.save()
+        assert Medication.objects.get(pk=medication.pk).interval_hours is None
+
+    def test_explicit_interval_kept_with_new_frequency(self, rounds):
+        medication = Medication.objects.get(pk=rounds['antibiotic'].pk)
+        medication.frequency = 'rano i wieczorem'
+        medication.interval_hours = 10
+        medication.save()
+
+        assert Medication.objects.get(pk=medication.pk).interval_hours == 10
+
+    def test_dose_times(self, rounds, today):
+        doses = medication_schedule.dose_times(rounds['antibiotic'], local(today), local(today + timedelta(days=1)))
+        assert doses == [local(today, 8), local(today, 20)]
+
+    def test_dose_times_stop_after_end_date(self, rounds, today):
+        ended = rounds['ended']
+        doses = medication_schedule.dose_times(ended, local(today - timedelta(days=1)), local(today + timedelta(days=1)))
+        assert doses == [local(today - timedelta(days=1), 8)]
+
+    def test_worklist_for_day(self, rounds, today, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            doses = medication_schedule.doses_due(local(today), local(today + timedelta(days=1)))
+
+        names = [(dose['medication_name'], timezone.localtime(dose['scheduled_at']).hour) for dose in doses]
+        assert ('Amoxicillin', 8) in names and ('Amoxicillin', 20) in names
+        assert all(name not in ('Metacam', 'Vetoquinol', 'Milbemax') for name, _ in names)
+
+    def test_is_active_in_sql(self, rounds):
+        active = dict(Medication.objects.with_is_active().values_list('medication_name', 'is_active'))
+        assert active['Amoxicillin'] is True
+        assert active['Metacam'] is False
+
+
+@pytest.mark.django_db
+class TestDueDosesView:
+    """Tests for the due-dose worklist endpoint."""
+
+    def test_day(self, authenticated_employee, rounds, today):
+        url = reverse('animals:medication-due-doses')
+        response = authenticated_employee.get(url, {'date': today.isoformat()})
+
+        assert response.status_code == 200
+        doses = response.json()['doses']
+        assert [dose['medication_name'] for dose in doses].count('Amoxicillin') == 2
+        assert doses[0]['animal_id'] == 'DOG-001'
+
+    def test_window(self, authenticated_employee, rounds, today):
+        url = reverse('animals:medication-due-doses')
+        response = authenticated_employee.get(url, {
+            'from': local(today, 7).isoformat(), 'to': local(today, 9).isoformat(),
+        })
+
+        assert response.status_code == 200
+        assert [dose['medication_name'] for dose in response.json()['doses']] == ['Amoxicillin']
+
+    def test_invalid_window(self, authenticated_employee):
+        url = reverse('animals:medication-due-doses')
+        response = authenticated_employee.get(url, {'from': '2026-01-10T00:00', 'to': '2026-01-01T00:00'})
+        assert response.status_code == 400
+
+    def test_volunteer_forbidden(self, authenticated_volunteer):
+        response = authenticated_volunteer.get(reverse('animals:medication-due-doses'))
+        assert response.status_code == 403
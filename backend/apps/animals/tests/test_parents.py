@@ -0,0 +1,172 @@
+"""
+Tests for parent assignment validation.
+"""
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apps.animals.models import Animal, AnimalParent, AnimalSpecies
+from apps.animals.services import lineage, parents
+
+
+def cat(name, *parent_animals):
+    animal = Animal.objects.create(animal_id=name.upper(), name=name, species=AnimalSpecies.CAT)
+    animal.parents.set(parent_animals)
+    return animal
+
+
+@pytest.fixture
+def litter(db):
+    """queen + tom -> kitten1..kitten3; kitten1 -> grandkitten."""
+    queen, tom = cat('queen'), cat('tom')
+    kittens = [cat(f'kitten{i}') for i in range(1, 4)]
+    kittens[0].parents.set([queen, tom])
+    return {
+        'queen': queen, 'tom': tom, 'kittens': kittens,
+        'grandkitten': cat('grandkitten', kittens[0]),
+    }
+
+
+@pytest.fixture(params=[True, False], ids=['cte', 'by-level'])
+def query_mode(request, monkeypatch):
+    monkeypatch.setattr(lineage, 'supports_recursive_cte', lambda: request.param)
+    return request.param
+
+
+def messages(excinfo):
+    return ' '.join(excinfo.value.messages)
+
+
+@pytest.mark.django_db
+class TestValidateParents:
+    """Tests for the parent assignment service."""
+
+    def test_valid_set_in_one_query(self, litter, query_mode):
+        with CaptureQueriesContext(connection) as queries:
+            result = parents.validate_parents(litter['kittens'][1], ['QUEEN', 'TOM'])
+
+        assert [parent.animal_id for parent in result] == ['QUEEN', 'TOM']
+        if query_mode:
+            assert len(queries) == 1
+
+    def test_missing_parent(self, litter):
+        with pytest.raises(ValidationError) as excinfo:
+            parents.validate_parents(litter['kittens'][1], ['QUEEN', 'NOPE'])
+        assert "Parents not found: ['NOPE']" in messages(excinfo)
+
+    def test_too_many_parents(self, litter):
+        with pytest.raises(ValidationError) as excinfo:
+            parents.validate_parents(None, ['QUEEN', 'TOM', 'KITTEN3'])
+        assert 'An animal can have at most 2 parents' in messages(excinfo)
+
+    def test_duplicates_and_self(self, litter):
+        with pytest.raises(ValidationError) as excinfo:
+            parents.validate_parents(litter['kittens'][1], ['KITTEN2', 'KITTEN2'])
+        assert 'Duplicate parents' in messages(excinfo)
+        assert 'cannot be its own parent' in messages(excinfo)
+
+    def test_descendant_as_parent_is_a_cycle(self, litter, query_mode):
+        with pytest.raises(ValidationError) as excinfo:
+            parents.validate_parents(litter['queen'], ['GRANDKITTEN'])
+        assert "descendants of this animal: ['GRANDKITTEN']" in messages(excinfo)
+
+    def test_batch_in_one_query(self, litter, query_mode):
+        kittens = litter['kittens']
+        with CaptureQueriesContext(connection) as queries:
+            result = parents.validate_parent_sets(
+                [(kitten, ['QUEEN', 'TOM']) for kitten in kittens] + [(None, ['QUEEN'])]
+            )
+
+        assert [len(parent_list) for parent_list in result] == [2, 2, 2, 1]
+        if query_mode:
+            assert len(queries) == 1
+
+    def test_batch_errors_keyed_by_animal(self, litter):
+        kittens = litter['kittens']
+        with pytest.raises(ValidationError) as excinfo:
+            parents.validate_parent_sets([
+                (kittens[1], ['QUEEN']),
+                (kittens[2], ['KITTEN3']),
+            ])
+        assert list(excinfo.value.message_dict) == ['KITTEN3']
+
+    def test_batch_cycle_between_proposed_links(self, litter):
+        kittens = litter['kittens']
+        with pytest.raises(ValidationError) as excinfo:
+            parents.validate_parent_sets([
+                (kittens[1], ['KITTEN3']),
+                (kittens[2], ['KITTEN2']),
+            ])
+        assert set(excinfo.value.message_dict) == {'KITTEN2', 'KITTEN3'}
+
+    def test_assign_parents_replaces_sets(self, litter):
+        kittens = litter['kittens']
+        parents.assign_parents([(kitten, ['QUEEN']) for kitten in kittens])
+
+        assert AnimalParent.objects.filter(parent=litter['queen']).count() == 3
+        assert not AnimalParent.objects.filter(parent=litter['tom']).exists()
+
+    def test_clean_checks_stored_parents(self, litter, query_mode):
+        grandkitten = litter['grandkitten']
+        kitten = litter['kittens'][0]
+        # a cycle stored behind the validation's back
+        AnimalParent.objects.create(child=kitten, parent=grandkitten)
+
+        with pytest.raises(ValidationError) as excinfo:
+            kitten.clean()
+        assert 'descendants of this animal' in messages(excinfo)
+
+    def test_clean_checks_stored_parents_in_one_query(self, litter):
+        kitten = litter['kittens'][0]
+        with CaptureQueriesContext(connection) as queries:
+            kitten.clean()
+        assert len(queries) == 1
+
+
+@pytest.mark.django_db
+class TestParentEndpoints:
+    """Tests for parent assignment through the API."""
+
+    def test_bulk_assign_litter(self, authenticated_employee, litter):
+        url = reverse('animals:animal-assign-parents')
+        response = authenticated_employee.post(url, {
+            'assignments': [
+                {'animal_id': kitten.animal_id, 'parents': ['QUEEN', 'TOM']}
+                for kitten in litter['kittens']
+            ],
+        }, format='json')
+
+        assert response.status_code == 200
+        assert response.json()['KITTEN3'] == ['QUEEN', 'TOM']
+        assert AnimalParent.objects.filter(parent=litter['tom']).count() == 3
+
+    def test_bulk_assign_rejects_invalid_set(self, authenticated_employee, litter):
+        url = reverse('animals:animal-assign-parents')
+        response = authenticated_employee.post(url, {
+            'assignments': [
+                {'animal_id': 'KITTEN2', 'parents': ['QUEEN']},
+                {'animal_id': 'QUEEN', 'parents': ['GRANDKITTEN']},
+            ],
+        }, format='json')
+
+        assert response.status_code == 400
+        assert not AnimalParent.objects.filter(child__animal_id='KITTEN2').exists()
+
+    @pytest.mark.parametrize('parents_value', ['QUEEN', {'animal_id': 'QUEEN'}])
+    def test_bulk_assign_requires_parent_list(self, authenticated_employee, litter, parents_value):
+        url = reverse('animals:animal-assign-parents')
+        response = authenticated_employee.post(url, {
+            'assignments': [{'animal_id': 'KITTEN2', 'parents': parents_value}],
+        }, format='json')
+
+        assert response.status_code == 400
+        assert 'list of parents' in str(response.data['assignments'])
+        assert not AnimalParent.objects.filter(child__animal_id='KITTEN2').exists()
+
+    def test_update_rejects_self_parent(self, authenticated_employee, litter):
+        url = reverse('animals:animal-detail', kwargs={'pk': litter['kittens'][1].pk})
+        response = authenticated_employee.patch(url, {'parents': ['KITTEN2']}, format='json')
+
+        assert response.status_code == 400
+        assert 'cannot be its own parent' in str(response.data['parents'])
@@ -0,0 +1,240 @@
+"""
+Tests for photo uploads and resized variants.
+"""
+import pytest
+from io import BytesIO, StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image
+from apps.animals.models import Animal, Photo, PhotoProcessingStatus
+from apps.animals.services.photo_pipeline import photo_storage
+from apps.jobs.services import queue
+
+
+def image_upload(name='max.png', size=(1200, 900), color='red', format='PNG', content_type='image/png'):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format=format)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=content_type)
+
+
+@pytest.fixture(autouse=True)
+def photo_settings(settings, tmp_path):
+    """Store photos in a temporary directory and resize synchronously."""
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'photos': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+            'OPTIONS': {'location': tmp_path, 'base_url': '/media/photos/'},
+        },
+    }
+    settings.PHOTOS = {**settings.PHOTOS, 'PROCESSING': 'sync'}
+    return settings
+
+
+@pytest.mark.django_db
+class TestPhotoUpload:
+    """Tests for multipart photo uploads."""
+
+    def upload(self, client, animal, **data):
+        url = reverse('animals:animal-photos-list', kwargs={'animal_pk': animal.pk})
+        return client.post(url, {'file': image_upload(), **data}, format='multipart')
+
+    def test_upload_stores_content_addressed_file(
+        self, authenticated_employee, dog_max, django_capture_on_commit_callbacks
+    ):
+        """Test that the original is saved under its hash and variants are created."""
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.upload(authenticated_employee, dog_max)
+
+        assert response.status_code == 201
+        photo = Photo.objects.get(animal=dog_max)
+        assert photo.filename == 'max.png'
+        assert photo.storage_name == f'originals/{photo.content_hash[:2]}/{photo.content_hash}.png'
+        assert photo.url == f'/media/photos/{photo.storage_name}'
+        assert photo.processing_status == PhotoProcessingStatus.READY
+
+        storage = photo_storage()
+        assert set(photo.variants) == {'thumb', 'medium', 'large'}
+        with storage.open(photo.variants['thumb'].removeprefix('/media/photos/')) as thumb:
+            assert max(Image.open(thumb).size) == 200
+        with storage.open(photo.variants['large'].removeprefix('/media/photos/')) as large:
+            # Never upscaled.
+            assert Image.open(large).size == (1200, 900)
+
+    def test_identical_uploads_share_files(self, authenticated_employee, dog_max, cat_luna):
+        """Test that the same image uploaded twice is stored once."""
+        self.upload(authenticated_employee, dog_max)
+        self.upload(authenticated_employee, cat_luna)
+
+        first, second = Photo.objects.all()
+        assert first.storage_name == second.storage_name
+        assert len(photo_storage().listdir(f'originals/{first.content_hash[:2]}')[1]) == 1
+
+    def test_processing_left_pending_for_worker(self, authenticated_employee, dog_max, settings):
+        """Test that worker mode defers resizing to process_photos."""
+        settings.PHOTOS = {**settings.PHOTOS, 'PROCESSING': 'worker'}
+        self.upload(authenticated_employee, dog_max)
+        photo = Photo.objects.get()
+        assert photo.processing_status == PhotoProcessingStatus.PENDING
+        uploaded_at = photo.updated_at
+
+        call_command('process_photos', stdout=StringIO())
+
+        photo.refresh_from_db()
+        assert photo.processing_status == PhotoProcessingStatus.READY
+        assert 'thumb' in photo.variants
+        # delta sync sees the variants appear
+        assert photo.updated_at > uploaded_at
+
+    def test_processing_queued_as_job(self, authenticated_employee, dog_max, settings):
+        """Test that queue mode leaves resizing to a background job."""
+        settings.PHOTOS = {**settings.PHOTOS, 'PROCESSING': 'queue'}
+        self.upload(authenticated_employee, dog_max)
+        photo = Photo.objects.get()
+        assert photo.processing_status == PhotoProcessingStatus.PENDING
+
+        [(name, outcome, _)] = [queue.run(job_id) for job_id in queue.claim('test-worker', 10)]
+
+        photo.refresh_from_db()
+        assert (name, outcome) == ('animals.process_photo', queue.DONE)
+        assert photo.processing_status == PhotoProcessingStatus.READY
+
+    def test_rejects_non_image(self, authenticated_employee, dog_max):
+        """Test that non-image uploads are rejected."""
+        url = reverse('animals:animal-photos-list', kwargs={'animal_pk': dog_max.pk})
+        upload = SimpleUploadedFile('notes.png', b'not an image', content_type='image/png')
+        response = authenticated_employee.post(url, {'file': upload}, format='multipart')
+
+        assert response.status_code == 400
+        assert 'file' in response.data
+
+    def test_extension_from_detected_format(self, authenticated_employee, dog_max, client):
+        """Test that the client's file name does not choose how the file is served."""
+        url = reverse('animals:animal-photos-list', kwargs={'animal_pk': dog_max.pk})
+        upload = image_upload(name='max.gif', content_type='image/gif')
+        response = authenticated_employee.post(url, {'file': upload}, format='multipart')
+
+        assert response.status_code == 201
+        photo = Photo.objects.get()
+        assert photo.storage_name.endswith('.png')
+        assert client.get(photo.url)['Content-Type'] == 'image/png'
+
+    def test_rejects_unsupported_format(self, authenticated_employee, dog_max):
+        """Test that images Pillow reads but photos do not accept are rejected."""
+        url = reverse('animals:animal-photos-list', kwargs={'animal_pk': dog_max.pk})
+        upload = image_upload(name='max.jpg', format='BMP', content_type='image/jpeg')
+        response = authenticated_employee.post(url, {'file': upload}, format='multipart')
+
+        assert response.status_code == 400
+        assert 'file' in response.data
+
+    def test_rejects_too_large(self, authenticated_employee, dog_max, settings):
+        """Test the upload size limit."""
+        settings.PHOTOS = {**settings.PHOTOS, 'MAX_UPLOAD_BYTES': 100}
+        response = self.upload(authenticated_employee, dog_max)
+
+        assert response.status_code == 400
+
+    def test_requires_file_or_filename(self, authenticated_employee, dog_max):
+        """Test that an empty create is rejected."""
+        url = reverse('animals:animal-photos-list', kwargs={'animal_pk': dog_max.pk})
+        response = authenticated_employee.post(url, {'is_identification_photo': True})
+
+        assert response.status_code == 400
+
+    def test_filename_only_keeps_legacy_url(self, authenticated_employee, dog_max):
+        """Test creating a photo record without uploading a file."""
+        url = reverse('animals:animal-photos-list', kwargs={'animal_pk': dog_max.pk})
+        response = authenticated_employee.post(url, {'filename': 'max.jpg'})
+
+        assert response.status_code == 201
+        assert response.data['url'] == '/media/animals/max.jpg'
+
+
+@pytest.mark.django_db
+class TestPhotoDelivery:
+    """Tests for thumbnails in the animal list and file serving."""
+
+    def test_animal_list_thumbnail(
+        self, authenticated_employee, dog_max, cat_luna, django_capture_on_commit_callbacks
+    ):
+        """Test that list rows carry the identification photo thumbnail."""
+        url = reverse('animals:animal-photos-list', kwargs={'animal_pk': dog_max.pk})
+        with django_capture_on_commit_callbacks(execute=True):
+            authenticated_employee.post(
+                url, {'file': image_upload(), 'is_identification_photo': True}, format='multipart'
+            )
+
+        response = authenticated_employee.get(reverse('animals:animal-list'))
+
+        thumbnails = {row['name']: row['thumbnail_url'] for row in response.data['results']}
+        assert thumbnails['Max'] == Photo.objects.get().variants['thumb']
+        assert thumbnails['Luna'] is None
+
+    def test_photo_file_is_cacheable(self, client, dog_max):
+        """Test that photo files are served with long-lived cache headers."""
+        name = photo_storage().save('originals/ab/abc.png', image_upload())
+        response = client.get(f'/media/photos/{name}')
+
+        assert response.status_code == 200
+        assert 'immutable' in response['Cache-Control']
+        assert 'max-age=31536000' in response['Cache-Control']
+
+
+@pytest.mark.django_db
+class TestIdentificationPhoto:
+    """Tests for the Animal.identification_photo pointer."""
+
+    def photo(self, animal, name, identification=True):
+        return Photo.objects.create(
+            animal=animal, filename=name, url=f'/media/animals/{name}',
+            is_identification_photo=identification,
+        )
+
+    def test_points_at_newest_identification_photo(self, dog_max):
+        first = self.photo(dog_max, 'a.jpg')
+        self.photo(dog_max, 'gallery.jpg', identification=False)
+        dog_max.refresh_from_db()
+        assert dog_max.identification_photo == first
+
+        second = self.photo(dog_max, 'b.jpg')
+        dog_max.refresh_from_db()
+        assert dog_max.identification_photo == second
+
+    def test_follows_flag_changes_and_deletes(self, dog_max):
+        first = self.photo(dog_max, 'a.jpg')
+        second = self.photo(dog_max, 'b.jpg')
+
+        second.is_identification_photo = False
+        second.save()
+        dog_max.refresh_from_db()
+        assert dog_max.identification_photo == first
+
+        first.delete()
+        dog_max.refresh_from_db()
+        assert dog_max.identification_photo is None
+
+    def test_refresh_all(self, dog_max, cat_luna):
+        photos = Photo.objects.bulk_create([
+            Photo(animal=dog_max, filename='max.jpg', url='/media/animals/max.jpg'),
+            Photo(animal=cat_luna, filename='luna.jpg', url='/media/animals/luna.jpg'),
+        ])
+
+        assert Animal.refresh_identification_photos() == 2
+        assert dict(Animal.objects.values_list('pk', 'identification_photo')) == {
+            dog_max.pk: photos[0].pk, cat_luna.pk: photos[1].pk,
+        }
+
+    def test_list_uses_single_query(
+        self, authenticated_employee, dog_max, cat_luna, django_assert_num_queries
+    ):
+        """Test that list thumbnails come from the joined photo."""
+        self.photo(dog_max, 'max.jpg')
+
+        # count + page
+        with django_assert_num_queries(2):
+            response = authenticated_employee.get(reverse('animals:animal-list'))
+
+        thumbnails = {row['name']: row['thumbnail_url'] for row in response.data['results']}
+        assert thumbnails == {'Max': '/media/animals/max.jpg', 'Luna': None}
@@ -0,0 +1,113 @@
+"""
+Tests for the daily reminder digests.
+"""
+import pytest
+from datetime import date, timedelta
+from io import StringIO
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from apps.animals.models import AnimalStatus, Medication, ReminderDigest, Vaccination
+from apps.animals.services.reminders import due_items, send_digests
+
+TODAY = date.today()
+
+
+class CountingBackend(EmailBackend):
+    """locmem backend counting the connections opened."""
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+
+def vaccinate(animal, user, due_in_days, name='Nobivac Rabies'):
+    return Vaccination.objects.create(
+        animal=animal, vaccine_name=name, vaccine_for='Wścieklizna', vaccine_batch_number='R1',
+        vaccination_date=TODAY - timedelta(days=365), expiration_date=TODAY + timedelta(days=due_in_days),
+        next_due_date=TODAY + timedelta(days=due_in_days), performed_by=user,
+    )
+
+
+@pytest.fixture
+def due(dog_max, cat_luna, veterinarian, employee_user, medication_for_max):
+    """
+    The veterinarian: Luna's vaccination in 3 days and the end of Max's
+    medication in 7; the employee: Max's vaccination tomorrow.
+    """
+    return {
+        'luna': vaccinate(cat_luna, veterinarian, 3),
+        'max': vaccinate(dog_max, employee_user, 1),
+        'medication': medication_for_max,
+    }
+
+
+@pytest.mark.django_db
+class TestReminderDigests:
+
+    def test_due_items_in_one_query(self, due, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            items = list(due_items(TODAY, 7))
+
+        assert {(item['email'], item['kind'], item['due']) for item in items} == {
+            ('dr.kowalczyk@schronisko.pl', 'vaccination', TODAY + timedelta(days=3)),
+            ('dr.kowalczyk@schronisko.pl', 'medication_end', TODAY + timedelta(days=7)),
+            ('pracownik@schronisko.pl', 'vaccination', TODAY + timedelta(days=1)),
+        }
+        # grouped by recipient, soonest first
+        keys = [(item['recipient'], item['due']) for item in items]
+        assert keys == sorted(keys)
+
+    def test_one_digest_per_recipient(self, due):
+        digests = send_digests(TODAY, 7)
+
+        assert sorted(digest.item_count for digest in digests) == [1, 2]
+        assert len(mail.outbox) == 2
+        [vet_mail] = [message for message in mail.outbox if message.to == ['dr.kowalczyk@schronisko.pl']]
+        assert vet_mail.subject == f'Przypomnienia na {TODAY:%d.%m.%Y} (2)'
+        lines = [line for line in vet_mail.body.splitlines() if line.startswith('- ')]
+        assert lines == [
+            f'- {TODAY + timedelta(days=3):%d.%m.%Y} Szczepienie: Nobivac Rabies - Luna ({due["luna"].animal.animal_id})',
+            f'- {TODAY + timedelta(days=7):%d.%m.%Y} Koniec leczenia: Amoxicylina - Max (DOG-001)',
+        ]
+
+    def test_skips_items_not_due_or_without_recipient(self, dog_max, cat_luna, veterinarian, employee_user):
+        vaccinate(dog_max, veterinarian, 30)
+        vaccinate(dog_max, None, 2)
+        vaccinate(dog_max, veterinarian, -1)
+        vaccinate(cat_luna, employee_user, 2)
+        cat_luna.status = AnimalStatus.ADOPTED
+        cat_luna.save()
+        employee_user.is_active = False
+        employee_user.save()
+
+        assert send_digests(TODAY, 7) == []
+        assert mail.outbox == []
+
+    def test_single_connection(self, due, settings):
+        settings.EMAIL_BACKEND = 'apps.animals.tests.test_reminders.CountingBackend'
+        CountingBackend.opened = 0
+
+        send_digests(TODAY, 7)
+
+        assert (CountingBackend.opened, len(mail.outbox)) == (1, 2)
+
+    def test_idempotent_per_day(self, due):
+        send_digests(TODAY, 7)
+        Medication.objects.filter(pk=due['medication'].pk).update(end_date=TODAY + timedelta(days=2))
+
+        assert send_digests(TODAY, 7) == []
+        assert len(mail.outbox) == 2
+        # the next day everyone gets a digest again
+        assert len(send_digests(TODAY + timedelta(days=1), 7)) == 2
+        assert ReminderDigest.objects.count() == 4
+
+    def test_command(self, due):
+        out = StringIO()
+
+        call_command('send_reminders', '--days-ahead', '3', stdout=out)
+        call_command('send_reminders', '--days-ahead', '3', stdout=out)
+
+        assert 'Sent 2 reminder digests (2 items)' in out.getvalue()
+        assert 'No reminders to send' in out.getvalue()
@@ -0,0 +1,139 @@
+"""
+Tests for the animal status log.
+"""
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from apps.animals.models import Animal, AnimalSpecies, AnimalStatus, AnimalStatusChange
+from apps.animals.services import status_history
+
+
+def log(animal):
+    return list(
+        AnimalStatusChange.objects.filter(animal=animal).values_list('from_status', 'to_status')
+    )
+
+
+@pytest.fixture
+def dog(db):
+    return Animal.objects.create(animal_id='DOG-1', name='Reksio', species=AnimalSpecies.DOG)
+
+
+@pytest.mark.django_db
+class TestStatusLog:
+    """Tests for writing the status log."""
+
+    def test_create_and_change(self, dog, employee_user):
+        dog.status = AnimalStatus.QUARANTINE
+        dog.save(changed_by=employee_user)
+        dog.name = 'Reksio II'
+        dog.save()
+
+        assert log(dog) == [('', AnimalStatus.NEW_INTAKE), (AnimalStatus.NEW_INTAKE, AnimalStatus.QUARANTINE)]
+        assert AnimalStatusChange.objects.last().changed_by == employee_user
+
+    def test_change_of_loaded_animal(self, dog):
+        animal = Animal.objects.get(pk=dog.pk)
+        animal.status = AnimalStatus.IN_SHELTER
+        animal.save(update_fields=['status'])
+
+        assert log(dog)[-1] == (AnimalStatus.NEW_INTAKE, AnimalStatus.IN_SHELTER)
+
+    def test_bulk_update(self, db, django_assert_num_queries):
+        Animal.objects.bulk_create(
+            Animal(animal_id=f'CAT-{i}', name=f'Kot {i}', species=AnimalSpecies.CAT) for i in range(5)
+        )
+        Animal.objects.filter(animal_id='CAT-0').update(status=AnimalStatus.ADOPTED)
+
+        # select previous statuses, update, one insert (plus savepoint)
+        with django_assert_num_queries(5):
+            updated = Animal.objects.filter(species=AnimalSpecies.CAT).update(status=AnimalStatus.ADOPTED)
+
+        assert updated == 5
+        adopted = AnimalStatusChange.objects.filter(to_status=AnimalStatus.ADOPTED)
+        assert adopted.count() == 5
+        assert AnimalStatusChange.objects.filter(from_status='').count() == 5
+
+    def test_bulk_create_backdated(self, db):
+        intake = timezone.now() - timedelta(days=30)
+        animals = Animal.objects.bulk_create(
+            [Animal(animal_id='CAT-0', name='Kot', species=AnimalSpecies.CAT)], changed_at=intake,
+        )
+
+        assert AnimalStatusChange.objects.get(animal=animals[0]).changed_at == intake
+
+    def test_update_without_status_is_not_logged(self, dog):
+        Animal.objects.filter(pk=dog.pk).update(name='Burek')
+        assert len(log(dog)) == 1
+
+    def test_log_is_append_only(self, dog):
+        change = AnimalStatusChange.objects.get(animal=dog)
+        with pytest.raises(ValueError):
+            change.save()
+
+
+@pytest.mark.django_db
+class TestStatusStatistics:
+    """Tests for statistics over the status log."""
+
+    def test_history(self, dog):
+        now = timezone.now()
+        AnimalStatusChange.objects.filter(animal=dog).update(changed_at=now - timedelta(days=10))
+        AnimalStatusChange.objects.create(
+            animal=dog, from_status=AnimalStatus.NEW_INTAKE, to_status=AnimalStatus.QUARANTINE,
+            changed_at=now - timedelta(days=4),
+        )
+
+        result = status_history.history(dog, now=now)
+
+        assert result['days_in_status'] == {AnimalStatus.NEW_INTAKE: 6.0, AnimalStatus.QUARANTINE: 4.0}
+
+    def test_outcomes_and_length_of_stay(self, dog):
+        now = timezone.now()
+        AnimalStatusChange.objects.filter(animal=dog).update(changed_at=now - timedelta(days=30))
+        Animal.objects.filter(pk=dog.pk).update(status=AnimalStatus.ADOPTED)
+
+        counts = status_history.transition_counts(now - timedelta(days=1), now + timedelta(minutes=1))
+        stays = status_history.length_of_stay(now - timedelta(days=1), now + timedelta(minutes=1))
+
+        assert counts == {AnimalStatus.ADOPTED: 1}
+        assert stays['count'] == 1
+        assert stays['by_outcome'][AnimalStatus.ADOPTED]['average_days'] == pytest.approx(30, abs=0.1)
+
+
+@pytest.mark.django_db
+class TestStatusEndpoints:
+    """Tests for the status log API."""
+
+    def test_update_logs_user(self, authenticated_employee, employee_user, dog):
+        url = reverse('animals:animal-detail', kwargs={'pk': dog.pk})
+        response = authenticated_employee.patch(url, {'status': AnimalStatus.IN_SHELTER}, format='json')
+
+        assert response.status_code == 200
+        change = AnimalStatusChange.objects.last()
+        assert (change.to_status, change.changed_by) == (AnimalStatus.IN_SHELTER, employee_user)
+
+    def test_list_in_range(self, authenticated_employee, dog):
+        Animal.objects.filter(pk=dog.pk).update(status=AnimalStatus.ADOPTED)
+        url = reverse('animals:animal-status-change-list')
+        since = (timezone.now() - timedelta(hours=1)).isoformat()
+
+        response = authenticated_employee.get(url, {'status': AnimalStatus.ADOPTED, 'since': since})
+
+        assert response.status_code == 200
+        assert [row['animal_id'] for row in response.json()['results']] == ['DOG-1']
+
+    def test_stats(self, authenticated_employee, dog):
+        Animal.objects.filter(pk=dog.pk).update(status=AnimalStatus.ADOPTED)
+        response = authenticated_employee.get(reverse('animals:animal-status-change-stats'))
+
+        assert response.status_code == 200
+        assert response.json()['transitions'][AnimalStatus.ADOPTED] == 1
+
+    def test_animal_history(self, authenticated_employee, dog):
+        url = reverse('animals:animal-status-history', kwargs={'pk': dog.pk})
+        response = authenticated_employee.get(url)
+
+        assert response.status_code == 200
+        assert response.json()['transitions'][0]['to_status'] == AnimalStatus.NEW_INTAKE
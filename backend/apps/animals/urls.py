@@ -3,12 +3,16 @@ URL configuration for animals app.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AnimalViewSet, VeterinarianListView, IntakeViewSet, BehavioralTagViewSet, PhotoViewSet
+from .views import (
+    AnimalViewSet, AnimalListView, AnimalDetailView, VeterinarianListView, DueDosesView,
+    IntakeViewSet, BehavioralTagViewSet, PhotoViewSet, AnimalStatusChangeViewSet,
+)
 from rest_framework_nested import routers
 
 
 router = DefaultRouter()
 router.register(r'animals', AnimalViewSet, basename='animal')
+router.register(r'animal-status-changes', AnimalStatusChangeViewSet, basename='animal-status-change')
 
 animals_router = routers.NestedDefaultRouter(router, r'animals', lookup='animal')
 animals_router.register(r'intakes', IntakeViewSet, basename='animal-intakes')
@@ -17,6 +21,11 @@ animals_router.register(r'behavioral-tags', BehavioralTagViewSet, basename='anim
 
 urlpatterns = [
     path('veterinarians/', VeterinarianListView.as_view(), name='veterinarian-list'),
+    path('medications/due/', DueDosesView.as_view(), name='medication-due-doses'),
+    # Async read paths, matched before the router's routes for the same URLs
+    path('animals/', AnimalListView.as_view(), name='animal-list'),
+    path('animals/parents/', AnimalViewSet.as_view({'post': 'assign_parents'}), name='animal-assign-parents'),
+    path('animals/<pk>/', AnimalDetailView.as_view(), name='animal-detail'),
     path('', include(router.urls)),
     path('', include(animals_router.urls)),
 ]
@@ -1,14 +1,29 @@
 """
 Views for animals app.
 """
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.static import serve
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from apps.accounts.permissions import IsEmployee
 from apps.accounts.models import User, Role
-from .models import Animal, BehavioralTag, Intake, Medication, Photo, Vaccination, MedicalProcedure
+from apps.core.async_views import AsyncAPIView, AsyncViewSetView
+from apps.core.replicas import ReplicaReadMixin
+from apps.shelters.tenancy import ShelterScopedMixin, get_scoped_or_404, scope, shelter_of
+from .filters import AnimalStatusChangeFilter
+from .models import (
+    Animal, AnimalStatusChange, BehavioralTag, Intake, Medication, Photo, Vaccination, MedicalProcedure,
+)
+from .services import lineage, medication_schedule, status_history
+from .services.parents import assign_parents
+from .services.photo_pipeline import photo_storage
 from .serializers import (
     AnimalCreateSerializer,
     AnimalListSerializer,
@@ -29,16 +44,19 @@ from .serializers import (
     BehavioralTagDetailSerializer,
     PhotoListSerializer,
     PhotoDetailSerializer,
-    PhotoCreateSerializer
+    PhotoCreateSerializer,
+    AnimalStatusChangeSerializer,
 )
 
 
-class AnimalViewSet(viewsets.ModelViewSet):
+class AnimalViewSet(ShelterScopedMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing animals.
 
     list: Get all animals with optional filtering and search.
     retrieve: Get detailed information about a single animal.
+
+    list and retrieve read from the replica when one is configured.
     """
     permission_classes = [IsEmployee]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -48,7 +66,10 @@ class AnimalViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return Animal.objects.all()
+        queryset = Animal.objects.all()
+        if self.action == 'list':
+            queryset = queryset.select_related('identification_photo')
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -140,23 +161,157 @@ class AnimalViewSet(viewsets.ModelViewSet):
                 )
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def _lineage_depth(self, request):
+        try:
+            depth = int(request.query_params.get('depth', 3))
+        except ValueError:
+            depth = 0
+        if not 1 <= depth <= lineage.MAX_DEPTH:
+            raise ValidationError({'depth': f'Must be an integer between 1 and {lineage.MAX_DEPTH}.'})
+        return depth
+
+    @action(detail=True, methods=['get'])
+    def ancestors(self, request, pk=None):
+        """Ancestor graph up to ?depth= generations (default 3)."""
+        animal = self.get_object()
+        return Response(lineage.ancestors(animal, self._lineage_depth(request), self.scope(Animal.objects.all())))
+
+    @action(detail=True, methods=['get'])
+    def descendants(self, request, pk=None):
+        """Descendant graph up to ?depth= generations (default 3)."""
+        animal = self.get_object()
+        return Response(lineage.descendants(animal, self._lineage_depth(request), self.scope(Animal.objects.all())))
+
+    @action(detail=True, methods=['get'])
+    def siblings(self, request, pk=None):
+        """Full and half siblings."""
+        return Response(lineage.siblings(self.get_object(), self.scope(Animal.objects.all())))
+
+    @action(detail=True, methods=['get'], url_path='status-history')
+    def status_history(self, request, pk=None):
+        """Status transitions and days spent in each status."""
+        return Response(status_history.history(self.get_object()))
+
+    @action(detail=False, methods=['post'], url_path='parents')
+    def assign_parents(self, request):
+        """
+        Set parents of many animals at once, e.g. a registered litter.
+
+        Body: ``{"assignments": [{"animal_id": "...", "parents": ["...", ...]}]}``.
+        """
+        assignments = request.data.get('assignments')
+        if not isinstance(assignments, list) or not assignments:
+            raise ValidationError({'assignments': 'Expected a non-empty list.'})
+        if not all(
+            isinstance(item, dict) and isinstance(item.get('animal_id'), str)
+            and isinstance(item.get('parents') or [], list)
+            for item in assignments
+        ):
+            raise ValidationError({'assignments': 'Each item needs animal_id and a list of parents.'})
+        wanted = {item['animal_id']: item.get('parents') or [] for item in assignments}
 
-class VeterinarianListView(APIView):
+        animals = {animal.animal_id: animal for animal in self.scope(self.get_queryset()).filter(animal_id__in=wanted)}
+        missing = [animal_id for animal_id in wanted if animal_id not in animals]
+        if missing:
+            raise ValidationError({'assignments': f'Animals not found: {missing}'})
+        try:
+            assigned = assign_parents(
+                [(animals[animal_id], parents) for animal_id, parents in wanted.items()], shelter_of(request.user),
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError(exc.message_dict if hasattr(exc, 'error_dict') else exc.messages)
+        return Response({
+            animal_id: [parent.animal_id for parent in parents]
+            for animal_id, parents in assigned.items()
+        })
+
+
+class AnimalListView(AsyncViewSetView):
+    """Animal list served asynchronously; creation goes to AnimalViewSet."""
+    viewset_class = AnimalViewSet
+    basename = 'animal'
+    actions = {'get': 'list', 'post': 'create'}
+
+
+class AnimalDetailView(AsyncViewSetView):
+    """Animal detail served asynchronously; writes go to AnimalViewSet."""
+    viewset_class = AnimalViewSet
+    basename = 'animal'
+    actions = {
+        'get': 'retrieve',
+        'put': 'update',
+        'patch': 'partial_update',
+        'delete': 'destroy',
+    }
+
+
+class VeterinarianListView(AsyncAPIView):
     """
-    API endpoint for listing veterinarians (employees).
+    API endpoint for listing veterinarians (employees of the user's shelter).
     Used in dropdowns when selecting who performed medical procedures.
     """
     permission_classes = [IsEmployee]
 
-    def get(self, request):
-        veterinarians = User.objects.filter(role=Role.EMPLOYEE, is_active=True)
+    async def get(self, request):
+        employees = scope(User.objects.filter(role=Role.EMPLOYEE, is_active=True), self.drf_request.user)
+        veterinarians = [user async for user in employees]
         serializer = VeterinarianSerializer(veterinarians, many=True)
-        return Response(serializer.data)
+        return self.respond(serializer.data)
+
+
+class DueDosesView(AsyncAPIView):
+    """
+    Shelter-wide worklist of medication doses.
 
+    ?date=YYYY-MM-DD lists a whole day, ?from=&to= (ISO datetimes) any window
+    up to a week; by default doses from an hour ago to two hours ahead.
+    """
+    permission_classes = [IsEmployee]
+
+    def window(self, params):
+        if params.get('date'):
+            try:
+                day = parse_date(params['date'])
+            except ValueError:
+                day = None
+            if day is None:
+                raise ValidationError({'date': 'Expected YYYY-MM-DD.'})
+            start = timezone.make_aware(datetime.combine(day, time()))
+            return start, start + timedelta(days=1)
+
+        now = timezone.now()
+        bounds = []
+        for name, default in (('from', now - medication_schedule.WORKLIST_BEFORE),
+                              ('to', now + medication_schedule.WORKLIST_AFTER)):
+            try:
+                value = parse_datetime(params[name]) if params.get(name) else default
+            except ValueError:
+                value = None
+            if value is None:
+                raise ValidationError({name: 'Expected an ISO 8601 datetime.'})
+            bounds.append(value if timezone.is_aware(value) else timezone.make_aware(value))
+        start, end = bounds
+        if not start < end <= start + medication_schedule.MAX_WINDOW:
+            raise ValidationError({'to': 'Must be after from and at most 7 days later.'})
+        return start, end
+
+    async def get(self, request):
+        start, end = self.window(request.GET)
+        running = scope(
+            medication_schedule.running_medications(start, end), self.drf_request.user, 'animal__shelter',
+        )
+        medications = [row async for row in running]
+        return self.respond({
+            'from': start,
+            'to': end,
+            'doses': medication_schedule.expand(medications, start, end),
+        })
 
-class IntakeViewSet(viewsets.ModelViewSet):
+
+class IntakeViewSet(ShelterScopedMixin, viewsets.ModelViewSet):
 
     queryset = Intake.objects.all()
+    shelter_field = 'animal__shelter'
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -170,11 +325,11 @@ class IntakeViewSet(viewsets.ModelViewSet):
         return self.queryset.filter(animal_id=animal_pk)
     
     def perform_create(self, serializer):
-        animal_pk = self.kwargs.get('animal_pk')
-        serializer.save(animal_id=animal_pk)    
+        animal = get_scoped_or_404(Animal.objects, self.request.user, pk=self.kwargs.get('animal_pk'))
+        serializer.save(animal=animal)
 
 
-class BehavioralTagViewSet(viewsets.ReadOnlyModelViewSet):
+class BehavioralTagViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
 
     queryset = BehavioralTag.objects.all()
 
@@ -192,10 +347,11 @@ class BehavioralTagViewSet(viewsets.ReadOnlyModelViewSet):
 
     
 
-class PhotoViewSet(viewsets.ModelViewSet):
+class PhotoViewSet(ShelterScopedMixin, viewsets.ModelViewSet):
 
     queryset = Photo.objects.all()
     lookup_field = 'photo_id'
+    shelter_field = 'animal__shelter'
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -209,5 +365,49 @@ class PhotoViewSet(viewsets.ModelViewSet):
         return self.queryset.filter(animal_id=animal_pk)
     
     def perform_create(self, serializer):
-        animal_pk = self.kwargs.get('animal_pk')
-        serializer.save(animal_id=animal_pk)  
\ No newline at end of file
+        animal = get_scoped_or_404(Animal.objects, self.request.user, pk=self.kwargs.get('animal_pk'))
+        serializer.save(animal=animal)
+
+
+class AnimalStatusChangeViewSet(ShelterScopedMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Status log of all animals, filtered by status and time range.
+
+    list: Transitions, e.g. ?status=ADOPTED&since=2026-01-01&until=2026-02-01
+    stats: Transition counts and length of stay of outcomes in ?since= / ?until=
+    """
+    queryset = AnimalStatusChange.objects.select_related('animal')
+    serializer_class = AnimalStatusChangeSerializer
+    permission_classes = [IsEmployee]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = AnimalStatusChangeFilter
+    ordering_fields = ['changed_at']
+    ordering = ['-changed_at']
+    shelter_field = 'animal__shelter'
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        period = AnimalStatusChangeFilter(request.query_params, queryset=self.queryset).form
+        if not period.is_valid():
+            raise ValidationError(period.errors)
+        until = period.cleaned_data.get('until') or timezone.now()
+        since = period.cleaned_data.get('since') or until - timedelta(days=30)
+        shelter = shelter_of(request.user)
+        return Response({
+            'since': since,
+            'until': until,
+            'transitions': status_history.transition_counts(since, until, shelter=shelter),
+            'length_of_stay': status_history.length_of_stay(since, until, shelter=shelter),
+        })
+
+
+def photo_file(request, path):
+    """
+    Serve a file from the local photos storage.
+
+    Names are content hashes, so responses are cacheable forever by browsers
+    and a CDN in front of the ALB.
+    """
+    response = serve(request, path, document_root=photo_storage().location)
+    response['Cache-Control'] = f"public, max-age={settings.PHOTOS['CACHE_MAX_AGE']}, immutable"
+    return response
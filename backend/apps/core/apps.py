@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Core'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+        from .db import on_connection_created
+        from .metrics import instrument_connection, instrument_serializers
+
+        connection_created.connect(on_connection_created)
+
+        if getattr(settings, 'REQUEST_METRICS', {}).get('ENABLED', True):
+            connection_created.connect(instrument_connection)
+            instrument_serializers()
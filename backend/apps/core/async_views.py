@@ -0,0 +1,199 @@
+"""
+Async views for hot read paths.
+
+DRF views are synchronous; under ASGI each request to them occupies a thread
+for its whole duration. The views here authenticate and check permissions with
+the regular DRF classes, but run queryset counting and fetching through
+Django's async ORM and return normal DRF ``Response`` objects, so clients (and
+tests) see the same payloads as from the viewsets they replace.
+"""
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.http import Http404
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from apps.core.replicas import use_primary, use_replica
+
+
+class AsyncAPIView(View):
+    """
+    Base class for async read-only API views.
+
+    Subclasses implement ``async def get(self, request, *args, **kwargs)`` and
+    return ``self.respond(data)``. ``self.drf_request`` holds the authenticated
+    DRF request.
+
+    A view shadowing a viewset route sets ``viewset_class``, ``basename`` (the
+    router's) and ``actions``: authentication and permission classes are then
+    the viewset's, and permissions are checked against a viewset instance for
+    the request's action, so ``view.action``, ``view.basename``,
+    ``view.get_queryset()`` and ``view.get_object()`` work in them as on the
+    synchronous route.
+    """
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+    # viewset action names reported to the request metrics, {method: action}
+    actions = {}
+    viewset_class = None
+    basename = None
+    action = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.actions = cls.actions
+        # Authentication is token based, same as the DRF views.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            self.action = self.actions.get(request.method.lower())
+            self.drf_request = Request(request, authenticators=self.get_authenticators())
+            await sync_to_async(self.check_permissions)(self.drf_request)
+            return await super().dispatch(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    def get_authenticators(self):
+        source = self.viewset_class or self
+        return [auth() for auth in source.authentication_classes]
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    def get_viewset(self, action):
+        lookup = self.viewset_class.lookup_url_kwarg or self.viewset_class.lookup_field
+        viewset = self.viewset_class(
+            request=self.drf_request, args=self.args, kwargs=self.kwargs, action=action,
+            basename=self.basename, detail=lookup in self.kwargs, format_kwarg=None,
+        )
+        viewset.headers = {}
+        return viewset
+
+    def check_permissions(self, request):
+        """Authenticate ``request`` and run permission classes (may hit the DB)."""
+        request.user
+        view = self.get_viewset(self.action) if self.viewset_class else self
+        for permission in view.get_permissions():
+            if not permission.has_permission(request, view):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticators = self.drf_request.authenticators if hasattr(self, 'drf_request') else []
+            auth_header = authenticators[0].authenticate_header(self.drf_request) if authenticators else None
+            if auth_header:
+                exc.auth_header = auth_header
+            else:
+                exc.status_code = 403
+        response = exception_handler(exc, {'view': self, 'request': getattr(self, 'drf_request', None)})
+        if response is None:
+            raise exc
+        return self.finalize(response)
+
+    def respond(self, data, status=200):
+        return self.finalize(Response(data, status=status))
+
+    def finalize(self, response):
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = 'application/json'
+        response.renderer_context = {'view': self, 'request': getattr(self, 'drf_request', None)}
+        return response
+
+
+class AsyncViewSetView(AsyncAPIView):
+    """
+    Serve GET of a viewset route asynchronously, delegating other methods.
+
+    ``actions`` maps methods to viewset actions like a router does; the GET
+    action must be ``list`` or ``retrieve``.
+
+    The viewset's ``get_queryset``, filter backends, serializer and paginator
+    are reused, so scoping and filtering rules stay in one place, and so are its
+    ``replica_actions`` (apps.core.replicas). Writes (``actions`` other than
+    the GET one) are passed to the synchronous viewset.
+    """
+    write_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        writes = {method: action for method, action in cls.actions.items() if method != 'get'}
+        if writes:
+            initkwargs.setdefault('write_view', cls.viewset_class.as_view(writes))
+        return super().as_view(**initkwargs)
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        if method != 'get' and method in self.actions:
+            return await sync_to_async(self.write_view)(request, *args, **kwargs)
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        action = self.actions['get']
+        use_replica(self.drf_request, action, getattr(self.viewset_class, 'replica_actions', ()))
+        try:
+            return await getattr(self, action)()
+        finally:
+            use_primary()
+
+    async def list(self):
+        viewset = self.get_viewset('list')
+        queryset = await sync_to_async(
+            lambda: viewset.filter_queryset(viewset.get_queryset())
+        )()
+        paginator = viewset.paginator
+        if paginator is None:
+            objects = [obj async for obj in queryset]
+            data = await sync_to_async(lambda: viewset.get_serializer(objects, many=True).data)()
+            return self.respond(data)
+
+        page = await self.paginate(paginator, queryset)
+        data = await sync_to_async(lambda: viewset.get_serializer(page, many=True).data)()
+        return self.finalize(paginator.get_paginated_response(data))
+
+    async def retrieve(self):
+        viewset = self.get_viewset('retrieve')
+        queryset = await sync_to_async(
+            lambda: viewset.filter_queryset(viewset.get_queryset())
+        )()
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+        try:
+            instance = await queryset.aget(**{viewset.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError):
+            raise Http404
+        await sync_to_async(viewset.check_object_permissions)(self.drf_request, instance)
+        data = await sync_to_async(lambda: viewset.get_serializer(instance).data)()
+        return self.respond(data)
+
+    async def paginate(self, paginator, queryset):
+        """Async equivalent of ``PageNumberPagination.paginate_queryset``."""
+        request = self.drf_request
+        page_size = paginator.get_page_size(request)
+        django_paginator = Paginator([], page_size)
+        django_paginator.count = await queryset.acount()
+
+        page_number = request.query_params.get(paginator.page_query_param) or 1
+        if page_number in paginator.last_page_strings:
+            page_number = django_paginator.num_pages
+        try:
+            number = django_paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise exceptions.NotFound(paginator.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+
+        offset = (number - 1) * page_size
+        objects = [obj async for obj in queryset[offset:offset + page_size]]
+        paginator.page = Page(objects, number, django_paginator)
+        paginator.request = request
+        paginator.display_page_controls = False
+        return objects
@@ -0,0 +1,91 @@
+"""
+Load-generation helpers shared by the benchmark management commands.
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+_SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def queries_from_server_timing(header):
+    """Extract the query count from a Server-Timing header (see RequestMetricsMiddleware)."""
+    match = _SERVER_TIMING_QUERIES.search(header or '')
+    return int(match.group(1)) if match else None
+
+
+def summarize(latencies, elapsed, errors=0, queries=None):
+    """Summary statistics for one endpoint; latencies in seconds, output in ms."""
+    ordered = sorted(latencies)
+    ms = lambda value: round(value * 1000, 3) if value is not None else None  # noqa: E731
+    queries = [q for q in (queries or []) if q is not None]
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'throughput_rps': round(len(ordered) / elapsed, 2) if elapsed else None,
+        'mean_ms': ms(sum(ordered) / len(ordered)) if ordered else None,
+        'min_ms': ms(ordered[0]) if ordered else None,
+        'p50_ms': ms(percentile(ordered, 50)),
+        'p95_ms': ms(percentile(ordered, 95)),
+        'p99_ms': ms(percentile(ordered, 99)),
+        'max_ms': ms(ordered[-1]) if ordered else None,
+        'mean_queries': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def run_load(make_sender, total, concurrency=1):
+    """
+    Send ``total`` requests using ``concurrency`` worker threads.
+
+    ``make_sender()`` is called once per worker and must return a callable that
+    performs one request and returns ``(ok, query_count)``. With a concurrency
+    of 1 everything runs in the calling thread.
+    """
+    latencies, queries = [], []
+    errors = 0
+    lock = threading.Lock()
+    remaining = iter(range(total))
+
+    def worker():
+        nonlocal errors
+        send = make_sender()
+        try:
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                start = time.perf_counter()
+                try:
+                    ok, query_count = send()
+                except Exception:
+                    ok, query_count = False, None
+                latency = time.perf_counter() - start
+                with lock:
+                    latencies.append(latency)
+                    queries.append(query_count)
+                    errors += 0 if ok else 1
+        finally:
+            if concurrency > 1:
+                connections.close_all()
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        worker()
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(worker) for _ in range(concurrency)]:
+                future.result()
+    return summarize(latencies, time.perf_counter() - started, errors, queries)
@@ -0,0 +1,52 @@
+"""
+Database connection statistics for the health check.
+
+Counts connections opened by this worker process (via ``connection_created``)
+and, on Postgres, asks the server how many connections the application holds.
+With ``DB_POOL_MODE=pgbouncer`` the server-side numbers are the pooler's
+server connections, so they show how well the pool is sized.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+_lock = threading.Lock()
+_opened = {}
+
+
+def on_connection_created(sender, connection, **kwargs):
+    connection.opened_at = time.monotonic()
+    with _lock:
+        _opened[connection.alias] = _opened.get(connection.alias, 0) + 1
+
+
+def reset():
+    with _lock:
+        _opened.clear()
+
+
+def pool_stats(alias='default'):
+    """Connection reuse settings and counters for ``alias`` (may query the DB)."""
+    connection = connections[alias]
+    opened_at = getattr(connection, 'opened_at', None)
+    stats = {
+        'mode': settings.DB_POOL_MODE,
+        'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+        'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+        'connections_opened': _opened.get(alias, 0),
+        'connection_age_seconds': (
+            round(time.monotonic() - opened_at, 1)
+            if connection.connection is not None and opened_at is not None else None
+        ),
+    }
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*), count(*) FILTER (WHERE state = 'idle') "
+                "FROM pg_stat_activity "
+                "WHERE datname = current_database() AND usename = current_user"
+            )
+            stats['server_connections'], stats['server_idle_connections'] = cursor.fetchone()
+    return stats
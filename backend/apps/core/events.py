@@ -0,0 +1,201 @@
+"""
+Live change events for server-sent event streams.
+
+Writers call ``publish(channel, build)`` inside their transaction; once it
+commits, ``build()`` returns the events (small dicts with a ``shelter`` key)
+and they are handed to every stream subscribed to the channel (with the
+local backend nothing is built while the process has no streams).
+
+``EVENTS['BACKEND']`` selects the fan-out:
+
+* ``local``: streams of this worker process only (one worker, or tests);
+* ``postgres``: events are sent with ``pg_notify`` and every worker runs a
+  listener thread (a dedicated connection doing ``LISTEN``) that hands them
+  to its own streams, so a stream sees writes made in any worker. The
+  listener needs a session to itself: with ``DB_POOL_MODE=pgbouncer`` point
+  ``EVENTS_LISTEN_HOST``/``EVENTS_LISTEN_PORT`` at PostgreSQL directly.
+
+Events are not stored. A stream whose queue overflowed, or whose worker lost
+the listener connection, gets a ``resync`` event and should reload (or
+delta-sync, apps.sync) what it shows.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = 'shelter_events'
+RESYNC = 'resync'
+
+
+class Subscription:
+    """A stream's queue of events, filled from any thread."""
+
+    def __init__(self, channels, shelter=None):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=settings.EVENTS['QUEUE_SIZE'])
+        self.channels = frozenset(channels)
+        self.shelter = shelter
+        self.lost = False
+
+    def wants(self, channel, event):
+        if channel == RESYNC:
+            return True
+        return channel in self.channels and (self.shelter is None or event.get('shelter') == self.shelter)
+
+    def offer(self, channel, event):
+        self.loop.call_soon_threadsafe(self._put, channel, event)
+
+    def _put(self, channel, event):
+        try:
+            self.queue.put_nowait((channel, event))
+        except asyncio.QueueFull:
+            # the client is not keeping up; it reloads instead
+            self.lost = True
+
+    async def next(self, timeout):
+        """The next ``(channel, event)``; None after ``timeout`` seconds without one."""
+        if self.lost:
+            self.lost = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return RESYNC, {}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    """The streams of this process."""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels, shelter=None):
+        """Subscribe the calling coroutine's stream to ``channels``."""
+        subscription = Subscription(channels, shelter)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        if settings.EVENTS['BACKEND'] == 'postgres':
+            listener.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def has_subscribers(self):
+        return bool(self._subscriptions)
+
+    def deliver(self, channel, event):
+        """Hand ``event`` to the interested streams (any thread)."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.wants(channel, event):
+                try:
+                    subscription.offer(channel, event)
+                except RuntimeError:
+                    # its event loop is closed
+                    self.unsubscribe(subscription)
+
+
+broker = Broker()
+
+
+def publish(channel, build, using=None):
+    """
+    Publish the events returned by ``build()`` on ``channel`` once the
+    current transaction commits (at once outside a transaction).
+    """
+    backend = settings.EVENTS['BACKEND']
+
+    def send():
+        if backend == 'local' and not broker.has_subscribers():
+            return
+        events = build()
+        if backend == 'local':
+            for event in events:
+                broker.deliver(channel, event)
+            return
+        with connections[using or 'default'].cursor() as cursor:
+            for event in events:
+                payload = json.dumps({'channel': channel, 'event': event}, cls=DjangoJSONEncoder)
+                cursor.execute('SELECT pg_notify(%s, %s)', [PG_CHANNEL, payload])
+
+    transaction.on_commit(send, using=using)
+
+
+def encode(event):
+    return json.dumps(event, cls=DjangoJSONEncoder, separators=(',', ':'))
+
+
+class Listener:
+    """
+    Thread relaying ``pg_notify`` events to this process's broker, started
+    with the first stream and kept (with its connection) for the process.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='events-listener', daemon=True)
+                self._thread.start()
+
+    def connect(self):
+        import psycopg2
+        params = connection.get_connection_params()
+        if settings.EVENTS['LISTEN_HOST']:
+            params['host'] = settings.EVENTS['LISTEN_HOST']
+            params['port'] = settings.EVENTS['LISTEN_PORT']
+        conn = psycopg2.connect(**params)
+        conn.set_session(autocommit=True)
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN {PG_CHANNEL}')
+        return conn
+
+    def run(self):
+        reconnect = False
+        while True:
+            try:
+                conn = self.connect()
+            except Exception:
+                logger.exception('Event listener cannot connect, retrying')
+                time.sleep(settings.EVENTS['HEARTBEAT_SECONDS'])
+                continue
+            if reconnect:
+                # events sent while not listening are lost
+                broker.deliver(RESYNC, {})
+            reconnect = True
+            try:
+                self.relay(conn)
+            except Exception:
+                logger.exception('Event listener connection lost')
+            finally:
+                conn.close()
+
+    def relay(self, conn):
+        while True:
+            if select.select([conn], [], [], settings.EVENTS['HEARTBEAT_SECONDS']) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                message = json.loads(conn.notifies.pop(0).payload)
+                broker.deliver(message['channel'], message['event'])
+
+
+listener = Listener()
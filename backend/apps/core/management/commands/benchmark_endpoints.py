@@ -0,0 +1,163 @@
+"""
+Management command to benchmark the main API endpoints.
+
+By default requests are sent in-process through the Django test client
+(authenticated as an employee), which measures server-side cost without the
+network. With --base-url the same endpoints are driven over HTTP against a
+running server, e.g. gunicorn or uvicorn on a local Postgres:
+
+    python manage.py generate_synthetic_data --animals 100000 ...
+    python manage.py benchmark_endpoints --requests 500 --concurrency 8 \\
+        --base-url http://localhost:8000 --token <access token> --output bench.json
+
+Results (p50/p95/p99 latency, throughput, mean query count per endpoint) are
+written as JSON.
+"""
+import json
+import platform
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User, Role
+from apps.animals.models import Animal
+from apps.core.benchmarking import queries_from_server_timing, run_load
+from apps.supplies.models import SupplyItem
+
+
+def _first_pk(model):
+    pk = model.objects.order_by('pk').values_list('pk', flat=True).first()
+    if pk is None:
+        raise LookupError(f'no {model.__name__} rows')
+    return pk
+
+
+# name -> callable returning the path to request
+ENDPOINTS = {
+    'health': lambda: reverse('health_check'),
+    'animal-list': lambda: reverse('animals:animal-list'),
+    'animal-detail': lambda: reverse('animals:animal-detail', kwargs={'pk': _first_pk(Animal)}),
+    'veterinarian-list': lambda: reverse('animals:veterinarian-list'),
+    'supply-item-list': lambda: reverse('supplies:supply-item-list'),
+    'supply-item-detail': lambda: reverse(
+        'supplies:supply-item-detail', kwargs={'pk': _first_pk(SupplyItem)}),
+    'supply-item-logs': lambda: reverse(
+        'supplies:supply-item-logs', kwargs={'pk': _first_pk(SupplyItem)}),
+    'schedule-list': lambda: reverse('volunteers:schedule-list'),
+    'task-list': lambda: reverse('volunteers:task-list'),
+    'my-tasks': lambda: reverse('volunteers:task-my-tasks'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the main API endpoints and report latency percentiles as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                            help='Comma-separated endpoint names')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per endpoint')
+        parser.add_argument('--base-url', default=None,
+                            help='Benchmark a running server over HTTP instead of in-process')
+        parser.add_argument('--token', default=None, help='OAuth2 access token for --base-url')
+        parser.add_argument('--user', default=None,
+                            help='Email of the employee to authenticate as (in-process mode)')
+        parser.add_argument('--output', default=None, help='Write JSON here instead of stdout')
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+        unknown = set(names) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+        if options['base_url']:
+            make_sender = self.http_sender(options['base_url'], options['token'])
+            mode = 'http'
+        else:
+            make_sender = self.in_process_sender(options['user'])
+            mode = 'in-process'
+
+        results = {}
+        for name in names:
+            try:
+                path = ENDPOINTS[name]()
+            except LookupError as e:
+                self.stderr.write(self.style.WARNING(f'Skipping {name}: {e}'))
+                continue
+            run_load(lambda: make_sender(path), options['warmup'])
+            results[name] = {
+                'path': path,
+                **run_load(lambda: make_sender(path), options['requests'], options['concurrency']),
+            }
+            self.stderr.write(
+                f'{name}: p50={results[name]["p50_ms"]}ms p95={results[name]["p95_ms"]}ms '
+                f'p99={results[name]["p99_ms"]}ms {results[name]["throughput_rps"]} req/s'
+            )
+
+        report = {
+            'meta': {
+                'mode': mode,
+                'base_url': options['base_url'],
+                'database': connection.vendor,
+                'concurrency': options['concurrency'],
+                'requests_per_endpoint': options['requests'],
+                'python': platform.python_version(),
+                'started_at': timezone.now().isoformat(),
+            },
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Report written to {options["output"]}'))
+        else:
+            sys.stdout.write(output + '\n')
+
+    def in_process_sender(self, email):
+        from rest_framework.test import APIClient
+
+        users = User.objects.filter(role=Role.EMPLOYEE, is_active=True)
+        user = users.filter(email=email).first() if email else users.first()
+        if user is None:
+            raise CommandError('No active employee to authenticate as (see --user)')
+
+        def make_sender(path):
+            client = APIClient()
+            client.force_authenticate(user=user)
+
+            def send():
+                response = client.get(path)
+                return (
+                    response.status_code < 400,
+                    queries_from_server_timing(response.get('Server-Timing')),
+                )
+
+            return send
+
+        return make_sender
+
+    def http_sender(self, base_url, token):
+        import requests
+
+        base_url = base_url.rstrip('/')
+
+        def make_sender(path):
+            session = requests.Session()
+            if token:
+                session.headers['Authorization'] = f'Bearer {token}'
+
+            def send():
+                response = session.get(base_url + path, timeout=30)
+                return (
+                    response.status_code < 400,
+                    queries_from_server_timing(response.headers.get('Server-Timing')),
+                )
+
+            return send
+
+        return make_sender
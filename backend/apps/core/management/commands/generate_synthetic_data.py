@@ -0,0 +1,445 @@
+"""
+Management command to generate large volumes of synthetic data for capacity
+planning and benchmarks.
+
+Rows are inserted with bulk_create in batches. Animals and inventory logs
+carry backdated auto_now_add timestamps, which bulk_create would overwrite, so
+they are written with a plain multi-row INSERT instead; on PostgreSQL they can
+be streamed with COPY (--copy), by far the fastest path for the inventory log.
+
+Example:
+    python manage.py generate_synthetic_data --animals 100000 \\
+        --vaccinations 1000000 --inventory-logs 5000000 --copy
+"""
+import csv
+import io
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.accounts.models import User, Role
+from apps.animals.models import (
+    Animal, AnimalStatusChange, Intake, Medication, Vaccination, MedicalProcedure,
+    AnimalSpecies, AnimalSex, AnimalStatus, IntakeType,
+)
+from apps.animals.services.medication_schedule import parse_frequency
+from apps.animals.services.status_history import OUTCOME_STATUSES
+from apps.supplies.models import (
+    SupplyCategory, UnitOfMeasure, SupplyItem, Inventory, InventoryLog,
+    InventoryOperationType,
+)
+from apps.volunteers.models import Schedule, Task, TaskStatus
+
+DOG_BREEDS = ['Mixed', 'Labrador', 'German Shepherd', 'Beagle', 'Husky', 'Dachshund']
+CAT_BREEDS = ['Mixed', 'European Shorthair', 'Maine Coon', 'Persian', 'Siamese']
+NAMES = ['Max', 'Luna', 'Burek', 'Mruczek', 'Bella', 'Rocky', 'Azor', 'Kicia', 'Reksio', 'Filemon']
+COLORS = ['Black', 'White', 'Ginger', 'Brown', 'Grey', 'Tricolor']
+MEDICATIONS = [
+    ('Amoxicillin', '250mg', '2 times a day'),
+    ('Metacam', '0.5ml', '1 time a day'),
+    ('Drontal', '1 tablet', 'every 12 hours'),
+]
+VACCINES = [('Nobivac DHPPi', 'Distemper, Parvovirus'), ('Nobivac Rabies', 'Rabies'),
+            ('Felocell CVR', 'Calicivirus, Panleukopenia')]
+SUPPLY_CATEGORIES = ['Żywność', 'Leki', 'Higiena', 'Akcesoria', 'Ochrona']
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic shelter data at scale (bulk_create / COPY)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--animals', type=int, default=0)
+        parser.add_argument('--intakes-per-animal', type=int, default=1)
+        parser.add_argument('--medications', type=int, default=0)
+        parser.add_argument('--vaccinations', type=int, default=0)
+        parser.add_argument('--procedures', type=int, default=0)
+        parser.add_argument('--supply-items', type=int, default=0)
+        parser.add_argument('--inventory-logs', type=int, default=0)
+        parser.add_argument('--volunteers', type=int, default=0)
+        parser.add_argument('--schedules', type=int, default=0)
+        parser.add_argument('--tasks', type=int, default=0)
+        parser.add_argument('--days', type=int, default=3 * 365,
+                            help='Spread dates over this many past days')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=None, help='Random seed')
+        parser.add_argument('--tag', default=None,
+                            help='Prefix for generated identifiers (defaults to a timestamp)')
+        parser.add_argument('--copy', action='store_true',
+                            help='Use COPY for animals and inventory logs on PostgreSQL')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.days = options['days']
+        self.tag = options['tag'] or timezone.now().strftime('S%y%m%d%H%M%S')
+        self.use_copy = options['copy'] and connection.vendor == 'postgresql'
+        if options['copy'] and not self.use_copy:
+            self.stdout.write(self.style.WARNING('COPY requires PostgreSQL, using bulk_create'))
+
+        self.staff = self.get_staff()
+        steps = [
+            ('animals', self.generate_animals),
+            ('medications', self.generate_medications),
+            ('vaccinations', self.generate_vaccinations),
+            ('procedures', self.generate_procedures),
+            ('supply_items', self.generate_supply_items),
+            ('inventory_logs', self.generate_inventory_logs),
+            ('volunteers', self.generate_volunteers),
+            ('schedules', self.generate_schedules),
+            ('tasks', self.generate_tasks),
+        ]
+        for option, step in steps:
+            count = options[option]
+            if count <= 0:
+                continue
+            start = time.perf_counter()
+            inserted = step(count, **options)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'{option}: {inserted} rows in {elapsed:.1f}s '
+                f'({inserted / elapsed if elapsed else 0:.0f} rows/s)'
+            )
+        self.stdout.write(self.style.SUCCESS('Synthetic data generation completed!'))
+
+    # Helpers
+
+    def bulk_insert(self, model, objects):
+        """bulk_create ``objects`` in batches, each in its own transaction."""
+        total = 0
+        objects = iter(objects)
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                return total
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+            total += len(batch)
+
+    def insert_backdated(self, model, objects):
+        """
+        Write ``objects`` once, keeping the values of their auto_now_add
+        fields (bulk_create would stamp them with the current time).
+
+        Uses COPY with --copy on PostgreSQL, otherwise raw_insert. Neither
+        runs save() or the manager's bulk_create, so model-level side effects
+        (e.g. the animal status log) are the caller's job.
+        """
+        fields = [
+            field for field in model._meta.concrete_fields
+            if field is not model._meta.auto_field
+        ]
+
+        def rows():
+            for obj in objects:
+                row = []
+                for field in fields:
+                    value = getattr(obj, field.attname)
+                    if value is None and (getattr(field, 'auto_now', False)
+                                          or getattr(field, 'auto_now_add', False)):
+                        value = field.pre_save(obj, add=True)
+                    row.append(field.get_db_prep_save(value, connection))
+                yield row
+
+        columns = [connection.ops.quote_name(field.column) for field in fields]
+        insert = self.copy_insert if self.use_copy else self.raw_insert
+        return insert(model, columns, rows())
+
+    def raw_insert(self, model, columns, rows):
+        """
+        INSERT ``rows`` with explicit values, one multi-row statement per
+        chunk. Each row is written once, but the parameters are still adapted
+        and bound one by one and the chunks are bounded by the backend's
+        parameter limit (999 values on older SQLite), so this runs at roughly
+        bulk_create speed, several times slower than COPY for large tables.
+        """
+        table = connection.ops.quote_name(model._meta.db_table)
+        placeholder = f'({", ".join(["%s"] * len(columns))})'
+        chunk = max(1, connection.features.max_query_params // len(columns)) \
+            if connection.features.max_query_params else self.batch_size
+        total = 0
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return total
+            with transaction.atomic(), connection.cursor() as cursor:
+                for start in range(0, len(batch), chunk):
+                    part = batch[start:start + chunk]
+                    cursor.execute(
+                        f'INSERT INTO {table} ({", ".join(columns)}) '
+                        f'VALUES {", ".join([placeholder] * len(part))}',
+                        [value for row in part for value in row],
+                    )
+            total += len(batch)
+
+    def copy_insert(self, model, columns, rows):
+        """Stream ``rows`` into ``model``'s table with COPY, batch by batch."""
+        table = connection.ops.quote_name(model._meta.db_table)
+        # unquoted empty fields are NULL in CSV mode, use an explicit marker
+        # so that blank strings stay blank
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        total = 0
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return total
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(
+                ['\\N' if value is None else value for value in row] for row in batch
+            )
+            buffer.seek(0)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.cursor.copy_expert(sql, buffer)
+            total += len(batch)
+
+    def random_date(self):
+        return date.today() - timedelta(days=self.random.randrange(self.days))
+
+    def random_datetime(self):
+        return timezone.now() - timedelta(seconds=self.random.randrange(self.days * 86400))
+
+    def get_staff(self):
+        staff = list(User.objects.filter(role=Role.EMPLOYEE).values_list('pk', flat=True)[:20])
+        if not staff:
+            user = User.objects.create_user(
+                email=f'synthetic.vet@{self.tag.lower()}.local', password=None,
+                first_name='Synthetic', last_name='Vet', role=Role.EMPLOYEE,
+            )
+            staff = [user.pk]
+        return staff
+
+    def animal_ids(self):
+        return list(Animal.objects.values_list('pk', flat=True))
+
+    # Generators
+
+    def generate_animals(self, count, intakes_per_animal=1, **options):
+        rnd = self.random
+
+        def animals():
+            for i in range(count):
+                species = rnd.choice([AnimalSpecies.DOG, AnimalSpecies.CAT, AnimalSpecies.OTHER])
+                breeds = CAT_BREEDS if species == AnimalSpecies.CAT else DOG_BREEDS
+                created_at = self.random_datetime()
+                yield Animal(
+                    animal_id=f'{self.tag}-A{i:07d}',
+                    species=species,
+                    breed=rnd.choice(breeds),
+                    name=rnd.choice(NAMES),
+                    birth_date=self.random_date() - timedelta(days=rnd.randrange(3650)),
+                    sex=rnd.choice(AnimalSex.values),
+                    coat_color=rnd.choice(COLORS),
+                    weight=Decimal(rnd.randrange(100, 6000)) / 100,
+                    status=rnd.choice(AnimalStatus.values),
+                    intake_date=created_at.date(),
+                    created_at=created_at,
+                )
+
+        total = self.insert_backdated(Animal, animals())
+
+        new_ids = list(
+            Animal.objects.filter(animal_id__startswith=f'{self.tag}-A')
+            .values_list('pk', 'created_at', 'status')
+        )
+        self.bulk_insert(AnimalStatusChange, self.status_history(new_ids))
+
+        def intakes():
+            for animal_pk, created_at, _ in new_ids:
+                for _ in range(intakes_per_animal):
+                    yield Intake(
+                        animal_id=animal_pk,
+                        intake_date=created_at.date(),
+                        animal_condition=rnd.choice(['Good', 'Fair', 'Poor']),
+                        location='Synthetic',
+                        notes='',
+                        intake_type=rnd.choice(IntakeType.values),
+                    )
+
+        self.bulk_insert(Intake, intakes())
+        return total
+
+    def status_history(self, animals):
+        """
+        Status log of the generated ``(pk, created_at, status)`` animals:
+        adopted and deceased animals arrive as new intakes and leave at a
+        random time between their intake and now, the others keep their
+        status from intake on.
+        """
+        now = timezone.now()
+        for animal_pk, created_at, status in animals:
+            if status not in OUTCOME_STATUSES:
+                yield AnimalStatusChange(animal_id=animal_pk, to_status=status, changed_at=created_at)
+                continue
+            yield AnimalStatusChange(
+                animal_id=animal_pk, to_status=AnimalStatus.NEW_INTAKE, changed_at=created_at,
+            )
+            stay = int((now - created_at).total_seconds())
+            yield AnimalStatusChange(
+                animal_id=animal_pk, from_status=AnimalStatus.NEW_INTAKE, to_status=status,
+                changed_at=created_at + timedelta(seconds=self.random.randrange(stay + 1)),
+            )
+
+    def generate_medications(self, count, **options):
+        rnd, animals = self.random, self.animal_ids()
+
+        def medications():
+            for _ in range(count):
+                name, dosage, frequency = rnd.choice(MEDICATIONS)
+                start = self.random_date()
+                yield Medication(
+                    animal_id=rnd.choice(animals), medication_name=name, dosage=dosage,
+                    frequency=frequency, interval_hours=parse_frequency(frequency), start_date=start,
+                    end_date=start + timedelta(days=rnd.randrange(3, 30)),
+                    reason='Synthetic', performed_by_id=rnd.choice(self.staff),
+                )
+
+        return self.bulk_insert(Medication, medications()) if animals else 0
+
+    def generate_vaccinations(self, count, **options):
+        rnd, animals = self.random, self.animal_ids()
+
+        def vaccinations():
+            for i in range(count):
+                name, vaccine_for = rnd.choice(VACCINES)
+                given = self.random_date()
+                yield Vaccination(
+                    animal_id=rnd.choice(animals), vaccine_name=name, vaccine_for=vaccine_for,
+                    vaccine_batch_number=f'{self.tag}-{i}', vaccination_date=given,
+                    expiration_date=given + timedelta(days=365),
+                    next_due_date=given + timedelta(days=365),
+                    performed_by_id=rnd.choice(self.staff),
+                )
+
+        return self.bulk_insert(Vaccination, vaccinations()) if animals else 0
+
+    def generate_procedures(self, count, **options):
+        rnd, animals = self.random, self.animal_ids()
+
+        def procedures():
+            for _ in range(count):
+                yield MedicalProcedure(
+                    animal_id=rnd.choice(animals), procedure_date=self.random_date(),
+                    description=rnd.choice(['Sterilization', 'Dental cleaning', 'Check-up']),
+                    result='Completed', cost=Decimal(rnd.randrange(50, 800)),
+                    performed_by_id=rnd.choice(self.staff),
+                )
+
+        return self.bulk_insert(MedicalProcedure, procedures()) if animals else 0
+
+    def generate_supply_items(self, count, **options):
+        rnd = self.random
+        categories = [SupplyCategory.objects.get_or_create(name=name)[0] for name in SUPPLY_CATEGORIES]
+        unit, _ = UnitOfMeasure.objects.get_or_create(name='sztuka', defaults={'abbreviation': 'szt'})
+
+        total = self.bulk_insert(SupplyItem, (
+            SupplyItem(
+                name=f'{self.tag} item {i:06d}', min_stock=Decimal(rnd.randrange(5, 200)),
+                category=rnd.choice(categories), unit=unit,
+            )
+            for i in range(count)
+        ))
+        items = SupplyItem.objects.filter(name__startswith=f'{self.tag} item ').values_list('pk', flat=True)
+        self.bulk_insert(Inventory, (Inventory(supply_item_id=pk) for pk in items.iterator()))
+        return total
+
+    def generate_inventory_logs(self, count, **options):
+        rnd = self.random
+        # only the items generated under this tag, real stock is left alone
+        generated = Inventory.objects.filter(supply_item__name__startswith=f'{self.tag} item ')
+        inventories = list(generated.values_list('pk', flat=True))
+        if not inventories:
+            self.stdout.write(self.style.WARNING(
+                f'No inventory rows tagged {self.tag}, skipping inventory logs '
+                '(generate --supply-items with the same --tag)'
+            ))
+            return 0
+
+        def logs():
+            for _ in range(count):
+                inbound = rnd.random() < 0.3
+                yield InventoryLog(
+                    inventory_id=rnd.choice(inventories),
+                    operation_type=InventoryOperationType.INBOUND if inbound else InventoryOperationType.OUTBOUND,
+                    quantity=Decimal(rnd.randrange(100, 5000 if inbound else 1000)) / 100,
+                    comment='Synthetic',
+                    timestamp=self.random_datetime(),
+                    performed_by_id=rnd.choice(self.staff),
+                )
+
+        total = self.insert_backdated(InventoryLog, logs())
+
+        # Keep current_quantity consistent with the generated ledger.
+        balance = (
+            InventoryLog.objects.filter(inventory=OuterRef('pk'))
+            .order_by()
+            .values('inventory')
+            .annotate(total=Sum(Case(
+                When(operation_type=InventoryOperationType.OUTBOUND, then=-F('quantity')),
+                default=F('quantity'),
+            )))
+            .values('total')
+        )
+        generated.update(current_quantity=Coalesce(
+            Subquery(balance), Value(Decimal('0.00')),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        ))
+        return total
+
+    def generate_volunteers(self, count, **options):
+        return self.bulk_insert(User, (
+            User(
+                email=f'{self.tag.lower()}.volunteer{i}@example.com',
+                first_name='Synthetic', last_name=f'Volunteer {i}',
+                role=Role.VOLUNTEER, password='!',
+            )
+            for i in range(count)
+        ))
+
+    def generate_schedules(self, count, **options):
+        def schedules():
+            for i in range(count):
+                start = self.random_date()
+                yield Schedule(
+                    schedule_id=f'{self.tag}-S{i:06d}', name=f'Schedule {i}',
+                    start_date=start, end_date=start + timedelta(days=30),
+                )
+
+        return self.bulk_insert(Schedule, schedules())
+
+    def generate_tasks(self, count, **options):
+        rnd = self.random
+        schedules = list(Schedule.objects.values_list('pk', flat=True))
+        if not schedules:
+            self.stdout.write(self.style.WARNING('No schedules, skipping tasks'))
+            return 0
+        volunteers = list(User.objects.filter(role=Role.VOLUNTEER).values_list('pk', flat=True)[:5000])
+
+        def tasks():
+            for i in range(count):
+                yield Task(
+                    task_id=f'{self.tag}-T{i:07d}', name=rnd.choice(['Walk', 'Feed', 'Clean']),
+                    datetime=self.random_datetime(), duration_in_minutes=rnd.choice([30, 60, 90]),
+                    maxVolunteers=rnd.randrange(1, 6), schedule_id=rnd.choice(schedules),
+                    status=TaskStatus.AVAILABLE,
+                )
+
+        total = self.bulk_insert(Task, tasks())
+        if volunteers:
+            Through = Task.volunteers.through
+            task_pks = Task.objects.filter(task_id__startswith=f'{self.tag}-T').values_list(
+                'pk', 'maxVolunteers')
+            self.bulk_insert(Through, (
+                Through(task_id=pk, user_id=user)
+                for pk, limit in task_pks.iterator()
+                for user in rnd.sample(volunteers, min(len(volunteers), rnd.randrange(0, limit + 1)))
+            ))
+        return total
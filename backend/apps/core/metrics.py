@@ -0,0 +1,224 @@
+"""
+Request metrics - per-request collectors and an in-process Prometheus registry.
+
+Each worker process keeps its own registry, so a Prometheus scrape through the
+load balancer returns the numbers of whichever worker answered. Scrape every
+task/container directly (or aggregate with ``sum by``) to get totals.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+# Upper bounds of histogram buckets ("le" labels). +Inf is implicit.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_current_collector = ContextVar('request_metrics_collector', default=None)
+
+
+class RequestMetrics:
+    """Measurements gathered while a single request is being handled."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper (see ``connection.execute_wrapper``)."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.query_count += 1
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    """Count the query for the request being handled, if any."""
+    metrics = _current_collector.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    """
+    ``connection_created`` receiver installing ``execute_wrapper``.
+
+    Connections are per thread, and under ASGI the ORM runs in
+    ``sync_to_async`` threads rather than the one handling the request, so
+    the wrapper stays on every connection instead of being installed per
+    request.
+    """
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+def current_metrics():
+    """Return the collector of the request being handled, or None."""
+    return _current_collector.get()
+
+
+def activate(metrics):
+    return _current_collector.set(metrics)
+
+
+def deactivate(token):
+    _current_collector.reset(token)
+
+
+def _timed_serializer_data(fget):
+    """Wrap a serializer ``data`` getter so its time is added to the request."""
+
+    def data(self):
+        metrics = _current_collector.get()
+        # Nested .data calls (e.g. inside a SerializerMethodField) are already
+        # covered by the outermost one.
+        if metrics is None or metrics._serializer_depth:
+            return fget(self)
+        metrics._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics._serializer_depth -= 1
+
+    data._request_metrics = True
+    return data
+
+
+def instrument_serializers():
+    """Time top-level ``Serializer.data`` / ``ListSerializer.data`` access."""
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        prop = cls.__dict__['data']
+        if getattr(prop.fget, '_request_metrics', False):
+            continue
+        cls.data = property(_timed_serializer_data(prop.fget))
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, Prometheus style."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.total += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    """Thread-safe store of request histograms keyed by (view, action, method)."""
+
+    HISTOGRAMS = {
+        'shelter_http_request_duration_seconds': (
+            'Total request latency.', LATENCY_BUCKETS),
+        'shelter_http_request_db_duration_seconds': (
+            'Time spent executing SQL per request.', LATENCY_BUCKETS),
+        'shelter_http_request_serializer_duration_seconds': (
+            'Time spent in DRF serializers per request.', LATENCY_BUCKETS),
+        'shelter_http_request_db_queries': (
+            'Number of SQL queries per request.', QUERY_COUNT_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._responses = {}
+        self._over_budget = {}
+        self._collectors = []
+
+    def register_collector(self, collector):
+        """Add ``collector()``, returning exposition lines, to every render."""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def record(self, labels, status_code, metrics, duration, over_budget=False):
+        values = {
+            'shelter_http_request_duration_seconds': duration,
+            'shelter_http_request_db_duration_seconds': metrics.sql_time,
+            'shelter_http_request_serializer_duration_seconds': metrics.serializer_time,
+            'shelter_http_request_db_queries': metrics.query_count,
+        }
+        status_labels = labels + (f'{status_code // 100}xx',)
+        with self._lock:
+            for name, value in values.items():
+                key = (name, labels)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(self.HISTOGRAMS[name][1])
+                histogram.observe(value)
+            self._responses[status_labels] = self._responses.get(status_labels, 0) + 1
+            if over_budget:
+                self._over_budget[labels] = self._over_budget.get(labels, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._responses.clear()
+            self._over_budget.clear()
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    base = _format_labels(labels)
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{{{base},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{base},le="+Inf"}} {histogram.total}')
+                    lines.append(f'{name}_sum{{{base}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{base}}} {histogram.total}')
+
+            lines.append('# HELP shelter_http_responses_total Responses by status class.')
+            lines.append('# TYPE shelter_http_responses_total counter')
+            for labels, count in sorted(self._responses.items()):
+                base = _format_labels(labels[:3])
+                lines.append(
+                    f'shelter_http_responses_total{{{base},status="{labels[3]}"}} {count}'
+                )
+
+            lines.append(
+                '# HELP shelter_http_requests_over_query_budget_total '
+                'Requests that executed more SQL queries than the configured budget.'
+            )
+            lines.append('# TYPE shelter_http_requests_over_query_budget_total counter')
+            for labels, count in sorted(self._over_budget.items()):
+                lines.append(
+                    f'shelter_http_requests_over_query_budget_total{{{_format_labels(labels)}}} {count}'
+                )
+        for collector in self._collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels):
+    view, action, method = labels
+    return f'view="{_escape(view)}",action="{_escape(action)}",method="{method}"'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
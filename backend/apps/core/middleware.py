@@ -0,0 +1,98 @@
+"""
+Middleware for core app.
+"""
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import RequestMetrics, activate, deactivate, registry
+
+logger = logging.getLogger('apps.core.metrics')
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, SQL time, serializer time and total latency per request.
+
+    Measurements are keyed by the resolved URL name and viewset action, exposed
+    as a ``Server-Timing`` header and aggregated into ``apps.core.metrics.registry``
+    (served by the ``metrics`` endpoint). Requests executing more queries than
+    ``REQUEST_METRICS['QUERY_BUDGET']`` are logged as warnings.
+
+    Runs natively in both modes, so under ASGI the request does not hop to a
+    thread before reaching async views. Queries are counted by the execute
+    wrapper every connection gets (``apps.core.metrics.instrument_connection``),
+    which finds the collector through a context variable, including in the
+    ``sync_to_async`` threads the ORM runs in.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, 'REQUEST_METRICS', {})
+        self.enabled = config.get('ENABLED', True)
+        self.server_timing = config.get('SERVER_TIMING', True)
+        self.query_budget = config.get('QUERY_BUDGET')
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = activate(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            deactivate(token)
+        return self.record(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = activate(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            deactivate(token)
+        return self.record(request, response, metrics)
+
+    def record(self, request, response, metrics):
+        duration = metrics.elapsed()
+        labels = self.labels(request)
+        over_budget = (
+            self.query_budget is not None and metrics.query_count > self.query_budget
+        )
+        if over_budget:
+            logger.warning(
+                'Query budget exceeded: %s %s (%s/%s) ran %d queries (budget %d) in %.1f ms',
+                request.method, request.path, labels[0], labels[1] or '-',
+                metrics.query_count, self.query_budget, duration * 1000,
+            )
+        registry.record(labels, response.status_code, metrics, duration, over_budget)
+
+        if self.server_timing:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.query_count} queries"',
+                f'ser;dur={metrics.serializer_time * 1000:.1f}',
+                f'total;dur={duration * 1000:.1f}',
+            ])
+        return response
+
+    @staticmethod
+    def labels(request):
+        """(view name, viewset action, method) of the resolved view."""
+        # read here rather than in process_view, which Django would adapt
+        # to a thread under ASGI
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return ('unresolved', '', request.method)
+        actions = getattr(match.func, 'actions', None) or {}
+        return (match.view_name, actions.get(request.method.lower(), ''), request.method)
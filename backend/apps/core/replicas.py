@@ -0,0 +1,149 @@
+"""
+Read-replica routing.
+
+With ``READ_REPLICA['ALIAS']`` configured, safe requests to the actions a view
+opts in with (``ReplicaReadMixin.replica_actions``) read from the replica;
+everything else reads from and writes to ``default``.
+
+Reads stay on the primary:
+
+* for the rest of a request once it has written anything (the router's
+  ``db_for_write`` is also consulted for ``select_for_update`` and
+  ``get_or_create``);
+* for ``READ_REPLICA['STICKY_SECONDS']`` after a request of the same user
+  wrote, so clients read their own writes despite replication lag. The pin
+  is kept in ``READ_REPLICA['CACHE']``, which should be shared between workers.
+
+The routing state lives in context variables, so it follows a request into
+``sync_to_async`` threads; ``ReplicaRoutingMiddleware`` resets it per request.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+_replica_reads = ContextVar('db_replica_reads', default=False)
+_wrote = ContextVar('db_wrote', default=False)
+
+
+def replica_alias():
+    return settings.READ_REPLICA['ALIAS']
+
+
+def _pin_key(user):
+    return f'db:primary:{user.pk}'
+
+
+def _pinned(user):
+    if user is None or not user.is_authenticated:
+        return False
+    return bool(caches[settings.READ_REPLICA['CACHE']].get(_pin_key(user)))
+
+
+def use_replica(request, action, replica_actions):
+    """Send this request's reads to the replica if ``action`` may use it."""
+    if (
+        replica_alias()
+        and request.method in SAFE_METHODS
+        and action in replica_actions
+        and not _pinned(getattr(request, 'user', None))
+    ):
+        _replica_reads.set(True)
+
+
+def use_primary():
+    _replica_reads.set(False)
+
+
+def reading_from_replica():
+    return _replica_reads.get() and not _wrote.get()
+
+
+class ReplicaRouter:
+    """Route reads to the replica while the current request allows it."""
+
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        if {obj1._state.db, obj2._state.db} <= {'default', replica_alias()}:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Reset the routing state per request and pin users who wrote to the primary.
+
+    Sync and async capable. On the async path the context variables are set
+    and reset in the request's task; ``sync_to_async`` copies them into the
+    thread running the view and copies changes (a write) back.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        reads = _replica_reads.set(False)
+        wrote = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote.get() and replica_alias():
+                self.pin(request)
+            return response
+        finally:
+            _replica_reads.reset(reads)
+            _wrote.reset(wrote)
+
+    async def __acall__(self, request):
+        reads = _replica_reads.set(False)
+        wrote = _wrote.set(False)
+        try:
+            response = await self.get_response(request)
+            if _wrote.get() and replica_alias():
+                # the user may still be a lazy session lookup
+                await sync_to_async(self.pin)(request)
+            return response
+        finally:
+            _replica_reads.reset(reads)
+            _wrote.reset(wrote)
+
+    @staticmethod
+    def pin(request):
+        """Keep the reads of the request's user on the primary for a while."""
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            caches[settings.READ_REPLICA['CACHE']].set(
+                _pin_key(user), True, settings.READ_REPLICA['STICKY_SECONDS'],
+            )
+
+
+class ReplicaReadMixin:
+    """
+    Viewset mixin: serve safe requests of ``replica_actions`` from the read
+    replica. Other actions (and all unsafe methods) use the primary.
+    """
+    replica_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        use_replica(request, self.action, self.replica_actions)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        use_primary()
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,45 @@
+"""
+Pytest plugin with query-count budget helpers.
+
+Loaded for the whole suite from pytest.ini (``-p apps.core.testing``).
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(func):
+    """Call ``func`` and return ``(result, number of SQL queries executed)``."""
+    with CaptureQueriesContext(connection) as context:
+        result = func()
+    return result, len(context.captured_queries)
+
+
+@pytest.fixture
+def assert_query_budget(db):
+    """
+    Assert that an endpoint runs a constant number of queries within a budget.
+
+    ``seed(start, count)`` must add ``count`` related rows numbered from
+    ``start``. The request is measured after seeding ``n`` rows and again after
+    growing to ``n * factor`` rows; both counts must be equal and not exceed
+    ``budget``. Returns the measured query count.
+    """
+
+    def check(request, seed, budget, n=2, factor=10):
+        seed(0, n)
+        response, small = count_queries(request)
+        assert response.status_code == 200, response.content
+
+        seed(n, n * factor - n)
+        response, large = count_queries(request)
+        assert response.status_code == 200, response.content
+
+        assert small == large, (
+            f'Query count grows with data: {small} queries for {n} rows, '
+            f'{large} for {n * factor} rows (N+1)'
+        )
+        assert large <= budget, f'{large} queries exceed the budget of {budget}'
+        return large
+
+    return check
@@ -0,0 +1,32 @@
+"""
+Pytest fixtures for core app tests.
+"""
+import pytest
+from rest_framework.test import APIClient
+from apps.accounts.models import User, Role
+
+
+@pytest.fixture
+def api_client():
+    """Return an unauthenticated API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def employee_user(db):
+    """Create and return an employee user."""
+    return User.objects.create_user(
+        email='pracownik@schronisko.pl',
+        password='haslo123',
+        first_name='Jan',
+        last_name='Kowalski',
+        role=Role.EMPLOYEE,
+        is_head_office=True,
+    )
+
+
+@pytest.fixture
+def authenticated_employee(api_client, employee_user):
+    """Return an API client authenticated as an employee."""
+    api_client.force_authenticate(user=employee_user)
+    return api_client
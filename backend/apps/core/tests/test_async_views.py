@@ -0,0 +1,252 @@
+"""
+Tests for the async views served under ASGI.
+"""
+import pytest
+from datetime import date, timedelta
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.accounts.models import User, Role
+from apps.animals.models import Animal, AnimalSpecies
+from apps.animals.views import AnimalViewSet
+from apps.supplies.models import SupplyCategory
+from apps.volunteers.models import Schedule, Task, TaskStatus
+from apps.volunteers.views import TaskViewSet
+from shelter_project.asgi import WHITENOISE_MIDDLEWARE, with_static_files
+
+
+@pytest.fixture
+def volunteer_user(db):
+    """Create and return a volunteer user."""
+    return User.objects.create_user(
+        email='wolontariusz@schronisko.pl',
+        password='haslo123',
+        first_name='Anna',
+        last_name='Nowak',
+        role=Role.VOLUNTEER,
+        is_head_office=True,
+    )
+
+
+@pytest.mark.django_db
+class TestAsyncViewSetView:
+    """Tests for viewset routes served by AsyncViewSetView."""
+
+    def test_list_requires_authentication(self, api_client):
+        """Test that unauthenticated requests get 401 like the viewset."""
+        response = api_client.get(reverse('animals:animal-list'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert 'WWW-Authenticate' in response
+
+    def test_list_forbidden_for_volunteer(self, api_client, volunteer_user):
+        """Test that viewset permission classes are applied."""
+        api_client.force_authenticate(user=volunteer_user)
+        response = api_client.get(reverse('animals:animal-list'))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_list_is_paginated_and_filtered(self, authenticated_employee):
+        """Test pagination and viewset filter backends on the async list."""
+        Animal.objects.bulk_create(
+            Animal(animal_id=f'CAT-{i}', name=f'Kot {i}', species=AnimalSpecies.CAT)
+            for i in range(25)
+        )
+        Animal.objects.create(name='Burek', species=AnimalSpecies.DOG)
+        url = reverse('animals:animal-list')
+
+        response = authenticated_employee.get(url, {'page': 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 26
+        assert len(response.data['results']) == 6
+        assert response.data['previous'] is not None
+        assert response.data['next'] is None
+
+        response = authenticated_employee.get(url, {'species': AnimalSpecies.DOG})
+        assert response.data['count'] == 1
+        assert response.data['results'][0]['name'] == 'Burek'
+
+    def test_list_invalid_page(self, authenticated_employee):
+        """Test that a page out of range returns 404."""
+        response = authenticated_employee.get(reverse('animals:animal-list'), {'page': 5})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_retrieve(self, authenticated_employee):
+        """Test the async detail view returns the viewset payload."""
+        animal = Animal.objects.create(name='Max', species=AnimalSpecies.DOG)
+        response = authenticated_employee.get(
+            reverse('animals:animal-detail', kwargs={'pk': animal.pk})
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['name'] == 'Max'
+
+    def test_retrieve_not_found(self, authenticated_employee):
+        """Test missing and malformed ids return 404."""
+        for pk in (999999, 'abc'):
+            response = authenticated_employee.get(
+                reverse('animals:animal-detail', kwargs={'pk': pk})
+            )
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_writes_are_delegated(self, authenticated_employee):
+        """Test that non-GET methods reach the synchronous viewset."""
+        animal = Animal.objects.create(name='Max', species=AnimalSpecies.DOG)
+        url = reverse('animals:animal-detail', kwargs={'pk': animal.pk})
+
+        response = authenticated_employee.patch(url, {'name': 'Maks'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        animal.refresh_from_db()
+        assert animal.name == 'Maks'
+
+        response = authenticated_employee.delete(url)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_undeclared_method_not_allowed(self, authenticated_employee):
+        """Test that methods outside actions are rejected."""
+        response = authenticated_employee.put(reverse('supplies:supply-category-list'), {})
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+    def test_supply_categories(self, authenticated_employee):
+        """Test the async supply category list."""
+        SupplyCategory.objects.create(name='Żywność')
+        response = authenticated_employee.get(reverse('supplies:supply-category-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert [c['name'] for c in response.data] == ['Żywność']
+
+
+class ActionPermission(BasePermission):
+    """Records the view it is given; refuses the retrieve action."""
+    seen = []
+
+    def has_permission(self, request, view):
+        self.seen.append((view.action, view.basename, view.detail, view.get_queryset().model))
+        return view.action != 'retrieve'
+
+
+@pytest.mark.django_db
+class TestPermissionParity:
+    """Async routes check permissions against the viewset action they shadow."""
+
+    @pytest.mark.parametrize('name, actions, detail', [
+        ('animals:animal-list', {'get': 'list'}, False),
+        ('animals:animal-detail', {'get': 'retrieve'}, True),
+    ])
+    def test_same_view_as_sync_route(self, monkeypatch, authenticated_employee, employee_user, name, actions, detail):
+        monkeypatch.setattr(AnimalViewSet, 'permission_classes', [ActionPermission])
+        monkeypatch.setattr(ActionPermission, 'seen', [])
+        animal = Animal.objects.create(name='Max', species=AnimalSpecies.DOG)
+        kwargs = {'pk': animal.pk} if detail else {}
+
+        async_response = authenticated_employee.get(reverse(name, kwargs=kwargs))
+        request = APIRequestFactory().get(reverse(name, kwargs=kwargs))
+        force_authenticate(request, user=employee_user)
+        sync_view = AnimalViewSet.as_view(actions, basename='animal', detail=detail)
+        sync_response = sync_view(request, **kwargs)
+
+        assert async_response.status_code == sync_response.status_code
+        async_seen, sync_seen = ActionPermission.seen
+        assert async_seen == sync_seen == (actions['get'], 'animal', detail, Animal)
+
+    def test_my_tasks_action(self, monkeypatch, api_client, volunteer_user):
+        monkeypatch.setattr(TaskViewSet, 'permission_classes', [ActionPermission])
+        monkeypatch.setattr(ActionPermission, 'seen', [])
+        api_client.force_authenticate(user=volunteer_user)
+
+        response = api_client.get(reverse('volunteers:task-my-tasks'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert ActionPermission.seen == [('my_tasks', 'task', False, Task)]
+
+
+@pytest.mark.django_db
+class TestAsyncAPIViews:
+    """Tests for hand-written async views."""
+
+    def test_health_check(self, api_client):
+        """Test the async health check pings the database."""
+        response = api_client.get(reverse('health_check'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['database'] == 'connected'
+
+    def test_veterinarians(self, authenticated_employee, employee_user):
+        """Test the async veterinarian list."""
+        response = authenticated_employee.get(reverse('animals:veterinarian-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert [v['id'] for v in response.data] == [employee_user.id]
+
+    def test_my_tasks(self, api_client, volunteer_user):
+        """Test my tasks lists only tasks the user signed up for."""
+        schedule = Schedule.objects.create(
+            name='Grafik', start_date=date.today(), end_date=date.today() + timedelta(days=7),
+        )
+        mine, other = (
+            Task.objects.create(
+                name=name, datetime=timezone.now(), duration_in_minutes=60,
+                maxVolunteers=2, schedule=schedule, status=TaskStatus.AVAILABLE,
+            )
+            for name in ('Spacer', 'Karmienie')
+        )
+        mine.volunteers.add(volunteer_user)
+        api_client.force_authenticate(user=volunteer_user)
+
+        response = api_client.get(reverse('volunteers:task-my-tasks'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'task_ids': [str(mine.task_id)]}
+
+    def test_my_tasks_requires_authentication(self, api_client):
+        """Test my tasks returns 401 without credentials."""
+        response = api_client.get(reverse('volunteers:task-my-tasks'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def asgi_get(app, path):
+    """Send a GET for ``path`` to the ASGI ``app``; return (status, body)."""
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+        'query_string': b'', 'headers': [], 'server': ('testserver', 80), 'scheme': 'http',
+        'http_version': '1.1', 'asgi': {'version': '3.0'},
+    }
+    async_to_sync(app)(scope, receive, send)
+    body = b''.join(message.get('body', b'') for message in sent if message['type'] == 'http.response.body')
+    return sent[0]['status'], body
+
+
+class TestAsgiApplication:
+    """Tests for running without thread adaptation under ASGI."""
+
+    def test_middleware_async_capable(self):
+        """Test that only WhiteNoise, left out under ASGI, is sync-only."""
+        sync_only = [
+            path for path in settings.MIDDLEWARE
+            if path != WHITENOISE_MIDDLEWARE and not import_string(path).async_capable
+        ]
+        assert sync_only == []
+
+    def test_static_files_served_before_django(self, settings, tmp_path):
+        """Test that static files do not reach the Django application."""
+        (tmp_path / 'app.css').write_text('body {}')
+        settings.STATIC_ROOT = tmp_path
+        reached = []
+
+        async def django_app(scope, receive, send):
+            reached.append(scope['path'])
+            await send({'type': 'http.response.start', 'status': 204, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        app = with_static_files(django_app)
+
+        assert asgi_get(app, '/static/app.css') == (200, b'body {}')
+        assert asgi_get(app, '/static/missing.css')[0] == 404
+        assert asgi_get(app, '/api/health/')[0] == 204
+        assert reached == ['/api/health/']
@@ -0,0 +1,72 @@
+"""
+Tests for database connection settings and pool stats.
+"""
+import pytest
+from django.db import connection
+from django.urls import reverse
+from shelter_project.settings.base import _db_connection_settings
+from apps.core import db
+
+
+class TestDbConnectionSettings:
+    """Tests for _db_connection_settings."""
+
+    def test_persistent_by_default(self, monkeypatch):
+        monkeypatch.delenv('DB_POOL_MODE', raising=False)
+        monkeypatch.delenv('DB_CONN_MAX_AGE', raising=False)
+        monkeypatch.delenv('DB_CONN_HEALTH_CHECKS', raising=False)
+
+        mode, config = _db_connection_settings()
+
+        assert mode == 'persistent'
+        assert config['CONN_MAX_AGE'] == 60
+        assert config['CONN_HEALTH_CHECKS'] is True
+        assert 'HOST' not in config
+
+    def test_none_disables_reuse(self, monkeypatch):
+        monkeypatch.setenv('DB_POOL_MODE', 'none')
+        monkeypatch.setenv('DB_CONN_MAX_AGE', '300')
+
+        mode, config = _db_connection_settings()
+
+        assert config['CONN_MAX_AGE'] == 0
+        assert config['CONN_HEALTH_CHECKS'] is False
+
+    def test_pgbouncer_points_at_pooler(self, monkeypatch):
+        monkeypatch.setenv('DB_POOL_MODE', 'pgbouncer')
+        monkeypatch.setenv('DB_POOLER_HOST', 'pgbouncer')
+        monkeypatch.setenv('DB_CONN_MAX_AGE', '0')
+
+        mode, config = _db_connection_settings()
+
+        assert mode == 'pgbouncer'
+        assert (config['HOST'], config['PORT']) == ('pgbouncer', '6432')
+        assert config['DISABLE_SERVER_SIDE_CURSORS'] is True
+        assert config['CONN_MAX_AGE'] == 0
+
+    def test_invalid_mode(self, monkeypatch):
+        monkeypatch.setenv('DB_POOL_MODE', 'psycopg')
+        with pytest.raises(ValueError):
+            _db_connection_settings()
+
+
+@pytest.mark.django_db
+class TestPoolStats:
+    """Tests for pool stats in the health check."""
+
+    def test_counts_opened_connections(self):
+        db.reset()
+        db.on_connection_created(sender=None, connection=connection)
+
+        stats = db.pool_stats()
+
+        assert stats['connections_opened'] == 1
+        assert stats['connection_age_seconds'] is not None
+        assert stats['conn_max_age'] == connection.settings_dict['CONN_MAX_AGE']
+
+    def test_health_check_reports_pool(self, api_client):
+        response = api_client.get(reverse('health_check'))
+
+        assert response.status_code == 200
+        pool = response.json()['database_pool']
+        assert {'mode', 'conn_max_age', 'health_checks', 'connections_opened'} <= set(pool)
@@ -0,0 +1,207 @@
+"""
+Tests for live change events and the server-sent event stream.
+"""
+import json
+import threading
+import time
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application
+from rest_framework import status
+from apps.accounts.models import User, Role
+from apps.core import events
+from apps.shelters.models import Shelter
+from apps.supplies.models import Inventory, SupplyCategory, SupplyItem, UnitOfMeasure
+from apps.supplies.services import stock
+from apps.volunteers.models import Schedule, Task, TaskStatus
+
+URL = reverse('events')
+
+
+@pytest.fixture
+def volunteer_user(db):
+    """Create and return a volunteer user."""
+    return User.objects.create_user(
+        email='wolontariusz@schronisko.pl',
+        password='haslo123',
+        first_name='Anna',
+        last_name='Nowak',
+        role=Role.VOLUNTEER,
+        is_head_office=True,
+    )
+
+
+@pytest.fixture
+def task(db):
+    schedule = Schedule.objects.create(name='Grafik', start_date=date.today(), end_date=date.today())
+    return Task.objects.create(
+        name='Spacer', datetime=timezone.now() + timedelta(hours=2), duration_in_minutes=60,
+        maxVolunteers=1, schedule=schedule, status=TaskStatus.AVAILABLE,
+    )
+
+
+@pytest.fixture
+def supply_item(db):
+    item = SupplyItem.objects.create(
+        name='Karma sucha dla psów', min_stock=Decimal('20'),
+        category=SupplyCategory.objects.create(name='Żywność'),
+        unit=UnitOfMeasure.objects.create(name='kilogram', abbreviation='kg'),
+    )
+    Inventory.objects.create(supply_item=item, current_quantity=Decimal('40'))
+    return item
+
+
+def _connect(user):
+    """GET the stream under ASGI with a bearer token of ``user``."""
+    application = Application.objects.create(
+        name='Frontend', client_type=Application.CLIENT_PUBLIC, authorization_grant_type=Application.GRANT_PASSWORD,
+    )
+    token = AccessToken.objects.create(
+        user=user, application=application, token=f'token-{user.pk}', scope='read write',
+        expires=timezone.now() + timedelta(hours=1),
+    )
+    return async_to_sync(AsyncClient().get)(URL, headers={'Authorization': f'Bearer {token.token}'})
+
+
+def _received(channels, action, shelter=None, count=1):
+    """Run ``action`` (sync) while subscribed; return the events received."""
+    async def scenario():
+        subscription = events.broker.subscribe(channels, shelter)
+        try:
+            await sync_to_async(action)()
+            received = []
+            while len(received) < count and (item := await subscription.next(0.5)) is not None:
+                received.append(item)
+            return received
+        finally:
+            events.broker.unsubscribe(subscription)
+    return async_to_sync(scenario)()
+
+
+def _read(response):
+    """The whole (async) stream of ``response``."""
+    async def read():
+        return b''.join([chunk async for chunk in response.streaming_content]).decode()
+    return async_to_sync(read)()
+
+
+@pytest.mark.django_db
+class TestPublishing:
+
+    def test_signup_publishes_count_after_commit(self, task, volunteer_user, django_capture_on_commit_callbacks):
+        def signup():
+            with django_capture_on_commit_callbacks(execute=True):
+                task.add_volunteer(volunteer_user)
+
+        [(channel, event)] = _received(['tasks'], signup)
+
+        assert channel == 'tasks'
+        assert event['id'] == task.pk
+        assert (event['volunteers'], event['maxVolunteers']) == (1, 1)
+        assert event['status'] == TaskStatus.PERSON_LIMIT_REACHED
+
+    def test_nothing_published_before_commit(self, task, volunteer_user):
+        # the test transaction never commits
+        assert _received(['tasks'], lambda: task.add_volunteer(volunteer_user)) == []
+
+    def test_stock_movement_publishes_quantity(self, supply_item, django_capture_on_commit_callbacks):
+        def issue():
+            with django_capture_on_commit_callbacks(execute=True):
+                stock.issue(supply_item, Decimal('15'))
+
+        [(channel, event)] = _received(['stock'], issue)
+
+        assert channel == 'stock'
+        assert event == {'item': supply_item.pk, 'shelter': None, 'quantity': Decimal('25.00')}
+
+    def test_sharded_stock_publishes_shard_total(self, supply_item, django_capture_on_commit_callbacks):
+        stock.set_shard_count(supply_item, 4)
+
+        def receive():
+            with django_capture_on_commit_callbacks(execute=True):
+                stock.receive(supply_item, Decimal('2'))
+
+        [(_, event)] = _received(['stock'], receive)
+
+        assert event['quantity'] == Decimal('42.00')
+
+    def test_events_are_not_built_without_subscribers(self, django_capture_on_commit_callbacks):
+        built = []
+        with django_capture_on_commit_callbacks(execute=True):
+            events.publish('tasks', lambda: built.append(1) or [])
+        assert built == []
+
+    def test_subscription_filters_channel_and_shelter(self):
+        def publish():
+            events.broker.deliver('stock', {'item': 1, 'shelter': 1})
+            events.broker.deliver('tasks', {'id': 2, 'shelter': 2})
+            events.broker.deliver('tasks', {'id': 3, 'shelter': 1})
+
+        received = _received(['tasks'], publish, shelter=1, count=2)
+
+        assert received == [('tasks', {'id': 3, 'shelter': 1})]
+
+    def test_overflow_sends_resync(self, settings):
+        settings.EVENTS = {**settings.EVENTS, 'QUEUE_SIZE': 1}
+
+        def publish():
+            for i in range(3):
+                events.broker.deliver('tasks', {'id': i})
+
+        received = _received(['tasks'], publish, count=1)
+
+        assert received == [(events.RESYNC, {})]
+
+
+@pytest.mark.django_db
+class TestEventStreamView:
+
+    def test_requires_authentication(self, api_client):
+        response = api_client.get(URL)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_refused_outside_asgi(self, api_client, volunteer_user):
+        api_client.force_authenticate(user=volunteer_user)
+
+        response = api_client.get(URL)
+
+        assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
+        assert not events.broker.has_subscribers()
+
+    def test_stream_headers(self, volunteer_user, settings):
+        settings.EVENTS = {**settings.EVENTS, 'STREAM_SECONDS': 0}
+
+        response = _connect(volunteer_user)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/event-stream'
+        assert response['Cache-Control'] == 'no-cache'
+        assert _read(response).startswith('retry: ')
+
+    def test_stream_sends_events_of_own_shelter(self, employee_user, settings):
+        krakow = Shelter.objects.create(code='krakow', name='Schronisko Kraków')
+        employee_user.shelter = krakow
+        employee_user.save(update_fields=['shelter'])
+        settings.EVENTS = {**settings.EVENTS, 'STREAM_SECONDS': 1, 'HEARTBEAT_SECONDS': 1}
+
+        def publish_once_connected():
+            deadline = time.monotonic() + 1
+            while not events.broker.has_subscribers() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            events.broker.deliver('stock', {'item': 1, 'shelter': krakow.pk + 1, 'quantity': '1.00'})
+            events.broker.deliver('stock', {'item': 2, 'shelter': krakow.pk, 'quantity': '5.00'})
+
+        publisher = threading.Thread(target=publish_once_connected)
+        publisher.start()
+        content = _read(_connect(employee_user))
+        publisher.join()
+
+        messages = [block for block in content.split('\n\n') if block.startswith('event:')]
+        assert messages == [
+            'event: stock\ndata: ' + json.dumps({'item': 2, 'shelter': krakow.pk, 'quantity': '5.00'}, separators=(',', ':'))
+        ]
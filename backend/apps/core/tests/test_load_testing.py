@@ -0,0 +1,143 @@
+"""
+Tests for the synthetic data generator and benchmark harness.
+"""
+import json
+from io import StringIO
+import pytest
+from decimal import Decimal
+from datetime import timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F, Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.animals.models import Animal, AnimalStatusChange, Intake, Vaccination
+from apps.animals.services import status_history
+from apps.animals.services.status_history import OUTCOME_STATUSES
+from apps.core.benchmarking import percentile, queries_from_server_timing, summarize
+from apps.supplies.models import Inventory, InventoryLog, InventoryOperationType, SupplyCategory, SupplyItem, UnitOfMeasure
+from apps.volunteers.models import Task
+
+
+class TestBenchmarkHelpers:
+    """Tests for benchmarking helpers."""
+
+    def test_percentile_interpolates(self):
+        values = [1, 2, 3, 4]
+        assert percentile(values, 0) == 1
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4
+        assert percentile([], 50) is None
+
+    def test_summarize(self):
+        summary = summarize([0.01, 0.02, 0.03], elapsed=0.5, errors=1, queries=[2, 4, None])
+        assert summary['requests'] == 3
+        assert summary['throughput_rps'] == 6.0
+        assert summary['p50_ms'] == 20.0
+        assert summary['mean_queries'] == 3.0
+
+    def test_queries_from_server_timing(self):
+        header = 'db;dur=1.2;desc="7 queries", ser;dur=0.1, total;dur=3.0'
+        assert queries_from_server_timing(header) == 7
+        assert queries_from_server_timing(None) is None
+
+
+@pytest.mark.django_db
+class TestGenerateSyntheticData:
+    """Tests for generate_synthetic_data command."""
+
+    def test_generates_requested_counts(self):
+        call_command(
+            'generate_synthetic_data', animals=30, vaccinations=50, supply_items=5,
+            inventory_logs=200, volunteers=5, schedules=2, tasks=10,
+            batch_size=16, seed=1, tag='T', stdout=StringIO(),
+        )
+
+        assert Animal.objects.count() == 30
+        assert Intake.objects.count() == 30
+        assert Vaccination.objects.count() == 50
+        assert InventoryLog.objects.count() == 200
+        assert Task.objects.count() == 10
+
+    def test_inventory_matches_generated_ledger(self):
+        call_command(
+            'generate_synthetic_data', supply_items=3, inventory_logs=100, seed=2, tag='L',
+            stdout=StringIO(),
+        )
+
+        for inventory in Inventory.objects.all():
+            logs = inventory.logs.all()
+            inbound = logs.filter(operation_type=InventoryOperationType.INBOUND).aggregate(
+                s=Sum('quantity'))['s'] or Decimal('0')
+            outbound = logs.filter(operation_type=InventoryOperationType.OUTBOUND).aggregate(
+                s=Sum('quantity'))['s'] or Decimal('0')
+            assert inventory.current_quantity == inbound - outbound
+
+    def test_other_inventories_untouched(self):
+        category = SupplyCategory.objects.create(name='Żywność')
+        unit = UnitOfMeasure.objects.create(name='kilogram', abbreviation='kg')
+        item = SupplyItem.objects.create(name='Karma', min_stock=Decimal('1'), category=category, unit=unit)
+        real = Inventory.objects.create(supply_item=item, current_quantity=Decimal('7.00'))
+
+        call_command(
+            'generate_synthetic_data', supply_items=2, inventory_logs=50, seed=5, tag='R',
+            stdout=StringIO(),
+        )
+
+        real.refresh_from_db()
+        assert real.current_quantity == Decimal('7.00')
+        assert not real.logs.exists()
+
+    def test_timestamps_are_spread(self):
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                'generate_synthetic_data', animals=20, supply_items=1, inventory_logs=50, days=90, seed=3,
+                tag='D', stdout=StringIO(),
+            )
+
+        assert InventoryLog.objects.dates('timestamp', 'day').count() > 1
+        assert Animal.objects.dates('created_at', 'day').count() > 1
+        assert Animal.objects.dates('intake_date', 'day').count() > 1
+        # the status history is backdated with the animals
+        arrivals = AnimalStatusChange.objects.filter(from_status='')
+        assert arrivals.count() == Animal.objects.count()
+        assert not arrivals.exclude(changed_at=F('animal__created_at')).exists()
+        # outcomes fall between the generated intake and now
+        outcomes = AnimalStatusChange.objects.filter(to_status__in=OUTCOME_STATUSES)
+        assert outcomes.exists()
+        assert not outcomes.filter(changed_at__lt=timezone.now() - timedelta(days=90)).exists()
+        assert not outcomes.filter(changed_at__gt=timezone.now()).exists()
+        assert not outcomes.filter(changed_at__lt=F('animal__created_at')).exists()
+        stay = status_history.length_of_stay(timezone.now() - timedelta(days=90), timezone.now())
+        assert stay['count'] == outcomes.count()
+        assert stay['average_days'] > 0
+        # backdated rows are written once, not inserted and then rewritten
+        rewrites = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith(('UPDATE "animals_animal"', 'UPDATE "supplies_inventorylog"'))
+        ]
+        assert rewrites == []
+
+
+@pytest.mark.django_db
+class TestBenchmarkEndpoints:
+    """Tests for benchmark_endpoints command."""
+
+    def test_writes_json_report(self, employee_user, tmp_path):
+        call_command(
+            'generate_synthetic_data', animals=5, seed=4, tag='B', stdout=StringIO(),
+        )
+        output = tmp_path / 'bench.json'
+
+        call_command(
+            'benchmark_endpoints', endpoints='health,animal-list,animal-detail',
+            requests=5, warmup=1, output=str(output), stderr=StringIO(),
+        )
+
+        report = json.loads(output.read_text())
+        assert report['meta']['mode'] == 'in-process'
+        animal_list = report['endpoints']['animal-list']
+        assert animal_list['requests'] == 5
+        assert animal_list['errors'] == 0
+        assert animal_list['p99_ms'] >= animal_list['p50_ms']
+        assert animal_list['mean_queries'] is not None
@@ -0,0 +1,102 @@
+"""
+Tests for request metrics middleware and endpoint.
+"""
+import logging
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from apps.accounts.models import User
+from apps.core.metrics import Histogram, registry
+from apps.core.middleware import RequestMetricsMiddleware
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_observe_is_cumulative(self):
+        histogram = Histogram((1, 5, 10))
+        for value in (0.5, 3, 7, 20):
+            histogram.observe(value)
+
+        assert histogram.counts == [1, 2, 3]
+        assert histogram.total == 4
+        assert histogram.sum == 30.5
+
+
+@pytest.mark.django_db
+class TestRequestMetricsMiddleware:
+    """Tests for RequestMetricsMiddleware."""
+
+    def test_server_timing_header(self, authenticated_employee):
+        """Test that responses carry query count and timings."""
+        response = authenticated_employee.get(reverse('animals:animal-list'))
+
+        assert response.status_code == 200
+        header = response['Server-Timing']
+        assert 'db;dur=' in header
+        assert 'queries"' in header
+        assert 'ser;dur=' in header
+        assert 'total;dur=' in header
+
+    def test_metrics_keyed_by_view_and_action(self, authenticated_employee, api_client, settings):
+        """Test that the metrics endpoint exposes per-view histograms."""
+        settings.REQUEST_METRICS = {**settings.REQUEST_METRICS, 'METRICS_TOKEN': 's3cret'}
+        authenticated_employee.get(reverse('animals:animal-list'))
+        response = api_client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        body = response.content.decode()
+        labels = 'view="animals:animal-list",action="list",method="GET"'
+        assert f'shelter_http_request_db_queries_count{{{labels}}} 1' in body
+        assert f'shelter_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in body
+        assert f'shelter_http_responses_total{{{labels},status="2xx"}} 1' in body
+
+    def test_query_budget_logs_warning(self, authenticated_employee, settings, caplog):
+        """Test that requests over the query budget are logged."""
+        settings.REQUEST_METRICS = {**settings.REQUEST_METRICS, 'QUERY_BUDGET': 0}
+        with caplog.at_level(logging.WARNING, logger='apps.core.metrics'):
+            authenticated_employee.get(reverse('animals:animal-list'))
+
+        assert 'Query budget exceeded' in caplog.text
+        assert 'shelter_http_requests_over_query_budget_total' in registry.render()
+
+    def test_metrics_token(self, api_client, settings):
+        """Test that the metrics endpoint can be protected with a token."""
+        settings.REQUEST_METRICS = {**settings.REQUEST_METRICS, 'METRICS_TOKEN': 's3cret'}
+
+        assert api_client.get(reverse('metrics')).status_code == 401
+        response = api_client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+        assert response.status_code == 200
+
+    def test_metrics_denied_without_token(self, api_client, employee_user):
+        """Test that without a token only staff get the metrics."""
+        assert api_client.get(reverse('metrics')).status_code == 401
+
+        api_client.force_login(employee_user)
+        assert api_client.get(reverse('metrics')).status_code == 401
+
+        staff = User.objects.create_superuser(email='admin@schronisko.pl', password='admin123')
+        api_client.force_login(staff)
+        assert api_client.get(reverse('metrics')).status_code == 200
+
+    def test_async_requests_measured(self):
+        """Test that the async path counts queries run in sync_to_async threads."""
+        async def view(request):
+            await sync_to_async(User.objects.count)()
+            return HttpResponse()
+
+        middleware = RequestMetricsMiddleware(view)
+        response = async_to_sync(middleware)(RequestFactory().get('/'))
+
+        assert 'desc="1 queries"' in response['Server-Timing']
+        assert 'view="unresolved",action="",method="GET"' in registry.render()
@@ -0,0 +1,291 @@
+"""
+Query-count budgets for list and detail endpoints.
+
+Every endpoint is measured with N and 10*N related rows; the query count must
+stay constant (no N+1) and within the budget from QUERY_BUDGETS. When an
+endpoint legitimately needs another query, raise its budget here.
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from apps.accounts.models import User, Role
+from apps.animals.models import (
+    Animal, BehavioralTag, Intake, IntakeType, Medication, Vaccination,
+    MedicalProcedure, Photo, AnimalSpecies, AnimalStatus,
+)
+from apps.supplies.models import (
+    SupplyCategory, UnitOfMeasure, Supplier, SupplyItem, Inventory,
+    InventoryLog, InventoryOperationType, SupplyOrder, SupplyOrderLine,
+    Stocktake, StocktakeLine,
+)
+from apps.dashboard.models import CensusSnapshot
+from apps.shelters.models import Shelter
+from apps.volunteers.models import Schedule, Task, TaskStatus
+
+
+def _volunteer(i):
+    return User.objects.create_user(
+        email=f'wolontariusz{i}@schronisko.pl',
+        password='haslo123',
+        first_name='Anna',
+        last_name=f'Nowak {i}',
+        role=Role.VOLUNTEER,
+        is_head_office=True,
+    )
+
+
+def _supply_item(i):
+    category, _ = SupplyCategory.objects.get_or_create(name='Żywność')
+    unit, _ = UnitOfMeasure.objects.get_or_create(name='kilogram', abbreviation='kg')
+    item = SupplyItem.objects.create(
+        name=f'Karma {i}', min_stock=Decimal('10.00'), category=category, unit=unit,
+    )
+    Inventory.objects.create(supply_item=item, current_quantity=Decimal('5.00'))
+    return item
+
+
+def _pending_order(item, i):
+    supplier, _ = Supplier.objects.get_or_create(name='PetFood Sp. z o.o.')
+    order = SupplyOrder.objects.create(
+        supplier=supplier,
+        expected_delivery_date=date.today() + timedelta(days=i + 1),
+    )
+    SupplyOrderLine.objects.create(order=order, supply_item=item, quantity=Decimal('3.00'))
+
+
+def _task(schedule, i, volunteers=()):
+    task = Task.objects.create(
+        name=f'Spacer {i}',
+        datetime=timezone.now() + timedelta(hours=i),
+        duration_in_minutes=60,
+        maxVolunteers=5,
+        schedule=schedule,
+        status=TaskStatus.AVAILABLE,
+    )
+    task.volunteers.set(volunteers)
+    return task
+
+
+# --- setups: create the object under test, return url kwargs ---------------
+
+def no_setup(ctx):
+    return {}
+
+
+def setup_animal(ctx):
+    ctx['animal'] = Animal.objects.create(name='Max', species=AnimalSpecies.DOG)
+    return {'pk': ctx['animal'].pk}
+
+
+def setup_nested_animal(ctx):
+    return {'animal_pk': setup_animal(ctx)['pk']}
+
+
+def setup_supply_item(ctx):
+    ctx['item'] = _supply_item('główna')
+    return {'pk': ctx['item'].pk}
+
+
+def setup_stocktake(ctx):
+    ctx['stocktake'] = Stocktake.objects.create(opened_by=ctx['user'])
+    return {'pk': ctx['stocktake'].pk}
+
+
+# --- seeders: add `count` related rows numbered from `start` ---------------
+
+def seed_animals(ctx, start, count):
+    animals = Animal.objects.bulk_create(
+        Animal(animal_id=f'DOG-{i}', name=f'Pies {i}', species=AnimalSpecies.DOG)
+        for i in range(start, start + count)
+    )
+    Photo.objects.bulk_create(
+        Photo(animal=animal, filename=f'{animal.animal_id}.jpg', url=f'/media/animals/{animal.animal_id}.jpg')
+        for animal in animals
+    )
+    Animal.refresh_identification_photos(Animal.objects.filter(pk__in=[a.pk for a in animals]))
+
+
+def seed_animal_records(ctx, start, count):
+    animal, vet = ctx['animal'], ctx['user']
+    for i in range(start, start + count):
+        Medication.objects.create(
+            animal=animal, medication_name=f'Lek {i}', dosage='1 tabl.',
+            frequency='1x dziennie', start_date=date.today(), reason='-', performed_by=vet,
+        )
+        Vaccination.objects.create(
+            animal=animal, vaccine_name=f'Szczepionka {i}', vaccine_for='-',
+            vaccine_batch_number=f'B{i}', vaccination_date=date.today(),
+            expiration_date=date.today(), performed_by=vet,
+        )
+        MedicalProcedure.objects.create(
+            animal=animal, procedure_date=date.today(), description=f'Zabieg {i}',
+            result='-', cost=Decimal('1.00'), performed_by=vet,
+        )
+        Photo.objects.create(animal=animal, filename=f'{i}.jpg', url=f'/media/animals/{i}.jpg')
+        Intake.objects.create(
+            animal=animal, animal_condition='-', location='-', notes='-',
+            intake_type=IntakeType.STRAY,
+        )
+        tag = BehavioralTag.objects.create(behavioral_tag_name=f'Tag {i}', description='-')
+        animal.behavioral_tags.add(tag)
+
+
+def seed_offspring(ctx, start, count):
+    for i in range(start, start + count):
+        child = Animal.objects.create(animal_id=f'PUP-{i}', name=f'Szczeniak {i}', species=AnimalSpecies.DOG)
+        child.parents.add(ctx['animal'])
+        grandchild = Animal.objects.create(animal_id=f'PUP-{i}-1', name=f'Wnuk {i}', species=AnimalSpecies.DOG)
+        grandchild.parents.add(child)
+
+
+def seed_siblings(ctx, start, count):
+    if not ctx['animal'].parents.exists():
+        ctx['animal'].parents.add(Animal.objects.create(name='Matka', species=AnimalSpecies.DOG))
+    mother = ctx['animal'].parents.get()
+    for i in range(start, start + count):
+        sibling = Animal.objects.create(animal_id=f'SIB-{i}', name=f'Rodzeństwo {i}', species=AnimalSpecies.DOG)
+        sibling.parents.add(mother)
+
+
+def seed_behavioral_tags(ctx, start, count):
+    for i in range(start, start + count):
+        tag = BehavioralTag.objects.create(behavioral_tag_name=f'Tag {i}', description='-')
+        ctx['animal'].behavioral_tags.add(tag)
+
+
+def seed_supply_items(ctx, start, count):
+    for i in range(start, start + count):
+        _pending_order(_supply_item(i), i)
+
+
+def seed_supply_item_history(ctx, start, count):
+    item = ctx['item']
+    for i in range(start, start + count):
+        _pending_order(item, i)
+        InventoryLog.objects.create(
+            inventory=item.inventory, operation_type=InventoryOperationType.INBOUND,
+            quantity=Decimal('1.00'), performed_by=ctx['user'],
+        )
+
+
+def seed_stocktake_lines(ctx, start, count):
+    for i in range(start, start + count):
+        StocktakeLine.objects.create(
+            stocktake=ctx['stocktake'], supply_item=_supply_item(i), counted_quantity=Decimal('4.00'),
+        )
+
+
+def seed_schedules(ctx, start, count):
+    for i in range(start, start + count):
+        schedule = Schedule.objects.create(
+            name=f'Grafik {i}', start_date=date.today(), end_date=date.today(),
+        )
+        _task(schedule, i, [_volunteer(i)])
+
+
+def seed_tasks(ctx, start, count):
+    schedule, _ = Schedule.objects.get_or_create(
+        name='Grafik', start_date=date.today(), end_date=date.today(),
+    )
+    for i in range(start, start + count):
+        _task(schedule, i, [_volunteer(i)])
+
+
+def seed_employees(ctx, start, count):
+    for i in range(start, start + count):
+        User.objects.create_user(
+            email=f'weterynarz{i}@schronisko.pl', password='haslo123',
+            first_name='Maria', last_name=f'Kowalczyk {i}', role=Role.EMPLOYEE, is_head_office=True,
+        )
+
+
+def seed_scheduled_medications(ctx, start, count):
+    seed_animals(ctx, start, count)
+    for animal in Animal.objects.filter(animal_id__in=[f'DOG-{i}' for i in range(start, start + count)]):
+        Medication.objects.create(
+            animal=animal, medication_name='Amoxicillin', dosage='250mg', frequency='every 1 hour',
+            start_date=date.today() - timedelta(days=1), reason='-', performed_by=ctx['user'],
+        )
+
+
+def seed_status_changes(ctx, start, count):
+    seed_animals(ctx, start, count)
+    Animal.objects.filter(animal_id__in=[f'DOG-{i}' for i in range(start, start + count)]).update(
+        status=AnimalStatus.ADOPTED,
+    )
+
+
+def seed_census(ctx, start, count):
+    seed_animals(ctx, start, count)
+    CensusSnapshot.objects.bulk_create(
+        CensusSnapshot(
+            date=date.today() - timedelta(days=i + 1), in_shelter=i, stay_days_total=i * 10,
+            intakes={IntakeType.STRAY: i},
+        )
+        for i in range(start, start + count)
+    )
+    # The live aggregates are cached; measure a cold dashboard every time.
+    cache.clear()
+
+
+def seed_shelters(ctx, start, count):
+    for i in range(start, start + count):
+        shelter = Shelter.objects.create(code=f'schronisko-{i}', name=f'Schronisko {i}')
+        Animal.objects.create(animal_id=f'DOG-{i}', name=f'Pies {i}', species=AnimalSpecies.DOG, shelter=shelter)
+        item = _supply_item(i)
+        item.shelter = shelter
+        item.save(update_fields=['shelter'])
+
+
+def seed_sync(ctx, start, count):
+    ctx['animal'] = Animal.objects.create(name='Max', species=AnimalSpecies.DOG)
+    seed_animal_records(ctx, start, count)
+    seed_animals(ctx, start, count)
+    seed_tasks(ctx, start, count)
+    seed_supply_items(ctx, start, count)
+
+
+QUERY_BUDGETS = [
+    # (url name, setup, seeder, max queries)
+    ('animals:animal-list', no_setup, seed_animals, 2),
+    ('animals:animal-detail', setup_animal, seed_animal_records, 8),
+    ('animals:animal-medications', setup_animal, seed_animal_records, 3),
+    ('animals:animal-vaccinations', setup_animal, seed_animal_records, 3),
+    ('animals:animal-procedures', setup_animal, seed_animal_records, 3),
+    ('animals:animal-descendants', setup_animal, seed_offspring, 3),
+    ('animals:animal-siblings', setup_animal, seed_siblings, 4),
+    ('animals:animal-status-change-list', no_setup, seed_status_changes, 2),
+    ('animals:animal-behavioral-tags-list', setup_nested_animal, seed_behavioral_tags, 2),
+    ('animals:veterinarian-list', no_setup, seed_employees, 1),
+    ('animals:medication-due-doses', no_setup, seed_scheduled_medications, 1),
+    ('supplies:supply-item-list', no_setup, seed_supply_items, 3),
+    ('supplies:supply-item-detail', setup_supply_item, seed_supply_item_history, 3),
+    ('supplies:supply-item-logs', setup_supply_item, seed_supply_item_history, 3),
+    ('supplies:stocktake-lines', setup_stocktake, seed_stocktake_lines, 3),
+    ('volunteers:schedule-list', no_setup, seed_schedules, 4),
+    ('volunteers:task-list', no_setup, seed_tasks, 3),
+    ('dashboard', no_setup, seed_census, 6),
+    ('shelters:shelter-summary', no_setup, seed_shelters, 7),
+    ('sync', no_setup, seed_sync, 6),
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url_name, setup, seed, budget', QUERY_BUDGETS, ids=[row[0] for row in QUERY_BUDGETS]
+)
+def test_endpoint_query_budget(
+    url_name, setup, seed, budget, authenticated_employee, employee_user, assert_query_budget
+):
+    """Test that the endpoint's query count is constant and within budget."""
+    ctx = {'user': employee_user}
+    url = reverse(url_name, kwargs=setup(ctx))
+
+    assert_query_budget(
+        lambda: authenticated_employee.get(url),
+        lambda start, count: seed(ctx, start, count),
+        budget,
+    )
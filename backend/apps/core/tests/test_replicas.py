@@ -0,0 +1,175 @@
+"""
+Tests for read-replica routing.
+
+The test settings define 'replica' as a separate database, so rows created
+with ``.using('replica')`` are visible only to reads routed there.
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from apps.animals.models import Animal, AnimalSpecies, AnimalStatus
+from apps.core.replicas import ReplicaRouter, ReplicaRoutingMiddleware, _pin_key, reading_from_replica, use_replica
+from apps.supplies.models import Inventory, SupplyCategory, SupplyItem, UnitOfMeasure
+from apps.volunteers.models import Schedule, Task, TaskStatus
+
+pytestmark = pytest.mark.django_db(databases=['default', 'replica'])
+
+
+@pytest.fixture
+def replica(settings):
+    """Enable routing to the 'replica' alias."""
+    settings.READ_REPLICA = {**settings.READ_REPLICA, 'ALIAS': 'replica'}
+    cache.clear()
+    yield 'replica'
+    cache.clear()
+
+
+def create_item(name, using='default'):
+    category, _ = SupplyCategory.objects.using(using).get_or_create(name='Żywność')
+    unit, _ = UnitOfMeasure.objects.using(using).get_or_create(name='kilogram', abbreviation='kg')
+    item = SupplyItem.objects.using(using).create(
+        name=name, min_stock=Decimal('1'), category=category, unit=unit,
+    )
+    Inventory.objects.using(using).create(supply_item=item, current_quantity=Decimal('10'))
+    return item
+
+
+def item_names(client):
+    response = client.get(reverse('supplies:supply-item-list'))
+    assert response.status_code == 200
+    return [item['name'] for item in response.data['results']]
+
+
+class TestReplicaRouter:
+    """Tests for the routing decisions."""
+
+    def run_request(self, handler, method='GET'):
+        request = SimpleNamespace(method=method, user=AnonymousUser())
+        return ReplicaRoutingMiddleware(lambda request: handler(request))(request)
+
+    def test_reads_use_replica_for_opted_in_actions(self, replica):
+        router = ReplicaRouter()
+
+        def handler(request):
+            use_replica(request, 'list', ('list', 'retrieve'))
+            return router.db_for_read(SupplyItem)
+
+        assert self.run_request(handler) == 'replica'
+        assert self.run_request(handler, method='POST') is None
+        # state does not leak out of the request
+        assert router.db_for_read(SupplyItem) is None
+
+    def test_write_pins_rest_of_request_to_primary(self, replica):
+        router = ReplicaRouter()
+
+        def handler(request):
+            use_replica(request, 'list', ('list',))
+            router.db_for_write(SupplyItem)
+            return router.db_for_read(SupplyItem)
+
+        assert self.run_request(handler) is None
+
+    def test_no_replica_configured(self):
+        def handler(request):
+            use_replica(request, 'list', ('list',))
+            return ReplicaRouter().db_for_read(SupplyItem)
+
+        assert self.run_request(handler) is None
+
+    def test_async_path_resets_state_and_pins_writer(self, replica, employee_user):
+        router = ReplicaRouter()
+
+        def view(request):
+            use_replica(request, 'list', ('list',))
+            router.db_for_write(SupplyItem)
+
+        async def handler(request):
+            await sync_to_async(view)(request)
+            # the write made in the view's thread is seen here
+            return reading_from_replica()
+
+        middleware = ReplicaRoutingMiddleware(handler)
+        request = SimpleNamespace(method='GET', user=employee_user)
+
+        assert async_to_sync(middleware)(request) is False
+        assert router.db_for_read(SupplyItem) is None
+        assert cache.get(_pin_key(employee_user))
+
+
+class TestReplicaViews:
+    """Tests for the views that read from the replica."""
+
+    def test_supply_list_reads_replica(self, replica, authenticated_employee):
+        create_item('Karma z primary')
+        create_item('Karma z repliki', using='replica')
+
+        assert item_names(authenticated_employee) == ['Karma z repliki']
+
+    def test_supply_list_reads_primary_without_replica(self, authenticated_employee):
+        create_item('Karma z primary')
+        create_item('Karma z repliki', using='replica')
+
+        assert item_names(authenticated_employee) == ['Karma z primary']
+
+    def test_update_inventory_uses_primary_and_pins_user(self, replica, authenticated_employee):
+        item = create_item('Karma z primary')
+        create_item('Karma z repliki', using='replica')
+        url = reverse('supplies:supply-item-update-inventory', kwargs={'pk': item.pk})
+
+        response = authenticated_employee.post(url, {'change_type': 'in', 'quantity_change': '5'}, format='json')
+
+        assert response.status_code == 200
+        assert Inventory.objects.get(supply_item=item).current_quantity == Decimal('15')
+        # the user reads their own write from the primary for a while
+        assert item_names(authenticated_employee) == ['Karma z primary']
+        cache.clear()
+        assert item_names(authenticated_employee) == ['Karma z repliki']
+
+    def test_custom_read_actions_use_primary(self, replica, authenticated_employee):
+        item = create_item('Karma z primary')
+        url = reverse('supplies:supply-item-lots', kwargs={'pk': item.pk})
+
+        assert authenticated_employee.get(url).status_code == 200
+
+    def test_async_animal_list_reads_replica(self, replica, authenticated_employee):
+        Animal.objects.create(name='Max', species=AnimalSpecies.DOG, status=AnimalStatus.IN_SHELTER)
+        Animal.objects.using('replica').create(
+            name='Luna', species=AnimalSpecies.CAT, status=AnimalStatus.IN_SHELTER,
+        )
+
+        response = authenticated_employee.get(reverse('animals:animal-list'))
+
+        assert response.status_code == 200
+        assert [animal['name'] for animal in response.data['results']] == ['Luna']
+
+    def test_schedule_list_reads_replica(self, replica, authenticated_employee):
+        Schedule.objects.using('replica').create(
+            name='Grudzień', start_date=date(2026, 12, 1), end_date=date(2026, 12, 31),
+        )
+
+        response = authenticated_employee.get(reverse('volunteers:schedule-list'))
+
+        assert response.status_code == 200
+        assert [schedule['name'] for schedule in response.data['results']] == ['Grudzień']
+
+    def test_task_signup_uses_primary(self, replica, authenticated_employee, employee_user):
+        schedule = Schedule.objects.create(
+            name='Grudzień', start_date=date(2026, 12, 1), end_date=date(2026, 12, 31),
+        )
+        task = Task.objects.create(
+            name='Spacer', datetime=timezone.now(), duration_in_minutes=60,
+            maxVolunteers=2, schedule=schedule, status=TaskStatus.AVAILABLE,
+        )
+        url = reverse('volunteers:task-signup', kwargs={'task_id': task.task_id})
+
+        response = authenticated_employee.post(url)
+
+        assert response.status_code == 200
+        assert response.data['volunteers_count'] == 1
+        assert list(task.volunteers.all()) == [employee_user]
@@ -3,4 +3,6 @@ from . import views
 
 urlpatterns = [
     path('health/', views.health_check, name='health_check'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('events/', views.EventStreamView.as_view(), name='events'),
 ]
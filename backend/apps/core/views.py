@@ -1,8 +1,28 @@
-from django.http import JsonResponse
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.db import connection
+from django.utils.crypto import constant_time_compare
+
+from apps.accounts.models import Role
+from apps.accounts.permissions import IsEmployeeOrVolunteer
+from apps.shelters.tenancy import shelter_of
+from . import events
+from .async_views import AsyncAPIView
+from .db import pool_stats
+from .metrics import registry
+
+
+def _check_database():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return pool_stats()
 
 
-def health_check(request):
+async def health_check(request):
     """Health check endpoint for load balancer and container orchestration."""
     health_status = {
         "status": "healthy",
@@ -11,8 +31,7 @@ def health_check(request):
 
     # Check database connection
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
+        health_status["database_pool"] = await sync_to_async(_check_database)()
         health_status["database"] = "connected"
     except Exception as e:
         health_status["status"] = "unhealthy"
@@ -20,3 +39,67 @@ def health_check(request):
         return JsonResponse(health_status, status=503)
 
     return JsonResponse(health_status)
+
+
+def metrics(request):
+    """
+    Request metrics of this worker process in Prometheus text format.
+
+    Served to ``Authorization: Bearer <METRICS_TOKEN>`` and to staff logged in
+    to the admin; with no token configured only staff get them.
+    """
+    token = settings.REQUEST_METRICS.get('METRICS_TOKEN')
+    has_token = bool(token) and constant_time_compare(
+        request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}',
+    )
+    if not has_token and not request.user.is_staff:
+        return HttpResponse(status=401)
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+class EventStreamView(AsyncAPIView):
+    """
+    Server-sent events replacing polling of tasks and stock (apps.core.events).
+
+    ``tasks`` events (signup counts, everyone) and ``stock`` events (item
+    quantities, employees) of the user's shelter; a comment line every
+    ``EVENTS['HEARTBEAT_SECONDS']`` keeps proxies from closing the idle
+    connection. The stream ends after ``EVENTS['STREAM_SECONDS']``, and
+    EventSource reconnects on its own.
+
+    Only served under ASGI (``SERVER_MODE=asgi``): a WSGI server would buffer
+    the stream and hold a sync worker for all of it, so the request is refused
+    with 501 and clients keep polling.
+    """
+    permission_classes = [IsEmployeeOrVolunteer]
+    actions = {'get': 'events'}
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return self.respond({'detail': 'Strumień zdarzeń wymaga serwera ASGI (SERVER_MODE=asgi).'}, status=501)
+        user = self.drf_request.user
+        channels = ('tasks', 'stock') if user.role == Role.EMPLOYEE else ('tasks',)
+        response = StreamingHttpResponse(self.stream(channels, shelter_of(user)), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # reverse proxies (nginx) must not buffer the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, channels, shelter):
+        subscription = events.broker.subscribe(channels, shelter)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.EVENTS['STREAM_SECONDS']
+        try:
+            yield f"retry: {settings.EVENTS['HEARTBEAT_SECONDS'] * 1000}\n\n"
+            while (remaining := deadline - loop.time()) > 0:
+                item = await subscription.next(min(settings.EVENTS['HEARTBEAT_SECONDS'], remaining))
+                if item is None:
+                    yield ': keepalive\n\n'
+                    continue
+                channel, event = item
+                yield f'event: {channel}\ndata: {events.encode(event)}\n\n'
+        finally:
+            events.broker.unsubscribe(subscription)
@@ -0,0 +1,13 @@
+"""
+Admin configuration for dashboard app.
+"""
+from django.contrib import admin
+from .models import CensusSnapshot
+
+
+@admin.register(CensusSnapshot)
+class CensusSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['date', 'shelter', 'in_shelter', 'average_days_in_shelter', 'created_at']
+    list_filter = ['shelter']
+    date_hierarchy = 'date'
+    readonly_fields = ['created_at']
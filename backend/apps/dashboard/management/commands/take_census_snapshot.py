@@ -0,0 +1,30 @@
+"""
+Management command to record daily census snapshots for the dashboard.
+
+Incremental: each run adds the days after the newest snapshot, so it can run
+daily shortly after midnight (cron or a scheduled ECS task):
+
+    python manage.py take_census_snapshot
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.services.census import take_snapshots
+
+
+class Command(BaseCommand):
+    help = "Record census snapshots for the days since the last one"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--until", type=date.fromisoformat, default=None,
+                            help="Last day to record (YYYY-MM-DD, default: yesterday)")
+
+    def handle(self, *args, **options):
+        snapshots = take_snapshots(options["until"])
+        if not snapshots:
+            self.stdout.write("Census is up to date")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Recorded {len(snapshots)} snapshots ({snapshots[0].date} - {snapshots[-1].date})"
+        ))
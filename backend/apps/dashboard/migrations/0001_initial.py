@@ -0,0 +1,65 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="CensusSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True, verbose_name="Date")),
+                (
+                    "in_shelter",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Animals in shelter"
+                    ),
+                ),
+                (
+                    "by_status",
+                    models.JSONField(default=dict, verbose_name="Animals by status"),
+                ),
+                (
+                    "by_species",
+                    models.JSONField(
+                        default=dict, verbose_name="Animals in shelter by species"
+                    ),
+                ),
+                (
+                    "by_sex",
+                    models.JSONField(
+                        default=dict, verbose_name="Animals in shelter by sex"
+                    ),
+                ),
+                (
+                    "intakes",
+                    models.JSONField(default=dict, verbose_name="Intakes by type"),
+                ),
+                (
+                    "stay_days_total",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="Total days in shelter"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Census snapshot",
+                "verbose_name_plural": "Census snapshots",
+                "ordering": ["-date"],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.14 on 2026-10-19 06:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dashboard", "0001_initial"),
+        ("shelters", "0002_assign_existing_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="censussnapshot",
+            name="shelter",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="census_snapshots",
+                to="shelters.shelter",
+                verbose_name="Shelter",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="censussnapshot",
+            name="date",
+            field=models.DateField(verbose_name="Date"),
+        ),
+        migrations.AddConstraint(
+            model_name="censussnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("shelter", "date"), name="census_snapshot_shelter_date_unique"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="censussnapshot",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("shelter__isnull", True)),
+                fields=("date",),
+                name="census_snapshot_total_date_unique",
+            ),
+        ),
+    ]
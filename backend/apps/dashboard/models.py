@@ -0,0 +1,78 @@
+"""
+Models for dashboard app - daily shelter census.
+"""
+from django.db import models
+
+
+class CensusSnapshot(models.Model):
+    """
+    Numbers of one shelter for one finished day, written by
+    ``take_census_snapshot``; rows without a shelter hold the organisation
+    total.
+
+    ``intakes`` is exact for every day (it is computed from Intake rows).
+    Population fields describe the shelter when the snapshot was taken; days
+    back-filled after a gap have no population (``in_shelter`` is null).
+    """
+    date = models.DateField(
+        verbose_name='Date',
+    )
+    shelter = models.ForeignKey(
+        'shelters.Shelter',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='census_snapshots',
+        verbose_name='Shelter',
+        # indexed as the leading column of the unique constraint
+        db_index=False,
+    )
+    in_shelter = models.PositiveIntegerField(
+        verbose_name='Animals in shelter',
+        null=True,
+        blank=True,
+    )
+    by_status = models.JSONField(
+        verbose_name='Animals by status',
+        default=dict,
+    )
+    by_species = models.JSONField(
+        verbose_name='Animals in shelter by species',
+        default=dict,
+    )
+    by_sex = models.JSONField(
+        verbose_name='Animals in shelter by sex',
+        default=dict,
+    )
+    intakes = models.JSONField(
+        verbose_name='Intakes by type',
+        default=dict,
+    )
+    stay_days_total = models.BigIntegerField(
+        verbose_name='Total days in shelter',
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Census snapshot'
+        verbose_name_plural = 'Census snapshots'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['shelter', 'date'], name='census_snapshot_shelter_date_unique'),
+            models.UniqueConstraint(
+                fields=['date'], condition=models.Q(shelter__isnull=True),
+                name='census_snapshot_total_date_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f'Census {self.date} ({self.shelter or "total"})'
+
+    @property
+    def average_days_in_shelter(self):
+        """Average days the animals in the shelter on this day had stayed so far."""
+        if not self.in_shelter:
+            return None
+        return round(self.stay_days_total / self.in_shelter, 1)
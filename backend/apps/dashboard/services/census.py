@@ -0,0 +1,229 @@
+"""
+Shelter statistics for the director's dashboard.
+
+Past days are read from ``CensusSnapshot`` rows (one per shelter and day plus
+an organisation total, written incrementally by ``take_census_snapshot``), so
+the dashboard cost depends on the number of days shown, not on the size of the
+Animal and Intake tables. Days after the newest snapshot - normally only today
+- come from a live aggregate that is cached for ``DASHBOARD['LIVE_CACHE_TTL']``
+seconds. Every function takes a ``shelter`` (id); None means all shelters.
+
+Two stay figures are reported: ``average_length_of_stay`` of the animals that
+left (were adopted or died) in the weeks shown, from the status log, and
+``average_days_in_shelter`` of the animals still in the shelter, which the
+snapshots keep per day.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.animals.models import Animal, AnimalStatus, Intake, IntakeType
+from apps.animals.services.status_history import length_of_stay
+from apps.dashboard.models import CensusSnapshot
+from apps.shelters.models import Shelter
+
+LIVE_CACHE_KEY = 'dashboard:live'
+
+# Statuses of animals that have left the shelter
+DEPARTED_STATUSES = (AnimalStatus.ADOPTED, AnimalStatus.DECEASED)
+
+
+def _animals(shelter):
+    animals = Animal.objects.all()
+    return animals if shelter is None else animals.filter(shelter=shelter)
+
+
+def _cache_key(shelter, *parts):
+    return ':'.join([LIVE_CACHE_KEY, str(shelter or 'all'), *parts])
+
+
+def population(today=None, shelter=None):
+    """
+    Current counts by status (all animals) and by species and sex (animals in
+    the shelter), plus the total of days the animals in the shelter have
+    stayed so far. Two grouped queries.
+    """
+    today = today or timezone.localdate()
+    by_status, by_species, by_sex = {}, {}, {}
+    in_shelter = 0
+    groups = _animals(shelter).values_list('status', 'species', 'sex').annotate(n=Count('pk')).order_by()
+    for status, species, sex, n in groups:
+        by_status[status] = by_status.get(status, 0) + n
+        if status in DEPARTED_STATUSES:
+            continue
+        in_shelter += n
+        by_species[species] = by_species.get(species, 0) + n
+        by_sex[sex] = by_sex.get(sex, 0) + n
+
+    stays = (
+        _animals(shelter).exclude(status__in=DEPARTED_STATUSES)
+        .values_list('intake_date').annotate(n=Count('pk')).order_by()
+    )
+    stay_days_total = sum(max((today - intake_date).days, 0) * n for intake_date, n in stays if intake_date)
+    return {
+        'in_shelter': in_shelter,
+        'by_status': by_status,
+        'by_species': by_species,
+        'by_sex': by_sex,
+        'stay_days_total': stay_days_total,
+    }
+
+
+def daily_intakes(start, end, shelter=None):
+    """Return ``{date: {intake_type: n}}`` for ``start`` <= date <= ``end``."""
+    days = {}
+    intakes = Intake.objects.filter(intake_date__range=(start, end))
+    if shelter is not None:
+        intakes = intakes.filter(animal__shelter=shelter)
+    rows = (
+        intakes.values_list('intake_date', 'intake_type').annotate(n=Count('pk')).order_by()
+    )
+    for intake_date, intake_type, n in rows:
+        days.setdefault(intake_date, {})[intake_type] = n
+    return days
+
+
+def first_census_date():
+    """The day the census starts: the oldest intake or animal, if any."""
+    dates = [
+        Intake.objects.order_by('intake_date').values_list('intake_date', flat=True).first(),
+        Animal.objects.order_by('intake_date').values_list('intake_date', flat=True).first(),
+    ]
+    dates = [value for value in dates if value]
+    return min(dates) if dates else None
+
+
+def take_snapshots(until=None):
+    """
+    Write snapshots for every day after the newest one, up to ``until``
+    (default: yesterday): the organisation total and one row per shelter.
+    Returns the created snapshots.
+
+    The last day gets the population as it is now - run the command shortly
+    after midnight so it describes the day that just ended. Earlier days of a
+    gap only get their intakes.
+    """
+    until = until or timezone.localdate() - timedelta(days=1)
+    latest = (
+        CensusSnapshot.objects.filter(shelter=None)
+        .order_by('-date').values_list('date', flat=True).first()
+    )
+    start = latest + timedelta(days=1) if latest else first_census_date()
+    if start is None or start > until:
+        return []
+
+    days = [start + timedelta(days=offset) for offset in range((until - start).days + 1)]
+    snapshots = []
+    for shelter in [None, *Shelter.objects.values_list('pk', flat=True)]:
+        intakes = daily_intakes(start, until, shelter)
+        scoped = [CensusSnapshot(date=day, shelter_id=shelter, intakes=intakes.get(day, {})) for day in days]
+        for name, value in population(until, shelter).items():
+            setattr(scoped[-1], name, value)
+        snapshots.extend(scoped)
+    return CensusSnapshot.objects.bulk_create(snapshots)
+
+
+def live_stats(shelter=None):
+    """
+    Numbers not covered by snapshots: current population and intakes of the
+    days after the newest snapshot. Cached briefly.
+    """
+    key = _cache_key(shelter)
+    stats = cache.get(key)
+    if stats is not None:
+        return stats
+
+    today = timezone.localdate()
+    latest = (
+        CensusSnapshot.objects.filter(shelter=shelter)
+        .order_by('-date').values_list('date', flat=True).first()
+    )
+    since = latest + timedelta(days=1) if latest else today - timedelta(weeks=settings.DASHBOARD['MAX_WEEKS'])
+    stats = {
+        'date': today,
+        'population': population(today, shelter),
+        'intakes': daily_intakes(since, today, shelter),
+    }
+    cache.set(key, stats, settings.DASHBOARD['LIVE_CACHE_TTL'])
+    return stats
+
+
+def departed_stay(since, shelter=None):
+    """
+    ``status_history.length_of_stay`` of the outcomes from ``since`` (a date)
+    until now. Cached like the live aggregate.
+    """
+    key = _cache_key(shelter, 'stay', since.isoformat())
+    stay = cache.get(key)
+    if stay is None:
+        stay = length_of_stay(
+            timezone.make_aware(datetime.combine(since, time())), timezone.now(), shelter=shelter,
+        )
+        cache.set(key, stay, settings.DASHBOARD['LIVE_CACHE_TTL'])
+    return stay
+
+
+def _average_stay(stay_days_total, in_shelter):
+    return round(stay_days_total / in_shelter, 1) if in_shelter else None
+
+
+def dashboard(weeks=None, shelter=None):
+    """
+    Dashboard payload: current counts, average stay of the animals that left
+    and of those still in the shelter, intakes per week by intake type and the
+    daily in-shelter history for the last ``weeks``.
+    """
+    weeks = weeks or settings.DASHBOARD['DEFAULT_WEEKS']
+    live = live_stats(shelter)
+    today = live['date']
+    first_week = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+
+    snapshots = (
+        CensusSnapshot.objects.filter(shelter=shelter, date__gte=first_week, date__lt=today)
+        .order_by('date').values_list('date', 'intakes', 'in_shelter', 'stay_days_total')
+    )
+    intakes = {}
+    history = []
+    for day, day_intakes, in_shelter, stay_days_total in snapshots:
+        intakes[day] = day_intakes
+        if in_shelter is not None:
+            history.append({
+                'date': day,
+                'in_shelter': in_shelter,
+                'average_days_in_shelter': _average_stay(stay_days_total, in_shelter),
+            })
+    # Live numbers win for the days they cover (today and any missed days).
+    intakes.update({day: counts for day, counts in live['intakes'].items() if day >= first_week})
+
+    per_week = []
+    for week in range(weeks):
+        week_start = first_week + timedelta(weeks=week)
+        counts = dict.fromkeys(IntakeType.values, 0)
+        for offset in range(7):
+            for intake_type, n in intakes.get(week_start + timedelta(days=offset), {}).items():
+                counts[intake_type] = counts.get(intake_type, 0) + n
+        per_week.append({'week_start': week_start, 'total': sum(counts.values()), 'by_type': counts})
+
+    current = live['population']
+    days_in_shelter = _average_stay(current['stay_days_total'], current['in_shelter'])
+    history.append({
+        'date': today,
+        'in_shelter': current['in_shelter'],
+        'average_days_in_shelter': days_in_shelter,
+    })
+    departed = departed_stay(first_week, shelter)
+    return {
+        'date': today,
+        'in_shelter': current['in_shelter'],
+        'average_length_of_stay': departed['average_days'],
+        'departures': departed['count'],
+        'average_days_in_shelter': days_in_shelter,
+        'by_status': current['by_status'],
+        'by_species': current['by_species'],
+        'by_sex': current['by_sex'],
+        'intakes_per_week': per_week,
+        'history': history,
+    }
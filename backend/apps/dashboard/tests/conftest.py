@@ -0,0 +1,54 @@
+"""
+Pytest fixtures for dashboard app tests.
+"""
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from apps.accounts.models import User, Role
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test without a cached live aggregate."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    """Return an unauthenticated API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def employee_user(db):
+    """Create and return an employee user."""
+    return User.objects.create_user(
+        email='dyrektor@schronisko.pl',
+        password='haslo123',
+        first_name='Jan',
+        last_name='Kowalski',
+        role=Role.EMPLOYEE,
+        is_head_office=True,
+    )
+
+
+@pytest.fixture
+def volunteer_user(db):
+    """Create and return a volunteer user."""
+    return User.objects.create_user(
+        email='wolontariusz@schronisko.pl',
+        password='haslo123',
+        first_name='Anna',
+        last_name='Nowak',
+        role=Role.VOLUNTEER,
+        is_head_office=True,
+    )
+
+
+@pytest.fixture
+def authenticated_employee(api_client, employee_user):
+    """Return an API client authenticated as an employee."""
+    api_client.force_authenticate(user=employee_user)
+    return api_client
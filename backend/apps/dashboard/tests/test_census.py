@@ -0,0 +1,156 @@
+"""
+Tests for census snapshots and the dashboard endpoint.
+"""
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from apps.animals.models import (
+    Animal, AnimalSex, AnimalSpecies, AnimalStatus, AnimalStatusChange, Intake, IntakeType,
+)
+from apps.dashboard.models import CensusSnapshot
+from apps.dashboard.services import census
+from apps.shelters.models import Shelter
+
+
+@pytest.fixture
+def today():
+    return timezone.localdate()
+
+
+@pytest.fixture
+def shelter(db, today):
+    """Two dogs and a cat in the shelter, an adopted cat; intakes over 3 weeks."""
+    def animal(name, species, sex, status, days_ago, intake_type):
+        created = Animal.objects.create(name=name, species=species, sex=sex, status=status)
+        Animal.objects.filter(pk=created.pk).update(intake_date=today - timedelta(days=days_ago))
+        Intake.objects.create(
+            animal=created, intake_date=today - timedelta(days=days_ago),
+            animal_condition='-', location='-', intake_type=intake_type,
+        )
+        return created
+
+    return [
+        animal('Reksio', AnimalSpecies.DOG, AnimalSex.MALE, AnimalStatus.IN_SHELTER, 20, IntakeType.STRAY),
+        animal('Azor', AnimalSpecies.DOG, AnimalSex.MALE, AnimalStatus.QUARANTINE, 10, IntakeType.SURRENDER),
+        animal('Mruczek', AnimalSpecies.CAT, AnimalSex.FEMALE, AnimalStatus.NEW_INTAKE, 0, IntakeType.STRAY),
+        animal('Filemon', AnimalSpecies.CAT, AnimalSex.MALE, AnimalStatus.ADOPTED, 15, IntakeType.TRANSFER),
+    ]
+
+
+@pytest.mark.django_db
+class TestCensusSnapshots:
+    """Tests for snapshot recording."""
+
+    def test_population(self, shelter, today):
+        current = census.population(today)
+
+        assert current['in_shelter'] == 3
+        assert current['by_status'][AnimalStatus.ADOPTED] == 1
+        assert current['by_species'] == {AnimalSpecies.DOG: 2, AnimalSpecies.CAT: 1}
+        assert current['by_sex'] == {AnimalSex.MALE: 2, AnimalSex.FEMALE: 1}
+        assert current['stay_days_total'] == 30
+
+    def test_take_snapshots_is_incremental(self, shelter, today):
+        created = census.take_snapshots()
+
+        assert created[0].date == today - timedelta(days=20)
+        assert created[-1].date == today - timedelta(days=1)
+        assert len(created) == 20
+        assert census.take_snapshots() == []
+
+        by_date = {snapshot.date: snapshot for snapshot in CensusSnapshot.objects.all()}
+        assert by_date[today - timedelta(days=20)].intakes == {IntakeType.STRAY: 1}
+        assert by_date[today - timedelta(days=20)].in_shelter is None
+        assert by_date[today - timedelta(days=1)].in_shelter == 3
+
+    def test_snapshot_per_shelter(self, shelter, today):
+        north, south = (Shelter.objects.create(code=code, name=code) for code in ('north', 'south'))
+        Animal.objects.filter(species=AnimalSpecies.DOG).update(shelter=north)
+        Animal.objects.filter(species=AnimalSpecies.CAT).update(shelter=south)
+
+        created = census.take_snapshots()
+
+        assert len(created) == 3 * 20
+        yesterday = CensusSnapshot.objects.filter(date=today - timedelta(days=1))
+        assert {row.shelter_id: row.in_shelter for row in yesterday} == {None: 3, north.pk: 2, south.pk: 1}
+        first_day = CensusSnapshot.objects.filter(date=today - timedelta(days=20))
+        assert {row.shelter_id: row.intakes for row in first_day} == {
+            None: {IntakeType.STRAY: 1}, north.pk: {IntakeType.STRAY: 1}, south.pk: {},
+        }
+
+    def test_command(self, shelter, today, capsys):
+        call_command('take_census_snapshot', until=today - timedelta(days=12))
+        call_command('take_census_snapshot')
+
+        assert CensusSnapshot.objects.count() == 20
+        assert 'Recorded 11 snapshots' in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestDashboardView:
+    """Tests for the dashboard endpoint."""
+
+    def test_dashboard(self, authenticated_employee, shelter, today):
+        # Filemon arrived 15 days ago and was adopted 3 days ago
+        now = timezone.now()
+        filemon = shelter[3]
+        AnimalStatusChange.objects.filter(animal=filemon).update(
+            to_status=AnimalStatus.IN_SHELTER, changed_at=now - timedelta(days=15),
+        )
+        AnimalStatusChange.objects.create(
+            animal=filemon, from_status=AnimalStatus.IN_SHELTER, to_status=AnimalStatus.ADOPTED,
+            changed_at=now - timedelta(days=3),
+        )
+        census.take_snapshots()
+        response = authenticated_employee.get(reverse('dashboard'), {'weeks': 4})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['in_shelter'] == 3
+        # of the animals that left, not of the ones still in the shelter
+        assert data['average_length_of_stay'] == 12.0
+        assert data['departures'] == 1
+        assert data['average_days_in_shelter'] == 10.0
+        assert data['history'][-1]['average_days_in_shelter'] == 10.0
+        assert data['by_species'] == {AnimalSpecies.DOG: 2, AnimalSpecies.CAT: 1}
+        weeks = data['intakes_per_week']
+        assert len(weeks) == 4
+        assert sum(week['total'] for week in weeks) == 4
+        # Today's intake comes from the live aggregate
+        assert weeks[-1]['by_type'][IntakeType.STRAY] >= 1
+        assert data['history'][-1]['date'] == today.isoformat()
+
+    def test_dashboard_of_one_shelter(self, shelter):
+        north = Shelter.objects.create(code='north', name='North')
+        Animal.objects.filter(species=AnimalSpecies.DOG).update(shelter=north)
+        census.take_snapshots()
+
+        data = census.dashboard(4, shelter=north.pk)
+
+        assert data['in_shelter'] == 2
+        assert data['by_species'] == {AnimalSpecies.DOG: 2}
+        assert data['departures'] == 0
+        assert sum(week['total'] for week in data['intakes_per_week']) == 2
+        assert census.dashboard(4)['in_shelter'] == 3
+
+    def test_dashboard_without_snapshots(self, authenticated_employee, shelter):
+        response = authenticated_employee.get(reverse('dashboard'), {'weeks': 4})
+
+        assert response.status_code == 200
+        assert sum(week['total'] for week in response.json()['intakes_per_week']) == 4
+
+    def test_live_aggregate_is_cached(self, authenticated_employee, shelter, django_assert_num_queries):
+        authenticated_employee.get(reverse('dashboard'))
+        with django_assert_num_queries(1):
+            authenticated_employee.get(reverse('dashboard'))
+
+    def test_invalid_weeks(self, authenticated_employee):
+        response = authenticated_employee.get(reverse('dashboard'), {'weeks': 'x'})
+        assert response.status_code == 400
+
+    def test_volunteer_forbidden(self, api_client, volunteer_user):
+        api_client.force_authenticate(user=volunteer_user)
+        response = api_client.get(reverse('dashboard'))
+        assert response.status_code == 403
@@ -0,0 +1,9 @@
+"""
+URL configuration for dashboard app.
+"""
+from django.urls import path
+from .views import DashboardView
+
+urlpatterns = [
+    path('', DashboardView.as_view(), name='dashboard'),
+]
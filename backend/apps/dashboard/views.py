@@ -0,0 +1,29 @@
+"""
+Views for dashboard app.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.accounts.permissions import IsEmployee
+from apps.shelters.tenancy import shelter_of
+from .services import census
+
+
+class DashboardView(APIView):
+    """
+    Shelter statistics: current census, intakes per week, length of stay.
+    Shelter staff see their shelter, the head office the whole organisation.
+    """
+    permission_classes = [IsEmployee]
+
+    def get(self, request):
+        max_weeks = settings.DASHBOARD['MAX_WEEKS']
+        try:
+            weeks = int(request.query_params.get('weeks', settings.DASHBOARD['DEFAULT_WEEKS']))
+        except ValueError:
+            weeks = 0
+        if not 1 <= weeks <= max_weeks:
+            raise ValidationError({'weeks': f'Must be an integer between 1 and {max_weeks}.'})
+        return Response(census.dashboard(weeks, shelter=shelter_of(request.user)))
@@ -0,0 +1,20 @@
+"""
+Admin configuration for jobs app.
+"""
+from django.contrib import admin
+from .models import Job
+from .services.queue import retry_failed
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'run_at', 'attempts', 'max_attempts', 'locked_by', 'created_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['locked_by', 'locked_at', 'last_error', 'created_at']
+    actions = ['retry']
+
+    @admin.action(description='Ponów wybrane nieudane zadania')
+    def retry(self, request, queryset):
+        count = retry_failed(queryset)
+        self.message_user(request, f'Ponowiono {count} zadań.')
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.jobs'
+    verbose_name = 'Zadania w tle'
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+        from apps.core.metrics import registry
+        from .services.queue import metric_lines
+
+        # job handlers live in the jobs.py module of each app
+        autodiscover_modules('jobs')
+        registry.register_collector(metric_lines)
@@ -0,0 +1,97 @@
+"""
+Management command running the background job worker.
+
+Claims due jobs with SELECT ... FOR UPDATE SKIP LOCKED (any number of
+workers can run side by side) and runs them in a pool of threads, or of
+processes for CPU-bound handlers. SIGTERM lets the running jobs finish:
+
+    python manage.py run_jobs
+    python manage.py run_jobs --concurrency 8 --pool process
+    python manage.py run_jobs --once    # run the jobs due now and exit
+"""
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.jobs.services import queue
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=None,
+                            help="Jobs run at once (default: JOBS['CONCURRENCY'])")
+        parser.add_argument("--pool", choices=["thread", "process"], default="thread")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit when no job is due instead of polling")
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"] or settings.JOBS["CONCURRENCY"]
+        poll = settings.JOBS["POLL_SECONDS"]
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.verbosity = options["verbosity"]
+        self.stopping = False
+        if not options["once"]:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        outcomes = Counter()
+        running = set()
+        executor = self.executor(options["pool"], concurrency)
+        try:
+            while True:
+                queue.release_expired()
+                free = concurrency - len(running)
+                job_ids = queue.claim(worker, free) if free and not self.stopping else []
+                running.update(executor.submit(queue.run_in_worker, job_id) for job_id in job_ids)
+                if not running:
+                    if options["once"] or self.stopping:
+                        break
+                    time.sleep(poll)
+                    continue
+                done, running = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.record(future, outcomes)
+        finally:
+            executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Jobs: {outcomes[queue.DONE]} done, {outcomes[queue.RETRY]} to retry, "
+            f"{outcomes[queue.FAILED]} failed"
+        ))
+
+    def executor(self, pool, concurrency):
+        if pool == "thread":
+            return ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="jobs")
+        # children open their own connections; none may be inherited
+        connections.close_all()
+        return ProcessPoolExecutor(
+            max_workers=concurrency, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup,
+        )
+
+    def record(self, future, outcomes):
+        try:
+            result = future.result()
+        except Exception as exc:
+            # the queue itself failed (e.g. lost connection); the lease expires
+            self.stderr.write(f"Job runner error: {exc!r}")
+            return
+        if result is None:
+            return
+        name, outcome, seconds = result
+        outcomes[outcome] += 1
+        if self.verbosity > 1 or outcome != queue.DONE:
+            self.stdout.write(f"{name}: {outcome} in {seconds:.2f}s")
+
+    def stop(self, signum, frame):
+        self.stopping = True
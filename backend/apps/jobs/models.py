@@ -0,0 +1,74 @@
+"""
+Models for jobs app - the background job queue (transactional outbox).
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class JobStatus(models.TextChoices):
+    """State of a queued job; finished jobs are deleted."""
+    PENDING = 'PENDING', 'Oczekuje'
+    RUNNING = 'RUNNING', 'W trakcie'
+    FAILED = 'FAILED', 'Nieudane'
+
+
+class Job(models.Model):
+    """
+    A unit of background work, written in the same transaction as the
+    change that needs it (apps.jobs.services.queue).
+    """
+    name = models.CharField(
+        verbose_name='Zadanie',
+        max_length=100,
+    )
+    payload = models.JSONField(
+        verbose_name='Argumenty',
+        default=dict,
+        blank=True,
+    )
+    status = models.CharField(
+        verbose_name='Status',
+        max_length=10,
+        choices=JobStatus.choices,
+        default=JobStatus.PENDING,
+    )
+    run_at = models.DateTimeField(
+        verbose_name='Do wykonania od',
+        default=timezone.now,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Liczba prób',
+        default=0,
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Maksymalna liczba prób',
+    )
+    locked_by = models.CharField(
+        verbose_name='Worker',
+        max_length=100,
+        blank=True,
+    )
+    locked_at = models.DateTimeField(
+        verbose_name='Pobrano',
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(
+        verbose_name='Ostatni błąd',
+        blank=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Zadanie w tle'
+        verbose_name_plural = 'Zadania w tle'
+        ordering = ['run_at']
+        indexes = [
+            # workers claim due jobs in run_at order
+            models.Index(fields=['run_at'], condition=models.Q(status=JobStatus.PENDING), name='job_due_idx'),
+            # claims of crashed workers
+            models.Index(fields=['locked_at'], condition=models.Q(status=JobStatus.RUNNING), name='job_running_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.get_status_display()})'
@@ -0,0 +1,161 @@
+"""
+Background jobs stored in the database.
+
+``enqueue`` inserts a ``Job`` row in the caller's transaction, so the job
+exists exactly when the business change that needs it commits (a
+transactional outbox) and the request does not wait for the work. Handlers
+are registered with ``@job(name)`` in an app's ``jobs.py`` module and called
+with the payload as keyword arguments.
+
+The ``run_jobs`` worker claims due jobs with ``SELECT ... FOR UPDATE SKIP
+LOCKED``, so any number of workers take disjoint jobs without waiting for
+each other. A handler runs in a transaction that also deletes its job:
+its database changes and the job's completion commit together. On an
+exception the job is retried with exponential backoff
+(``JOBS['BACKOFF_SECONDS']`` doubling per attempt, up to
+``JOBS['MAX_BACKOFF_SECONDS']``) until ``max_attempts``, then kept as
+FAILED. Jobs of a worker that died are claimed again once their lease
+(``JOBS['LEASE_SECONDS']``) expires, so delivery is at least once and
+handlers must be idempotent.
+"""
+import random
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from apps.jobs.models import Job, JobStatus
+
+_handlers = {}
+
+DONE = 'done'
+RETRY = 'retry'
+FAILED = 'failed'
+
+
+def job(name, max_attempts=None):
+    """Register the decorated function as the handler of job ``name``."""
+    def register(func):
+        _handlers[name] = (func, max_attempts)
+        return func
+    return register
+
+
+def enqueue(name, payload=None, delay=None, using=None):
+    """Queue job ``name`` in the current transaction; return the Job."""
+    if name not in _handlers:
+        raise LookupError(f'No handler registered for job {name!r}')
+    max_attempts = _handlers[name][1] or settings.JOBS['MAX_ATTEMPTS']
+    return Job.objects.using(using).create(
+        name=name, payload=payload or {}, max_attempts=max_attempts,
+        run_at=timezone.now() + (delay or timedelta()),
+    )
+
+
+def backoff(attempts):
+    """Seconds before retry number ``attempts`` (exponential, with jitter)."""
+    seconds = min(settings.JOBS['BACKOFF_SECONDS'] * 2 ** (attempts - 1), settings.JOBS['MAX_BACKOFF_SECONDS'])
+    return seconds * random.uniform(0.8, 1.0)
+
+
+def release_expired(now=None):
+    """Return jobs of crashed workers to the queue (or fail them); return the count."""
+    now = now or timezone.now()
+    expired = Job.objects.filter(
+        status=JobStatus.RUNNING, locked_at__lt=now - timedelta(seconds=settings.JOBS['LEASE_SECONDS']),
+    )
+    failed = expired.filter(attempts__gte=F('max_attempts')).update(
+        status=JobStatus.FAILED, last_error='Lease expired (worker stopped)',
+    )
+    released = expired.update(status=JobStatus.PENDING, run_at=now, locked_by='', locked_at=None)
+    return failed + released
+
+
+@transaction.atomic
+def claim(worker, limit, now=None):
+    """Lock up to ``limit`` due jobs for ``worker``; return their ids."""
+    now = now or timezone.now()
+    ids = list(
+        Job.objects.select_for_update(skip_locked=True)
+        .filter(status=JobStatus.PENDING, run_at__lte=now)
+        .order_by('run_at').values_list('pk', flat=True)[:limit]
+    )
+    if ids:
+        Job.objects.filter(pk__in=ids).update(
+            status=JobStatus.RUNNING, locked_by=worker, locked_at=now, attempts=F('attempts') + 1,
+        )
+    return ids
+
+
+def run(job_id):
+    """
+    Run a claimed job; return ``(name, outcome, seconds)`` with outcome
+    DONE, RETRY or FAILED, or None if the job is no longer claimed.
+    """
+    job = Job.objects.filter(pk=job_id, status=JobStatus.RUNNING).first()
+    if job is None:
+        return None
+    started = time.perf_counter()
+    try:
+        handler = _handlers[job.name][0]
+    except KeyError:
+        return _fail(job, f'No handler registered for job {job.name!r}', started, final=True)
+    try:
+        with transaction.atomic():
+            handler(**job.payload)
+            Job.objects.filter(pk=job.pk).delete()
+    except Exception:
+        return _fail(job, traceback.format_exc(), started)
+    return job.name, DONE, time.perf_counter() - started
+
+
+def _fail(job, error, started, final=False):
+    if final or job.attempts >= job.max_attempts:
+        Job.objects.filter(pk=job.pk).update(status=JobStatus.FAILED, last_error=error)
+        outcome = FAILED
+    else:
+        Job.objects.filter(pk=job.pk).update(
+            status=JobStatus.PENDING, last_error=error, locked_by='', locked_at=None,
+            run_at=timezone.now() + timedelta(seconds=backoff(job.attempts)),
+        )
+        outcome = RETRY
+    return job.name, outcome, time.perf_counter() - started
+
+
+def run_in_worker(job_id):
+    """``run`` for pool threads and processes, which own their connections."""
+    try:
+        return run(job_id)
+    finally:
+        close_old_connections()
+
+
+def retry_failed(queryset=None):
+    """Queue FAILED jobs again with fresh attempts; return the count."""
+    queryset = Job.objects.all() if queryset is None else queryset
+    return queryset.filter(status=JobStatus.FAILED).update(
+        status=JobStatus.PENDING, attempts=0, run_at=timezone.now(), locked_by='', locked_at=None,
+    )
+
+
+def metric_lines():
+    """Queue gauges for the Prometheus endpoint (one grouped query)."""
+    now = timezone.now()
+    rows = Job.objects.order_by().values('name', 'status').annotate(count=Count('pk'), oldest=Min('run_at'))
+    lines = [
+        '# HELP shelter_jobs Background jobs in the queue by state.',
+        '# TYPE shelter_jobs gauge',
+    ]
+    delays = []
+    for row in sorted(rows, key=lambda row: (row['name'], row['status'])):
+        lines.append(f'shelter_jobs{{name="{row["name"]}",status="{row["status"].lower()}"}} {row["count"]}')
+        if row['status'] == JobStatus.PENDING:
+            delays.append((row['name'], max((now - row['oldest']).total_seconds(), 0)))
+    lines.append('# HELP shelter_jobs_oldest_pending_seconds Time since the oldest pending job became due.')
+    lines.append('# TYPE shelter_jobs_oldest_pending_seconds gauge')
+    lines.extend(f'shelter_jobs_oldest_pending_seconds{{name="{name}"}} {delay:.3f}' for name, delay in delays)
+    return lines
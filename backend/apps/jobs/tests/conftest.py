@@ -0,0 +1,32 @@
+"""
+Pytest fixtures for jobs app tests.
+"""
+import pytest
+from apps.jobs.services import queue
+from apps.shelters.models import Shelter
+
+
+@pytest.fixture
+def handlers():
+    """
+    Register test job handlers: ``tests.create_shelter`` creates a shelter,
+    ``tests.broken`` creates one and then raises. Calls are recorded.
+    """
+    calls = []
+
+    def create_shelter(code):
+        calls.append(code)
+        Shelter.objects.create(code=code, name=f'Schronisko {code}')
+
+    def broken(code):
+        create_shelter(code)
+        raise RuntimeError('Usługa niedostępna')
+
+    registered = {
+        'tests.create_shelter': (create_shelter, None),
+        'tests.broken': (broken, 2),
+    }
+    queue._handlers.update(registered)
+    yield calls
+    for name in registered:
+        queue._handlers.pop(name)
@@ -0,0 +1,148 @@
+"""
+Tests for the background job queue and its worker.
+"""
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.core.metrics import registry
+from apps.jobs.models import Job, JobStatus
+from apps.jobs.services import queue
+from apps.shelters.models import Shelter
+
+
+def _claim_and_run(limit=10):
+    return [queue.run(job_id) for job_id in queue.claim('test-worker', limit)]
+
+
+@pytest.mark.django_db
+class TestQueue:
+
+    def test_enqueue_unknown_job(self):
+        with pytest.raises(LookupError):
+            queue.enqueue('tests.missing')
+
+    def test_job_is_rolled_back_with_its_transaction(self, handlers):
+        with pytest.raises(ValueError):
+            with transaction.atomic():
+                queue.enqueue('tests.create_shelter', {'code': 'krakow'})
+                raise ValueError
+
+        assert not Job.objects.exists()
+
+    def test_run_success_deletes_job(self, handlers):
+        queue.enqueue('tests.create_shelter', {'code': 'krakow'})
+
+        [(name, outcome, _)] = _claim_and_run()
+
+        assert (name, outcome) == ('tests.create_shelter', queue.DONE)
+        assert handlers == ['krakow']
+        assert Shelter.objects.filter(code='krakow').exists()
+        assert not Job.objects.exists()
+
+    def test_claim_takes_due_pending_jobs_in_order(self, handlers):
+        later = queue.enqueue('tests.create_shelter', {'code': 'b'}, delay=timedelta(hours=1))
+        first = queue.enqueue('tests.create_shelter', {'code': 'a'})
+        second = queue.enqueue('tests.create_shelter', {'code': 'c'})
+        Job.objects.filter(pk=second.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+
+        assert queue.claim('w1', 10) == [second.pk, first.pk]
+        # claimed jobs are not handed out again
+        assert queue.claim('w2', 10) == []
+        claimed = Job.objects.get(pk=first.pk)
+        assert (claimed.status, claimed.locked_by, claimed.attempts) == (JobStatus.RUNNING, 'w1', 1)
+        assert Job.objects.get(pk=later.pk).status == JobStatus.PENDING
+
+    def test_failure_is_retried_with_backoff(self, handlers, settings):
+        settings.JOBS = {**settings.JOBS, 'BACKOFF_SECONDS': 100}
+        job = queue.enqueue('tests.broken', {'code': 'krakow'})
+
+        [(_, outcome, _)] = _claim_and_run()
+
+        job.refresh_from_db()
+        assert outcome == queue.RETRY
+        assert job.status == JobStatus.PENDING
+        assert 'Usługa niedostępna' in job.last_error
+        assert timezone.now() + timedelta(seconds=70) < job.run_at <= timezone.now() + timedelta(seconds=100)
+        # the handler's writes were rolled back
+        assert not Shelter.objects.exists()
+
+    def test_failure_after_max_attempts(self, handlers):
+        job = queue.enqueue('tests.broken', {'code': 'krakow'})
+        Job.objects.filter(pk=job.pk).update(attempts=1)
+
+        [(_, outcome, _)] = _claim_and_run()
+
+        job.refresh_from_db()
+        assert outcome == queue.FAILED
+        assert (job.status, job.attempts, job.max_attempts) == (JobStatus.FAILED, 2, 2)
+
+    def test_retry_failed(self, handlers):
+        job = queue.enqueue('tests.broken', {'code': 'krakow'})
+        Job.objects.filter(pk=job.pk).update(status=JobStatus.FAILED, attempts=2)
+
+        assert queue.retry_failed() == 1
+
+        job.refresh_from_db()
+        assert (job.status, job.attempts) == (JobStatus.PENDING, 0)
+
+    def test_backoff_is_capped(self, settings):
+        settings.JOBS = {**settings.JOBS, 'BACKOFF_SECONDS': 10, 'MAX_BACKOFF_SECONDS': 60}
+
+        assert 8 <= queue.backoff(1) <= 10
+        assert 32 <= queue.backoff(3) <= 40
+        assert 48 <= queue.backoff(10) <= 60
+
+    def test_expired_leases_are_released(self, handlers, settings):
+        crashed = queue.enqueue('tests.create_shelter', {'code': 'a'})
+        exhausted = queue.enqueue('tests.broken', {'code': 'b'})
+        queue.claim('dead-worker', 10)
+        Job.objects.filter(pk=exhausted.pk).update(attempts=2)
+        later = timezone.now() + timedelta(seconds=settings.JOBS['LEASE_SECONDS'] + 1)
+
+        assert queue.release_expired(later) == 2
+
+        crashed.refresh_from_db()
+        exhausted.refresh_from_db()
+        assert (crashed.status, crashed.locked_by) == (JobStatus.PENDING, '')
+        assert exhausted.status == JobStatus.FAILED
+
+    def test_metrics(self, handlers):
+        queue.enqueue('tests.create_shelter', {'code': 'a'})
+        queue.enqueue('tests.create_shelter', {'code': 'b'})
+
+        output = registry.render()
+
+        assert 'shelter_jobs{name="tests.create_shelter",status="pending"} 2' in output
+        assert 'shelter_jobs_oldest_pending_seconds{name="tests.create_shelter"}' in output
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_jobs_once(handlers):
+    queue.enqueue('tests.create_shelter', {'code': 'krakow'})
+    queue.enqueue('tests.broken', {'code': 'gdansk'})
+    out = StringIO()
+
+    # one thread: SQLite locks the whole database for a writer
+    call_command('run_jobs', '--once', '--concurrency', '1', stdout=out)
+
+    assert 'Jobs: 1 done, 1 to retry, 0 failed' in out.getvalue()
+    assert list(Shelter.objects.values_list('code', flat=True)) == ['krakow']
+    assert list(Job.objects.values_list('name', flat=True)) == ['tests.broken']
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='concurrent writers need PostgreSQL')
+@pytest.mark.django_db(transaction=True)
+def test_run_jobs_concurrently(handlers):
+    codes = [f'shelter-{i}' for i in range(20)]
+    for code in codes:
+        queue.enqueue('tests.create_shelter', {'code': code})
+    out = StringIO()
+
+    call_command('run_jobs', '--once', '--concurrency', '4', stdout=out)
+
+    assert 'Jobs: 20 done, 0 to retry, 0 failed' in out.getvalue()
+    assert sorted(handlers) == sorted(codes)
+    assert not Job.objects.exists()
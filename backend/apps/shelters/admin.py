@@ -0,0 +1,12 @@
+"""
+Admin configuration for shelters app.
+"""
+from django.contrib import admin
+from .models import Shelter
+
+
+@admin.register(Shelter)
+class ShelterAdmin(admin.ModelAdmin):
+    list_display = ['code', 'name', 'city', 'created_at']
+    search_fields = ['code', 'name', 'city']
+    readonly_fields = ['created_at']
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class SheltersConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.shelters'
+    verbose_name = 'Schroniska'
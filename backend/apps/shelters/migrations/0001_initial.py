@@ -0,0 +1,41 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Shelter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "code",
+                    models.SlugField(max_length=20, unique=True, verbose_name="Kod"),
+                ),
+                ("name", models.CharField(max_length=200, verbose_name="Nazwa")),
+                (
+                    "city",
+                    models.CharField(blank=True, max_length=100, verbose_name="Miasto"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Schronisko",
+                "verbose_name_plural": "Schroniska",
+                "ordering": ["name"],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+"""
+Put the data of an existing (single-shelter) deployment into one shelter.
+
+Users are bound to it as well, so nobody starts seeing more than before;
+head office accounts are unbound in the admin afterwards. New, empty
+databases get no shelter.
+"""
+from django.db import migrations
+
+SCOPED = [
+    ('animals', 'Animal'),
+    ('supplies', 'SupplyItem'),
+    ('supplies', 'Stocktake'),
+    ('volunteers', 'Schedule'),
+    ('accounts', 'User'),
+]
+
+
+def assign_existing_data(apps, schema_editor):
+    models = [apps.get_model(app_label, name) for app_label, name in SCOPED]
+    if not any(model.objects.exists() for model in models):
+        return
+    Shelter = apps.get_model('shelters', 'Shelter')
+    shelter, _ = Shelter.objects.get_or_create(code='main', defaults={'name': 'Schronisko'})
+    for model in models:
+        model.objects.filter(shelter__isnull=True).update(shelter=shelter)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('shelters', '0001_initial'),
+        ('accounts', '0003_user_shelter'),
+        ('animals', '0015_animal_shelter'),
+        ('supplies', '0006_shelters'),
+        ('volunteers', '0004_schedule_shelter'),
+    ]
+
+    operations = [
+        migrations.RunPython(assign_existing_data, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+"""
+Models for shelters app - shelters (tenants) of the organisation.
+"""
+from django.db import models
+
+
+class Shelter(models.Model):
+    """
+    One shelter of the organisation.
+
+    Animals, supply items, stocktakes and volunteer schedules belong to a
+    shelter; users bound to a shelter only see its data (apps.shelters.tenancy).
+    Head office users (User.is_head_office) see all shelters.
+    """
+    code = models.SlugField(
+        verbose_name='Kod',
+        max_length=20,
+        unique=True,
+    )
+    name = models.CharField(
+        verbose_name='Nazwa',
+        max_length=200,
+    )
+    city = models.CharField(
+        verbose_name='Miasto',
+        max_length=100,
+        blank=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Schronisko'
+        verbose_name_plural = 'Schroniska'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
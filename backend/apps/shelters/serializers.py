@@ -0,0 +1,13 @@
+"""
+Serializers for shelters app.
+"""
+from rest_framework import serializers
+from .models import Shelter
+
+
+class ShelterSerializer(serializers.ModelSerializer):
+    """Serializer for Shelter."""
+
+    class Meta:
+        model = Shelter
+        fields = ['id', 'code', 'name', 'city']
@@ -0,0 +1,77 @@
+"""
+Cross-shelter reports for the head office.
+
+Every figure is one query grouped by the shelter column, so the report costs
+the same handful of queries however many shelters there are. Data not yet
+assigned to a shelter is reported in a row with ``shelter`` None.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Case, Count, DecimalField, F, OuterRef, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.animals.models import Animal, AnimalStatus, AnimalStatusChange
+from apps.shelters.models import Shelter
+from apps.supplies.models import Stocktake, StocktakeStatus, SupplyItem
+from apps.supplies.services import stock
+from apps.volunteers.models import Task
+
+DEPARTED_STATUSES = (AnimalStatus.ADOPTED, AnimalStatus.DECEASED)
+FIGURES = ('in_shelter', 'intakes', 'adoptions', 'low_stock_items', 'open_stocktakes', 'upcoming_tasks')
+
+
+def _by_shelter(queryset, field='shelter'):
+    return dict(queryset.order_by().values_list(field).annotate(n=Count('pk')))
+
+
+def _quantity():
+    return Case(
+        When(inventory__shard_count__gt=0, then=Coalesce(stock.shard_total(OuterRef('inventory')), Value(Decimal('0')))),
+        default=Coalesce('inventory__current_quantity', Value(Decimal('0'))),
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    )
+
+
+def summary(days=30, now=None):
+    """
+    Per-shelter figures: animals in the shelter, intakes and adoptions in the
+    last ``days`` days, supply items below their minimum stock, open
+    stocktakes and volunteer tasks in the coming week.
+    """
+    now = now or timezone.now()
+    since = now - timedelta(days=days)
+    figures = {
+        'in_shelter': _by_shelter(Animal.objects.exclude(status__in=DEPARTED_STATUSES)),
+        'intakes': _by_shelter(
+            Animal.objects.filter(intake_date__gte=timezone.localdate(since))
+        ),
+        'adoptions': _by_shelter(
+            AnimalStatusChange.objects.filter(to_status=AnimalStatus.ADOPTED, changed_at__gte=since),
+            'animal__shelter',
+        ),
+        'low_stock_items': _by_shelter(
+            SupplyItem.objects.annotate(quantity=_quantity()).filter(quantity__lt=F('min_stock'))
+        ),
+        'open_stocktakes': _by_shelter(Stocktake.objects.filter(status=StocktakeStatus.OPEN)),
+        'upcoming_tasks': _by_shelter(
+            Task.objects.filter(datetime__gte=now, datetime__lt=now + timedelta(days=7)),
+            'schedule__shelter',
+        ),
+    }
+    shelters = [(shelter.pk, shelter.code, shelter.name) for shelter in Shelter.objects.all()]
+    if any(None in counts for counts in figures.values()):
+        shelters.append((None, None, 'Bez przypisanego schroniska'))
+    rows = [
+        {
+            'shelter': pk, 'code': code, 'name': name,
+            **{figure: figures[figure].get(pk, 0) for figure in FIGURES},
+        }
+        for pk, code, name in shelters
+    ]
+    return {
+        'since': since,
+        'shelters': rows,
+        'totals': {figure: sum(row[figure] for row in rows) for figure in FIGURES},
+    }
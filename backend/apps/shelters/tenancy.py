@@ -0,0 +1,75 @@
+"""
+Shelter (tenant) scoping of querysets and viewsets.
+
+A user with a ``shelter`` only sees rows of that shelter. Head office users
+(``User.is_head_office``, and superusers without a shelter) see every
+shelter. Any other user without a shelter is refused rather than shown
+everything, so an account nobody assigned yet fails closed. Scoping filters
+on the shelter column, and the models lead their composite indexes with it,
+so a shelter's queries read only its part of each index.
+"""
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import PermissionDenied
+
+UNASSIGNED_MESSAGE = 'Konto nie jest przypisane do schroniska.'
+
+
+def sees_all_shelters(user):
+    """Whether ``user`` works for the head office (is not limited to a shelter)."""
+    return bool(getattr(user, 'is_head_office', False) or getattr(user, 'is_superuser', False))
+
+
+def shelter_of(user):
+    """
+    Id of the shelter ``user`` is limited to, None for head office users.
+    Raises PermissionDenied for other users without a shelter.
+    """
+    shelter_id = getattr(user, 'shelter_id', None)
+    if shelter_id is None and not sees_all_shelters(user):
+        raise PermissionDenied(UNASSIGNED_MESSAGE)
+    return shelter_id
+
+
+def scope(queryset, user, field='shelter'):
+    """Limit ``queryset`` to the shelter of ``user``; ``field`` leads to the shelter."""
+    shelter_id = shelter_of(user)
+    if shelter_id is None:
+        return queryset
+    return queryset.filter(**{field: shelter_id})
+
+
+class ShelterScopedMixin:
+    """
+    Viewset mixin limiting every request to the user's shelter.
+
+    The scope is applied in ``filter_queryset``, which list, ``get_object``
+    (so retrieve, writes and detail actions) and AsyncViewSetView all go
+    through; actions building querysets of their own call ``self.scope``.
+    ``shelter_field`` is the lookup from the model to its shelter. New and
+    updated objects of models with a ``shelter`` field are saved in the
+    user's shelter.
+    """
+    shelter_field = 'shelter'
+
+    def scope(self, queryset, field=None):
+        return scope(queryset, self.request.user, field or self.shelter_field)
+
+    def filter_queryset(self, queryset):
+        return self.scope(super().filter_queryset(queryset))
+
+    def shelter_kwargs(self):
+        shelter_id = shelter_of(self.request.user)
+        if shelter_id is None or self.shelter_field != 'shelter':
+            return {}
+        return {'shelter_id': shelter_id}
+
+    def perform_create(self, serializer):
+        serializer.save(**self.shelter_kwargs())
+
+    def perform_update(self, serializer):
+        serializer.save(**self.shelter_kwargs())
+
+
+def get_scoped_or_404(queryset, user, field='shelter', **lookup):
+    """``get_object_or_404`` within the shelter of ``user``."""
+    return get_object_or_404(scope(queryset, user, field), **lookup)
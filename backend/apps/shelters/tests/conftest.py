@@ -0,0 +1,81 @@
+"""
+Pytest fixtures for shelters app tests.
+"""
+import pytest
+from decimal import Decimal
+from rest_framework.test import APIClient
+from apps.accounts.models import User, Role
+from apps.animals.models import Animal, AnimalSpecies
+from apps.shelters.models import Shelter
+from apps.supplies.models import Inventory, SupplyCategory, SupplyItem, UnitOfMeasure
+
+
+@pytest.fixture
+def api_client():
+    """Return an unauthenticated API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def krakow(db):
+    return Shelter.objects.create(code='krakow', name='Schronisko Kraków', city='Kraków')
+
+
+@pytest.fixture
+def gdansk(db):
+    return Shelter.objects.create(code='gdansk', name='Schronisko Gdańsk', city='Gdańsk')
+
+
+def _employee(email, shelter=None):
+    return User.objects.create_user(
+        email=email, password='haslo123', first_name='Jan', last_name='Kowalski',
+        role=Role.EMPLOYEE, shelter=shelter, is_head_office=shelter is None,
+    )
+
+
+@pytest.fixture
+def krakow_employee(krakow):
+    """Employee of the Kraków shelter."""
+    return _employee('krakow@schronisko.pl', krakow)
+
+
+@pytest.fixture
+def head_office_employee(db):
+    """Employee of the head office (no shelter, sees all)."""
+    return _employee('centrala@schronisko.pl')
+
+
+@pytest.fixture
+def krakow_client(api_client, krakow_employee):
+    api_client.force_authenticate(user=krakow_employee)
+    return api_client
+
+
+@pytest.fixture
+def head_office_client(api_client, head_office_employee):
+    api_client.force_authenticate(user=head_office_employee)
+    return api_client
+
+
+@pytest.fixture
+def animals(krakow, gdansk):
+    """One dog in each shelter."""
+    return {
+        shelter.code: Animal.objects.create(name=name, species=AnimalSpecies.DOG, shelter=shelter)
+        for shelter, name in ((krakow, 'Burek'), (gdansk, 'Azor'))
+    }
+
+
+@pytest.fixture
+def supply_items(krakow, gdansk):
+    """The same product, stocked below its minimum in Gdańsk only."""
+    category = SupplyCategory.objects.create(name='Żywność')
+    unit = UnitOfMeasure.objects.create(name='kilogram', abbreviation='kg')
+    items = {}
+    for shelter, quantity in ((krakow, '40'), (gdansk, '5')):
+        item = SupplyItem.objects.create(
+            name='Karma sucha dla psów', min_stock=Decimal('20'), category=category, unit=unit, shelter=shelter,
+        )
+        Inventory.objects.create(supply_item=item, current_quantity=Decimal(quantity))
+        items[shelter.code] = item
+    return items
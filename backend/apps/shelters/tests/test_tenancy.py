@@ -0,0 +1,164 @@
+"""
+Tests for shelter scoping and the head office report.
+"""
+import pytest
+from decimal import Decimal
+from django.db import IntegrityError
+from django.urls import reverse
+from apps.accounts.models import Role, User
+from apps.animals.models import Animal, AnimalParent, AnimalSpecies, Intake
+from apps.supplies.models import Stocktake, SupplyItem
+
+
+def names(response):
+    return sorted(row['name'] for row in response.data['results'])
+
+
+@pytest.mark.django_db
+class TestShelterScoping:
+    """Tests for limiting shelter staff to their shelter."""
+
+    def test_animal_list_scoped(self, krakow_client, animals, krakow):
+        response = krakow_client.get(reverse('animals:animal-list'))
+
+        assert response.status_code == 200
+        assert names(response) == ['Burek']
+        assert response.data['results'][0]['shelter'] == krakow.pk
+
+    def test_head_office_sees_all(self, head_office_client, animals):
+        response = head_office_client.get(reverse('animals:animal-list'))
+
+        assert names(response) == ['Azor', 'Burek']
+
+    def test_other_shelter_animal_not_found(self, krakow_client, animals):
+        url = reverse('animals:animal-detail', kwargs={'pk': animals['gdansk'].pk})
+
+        assert krakow_client.get(url).status_code == 404
+        assert krakow_client.patch(url, {'name': 'Reks'}, format='json').status_code == 404
+
+    def test_cannot_add_intake_to_other_shelter_animal(self, krakow_client, animals):
+        url = reverse('animals:animal-intakes-list', kwargs={'animal_pk': animals['gdansk'].pk})
+        response = krakow_client.post(url, {
+            'intake_type': 'STRAY', 'animal_condition': 'Dobry', 'location': 'Park', 'notes': '-',
+        }, format='json')
+
+        assert response.status_code == 404
+        assert not Intake.objects.exists()
+
+    def test_supply_items_scoped(self, krakow_client, supply_items):
+        response = krakow_client.get(reverse('supplies:supply-item-list'))
+
+        assert [row['id'] for row in response.data['results']] == [supply_items['krakow'].pk]
+
+    def test_update_inventory_of_other_shelter(self, krakow_client, supply_items):
+        url = reverse('supplies:supply-item-update-inventory', kwargs={'pk': supply_items['gdansk'].pk})
+        response = krakow_client.post(url, {'change_type': 'in', 'quantity_change': '1'}, format='json')
+
+        assert response.status_code == 404
+
+    def test_stocktake_opened_in_users_shelter(self, krakow_client, krakow, gdansk):
+        response = krakow_client.post(reverse('supplies:stocktake-list'), {'shelter': gdansk.pk}, format='json')
+
+        assert response.status_code == 201
+        assert Stocktake.objects.get().shelter == krakow
+
+    def test_stocktake_rejects_other_shelter_items(self, krakow_client, supply_items):
+        stocktake = krakow_client.post(reverse('supplies:stocktake-list'), {}, format='json').data
+        url = reverse('supplies:stocktake-counts', kwargs={'pk': stocktake['id']})
+        response = krakow_client.post(url, {'counts': [
+            {'supply_item': supply_items['gdansk'].pk, 'counted_quantity': '3'},
+        ]}, format='json')
+
+        assert response.status_code == 400
+
+    def test_shelter_list(self, krakow_client, krakow, gdansk):
+        response = krakow_client.get(reverse('shelters:shelter-list'))
+
+        assert [row['code'] for row in response.data] == ['krakow']
+
+    def test_cannot_assign_other_shelter_parent(self, krakow_client, animals):
+        url = reverse('animals:animal-assign-parents')
+        response = krakow_client.post(url, {
+            'assignments': [{'animal_id': animals['krakow'].animal_id, 'parents': [animals['gdansk'].animal_id]}],
+        }, format='json')
+
+        assert response.status_code == 400
+        assert not AnimalParent.objects.exists()
+
+    def test_lineage_hides_other_shelter(self, krakow_client, animals, krakow):
+        mother = Animal.objects.create(name='Sonia', species=AnimalSpecies.DOG, shelter=krakow)
+        AnimalParent.objects.create(child=animals['krakow'], parent=mother)
+        AnimalParent.objects.create(child=animals['krakow'], parent=animals['gdansk'])
+
+        url = reverse('animals:animal-ancestors', kwargs={'pk': animals['krakow'].pk})
+        response = krakow_client.get(url)
+
+        assert response.status_code == 200
+        assert sorted(node['name'] for node in response.data['nodes']) == ['Burek', 'Sonia']
+
+    def test_veterinarians_scoped(self, krakow_client, krakow_employee, head_office_employee, gdansk):
+        User.objects.create_user(
+            email='gdansk@schronisko.pl', password='haslo123', first_name='Ewa', last_name='Nowak',
+            role=Role.EMPLOYEE, shelter=gdansk,
+        )
+        response = krakow_client.get(reverse('animals:veterinarian-list'))
+
+        assert response.status_code == 200
+        assert [row['id'] for row in response.json()] == [krakow_employee.pk]
+
+    def test_unassigned_user_sees_nothing(self, api_client, animals):
+        user = User.objects.create_user(
+            email='nikt@schronisko.pl', password='haslo123', first_name='Jan', last_name='Nowak',
+            role=Role.EMPLOYEE,
+        )
+        api_client.force_authenticate(user=user)
+
+        assert api_client.get(reverse('animals:animal-list')).status_code == 403
+        assert api_client.get(reverse('animals:veterinarian-list')).status_code == 403
+
+    def test_dashboard_scoped(self, krakow_client, animals):
+        response = krakow_client.get(reverse('dashboard'))
+
+        assert response.status_code == 200
+        assert response.data['in_shelter'] == 1
+
+    def test_head_office_dashboard(self, head_office_client, animals):
+        assert head_office_client.get(reverse('dashboard')).data['in_shelter'] == 2
+
+    def test_names_unique_per_shelter(self, supply_items, krakow):
+        item = supply_items['krakow']
+        with pytest.raises(IntegrityError):
+            SupplyItem.objects.create(
+                name=item.name, min_stock=Decimal('1'), category=item.category, unit=item.unit, shelter=krakow,
+            )
+
+
+@pytest.mark.django_db
+class TestHeadOfficeSummary:
+    """Tests for the cross-shelter report."""
+
+    def test_summary(self, head_office_client, animals, supply_items, django_assert_max_num_queries):
+        with django_assert_max_num_queries(7):
+            response = head_office_client.get(reverse('shelters:shelter-summary'))
+
+        assert response.status_code == 200
+        rows = {row['code']: row for row in response.data['shelters']}
+        assert rows['krakow']['in_shelter'] == 1
+        assert rows['krakow']['low_stock_items'] == 0
+        assert rows['gdansk']['low_stock_items'] == 1
+        assert response.data['totals']['in_shelter'] == 2
+
+    def test_unassigned_data_reported(self, head_office_client, animals):
+        animals['gdansk'].shelter = None
+        animals['gdansk'].save()
+        response = head_office_client.get(reverse('shelters:shelter-summary'))
+
+        assert response.data['shelters'][-1]['shelter'] is None
+        assert response.data['shelters'][-1]['in_shelter'] == 1
+
+    def test_shelter_staff_forbidden(self, krakow_client):
+        assert krakow_client.get(reverse('shelters:shelter-summary')).status_code == 403
+
+    def test_invalid_days(self, head_office_client):
+        response = head_office_client.get(reverse('shelters:shelter-summary'), {'days': 'x'})
+        assert response.status_code == 400
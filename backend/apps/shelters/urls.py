@@ -0,0 +1,15 @@
+"""
+URL configuration for shelters app.
+"""
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import ShelterViewSet
+
+app_name = 'shelters'
+
+router = DefaultRouter()
+router.register(r'', ShelterViewSet, basename='shelter')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
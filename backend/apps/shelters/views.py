@@ -0,0 +1,37 @@
+"""
+Views for shelters app.
+"""
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from apps.accounts.permissions import IsEmployee, IsHeadOffice
+from .models import Shelter
+from .serializers import ShelterSerializer
+from .services import reports
+from .tenancy import ShelterScopedMixin
+
+
+class ShelterViewSet(ShelterScopedMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for viewing shelters.
+
+    list: Shelters visible to the user (only their own for shelter staff).
+    summary: Head office report, per-shelter figures for the last ?days= (default 30).
+    """
+    queryset = Shelter.objects.all()
+    serializer_class = ShelterSerializer
+    permission_classes = [IsEmployee]
+    pagination_class = None
+    shelter_field = 'pk'
+
+    @action(detail=False, methods=['get'], permission_classes=[IsHeadOffice])
+    def summary(self, request):
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= 366:
+            raise ValidationError({'days': 'Must be an integer between 1 and 366.'})
+        return Response(reports.summary(days))
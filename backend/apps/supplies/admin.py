@@ -4,7 +4,8 @@ Admin configuration for supplies app.
 from django.contrib import admin
 from .models import (
     SupplyCategory, UnitOfMeasure, Supplier, SupplyItem,
-    Inventory, InventoryLog, SupplyOrder, SupplyOrderLine
+    Inventory, InventoryLog, InventoryLot, InventoryShard, SupplyOrder, SupplyOrderLine,
+    Stocktake, StocktakeLine,
 )
 
 
@@ -29,12 +30,14 @@ class SupplierAdmin(admin.ModelAdmin):
 class InventoryInline(admin.StackedInline):
     model = Inventory
     can_delete = False
+    # Changed with the compact_inventory_shards command, which moves the stock
+    readonly_fields = ['shard_count']
 
 
 @admin.register(SupplyItem)
 class SupplyItemAdmin(admin.ModelAdmin):
-    list_display = ['name', 'category', 'unit', 'min_stock', 'get_current_quantity', 'get_stock_status']
-    list_filter = ['category']
+    list_display = ['name', 'shelter', 'category', 'unit', 'min_stock', 'get_current_quantity', 'get_stock_status']
+    list_filter = ['shelter', 'category']
     search_fields = ['name', 'description']
     inlines = [InventoryInline]
 
@@ -52,10 +55,41 @@ class SupplyItemAdmin(admin.ModelAdmin):
     get_stock_status.short_description = 'Status'
 
 
+class InventoryLotInline(admin.TabularInline):
+    model = InventoryLot
+    extra = 0
+    readonly_fields = ['received_quantity', 'quantity', 'received_at']
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        # Lots are created by stock receipts only
+        return False
+
+
+class InventoryShardInline(admin.TabularInline):
+    model = InventoryShard
+    extra = 0
+    readonly_fields = ['index', 'quantity']
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Inventory)
 class InventoryAdmin(admin.ModelAdmin):
-    list_display = ['supply_item', 'current_quantity', 'expiration_date']
+    list_display = ['supply_item', 'current_quantity', 'shard_count', 'expiration_date']
     search_fields = ['supply_item__name']
+    readonly_fields = ['shard_count']
+    inlines = [InventoryShardInline, InventoryLotInline]
+
+
+@admin.register(InventoryLot)
+class InventoryLotAdmin(admin.ModelAdmin):
+    list_display = ['inventory', 'lot_number', 'quantity', 'received_quantity', 'expiration_date', 'received_at']
+    list_filter = ['expiration_date']
+    search_fields = ['inventory__supply_item__name', 'lot_number']
+    readonly_fields = ['received_at']
 
 
 @admin.register(InventoryLog)
@@ -77,3 +111,19 @@ class SupplyOrderAdmin(admin.ModelAdmin):
     list_filter = ['status', 'supplier']
     search_fields = ['supplier__name']
     inlines = [SupplyOrderLineInline]
+
+
+class StocktakeLineInline(admin.TabularInline):
+    model = StocktakeLine
+    extra = 0
+    raw_id_fields = ['supply_item']
+    readonly_fields = ['expected_quantity', 'counted_at']
+
+
+@admin.register(Stocktake)
+class StocktakeAdmin(admin.ModelAdmin):
+    list_display = ['id', 'shelter', 'status', 'opened_at', 'opened_by', 'closed_at', 'closed_by']
+    list_filter = ['shelter', 'status']
+    # Status changes go through the stocktake service (commit adjusts stock)
+    readonly_fields = ['status', 'opened_at', 'closed_at', 'closed_by']
+    inlines = [StocktakeLineInline]
@@ -0,0 +1,103 @@
+"""
+Management command to benchmark concurrent stock issues of one item.
+
+Issues run from --concurrency threads against a temporary supply item, once
+per shard count in --shards (0 is the single-row path), so lock waits on the
+Inventory row show up as lower throughput and higher tail latency:
+
+    python manage.py benchmark_inventory --requests 2000 --concurrency 16 \\
+        --shards 0,4,16 --output inventory-bench.json
+
+Meaningful on PostgreSQL only: SQLite serialises all writers regardless of
+sharding. After each run the item is compacted and its final stock checked
+against the successful issues; the item is deleted afterwards.
+"""
+import json
+import platform
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.core.benchmarking import run_load
+from apps.supplies.models import SupplyCategory, SupplyItem, UnitOfMeasure
+from apps.supplies.services import stock
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent stock issues, single-row vs sharded inventory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shards', default='0,8',
+                            help='Comma-separated shard counts to compare (0: single row)')
+        parser.add_argument('--requests', type=int, default=1000, help='Issues per run')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--quantity', type=Decimal, default=Decimal('1'), help='Quantity per issue')
+        parser.add_argument('--output', default=None, help='Write JSON here instead of stdout')
+
+    def handle(self, *args, **options):
+        try:
+            shard_counts = [int(value) for value in options['shards'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError('--shards must be a comma-separated list of integers')
+        category, unit = SupplyCategory.objects.first(), UnitOfMeasure.objects.first()
+        if category is None or unit is None:
+            raise CommandError('Needs at least one supply category and unit (see seed_supplies)')
+
+        results = {}
+        for shard_count in shard_counts:
+            item = SupplyItem.objects.create(
+                name=f'benchmark-inventory-{shard_count}-{timezone.now().timestamp()}',
+                category=category, unit=unit,
+            )
+            try:
+                results[str(shard_count)] = self.run(item, shard_count, options)
+            finally:
+                item.delete()
+            result = results[str(shard_count)]
+            self.stderr.write(
+                f'shards={shard_count}: p50={result["p50_ms"]}ms p99={result["p99_ms"]}ms '
+                f'{result["throughput_rps"]} issues/s consistent={result["stock_consistent"]}'
+            )
+
+        report = {
+            'meta': {
+                'database': connection.vendor,
+                'concurrency': options['concurrency'],
+                'requests_per_run': options['requests'],
+                'quantity': str(options['quantity']),
+                'python': platform.python_version(),
+                'started_at': timezone.now().isoformat(),
+            },
+            'runs': results,
+        }
+        output = json.dumps(report, indent=2, default=str)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Report written to {options["output"]}'))
+        else:
+            self.stdout.write(output)
+
+    def run(self, item, shard_count, options):
+        quantity = options['quantity']
+        opening = quantity * options['requests']
+        stock.receive(item, opening, comment='benchmark')
+        stock.set_shard_count(item, shard_count)
+
+        def make_sender():
+            def send():
+                try:
+                    stock.issue(item, quantity, comment='benchmark')
+                except stock.InsufficientStock:
+                    return False, None
+                return True, None
+            return send
+
+        result = run_load(make_sender, options['requests'], options['concurrency'])
+        inventory = stock.set_shard_count(item, 0)
+        issued = quantity * (result['requests'] - result['errors'])
+        result['closing_quantity'] = inventory.current_quantity
+        result['stock_consistent'] = inventory.current_quantity == opening - issued
+        return result
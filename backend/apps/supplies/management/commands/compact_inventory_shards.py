@@ -0,0 +1,52 @@
+"""
+Management command to compact sharded inventories.
+
+Reconciles lots with the shard totals, spreads the stock evenly over the
+shards again and stores it in Inventory.current_quantity. Run it every few
+minutes (cron or a scheduled ECS task) for items in sharded mode:
+
+    python manage.py compact_inventory_shards
+
+With --item the command switches one item to --shards sub-counters instead
+(0 returns it to the single-row mode):
+
+    python manage.py compact_inventory_shards --item "Karma sucha dla psów" --shards 8
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.supplies.models import SupplyItem
+from apps.supplies.services import stock
+
+
+class Command(BaseCommand):
+    help = "Compact sharded inventories or change an item's shard count"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--item", default=None, help="Supply item name or id to reshard")
+        parser.add_argument("--shards", type=int, default=None,
+                            help=f"Shard count for --item (0-{stock.MAX_SHARDS}, 0: single row)")
+
+    def handle(self, *args, **options):
+        if options["item"] is None:
+            if options["shards"] is not None:
+                raise CommandError("--shards requires --item")
+            count = stock.compact_all()
+            self.stdout.write(self.style.SUCCESS(f"Compacted {count} sharded inventories"))
+            return
+
+        if options["shards"] is None:
+            raise CommandError("--item requires --shards")
+        item_filter = {"pk": options["item"]} if options["item"].isdigit() else {"name": options["item"]}
+        try:
+            item = SupplyItem.objects.get(**item_filter)
+        except SupplyItem.DoesNotExist:
+            raise CommandError(f"Supply item not found: {options['item']}")
+        except SupplyItem.MultipleObjectsReturned:
+            raise CommandError(f"Several shelters have {options['item']!r}, pass the item id")
+        try:
+            inventory = stock.set_shard_count(item, options["shards"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"{item.name}: {inventory.shard_count} shards, {inventory.current_quantity} in stock"
+        ))
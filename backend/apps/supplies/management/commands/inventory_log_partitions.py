@@ -0,0 +1,66 @@
+"""
+Management command to manage monthly partitions of the inventory log
+(PostgreSQL only).
+
+    python manage.py inventory_log_partitions status
+    python manage.py inventory_log_partitions convert      # once, maintenance window
+    python manage.py inventory_log_partitions create       # daily: upcoming months
+    python manage.py inventory_log_partitions archive --retention-months 24 --dir /backups
+
+archive exports months older than the retention period to gzipped CSV,
+detaches and drops them; --dry-run lists them only.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.supplies.services import log_partitions
+
+
+class Command(BaseCommand):
+    help = 'Convert, extend and archive the monthly partitions of the inventory log'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['status', 'convert', 'create', 'archive'])
+        parser.add_argument('--months-ahead', type=int, default=None,
+                            help='Months to create ahead (default: INVENTORY_LOG_PARTITIONS)')
+        parser.add_argument('--retention-months', type=int, default=None,
+                            help='Months kept by archive (default: INVENTORY_LOG_PARTITIONS)')
+        parser.add_argument('--dir', default=None, help='Archive directory (default: INVENTORY_LOG_ARCHIVE_DIR)')
+        parser.add_argument('--dry-run', action='store_true', help='archive: list the months only')
+
+    def handle(self, *args, **options):
+        try:
+            getattr(self, options['action'])(options)
+        except log_partitions.PartitioningUnavailable as e:
+            raise CommandError(str(e))
+
+    def status(self, options):
+        if not log_partitions.is_partitioned():
+            self.stdout.write(f'{log_partitions.TABLE} is not partitioned')
+            return
+        for name, month, rows in log_partitions.partitions():
+            self.stdout.write(f'{name}\t{month or "default"}\t~{rows} rows')
+
+    def convert(self, options):
+        created = log_partitions.convert(options['months_ahead'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{log_partitions.TABLE} partitioned into {len(created)} partitions; the original table is kept as '
+            f'{log_partitions.ORIGINAL_TABLE}'
+        ))
+
+    def create(self, options):
+        created = log_partitions.create_partitions(options['months_ahead'])
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} partitions'))
+        for name in created:
+            self.stdout.write(f'  {name}')
+
+    def archive(self, options):
+        if options['dry_run']:
+            for name, month in log_partitions.archivable(options['retention_months']):
+                self.stdout.write(f'{name}\t{month:%Y-%m}')
+            return
+        directory = options['dir'] or settings.INVENTORY_LOG_PARTITIONS['ARCHIVE_DIR']
+        archived = log_partitions.archive(directory, options['retention_months'])
+        for name, path, carried in archived:
+            self.stdout.write(f'{name} -> {path} ({carried} balances carried forward)')
+        self.stdout.write(self.style.SUCCESS(f'Archived {len(archived)} partitions'))
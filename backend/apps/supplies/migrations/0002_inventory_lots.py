@@ -0,0 +1,102 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_lots(apps, schema_editor):
+    """Turn the current stock of every item into one lot with its expiry date."""
+    Inventory = apps.get_model("supplies", "Inventory")
+    InventoryLot = apps.get_model("supplies", "InventoryLot")
+    InventoryLot.objects.bulk_create(
+        [
+            InventoryLot(
+                inventory_id=pk, received_quantity=quantity, quantity=quantity,
+                expiration_date=expiration_date,
+            )
+            for pk, quantity, expiration_date in Inventory.objects.filter(
+                current_quantity__gt=0
+            ).values_list("pk", "current_quantity", "expiration_date")
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("supplies", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InventoryLot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "lot_number",
+                    models.CharField(
+                        blank=True, max_length=100, verbose_name="Numer partii"
+                    ),
+                ),
+                (
+                    "received_quantity",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Ilość przyjęta"
+                    ),
+                ),
+                (
+                    "quantity",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Ilość pozostała"
+                    ),
+                ),
+                (
+                    "expiration_date",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="Data ważności"
+                    ),
+                ),
+                (
+                    "received_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Data przyjęcia"
+                    ),
+                ),
+                (
+                    "inventory",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lots",
+                        to="supplies.inventory",
+                        verbose_name="Stan magazynowy",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Partia",
+                "verbose_name_plural": "Partie",
+                "ordering": ["expiration_date", "received_at"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("quantity__gt", 0)),
+                        fields=["inventory", "expiration_date"],
+                        name="inventory_lot_fefo_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(("quantity__gt", 0)),
+                        fields=["expiration_date"],
+                        name="inventory_lot_expiry_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_lots, migrations.RunPython.noop),
+    ]
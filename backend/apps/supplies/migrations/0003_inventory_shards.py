@@ -0,0 +1,75 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:26
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("supplies", "0002_inventory_lots"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="inventory",
+            name="shard_count",
+            field=models.PositiveSmallIntegerField(
+                default=0, verbose_name="Liczba podliczników"
+            ),
+        ),
+        migrations.CreateModel(
+            name="InventoryShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "index",
+                    models.PositiveSmallIntegerField(verbose_name="Numer podlicznika"),
+                ),
+                (
+                    "quantity",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        max_digits=10,
+                        verbose_name="Ilość",
+                    ),
+                ),
+                (
+                    "inventory",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shards",
+                        to="supplies.inventory",
+                        verbose_name="Stan magazynowy",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Podlicznik stanu",
+                "verbose_name_plural": "Podliczniki stanu",
+                "ordering": ["inventory", "index"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="inventoryshard",
+            constraint=models.UniqueConstraint(
+                fields=("inventory", "index"), name="inventory_shard_unique"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="inventoryshard",
+            constraint=models.CheckConstraint(
+                check=models.Q(("quantity__gte", 0)),
+                name="inventory_shard_non_negative",
+            ),
+        ),
+    ]
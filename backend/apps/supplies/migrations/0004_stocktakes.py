@@ -0,0 +1,158 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("supplies", "0003_inventory_shards"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="inventorylog",
+            name="operation_type",
+            field=models.CharField(
+                choices=[
+                    ("IN", "Przyjęcie"),
+                    ("OUT", "Wydanie"),
+                    ("ADJ", "Korekta inwentaryzacyjna"),
+                ],
+                max_length=3,
+                verbose_name="Typ operacji",
+            ),
+        ),
+        migrations.CreateModel(
+            name="Stocktake",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("OPEN", "Otwarta"),
+                            ("COMMITTED", "Zatwierdzona"),
+                            ("CANCELLED", "Anulowana"),
+                        ],
+                        default="OPEN",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("notes", models.TextField(blank=True, verbose_name="Uwagi")),
+                (
+                    "opened_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Data otwarcia"
+                    ),
+                ),
+                (
+                    "closed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Data zamknięcia"
+                    ),
+                ),
+                (
+                    "closed_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="stocktakes_closed",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Zamknął",
+                    ),
+                ),
+                (
+                    "opened_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="stocktakes_opened",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Otworzył",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Inwentaryzacja",
+                "verbose_name_plural": "Inwentaryzacje",
+                "ordering": ["-opened_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="StocktakeLine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "counted_quantity",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Ilość policzona"
+                    ),
+                ),
+                (
+                    "expected_quantity",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        verbose_name="Ilość w systemie",
+                    ),
+                ),
+                (
+                    "counted_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Data liczenia"),
+                ),
+                (
+                    "stocktake",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lines",
+                        to="supplies.stocktake",
+                        verbose_name="Inwentaryzacja",
+                    ),
+                ),
+                (
+                    "supply_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stocktake_lines",
+                        to="supplies.supplyitem",
+                        verbose_name="Zasób",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Pozycja inwentaryzacji",
+                "verbose_name_plural": "Pozycje inwentaryzacji",
+                "ordering": ["supply_item__name"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="stocktakeline",
+            constraint=models.UniqueConstraint(
+                fields=("stocktake", "supply_item"), name="stocktake_line_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("supplies", "0004_stocktakes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="inventorylog",
+            index=models.Index(
+                fields=["inventory", "-timestamp"], name="inventory_log_recent_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shelters", "0001_initial"),
+        ("supplies", "0005_inventory_log_recent_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stocktake",
+            name="shelter",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="stocktakes",
+                to="shelters.shelter",
+                verbose_name="Schronisko",
+            ),
+        ),
+        migrations.AddField(
+            model_name="supplyitem",
+            name="shelter",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="supply_items",
+                to="shelters.shelter",
+                verbose_name="Schronisko",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="supplyitem",
+            name="name",
+            field=models.CharField(max_length=200, verbose_name="Nazwa zasobu"),
+        ),
+        migrations.AddIndex(
+            model_name="stocktake",
+            index=models.Index(
+                fields=["shelter", "status"], name="stocktake_shelter_status_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="supplyitem",
+            constraint=models.UniqueConstraint(
+                fields=("shelter", "name"), name="supply_item_shelter_name_unique"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="supplyitem",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("shelter__isnull", True)),
+                fields=("name",),
+                name="supply_item_name_unique_without_shelter",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shelters", "0002_assign_existing_data"),
+        ("supplies", "0006_shelters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="supplyitem",
+            index=models.Index(fields=["updated_at"], name="supply_item_updated_idx"),
+        ),
+    ]
@@ -73,7 +73,6 @@ class SupplyItem(models.Model):
     name = models.CharField(
         verbose_name='Nazwa zasobu',
         max_length=200,
-        unique=True,
     )
     description = models.TextField(
         verbose_name='Opis',
@@ -97,6 +96,16 @@ class SupplyItem(models.Model):
         related_name='items',
         verbose_name='Jednostka miary',
     )
+    shelter = models.ForeignKey(
+        'shelters.Shelter',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='supply_items',
+        verbose_name='Schronisko',
+        # indexed as the leading column of the model's composite indexes
+        db_index=False,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -104,17 +113,39 @@ class SupplyItem(models.Model):
         verbose_name = 'Zasób magazynowy'
         verbose_name_plural = 'Zasoby magazynowe'
         ordering = ['name']
+        constraints = [
+            # names are unique per shelter; the index also serves a shelter's list by name
+            models.UniqueConstraint(fields=['shelter', 'name'], name='supply_item_shelter_name_unique'),
+            models.UniqueConstraint(
+                fields=['name'], condition=models.Q(shelter__isnull=True),
+                name='supply_item_name_unique_without_shelter',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['updated_at'], name='supply_item_updated_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
     @property
     def current_quantity(self):
-        """Get current quantity from inventory."""
+        """
+        Get current quantity from inventory.
+
+        For sharded inventory this is the sum of the shards, taken from the
+        ``sharded_quantity`` annotation when the queryset provides it.
+        """
         try:
-            return self.inventory.current_quantity
+            inventory = self.inventory
         except Inventory.DoesNotExist:
             return Decimal('0.00')
+        if not inventory.shard_count:
+            return inventory.current_quantity
+        quantity = getattr(self, 'sharded_quantity', None)
+        if quantity is None:
+            quantity = inventory.shards.aggregate(total=models.Sum('quantity'))['total']
+        return quantity if quantity is not None else Decimal('0.00')
 
     @property
     def stock_status(self):
@@ -148,11 +179,20 @@ class Inventory(models.Model):
         decimal_places=2,
         default=Decimal('0.00'),
     )
+    # Earliest expiry among lots with stock left, kept up to date by the
+    # stock service
     expiration_date = models.DateField(
         verbose_name='Data ważności',
         null=True,
         blank=True,
     )
+    # 0: the quantity lives in current_quantity (one locked row per item).
+    # N > 0: it is spread over N InventoryShard rows and current_quantity is
+    # only the total as of the last compaction (apps.supplies.services.stock).
+    shard_count = models.PositiveSmallIntegerField(
+        verbose_name='Liczba podliczników',
+        default=0,
+    )
 
     class Meta:
         verbose_name = 'Stan magazynowy'
@@ -162,10 +202,108 @@ class Inventory(models.Model):
         return f'{self.supply_item.name}: {self.current_quantity} {self.supply_item.unit.abbreviation}'
 
 
+class InventoryShard(models.Model):
+    """
+    One of the sub-counters of a sharded inventory.
+
+    The item's stock is the sum of its shards; concurrent movements update
+    different shards instead of queueing on the single Inventory row.
+    """
+    inventory = models.ForeignKey(
+        Inventory,
+        on_delete=models.CASCADE,
+        related_name='shards',
+        verbose_name='Stan magazynowy',
+    )
+    index = models.PositiveSmallIntegerField(
+        verbose_name='Numer podlicznika',
+    )
+    quantity = models.DecimalField(
+        verbose_name='Ilość',
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal('0.00'),
+    )
+
+    class Meta:
+        verbose_name = 'Podlicznik stanu'
+        verbose_name_plural = 'Podliczniki stanu'
+        ordering = ['inventory', 'index']
+        constraints = [
+            models.UniqueConstraint(fields=['inventory', 'index'], name='inventory_shard_unique'),
+            models.CheckConstraint(check=models.Q(quantity__gte=0), name='inventory_shard_non_negative'),
+        ]
+
+    def __str__(self):
+        return f'{self.inventory.supply_item.name} #{self.index}: {self.quantity}'
+
+
+class InventoryLot(models.Model):
+    """
+    Stock received in one delivery, with its own expiry date.
+
+    Outbound operations consume lots first-expired-first-out
+    (apps.supplies.services.stock). ``quantity`` is what is left of the lot.
+    """
+    inventory = models.ForeignKey(
+        Inventory,
+        on_delete=models.CASCADE,
+        related_name='lots',
+        verbose_name='Stan magazynowy',
+    )
+    lot_number = models.CharField(
+        verbose_name='Numer partii',
+        max_length=100,
+        blank=True,
+    )
+    received_quantity = models.DecimalField(
+        verbose_name='Ilość przyjęta',
+        max_digits=10,
+        decimal_places=2,
+    )
+    quantity = models.DecimalField(
+        verbose_name='Ilość pozostała',
+        max_digits=10,
+        decimal_places=2,
+    )
+    expiration_date = models.DateField(
+        verbose_name='Data ważności',
+        null=True,
+        blank=True,
+    )
+    received_at = models.DateTimeField(
+        verbose_name='Data przyjęcia',
+        auto_now_add=True,
+    )
+
+    class Meta:
+        verbose_name = 'Partia'
+        verbose_name_plural = 'Partie'
+        ordering = ['expiration_date', 'received_at']
+        indexes = [
+            # Lots with stock left: FEFO order per item, expiring across all items
+            models.Index(
+                fields=['inventory', 'expiration_date'],
+                condition=models.Q(quantity__gt=0),
+                name='inventory_lot_fefo_idx',
+            ),
+            models.Index(
+                fields=['expiration_date'],
+                condition=models.Q(quantity__gt=0),
+                name='inventory_lot_expiry_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.inventory.supply_item.name} {self.lot_number or "-"}: {self.quantity} ({self.expiration_date})'
+
+
 class InventoryOperationType(models.TextChoices):
     """Types of inventory operations."""
     INBOUND = 'IN', 'Przyjęcie'
     OUTBOUND = 'OUT', 'Wydanie'
+    # Signed quantity: counted minus expected stock at a stocktake
+    ADJUSTMENT = 'ADJ', 'Korekta inwentaryzacyjna'
 
 
 class InventoryLog(models.Model):
@@ -207,12 +345,136 @@ class InventoryLog(models.Model):
         verbose_name = 'Operacja magazynowa'
         verbose_name_plural = 'Operacje magazynowe'
         ordering = ['-timestamp']
+        indexes = [
+            # Recent operations of an item (detail view, logs action). On a
+            # partitioned log (services.log_partitions) every month has its own copy.
+            models.Index(fields=['inventory', '-timestamp'], name='inventory_log_recent_idx'),
+        ]
 
     def __str__(self):
+        if self.operation_type == InventoryOperationType.ADJUSTMENT:
+            return f'{self.inventory.supply_item.name}: {self.quantity:+} (korekta)'
         sign = '+' if self.operation_type == InventoryOperationType.INBOUND else '-'
         return f'{self.inventory.supply_item.name}: {sign}{self.quantity}'
 
 
+class StocktakeStatus(models.TextChoices):
+    """Status of stocktake sessions."""
+    OPEN = 'OPEN', 'Otwarta'
+    COMMITTED = 'COMMITTED', 'Zatwierdzona'
+    CANCELLED = 'CANCELLED', 'Anulowana'
+
+
+class Stocktake(models.Model):
+    """
+    Physical inventory count session.
+
+    Counts are submitted in batches while the session is open; committing it
+    sets every counted item's stock to the counted quantity and logs the
+    differences as ADJ operations (apps.supplies.services.stocktake).
+    """
+    status = models.CharField(
+        verbose_name='Status',
+        max_length=10,
+        choices=StocktakeStatus.choices,
+        default=StocktakeStatus.OPEN,
+    )
+    notes = models.TextField(
+        verbose_name='Uwagi',
+        blank=True,
+    )
+    opened_at = models.DateTimeField(
+        verbose_name='Data otwarcia',
+        auto_now_add=True,
+    )
+    opened_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='stocktakes_opened',
+        verbose_name='Otworzył',
+    )
+    closed_at = models.DateTimeField(
+        verbose_name='Data zamknięcia',
+        null=True,
+        blank=True,
+    )
+    closed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='stocktakes_closed',
+        verbose_name='Zamknął',
+    )
+    shelter = models.ForeignKey(
+        'shelters.Shelter',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='stocktakes',
+        verbose_name='Schronisko',
+        # indexed as the leading column of the model's composite indexes
+        db_index=False,
+    )
+
+    class Meta:
+        verbose_name = 'Inwentaryzacja'
+        verbose_name_plural = 'Inwentaryzacje'
+        ordering = ['-opened_at']
+        indexes = [
+            models.Index(fields=['shelter', 'status'], name='stocktake_shelter_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'Inwentaryzacja #{self.id} ({self.get_status_display()})'
+
+
+class StocktakeLine(models.Model):
+    """Counted quantity of one item in a stocktake."""
+    stocktake = models.ForeignKey(
+        Stocktake,
+        on_delete=models.CASCADE,
+        related_name='lines',
+        verbose_name='Inwentaryzacja',
+    )
+    supply_item = models.ForeignKey(
+        SupplyItem,
+        on_delete=models.CASCADE,
+        related_name='stocktake_lines',
+        verbose_name='Zasób',
+    )
+    counted_quantity = models.DecimalField(
+        verbose_name='Ilość policzona',
+        max_digits=10,
+        decimal_places=2,
+    )
+    # Stock in the system when the stocktake was committed
+    expected_quantity = models.DecimalField(
+        verbose_name='Ilość w systemie',
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+    )
+    counted_at = models.DateTimeField(
+        verbose_name='Data liczenia',
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = 'Pozycja inwentaryzacji'
+        verbose_name_plural = 'Pozycje inwentaryzacji'
+        ordering = ['supply_item__name']
+        constraints = [
+            models.UniqueConstraint(fields=['stocktake', 'supply_item'], name='stocktake_line_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.supply_item.name}: {self.counted_quantity}'
+
+
 class SupplyOrderStatus(models.TextChoices):
     """Status of supply orders."""
     IN_PROGRESS = 'IN_PROGRESS', 'W realizacji'
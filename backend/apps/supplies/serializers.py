@@ -4,8 +4,8 @@ Serializers for supplies app.
 from rest_framework import serializers
 from .models import (
     SupplyCategory, UnitOfMeasure, Supplier, SupplyItem,
-    Inventory, InventoryLog, SupplyOrder, SupplyOrderLine,
-    SupplyOrderStatus
+    Inventory, InventoryLog, InventoryLot, SupplyOrder, SupplyOrderLine,
+    SupplyOrderStatus, Stocktake, StocktakeLine
 )
 from apps.accounts.serializers import UserMinimalSerializer
 
@@ -96,6 +96,20 @@ class SupplyOrderMinimalSerializer(serializers.ModelSerializer):
         return None
 
 
+class InventoryLotSerializer(serializers.ModelSerializer):
+    """Serializer for InventoryLot."""
+    supply_item = serializers.IntegerField(source='inventory.supply_item_id', read_only=True)
+    supply_item_name = serializers.CharField(source='inventory.supply_item.name', read_only=True)
+    unit = serializers.CharField(source='inventory.supply_item.unit.abbreviation', read_only=True)
+
+    class Meta:
+        model = InventoryLot
+        fields = [
+            'id', 'supply_item', 'supply_item_name', 'lot_number', 'quantity',
+            'received_quantity', 'unit', 'expiration_date', 'received_at',
+        ]
+
+
 class InventorySerializer(serializers.ModelSerializer):
     """Serializer for Inventory."""
 
@@ -119,17 +133,21 @@ class SupplyItemListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'description', 'min_stock',
             'category', 'unit', 'current_quantity',
-            'stock_status', 'next_delivery'
+            'stock_status', 'next_delivery', 'shelter',
         ]
 
     def get_next_delivery(self, obj):
         """Get the next pending delivery for this item."""
-        pending_order_line = SupplyOrderLine.objects.filter(
-            supply_item=obj,
-            order__status=SupplyOrderStatus.IN_PROGRESS
-        ).select_related('order', 'order__supplier').order_by(
-            'order__expected_delivery_date'
-        ).first()
+        prefetched = getattr(obj, 'pending_order_lines', None)
+        if prefetched is not None:
+            pending_order_line = prefetched[0] if prefetched else None
+        else:
+            pending_order_line = SupplyOrderLine.objects.filter(
+                supply_item=obj,
+                order__status=SupplyOrderStatus.IN_PROGRESS
+            ).select_related('order', 'order__supplier').order_by(
+                'order__expected_delivery_date'
+            ).first()
 
         if pending_order_line:
             return {
@@ -156,7 +174,7 @@ class SupplyItemDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'description', 'min_stock',
             'category', 'unit', 'current_quantity',
-            'stock_status', 'pending_orders', 'recent_logs'
+            'stock_status', 'pending_orders', 'recent_logs', 'shelter',
         ]
 
     def get_pending_orders(self, obj):
@@ -187,3 +205,40 @@ class SupplyItemDetailSerializer(serializers.ModelSerializer):
             return InventoryLogSerializer(logs, many=True).data
         except Inventory.DoesNotExist:
             return []
+
+
+class StocktakeSerializer(serializers.ModelSerializer):
+    """Serializer for Stocktake."""
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    opened_by = UserMinimalSerializer(read_only=True)
+    closed_by = UserMinimalSerializer(read_only=True)
+    line_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Stocktake
+        fields = [
+            'id', 'status', 'status_display', 'notes', 'opened_at', 'opened_by',
+            'closed_at', 'closed_by', 'line_count', 'shelter',
+        ]
+        read_only_fields = ['status', 'opened_at', 'closed_at']
+
+
+class StocktakeLineSerializer(serializers.ModelSerializer):
+    """Serializer for StocktakeLine annotated with the stock difference."""
+    supply_item_name = serializers.CharField(source='supply_item.name', read_only=True)
+    unit = serializers.CharField(source='supply_item.unit.abbreviation', read_only=True)
+    system_quantity = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    difference = serializers.DecimalField(max_digits=11, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = StocktakeLine
+        fields = [
+            'id', 'supply_item', 'supply_item_name', 'unit', 'counted_quantity',
+            'system_quantity', 'difference', 'counted_at',
+        ]
+
+
+class StocktakeCountSerializer(serializers.Serializer):
+    """One counted quantity in a batch."""
+    supply_item = serializers.IntegerField()
+    counted_quantity = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
@@ -0,0 +1,130 @@
+"""
+Inventory ledger verification.
+
+The ledger of an item is the running sum of its ``InventoryLog`` rows:
+receipts add, issues subtract and ADJ rows carry their own sign. It should
+equal the stock (``Inventory.current_quantity``, or the shard total for
+sharded inventories).
+
+Inventories are checked in chunks of consecutive primary keys; a chunk costs
+two queries, one of them a grouped aggregate over the chunk's log rows on the
+``inventory_id`` index. Chunks can be split between processes with
+``chunks(..., part, parts)``. The scan takes no locks, so movements committed
+while it runs can look like drift; ``confirm`` re-checks the candidates with
+the inventories locked and optionally repairs them.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import (
+    Case, Count, DecimalField, F, Max, Min, OuterRef, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce
+
+from apps.supplies.models import (
+    Inventory, InventoryLog, InventoryOperationType, InventoryShard,
+)
+from apps.supplies.services import stock
+
+REPAIR_STOCK = 'stock'
+REPAIR_LEDGER = 'ledger'
+REPAIR_MODES = (REPAIR_STOCK, REPAIR_LEDGER)
+
+_DECIMAL = DecimalField(max_digits=14, decimal_places=2)
+
+
+def balance():
+    """Aggregate: the ledger sum of the log rows in the query."""
+    return Coalesce(
+        Sum(Case(
+            When(operation_type=InventoryOperationType.OUTBOUND, then=-F('quantity')),
+            default=F('quantity'),
+        )),
+        Value(Decimal('0')),
+        output_field=_DECIMAL,
+    )
+
+
+def chunks(chunk_size, part=0, parts=1):
+    """Primary key ranges ``[low, high)`` of inventories; every ``parts``-th from ``part``."""
+    bounds = Inventory.objects.aggregate(low=Min('pk'), high=Max('pk'))
+    if bounds['low'] is None:
+        return []
+    ranges = [
+        (low, low + chunk_size) for low in range(bounds['low'], bounds['high'] + 1, chunk_size)
+    ]
+    return ranges[part::parts]
+
+
+def _stock(inventories):
+    return inventories.annotate(sharded_quantity=stock.shard_total(OuterRef('pk'))).values_list(
+        'pk', 'supply_item_id', 'supply_item__name', 'current_quantity', 'shard_count', 'sharded_quantity',
+    )
+
+
+def _compare(inventory_rows, ledgers):
+    drift = []
+    for pk, item_id, name, current_quantity, shard_count, sharded_quantity in inventory_rows:
+        quantity = (sharded_quantity or Decimal('0')) if shard_count else current_quantity
+        ledger = ledgers.get(pk, Decimal('0.00'))
+        if quantity != ledger:
+            drift.append({
+                'inventory': pk, 'supply_item': item_id, 'name': name,
+                'stock': quantity, 'ledger': ledger, 'drift': quantity - ledger,
+            })
+    return drift
+
+
+def check_chunk(low, high):
+    """
+    Compare stock and ledger of inventories with ``low <= pk < high``;
+    return ``(inventories, log rows, drift)``.
+    """
+    ledgers, log_rows = {}, 0
+    for pk, total, rows in (
+        InventoryLog.objects.filter(inventory_id__gte=low, inventory_id__lt=high)
+        .order_by().values('inventory').annotate(total=balance(), rows=Count('pk'))
+        .values_list('inventory', 'total', 'rows')
+    ):
+        ledgers[pk] = total
+        log_rows += rows
+    inventory_rows = list(_stock(Inventory.objects.filter(pk__gte=low, pk__lt=high)))
+    return len(inventory_rows), log_rows, _compare(inventory_rows, ledgers)
+
+
+@transaction.atomic
+def confirm(inventory_ids, repair=None):
+    """
+    Re-check ``inventory_ids`` with the inventories (and their shards)
+    locked; return the confirmed drift.
+
+    ``repair='stock'`` sets the stock to the ledger (unless the ledger is
+    negative); ``repair='ledger'`` appends an ADJ row per item so the ledger
+    matches the stock. Repaired rows are marked with ``repaired``.
+    """
+    if repair not in (None, *REPAIR_MODES):
+        raise ValueError(f'repair must be one of {REPAIR_MODES}')
+    inventories = Inventory.objects.filter(pk__in=inventory_ids)
+    list(inventories.select_for_update().order_by('pk').values_list('pk'))
+    list(InventoryShard.objects.select_for_update().filter(inventory__in=inventory_ids)
+         .order_by('inventory', 'index').values_list('pk'))
+
+    ledgers = dict(
+        InventoryLog.objects.filter(inventory__in=inventory_ids).order_by()
+        .values('inventory').annotate(total=balance()).values_list('inventory', 'total')
+    )
+    drift = _compare(_stock(inventories), ledgers)
+
+    for row in drift:
+        row['repaired'] = repair == REPAIR_LEDGER or (repair == REPAIR_STOCK and row['ledger'] >= 0)
+    if repair == REPAIR_STOCK:
+        stock.adjust({row['supply_item']: row['ledger'] for row in drift if row['repaired']}, log=False)
+    elif repair == REPAIR_LEDGER:
+        InventoryLog.objects.bulk_create([
+            InventoryLog(
+                inventory_id=row['inventory'], operation_type=InventoryOperationType.ADJUSTMENT,
+                quantity=row['drift'], comment='Korekta rejestru (weryfikacja stanów)',
+            )
+            for row in drift
+        ])
+    return drift
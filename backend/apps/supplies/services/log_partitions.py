@@ -0,0 +1,275 @@
+"""
+Monthly range partitioning of the inventory log (PostgreSQL only).
+
+``convert`` turns the plain ``supplies_inventorylog`` table into a table
+partitioned by ``timestamp`` with one partition per month and a default
+partition for anything outside them. Django keeps using the same table name,
+so the model and all queries are unchanged; the primary key becomes
+``(id, timestamp)`` as partitioning requires.
+
+``create_partitions`` adds the coming months (moving any of their rows out of
+the default partition first) and ``archive`` exports months older than the
+retention period to gzipped CSV, then detaches and drops them. Archived
+quantities are carried forward as one ADJ row per item, so the ledger sum
+(apps.supplies.services.ledger) still matches the stock.
+"""
+import gzip
+import os
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.supplies.models import InventoryLog, InventoryOperationType
+
+TABLE = InventoryLog._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+ORIGINAL_TABLE = f'{TABLE}_unpartitioned'
+CARRY_FORWARD_COMMENT = 'Saldo przeniesione z archiwum do {month:%Y-%m}'
+
+
+class PartitioningUnavailable(Exception):
+    """Raised when partitioning is requested on a database that lacks it."""
+
+
+def _q(name):
+    return connection.ops.quote_name(name)
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y_%m}'
+
+
+def month_of(name):
+    """The month of a partition name, None for other tables."""
+    prefix = f'{TABLE}_p'
+    if not name.startswith(prefix):
+        return None
+    try:
+        return datetime.strptime(name[len(prefix):], '%Y_%m').date()
+    except ValueError:
+        return None
+
+
+def _bound(month):
+    """Partition bound for the start of ``month`` in the shelter's time zone."""
+    return timezone.make_aware(datetime.combine(month, time()))
+
+
+def _require_postgres():
+    if connection.vendor != 'postgresql':
+        raise PartitioningUnavailable(
+            f'Inventory log partitioning needs PostgreSQL, not {connection.vendor}'
+        )
+
+
+def is_partitioned():
+    _require_postgres()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions():
+    """``[(name, month or None for the default partition, rows estimate)]`` by month."""
+    _require_postgres()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            '''
+            SELECT child.relname, child.reltuples::bigint
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            ''',
+            [TABLE],
+        )
+        rows = [(name, month_of(name), max(estimate, 0)) for name, estimate in cursor.fetchall()]
+    return sorted(rows, key=lambda row: (row[1] is None, row[1] or date.min))
+
+
+def _attach_month(cursor, month):
+    """Create and attach ``month``'s partition, moving its rows out of the default one."""
+    name = partition_name(month)
+    low, high = _bound(month), _bound(add_months(month, 1))
+    cursor.execute(f'CREATE TABLE {_q(name)} (LIKE {_q(TABLE)} INCLUDING DEFAULTS)')
+    cursor.execute(
+        f'''
+        WITH moved AS (
+            DELETE FROM {_q(DEFAULT_PARTITION)} WHERE timestamp >= %s AND timestamp < %s RETURNING *
+        )
+        INSERT INTO {_q(name)} SELECT * FROM moved
+        ''',
+        [low, high],
+    )
+    cursor.execute(
+        f'ALTER TABLE {_q(TABLE)} ATTACH PARTITION {_q(name)} FOR VALUES FROM (%s) TO (%s)',
+        [low, high],
+    )
+    return name
+
+
+@transaction.atomic
+def create_partitions(months_ahead=None, today=None):
+    """Make sure partitions exist up to ``months_ahead`` months from now; return the new ones."""
+    if not is_partitioned():
+        raise PartitioningUnavailable(f'{TABLE} is not partitioned (run convert first)')
+    months_ahead = settings.INVENTORY_LOG_PARTITIONS['MONTHS_AHEAD'] if months_ahead is None else months_ahead
+    existing = {month for _, month, _ in partitions() if month}
+    current = month_start(today or timezone.localdate())
+    created = []
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month not in existing:
+                created.append(_attach_month(cursor, month))
+    return created
+
+
+@transaction.atomic
+def convert(months_ahead=None, today=None):
+    """
+    Rebuild the inventory log as a partitioned table; return the partitions.
+
+    Runs in one transaction holding an exclusive lock on the log, copying all
+    rows: plan a maintenance window on large databases. The original table
+    is kept as ``supplies_inventorylog_unpartitioned`` until dropped by hand.
+    """
+    if is_partitioned():
+        raise PartitioningUnavailable(f'{TABLE} is already partitioned')
+    months_ahead = settings.INVENTORY_LOG_PARTITIONS['MONTHS_AHEAD'] if months_ahead is None else months_ahead
+    new_table = f'{TABLE}_partitioned'
+    with connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {_q(TABLE)} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            '''
+            SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid), indisprimary
+            FROM pg_index WHERE indrelid = to_regclass(%s)
+            ''',
+            [TABLE],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            '''
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'f'
+            ''',
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT min(timestamp) FROM {_q(TABLE)}')
+        (first,) = cursor.fetchone()
+
+        cursor.execute(
+            f'''
+            CREATE TABLE {_q(new_table)} (LIKE {_q(TABLE)} INCLUDING DEFAULTS INCLUDING IDENTITY)
+            PARTITION BY RANGE (timestamp)
+            '''
+        )
+        cursor.execute(
+            f'CREATE TABLE {_q(DEFAULT_PARTITION)} PARTITION OF {_q(new_table)} DEFAULT'
+        )
+
+        # Free the index names for the new table, then swap the tables
+        for name, _, _ in indexes:
+            cursor.execute(f'ALTER INDEX {_q(name)} RENAME TO {_q(name[:50] + "_unpart")}')
+        cursor.execute(f'ALTER TABLE {_q(TABLE)} RENAME TO {_q(ORIGINAL_TABLE)}')
+        cursor.execute(f'ALTER TABLE {_q(new_table)} RENAME TO {_q(TABLE)}')
+
+        for name, definition, primary in indexes:
+            if primary:
+                cursor.execute(
+                    f'ALTER TABLE {_q(TABLE)} ADD CONSTRAINT {_q(name)} PRIMARY KEY (id, timestamp)'
+                )
+            else:
+                # captured before the swap, so it already names the new table
+                cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {_q(TABLE)} ADD CONSTRAINT {_q(name)} {definition}')
+
+        current = month_start(timezone.localdate(first) if first else (today or timezone.localdate()))
+        last = add_months(month_start(today or timezone.localdate()), months_ahead)
+        while current <= last:
+            _attach_month(cursor, current)
+            current = add_months(current, 1)
+
+        cursor.execute(
+            f'INSERT INTO {_q(TABLE)} OVERRIDING SYSTEM VALUE SELECT * FROM {_q(ORIGINAL_TABLE)}'
+        )
+        cursor.execute(
+            f'''
+            SELECT setval(pg_get_serial_sequence(%s, 'id'), coalesce(max(id), 0) + 1, false)
+            FROM {_q(TABLE)}
+            ''',
+            [TABLE],
+        )
+    return partitions()
+
+
+def archivable(retention_months=None, today=None):
+    """Monthly partitions entirely older than the retention period."""
+    if retention_months is None:
+        retention_months = settings.INVENTORY_LOG_PARTITIONS['RETENTION_MONTHS']
+    cutoff = add_months(month_start(today or timezone.localdate()), -retention_months)
+    return [(name, month) for name, month, _ in partitions() if month and month < cutoff]
+
+
+def export(name, directory):
+    """Write a partition to ``directory/<name>.csv.gz``; return the path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{name}.csv.gz')
+    with gzip.open(path, 'wb') as f, connection.cursor() as cursor:
+        cursor.cursor.copy_expert(f'COPY {_q(name)} TO STDOUT WITH (FORMAT csv, HEADER)', f)
+    return path
+
+
+@transaction.atomic
+def drop_month(name, month):
+    """
+    Detach and drop an exported partition, carrying its quantities forward
+    as ADJ rows at the start of the next month; return the rows carried.
+    """
+    carried_at = _bound(add_months(month, 1))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            INSERT INTO {_q(TABLE)} (inventory_id, operation_type, quantity, comment, timestamp, performed_by_id)
+            SELECT inventory_id, %s,
+                   sum(CASE WHEN operation_type = %s THEN -quantity ELSE quantity END), %s, %s, NULL
+            FROM {_q(name)}
+            GROUP BY inventory_id
+            HAVING sum(CASE WHEN operation_type = %s THEN -quantity ELSE quantity END) <> 0
+            ''',
+            [
+                InventoryOperationType.ADJUSTMENT, InventoryOperationType.OUTBOUND,
+                CARRY_FORWARD_COMMENT.format(month=month), carried_at, InventoryOperationType.OUTBOUND,
+            ],
+        )
+        carried = cursor.rowcount
+        cursor.execute(f'ALTER TABLE {_q(TABLE)} DETACH PARTITION {_q(name)}')
+        cursor.execute(f'DROP TABLE {_q(name)}')
+    return carried
+
+
+def archive(directory, retention_months=None, today=None):
+    """
+    Export and drop every partition older than the retention period; return
+    ``[(partition, file, carried rows)]``. Each month is dropped only after
+    its export is written.
+    """
+    archived = []
+    for name, month in archivable(retention_months, today):
+        path = export(name, directory)
+        archived.append((name, path, drop_month(name, month)))
+    return archived
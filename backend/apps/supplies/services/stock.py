@@ -0,0 +1,374 @@
+"""
+Stock movements with lot (batch) tracking.
+
+Every receipt creates an ``InventoryLot`` with its expiry date; issues consume
+lots first-expired-first-out. Both run in one transaction holding a row lock
+on the item's ``Inventory`` (and, for issues, its lots), so concurrent
+movements of the same item are serialised and cannot oversell.
+
+Stock without a lot (from before lots, or entered directly) counts as having
+no expiry date and is consumed after all lots.
+
+Sharded inventory
+-----------------
+For the busiest items the single Inventory row lock becomes the bottleneck.
+With ``set_shard_count(item, n)`` the quantity is spread over ``n``
+``InventoryShard`` rows and movements no longer lock the Inventory row:
+
+* a receipt adds to one random shard;
+* an issue reserves stock with a conditional
+  ``UPDATE ... SET quantity = quantity - q WHERE quantity >= q`` on the shards
+  in random order, so two issues only wait for each other when they hit the
+  same shard and a shard can never go negative;
+* when no single shard covers the request, the issue locks all shards in
+  index order (no deadlocks with other slow issues), checks their sum and
+  drains them, or raises ``InsufficientStock``.
+
+Lots are not consumed by sharded issues. ``compact`` (run periodically by the
+``compact_inventory_shards`` command) reconciles them FEFO against the shard
+total, spreads the total evenly over the shards again and stores it in
+``Inventory.current_quantity``.
+"""
+import random
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Min, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from apps.core import events
+from apps.supplies.models import (
+    Inventory, InventoryLog, InventoryLot, InventoryOperationType, InventoryShard, SupplyItem,
+)
+
+MAX_SHARDS = 64
+
+
+class InsufficientStock(Exception):
+    """Raised when an issue asks for more than is in stock."""
+
+
+def _locked_inventory(inventory):
+    return Inventory.objects.select_for_update().get(pk=inventory.pk)
+
+
+def _refresh_expiration_date(inventory):
+    inventory.expiration_date = (
+        inventory.lots.filter(quantity__gt=0).aggregate(earliest=Min('expiration_date'))['earliest']
+    )
+
+
+def _shards(inventory):
+    return InventoryShard.objects.filter(inventory=inventory)
+
+
+def _sharded_total(inventory):
+    return _shards(inventory).aggregate(total=Sum('quantity'))['total'] or Decimal('0.00')
+
+
+def shard_total(inventory):
+    """Subquery summing the shards of ``inventory`` (an ``OuterRef``)."""
+    return Subquery(
+        InventoryShard.objects.filter(inventory=inventory)
+        .values('inventory').annotate(total=Sum('quantity')).values('total')
+    )
+
+
+def _unlocked_inventory(supply_item):
+    inventory, _ = Inventory.objects.get_or_create(supply_item=supply_item)
+    return inventory
+
+
+def _log(inventory, operation_type, quantity, comment, performed_by):
+    InventoryLog.objects.create(
+        inventory=inventory, operation_type=operation_type,
+        quantity=quantity, comment=comment, performed_by=performed_by,
+    )
+
+
+def _stock_events(inventory_ids):
+    rows = (
+        Inventory.objects.filter(pk__in=inventory_ids)
+        .annotate(sharded=shard_total(OuterRef('pk')))
+        .values_list('supply_item', 'supply_item__shelter', 'shard_count', 'current_quantity', 'sharded')
+    )
+    return [
+        {'item': item, 'shelter': shelter, 'quantity': (sharded or Decimal('0.00')) if shard_count else quantity}
+        for item, shelter, shard_count, quantity, sharded in rows
+    ]
+
+
+def _publish(inventory_ids):
+    """
+    Send the stock of the inventories to live clients (apps.core.events). It
+    is read after the commit, so concurrent movements never leave a client
+    with an older total than the last event.
+    """
+    events.publish('stock', lambda: _stock_events(inventory_ids))
+
+
+def _split(total, count):
+    """``total`` split into ``count`` parts differing by at most one cent."""
+    if not count:
+        return []
+    cents, remainder = divmod(int(total * 100), count)
+    return [Decimal(cents + (1 if index < remainder else 0)) / 100 for index in range(count)]
+
+
+def _add_to_shard(inventory, quantity, index=None):
+    if index is None:
+        index = random.randrange(inventory.shard_count)
+    return _shards(inventory).filter(index=index).update(quantity=F('quantity') + quantity)
+
+
+def _consume_lots(inventory, quantity):
+    """Take up to ``quantity`` from the lots, FEFO; return ``[(lot, taken)]``."""
+    lots = (
+        inventory.lots.select_for_update().filter(quantity__gt=0)
+        .order_by(F('expiration_date').asc(nulls_last=True), 'received_at', 'pk')
+    )
+    remaining = quantity
+    taken = []
+    for lot in lots:
+        if remaining <= 0:
+            break
+        take = min(lot.quantity, remaining)
+        lot.quantity -= take
+        remaining -= take
+        taken.append((lot, take))
+    InventoryLot.objects.bulk_update([lot for lot, _ in taken], ['quantity'])
+    return taken
+
+
+@transaction.atomic
+def receive(supply_item, quantity, performed_by=None, comment='', expiration_date=None, lot_number=''):
+    """
+    Add ``quantity`` to stock as a new lot; return ``(inventory, lot)``.
+
+    For sharded inventory the earliest expiry is refreshed by ``compact`` and
+    ``inventory.current_quantity`` is set, unsaved, to the shard total.
+    """
+    inventory = _unlocked_inventory(supply_item)
+    if not inventory.shard_count or not _add_to_shard(inventory, quantity):
+        inventory = _locked_inventory(inventory)
+        if inventory.shard_count:
+            # sharding was switched on while we waited for the lock
+            _add_to_shard(inventory, quantity, index=0)
+        else:
+            inventory.current_quantity += quantity
+            if expiration_date and (inventory.expiration_date is None or expiration_date < inventory.expiration_date):
+                inventory.expiration_date = expiration_date
+            inventory.save(update_fields=['current_quantity', 'expiration_date'])
+
+    lot = InventoryLot.objects.create(
+        inventory=inventory, lot_number=lot_number, received_quantity=quantity,
+        quantity=quantity, expiration_date=expiration_date,
+    )
+    _log(inventory, InventoryOperationType.INBOUND, quantity, comment, performed_by)
+    if inventory.shard_count:
+        inventory.current_quantity = _sharded_total(inventory)
+    _publish([inventory.pk])
+    return inventory, lot
+
+
+@transaction.atomic
+def issue(supply_item, quantity, performed_by=None, comment=''):
+    """
+    Take ``quantity`` from stock, earliest-expiring lots first; return
+    ``(inventory, [(lot, quantity taken)])``.
+
+    For sharded inventory no lots are returned (they are reconciled by
+    ``compact``) and ``inventory.current_quantity`` is set, unsaved, to the
+    shard total after the issue.
+    """
+    inventory = _unlocked_inventory(supply_item)
+    if not inventory.shard_count:
+        inventory = _locked_inventory(inventory)
+    if inventory.shard_count:
+        return _issue_sharded(supply_item, inventory, quantity, performed_by, comment)
+
+    if inventory.current_quantity < quantity:
+        raise InsufficientStock(
+            f'{supply_item.name}: requested {quantity}, in stock {inventory.current_quantity}'
+        )
+
+    taken = _consume_lots(inventory, quantity)
+    inventory.current_quantity -= quantity
+    _refresh_expiration_date(inventory)
+    inventory.save(update_fields=['current_quantity', 'expiration_date'])
+    _log(inventory, InventoryOperationType.OUTBOUND, quantity, comment, performed_by)
+    _publish([inventory.pk])
+    return inventory, taken
+
+
+def _issue_sharded(supply_item, inventory, quantity, performed_by, comment):
+    indexes = list(range(inventory.shard_count))
+    random.shuffle(indexes)
+    for index in indexes:
+        if _shards(inventory).filter(index=index, quantity__gte=quantity).update(
+            quantity=F('quantity') - quantity
+        ):
+            break
+    else:
+        # No shard covers the whole request: lock them all, in index order.
+        shards = list(_shards(inventory).select_for_update().order_by('index'))
+        if not shards and not _locked_inventory(inventory).shard_count:
+            # sharding was switched off meanwhile
+            return issue(supply_item, quantity, performed_by, comment)
+        available = sum((shard.quantity for shard in shards), Decimal('0.00'))
+        if available < quantity:
+            raise InsufficientStock(
+                f'{supply_item.name}: requested {quantity}, in stock {available}'
+            )
+        remaining = quantity
+        for shard in shards:
+            take = min(shard.quantity, remaining)
+            shard.quantity -= take
+            remaining -= take
+        InventoryShard.objects.bulk_update(shards, ['quantity'])
+
+    _log(inventory, InventoryOperationType.OUTBOUND, quantity, comment, performed_by)
+    inventory.current_quantity = _sharded_total(inventory)
+    _publish([inventory.pk])
+    return inventory, []
+
+
+
+
+def _rebalance(inventory, shard_count=None):
+    """
+    Lock the inventory and its shards, reconcile lots with the stock and
+    spread it over ``shard_count`` shards (0: back to the single row, None:
+    keep the current count).
+    """
+    # FOR NO KEY UPDATE: log inserts referencing the row are not blocked
+    inventory = Inventory.objects.select_for_update(no_key=True).get(pk=inventory.pk)
+    if shard_count is None:
+        shard_count = inventory.shard_count
+    shards = list(_shards(inventory).select_for_update().order_by('index'))
+    if inventory.shard_count and shards:
+        total = sum((shard.quantity for shard in shards), Decimal('0.00'))
+        in_lots = inventory.lots.aggregate(total=Sum('quantity'))['total'] or Decimal('0.00')
+        if in_lots > total:
+            _consume_lots(inventory, in_lots - total)
+    else:
+        total = inventory.current_quantity
+
+    if len(shards) == shard_count:
+        for shard, part in zip(shards, _split(total, shard_count)):
+            shard.quantity = part
+        InventoryShard.objects.bulk_update(shards, ['quantity'])
+    else:
+        _shards(inventory).delete()
+        InventoryShard.objects.bulk_create(
+            InventoryShard(inventory=inventory, index=index, quantity=part)
+            for index, part in enumerate(_split(total, shard_count))
+        )
+
+    inventory.current_quantity = total
+    inventory.shard_count = shard_count
+    _refresh_expiration_date(inventory)
+    inventory.save(update_fields=['current_quantity', 'shard_count', 'expiration_date'])
+    return inventory
+
+
+@transaction.atomic
+def set_shard_count(supply_item, shard_count):
+    """Switch an item to ``shard_count`` sub-counters (0: single-row mode)."""
+    if not 0 <= shard_count <= MAX_SHARDS:
+        raise ValueError(f'shard_count must be between 0 and {MAX_SHARDS}')
+    return _rebalance(_unlocked_inventory(supply_item), shard_count)
+
+
+@transaction.atomic
+def compact(inventory):
+    """Fold a sharded inventory's shards back into even parts; return it."""
+    return _rebalance(inventory)
+
+
+def compact_all():
+    """Compact every sharded inventory, each in its own transaction; return the count."""
+    inventories = list(Inventory.objects.filter(shard_count__gt=0))
+    for inventory in inventories:
+        compact(inventory)
+    return len(inventories)
+
+
+@transaction.atomic
+def adjust(counts, performed_by=None, comment='', log=True):
+    """
+    Set the stock of many items to counted quantities at once.
+
+    ``counts`` maps supply item ids to quantities. All inventories are locked
+    with one query (in primary key order, shards after them), differences are
+    logged as ADJ operations with one insert (unless ``log`` is false) and
+    lots are trimmed FEFO where they exceed the new stock; without a log the
+    items' ``updated_at`` is bumped instead. Return
+    ``{supply item id: stock before}``.
+    """
+    item_ids = sorted(counts)
+    Inventory.objects.bulk_create(
+        [Inventory(supply_item_id=item_id) for item_id in item_ids], ignore_conflicts=True,
+    )
+    inventories = list(
+        Inventory.objects.select_for_update().filter(supply_item_id__in=item_ids).order_by('pk')
+    )
+    shards = defaultdict(list)
+    sharded = [inventory.pk for inventory in inventories if inventory.shard_count]
+    if sharded:
+        for shard in InventoryShard.objects.select_for_update().filter(
+            inventory__in=sharded,
+        ).order_by('inventory', 'index'):
+            shards[shard.inventory_id].append(shard)
+    in_lots = dict(
+        InventoryLot.objects.filter(inventory__in=inventories, quantity__gt=0).order_by()
+        .values('inventory').annotate(total=Sum('quantity')).values_list('inventory', 'total')
+    )
+
+    before = {}
+    logs, changed, changed_shards = [], [], []
+    for inventory in inventories:
+        if inventory.shard_count:
+            current = sum((shard.quantity for shard in shards[inventory.pk]), Decimal('0.00'))
+        else:
+            current = inventory.current_quantity
+        before[inventory.supply_item_id] = current
+        counted = counts[inventory.supply_item_id]
+        if counted == current:
+            continue
+        if log:
+            logs.append(InventoryLog(
+                inventory=inventory, operation_type=InventoryOperationType.ADJUSTMENT,
+                quantity=counted - current, comment=comment, performed_by=performed_by,
+            ))
+        inventory.current_quantity = counted
+        for shard, part in zip(shards[inventory.pk], _split(counted, len(shards[inventory.pk]))):
+            shard.quantity = part
+            changed_shards.append(shard)
+        if in_lots.get(inventory.pk, 0) > counted:
+            _consume_lots(inventory, in_lots[inventory.pk] - counted)
+            _refresh_expiration_date(inventory)
+        changed.append(inventory)
+
+    Inventory.objects.bulk_update(changed, ['current_quantity', 'expiration_date'], batch_size=500)
+    InventoryShard.objects.bulk_update(changed_shards, ['quantity'], batch_size=500)
+    InventoryLog.objects.bulk_create(logs, batch_size=1000)
+    if not log and changed:
+        # delta sync (apps.sync) sees stock changes through the log
+        SupplyItem.objects.filter(inventory__in=changed).update(updated_at=timezone.now())
+    if changed:
+        _publish([inventory.pk for inventory in changed])
+    return before
+
+
+def expiring_lots(days, today=None):
+    """Lots with stock left expiring within ``days`` (including expired ones)."""
+    today = today or timezone.localdate()
+    return (
+        InventoryLot.objects.filter(quantity__gt=0, expiration_date__lte=today + timedelta(days=days))
+        .select_related('inventory__supply_item__unit')
+        .order_by('expiration_date', 'pk')
+    )
+
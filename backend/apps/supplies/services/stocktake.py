@@ -0,0 +1,116 @@
+"""
+Stocktake (physical inventory count) sessions.
+
+Staff open a session, submit counted quantities in batches (repeated counts
+of an item overwrite the earlier one) and commit it: the stock of every
+counted item is set to the counted quantity in one transaction through
+``stock.adjust``, which logs the differences as ADJ operations.
+"""
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.supplies.models import (
+    Stocktake, StocktakeLine, StocktakeStatus, SupplyItem,
+)
+from apps.supplies.services import stock
+
+MAX_BATCH = 5000
+
+
+def _check_open(stocktake):
+    if stocktake.status != StocktakeStatus.OPEN:
+        raise ValidationError(f'Stocktake #{stocktake.pk} is {stocktake.get_status_display().lower()}.')
+
+
+@transaction.atomic
+def record_counts(stocktake, counts):
+    """
+    Store counted quantities (``{supply item id: quantity}``) with one
+    upsert; return the number of lines written.
+    """
+    stocktake = Stocktake.objects.select_for_update().get(pk=stocktake.pk)
+    _check_open(stocktake)
+    if len(counts) > MAX_BATCH:
+        raise ValidationError(f'At most {MAX_BATCH} items per batch.')
+    negative = sorted(item_id for item_id, quantity in counts.items() if quantity < 0)
+    if negative:
+        raise ValidationError(f'Counted quantities cannot be negative: {negative}')
+    items = SupplyItem.objects.filter(pk__in=counts)
+    if stocktake.shelter_id is not None:
+        # a shelter's stocktake counts only that shelter's items
+        items = items.filter(shelter=stocktake.shelter_id)
+    known = set(items.values_list('pk', flat=True))
+    missing = sorted(set(counts) - known)
+    if missing:
+        raise ValidationError(f'Supply items not found: {missing}')
+
+    StocktakeLine.objects.bulk_create(
+        [
+            StocktakeLine(stocktake=stocktake, supply_item_id=item_id, counted_quantity=quantity)
+            for item_id, quantity in counts.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['stocktake', 'supply_item'],
+        update_fields=['counted_quantity', 'counted_at'],
+        batch_size=1000,
+    )
+    return len(counts)
+
+
+def lines_with_differences(stocktake):
+    """
+    Lines annotated with the item's stock (``system_quantity``) and the
+    difference to the count, in one query. After the commit the stock is the
+    one recorded at commit time.
+    """
+    decimal = DecimalField(max_digits=10, decimal_places=2)
+    sharded_total = stock.shard_total(OuterRef('supply_item__inventory'))
+    current = Case(
+        When(supply_item__inventory__shard_count__gt=0, then=Coalesce(sharded_total, Value(Decimal('0')))),
+        default=Coalesce('supply_item__inventory__current_quantity', Value(Decimal('0'))),
+        output_field=decimal,
+    )
+    return (
+        stocktake.lines.select_related('supply_item__unit')
+        .annotate(system_quantity=Coalesce('expected_quantity', current, output_field=decimal))
+        .annotate(difference=F('counted_quantity') - F('system_quantity'))
+    )
+
+
+@transaction.atomic
+def commit(stocktake, user=None):
+    """
+    Apply the counts to the stock; return the number of adjusted items.
+    """
+    stocktake = Stocktake.objects.select_for_update().get(pk=stocktake.pk)
+    _check_open(stocktake)
+    lines = list(stocktake.lines.all())
+    before = stock.adjust(
+        {line.supply_item_id: line.counted_quantity for line in lines},
+        performed_by=user, comment=f'Inwentaryzacja #{stocktake.pk}',
+    )
+    for line in lines:
+        line.expected_quantity = before[line.supply_item_id]
+    StocktakeLine.objects.bulk_update(lines, ['expected_quantity'], batch_size=500)
+
+    stocktake.status = StocktakeStatus.COMMITTED
+    stocktake.closed_at = timezone.now()
+    stocktake.closed_by = user
+    stocktake.save(update_fields=['status', 'closed_at', 'closed_by'])
+    return sum(1 for line in lines if line.counted_quantity != line.expected_quantity)
+
+
+@transaction.atomic
+def cancel(stocktake, user=None):
+    stocktake = Stocktake.objects.select_for_update().get(pk=stocktake.pk)
+    _check_open(stocktake)
+    stocktake.status = StocktakeStatus.CANCELLED
+    stocktake.closed_at = timezone.now()
+    stocktake.closed_by = user
+    stocktake.save(update_fields=['status', 'closed_at', 'closed_by'])
+    return stocktake
@@ -28,6 +28,7 @@ def employee_user(db):
         first_name='Jan',
         last_name='Kowalski',
         role=Role.EMPLOYEE,
+        is_head_office=True,
     )
 
 
@@ -40,6 +41,7 @@ def volunteer_user(db):
         first_name='Anna',
         last_name='Nowak',
         role=Role.VOLUNTEER,
+        is_head_office=True,
     )
 
 
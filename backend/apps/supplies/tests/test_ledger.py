@@ -0,0 +1,105 @@
+"""
+Tests for the inventory ledger verifier.
+"""
+import json
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from apps.supplies.models import Inventory, InventoryLog, InventoryOperationType
+from apps.supplies.services import ledger, stock
+
+
+@pytest.fixture
+def ledgered_items(supply_items, employee_user):
+    """Dog food and cat food with stock matching their logs, antibiotics drifted by +5."""
+    dog_food, cat_food, antibiotics = supply_items
+    for item in (dog_food, cat_food):
+        InventoryLog.objects.create(
+            inventory=item.inventory, operation_type=InventoryOperationType.INBOUND,
+            quantity=item.inventory.current_quantity + 10,
+        )
+        InventoryLog.objects.create(
+            inventory=item.inventory, operation_type=InventoryOperationType.OUTBOUND, quantity=Decimal('10'),
+        )
+    stock.receive(antibiotics, Decimal('3'))
+    return supply_items
+
+
+def run(**options):
+    out = StringIO()
+    call_command('verify_inventory_ledger', stdout=out, stderr=StringIO(), **options)
+    return json.loads(out.getvalue())
+
+
+@pytest.mark.django_db
+class TestLedgerService:
+    """Tests for chunked checks and repairs."""
+
+    def test_chunks_split_between_parts(self, supply_items):
+        low = Inventory.objects.order_by('pk').first().pk
+        assert ledger.chunks(2) == [(low, low + 2), (low + 2, low + 4)]
+        assert ledger.chunks(1, part=1, parts=2) == [(low + 1, low + 2)]
+
+    def test_check_chunk(self, ledgered_items):
+        inventories, log_rows, drift = ledger.check_chunk(0, 10 ** 9)
+
+        assert (inventories, log_rows) == (3, 5)
+        assert [(row['name'], row['drift']) for row in drift] == [('Antybiotyki', Decimal('5.00'))]
+
+    def test_adjustments_count_with_sign(self, ledgered_items):
+        dog_food = ledgered_items[0]
+        stock.adjust({dog_food.pk: Decimal('30')})
+
+        _, _, drift = ledger.check_chunk(0, 10 ** 9)
+        assert [row['name'] for row in drift] == ['Antybiotyki']
+
+    def test_repair_stock(self, ledgered_items):
+        antibiotics = ledgered_items[2]
+        drift = ledger.confirm([antibiotics.inventory.pk], repair=ledger.REPAIR_STOCK)
+
+        assert drift[0]['repaired']
+        antibiotics.inventory.refresh_from_db()
+        assert antibiotics.inventory.current_quantity == Decimal('3')
+        assert ledger.check_chunk(0, 10 ** 9)[2] == []
+
+    def test_repair_ledger(self, ledgered_items):
+        antibiotics = ledgered_items[2]
+        ledger.confirm([antibiotics.inventory.pk], repair=ledger.REPAIR_LEDGER)
+
+        assert antibiotics.inventory.logs.get(operation_type=InventoryOperationType.ADJUSTMENT).quantity == 5
+        assert ledger.check_chunk(0, 10 ** 9)[2] == []
+
+    def test_sharded_stock(self, ledgered_items):
+        dog_food = ledgered_items[0]
+        stock.set_shard_count(dog_food, 3)
+        stock.issue(dog_food, Decimal('4'))
+
+        _, _, drift = ledger.check_chunk(0, 10 ** 9)
+        assert [row['name'] for row in drift] == ['Antybiotyki']
+
+
+@pytest.mark.django_db
+class TestVerifyCommand:
+    """Tests for the verify_inventory_ledger command."""
+
+    def test_report(self, ledgered_items):
+        report = run(chunk_size=1)
+
+        assert report['summary']['inventories'] == 3
+        assert report['summary']['log_rows'] == 5
+        assert report['summary']['drifted'] == 1
+        assert report['chunks']['requests'] == 3
+        assert report['drift'][0]['name'] == 'Antybiotyki'
+
+    def test_repair_and_fail_on_drift(self, ledgered_items):
+        with pytest.raises(CommandError):
+            run(fail_on_drift=True)
+
+        assert run(repair='stock')['summary']['repaired'] == 1
+        assert run(fail_on_drift=True)['summary']['drifted'] == 0
+
+    def test_invalid_part(self, db):
+        with pytest.raises(CommandError):
+            run(part=2, parts=2)
@@ -0,0 +1,122 @@
+"""
+Tests for inventory log partitioning helpers.
+
+The partition DDL needs PostgreSQL; those tests are skipped on SQLite.
+"""
+import json
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+from apps.supplies.models import Inventory, InventoryLog, InventoryOperationType
+from apps.supplies.services import ledger, log_partitions
+
+needs_postgres = pytest.mark.skipif(connection.vendor != 'postgresql', reason='partitioning needs PostgreSQL')
+
+TODAY = date(2026, 10, 15)
+
+
+@pytest.mark.parametrize('month, count, expected', [
+    (date(2026, 1, 1), 1, date(2026, 2, 1)),
+    (date(2026, 12, 1), 1, date(2027, 1, 1)),
+    (date(2026, 1, 1), -1, date(2025, 12, 1)),
+    (date(2026, 3, 1), -24, date(2024, 3, 1)),
+])
+def test_add_months(month, count, expected):
+    assert log_partitions.add_months(month, count) == expected
+
+
+def test_partition_names():
+    name = log_partitions.partition_name(date(2026, 10, 1))
+
+    assert name == 'supplies_inventorylog_p2026_10'
+    assert log_partitions.month_of(name) == date(2026, 10, 1)
+    assert log_partitions.month_of(log_partitions.DEFAULT_PARTITION) is None
+
+
+@pytest.mark.django_db
+def test_command_needs_postgres():
+    with pytest.raises(CommandError, match='PostgreSQL'):
+        call_command('inventory_log_partitions', 'status', stdout=StringIO())
+
+
+def balances():
+    return dict(
+        InventoryLog.objects.order_by().values('inventory').annotate(total=ledger.balance())
+        .values_list('inventory', 'total')
+    )
+
+
+def verify():
+    out = StringIO()
+    call_command('verify_inventory_ledger', stdout=out, stderr=StringIO())
+    return json.loads(out.getvalue())['summary']
+
+
+@pytest.fixture
+def dated_logs(supply_items):
+    """Receipts and issues of dog and cat food from January to September 2026; stock matches."""
+    def log(item, operation, quantity, day):
+        entry = InventoryLog.objects.create(
+            inventory=item.inventory, operation_type=operation, quantity=Decimal(quantity),
+        )
+        InventoryLog.objects.filter(pk=entry.pk).update(timestamp=timezone.make_aware(day))
+
+    dog_food, cat_food, _ = supply_items
+    for item in (dog_food, cat_food):
+        log(item, InventoryOperationType.INBOUND, '50', datetime(2026, 1, 10))
+        log(item, InventoryOperationType.OUTBOUND, '20', datetime(2026, 1, 20))
+        log(item, InventoryOperationType.INBOUND, '10', datetime(2026, 2, 5))
+        log(item, InventoryOperationType.OUTBOUND, '5', datetime(2026, 9, 1))
+    totals = balances()
+    for inventory in Inventory.objects.all():
+        inventory.current_quantity = totals.get(inventory.pk, Decimal('0'))
+        inventory.save(update_fields=['current_quantity'])
+    return supply_items
+
+
+@needs_postgres
+@pytest.mark.django_db
+class TestPartitioning:
+    """Tests for the partition DDL."""
+
+    def test_convert_keeps_rows_and_balances(self, dated_logs):
+        rows, totals = InventoryLog.objects.count(), balances()
+
+        created = log_partitions.convert(months_ahead=1, today=TODAY)
+
+        assert log_partitions.is_partitioned()
+        months = [month for _, month, _ in created if month]
+        assert months[0] == date(2026, 1, 1)
+        assert months[-1] == date(2026, 11, 1)
+        assert InventoryLog.objects.count() == rows
+        assert balances() == totals
+        assert verify()['drifted'] == 0
+        # new rows get fresh ids and land in their month
+        entry = InventoryLog.objects.create(
+            inventory=dated_logs[0].inventory, operation_type=InventoryOperationType.INBOUND, quantity=Decimal('1'),
+        )
+        assert entry.pk > max(InventoryLog.objects.exclude(pk=entry.pk).values_list('pk', flat=True))
+
+    def test_archive_carries_balances_forward(self, dated_logs, tmp_path):
+        log_partitions.convert(months_ahead=1, today=TODAY)
+        totals = balances()
+
+        archived = log_partitions.archive(tmp_path, retention_months=6, today=TODAY)
+
+        assert [name for name, _, _ in archived] == [
+            log_partitions.partition_name(date(2026, month, 1)) for month in (1, 2, 3)
+        ]
+        assert all((tmp_path / f'{name}.csv.gz').exists() for name, _, _ in archived)
+        assert balances() == totals
+        # January's carry-forward went into February and was carried again
+        carried = InventoryLog.objects.filter(operation_type=InventoryOperationType.ADJUSTMENT)
+        assert sorted(carried.values_list('quantity', flat=True)) == [Decimal('40.00')] * 2
+        assert {entry.timestamp for entry in carried} == {
+            timezone.make_aware(datetime(2026, 4, 1)),
+        }
+        assert verify()['drifted'] == 0
@@ -0,0 +1,133 @@
+"""
+Tests for sharded inventory counters.
+"""
+import json
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from apps.supplies.models import InventoryLog, InventoryLot, InventoryOperationType, InventoryShard
+from apps.supplies.services import stock
+
+
+def shards(item):
+    return list(InventoryShard.objects.filter(inventory__supply_item=item).values_list('quantity', flat=True))
+
+
+@pytest.fixture
+def sharded_food(supply_item_dog_food):
+    """Dog food (35.00 in stock) spread over three shards."""
+    stock.set_shard_count(supply_item_dog_food, 3)
+    supply_item_dog_food.inventory.refresh_from_db()
+    return supply_item_dog_food
+
+
+@pytest.mark.django_db
+class TestShardedStock:
+    """Tests for movements of sharded inventory."""
+
+    def test_set_shard_count_splits_stock(self, sharded_food):
+        assert shards(sharded_food) == [Decimal('11.67'), Decimal('11.67'), Decimal('11.66')]
+        assert sharded_food.inventory.shard_count == 3
+        assert sharded_food.current_quantity == Decimal('35.00')
+
+    def test_issue_from_one_shard(self, sharded_food, employee_user, django_assert_max_num_queries):
+        before = shards(sharded_food)
+        # get inventory, at most three shard updates, log, total
+        with django_assert_max_num_queries(8):
+            inventory, taken = stock.issue(sharded_food, Decimal('5'), performed_by=employee_user)
+
+        assert taken == []
+        assert inventory.current_quantity == Decimal('30.00')
+        assert [old - new for old, new in zip(before, shards(sharded_food)) if old != new] == [Decimal('5')]
+        assert InventoryLog.objects.filter(operation_type=InventoryOperationType.OUTBOUND).count() == 1
+
+    def test_issue_across_shards(self, sharded_food):
+        inventory, _ = stock.issue(sharded_food, Decimal('30'))
+
+        assert inventory.current_quantity == Decimal('5.00')
+        assert all(quantity >= 0 for quantity in shards(sharded_food))
+
+    def test_insufficient_stock(self, sharded_food):
+        with pytest.raises(stock.InsufficientStock):
+            stock.issue(sharded_food, Decimal('35.01'))
+        assert sum(shards(sharded_food)) == Decimal('35.00')
+
+    def test_receive_adds_to_a_shard(self, sharded_food):
+        inventory, lot = stock.receive(sharded_food, Decimal('10'), lot_number='L1')
+
+        assert inventory.current_quantity == Decimal('45.00')
+        assert sum(shards(sharded_food)) == Decimal('45.00')
+        assert lot.quantity == Decimal('10')
+
+    def test_compact_reconciles_lots(self, sharded_food):
+        today = date.today()
+        stock.receive(sharded_food, Decimal('4'), lot_number='A', expiration_date=today + timedelta(days=5))
+        stock.receive(sharded_food, Decimal('6'), lot_number='B', expiration_date=today + timedelta(days=50))
+        stock.issue(sharded_food, Decimal('40'))
+
+        inventory = stock.compact(sharded_food.inventory)
+
+        assert inventory.current_quantity == Decimal('5.00')
+        assert shards(sharded_food) == [Decimal('1.67'), Decimal('1.67'), Decimal('1.66')]
+        lots = dict(InventoryLot.objects.filter(inventory=inventory).values_list('lot_number', 'quantity'))
+        assert lots == {'A': Decimal('0'), 'B': Decimal('5')}
+        assert inventory.expiration_date == today + timedelta(days=50)
+
+    def test_back_to_single_row(self, sharded_food):
+        stock.issue(sharded_food, Decimal('5'))
+        inventory = stock.set_shard_count(sharded_food, 0)
+
+        assert inventory.current_quantity == Decimal('30.00')
+        assert shards(sharded_food) == []
+        inventory, _ = stock.issue(sharded_food, Decimal('1'))
+        assert inventory.current_quantity == Decimal('29.00')
+
+    def test_invalid_shard_count(self, supply_item_dog_food):
+        with pytest.raises(ValueError):
+            stock.set_shard_count(supply_item_dog_food, stock.MAX_SHARDS + 1)
+
+
+@pytest.mark.django_db
+class TestShardedEndpoints:
+    """Tests for sharded inventory through the API."""
+
+    def test_list_sums_shards(self, authenticated_employee, sharded_food):
+        stock.issue(sharded_food, Decimal('5'))
+        response = authenticated_employee.get(reverse('supplies:supply-item-list'))
+
+        assert Decimal(response.data['results'][0]['current_quantity']) == Decimal('30.00')
+
+    def test_update_inventory_out(self, authenticated_employee, sharded_food):
+        url = reverse('supplies:supply-item-update-inventory', kwargs={'pk': sharded_food.pk})
+        response = authenticated_employee.post(url, {'change_type': 'out', 'quantity_change': '20'}, format='json')
+
+        assert response.status_code == 200
+        assert response.data['new_quantity'] == Decimal('15.00')
+
+
+@pytest.mark.django_db
+class TestCommands:
+    """Tests for the compaction and benchmark commands."""
+
+    def test_compact_all(self, sharded_food):
+        stock.issue(sharded_food, Decimal('5'))
+        call_command('compact_inventory_shards', stdout=StringIO())
+
+        sharded_food.inventory.refresh_from_db()
+        assert sharded_food.inventory.current_quantity == Decimal('30.00')
+        assert shards(sharded_food) == [Decimal('10.00')] * 3
+
+    def test_reshard_item(self, supply_item_dog_food):
+        call_command('compact_inventory_shards', item=supply_item_dog_food.name, shards=5, stdout=StringIO())
+        assert len(shards(supply_item_dog_food)) == 5
+
+    def test_benchmark(self, supply_item_dog_food):
+        out = StringIO()
+        call_command('benchmark_inventory', shards='0,4', requests=20, concurrency=1, stdout=out, stderr=StringIO())
+
+        runs = json.loads(out.getvalue())['runs']
+        assert runs['0']['stock_consistent'] and runs['4']['stock_consistent']
+        assert runs['4']['errors'] == 0
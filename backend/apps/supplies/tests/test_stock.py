@@ -0,0 +1,108 @@
+"""
+Tests for lot tracking and FEFO stock issues.
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.urls import reverse
+from apps.supplies.models import InventoryLog, InventoryLot, InventoryOperationType
+from apps.supplies.services import stock
+
+
+@pytest.fixture
+def antibiotic_lots(supply_item_antibiotics, employee_user):
+    """Three lots received out of expiry order."""
+    today = date.today()
+    for lot_number, quantity, days in (('B', '10', 60), ('A', '5', 10), ('C', '8', 200)):
+        stock.receive(
+            supply_item_antibiotics, Decimal(quantity), performed_by=employee_user,
+            expiration_date=today + timedelta(days=days), lot_number=lot_number,
+        )
+    return supply_item_antibiotics
+
+
+def remaining(item):
+    return dict(
+        InventoryLot.objects.filter(inventory__supply_item=item).values_list('lot_number', 'quantity')
+    )
+
+
+@pytest.mark.django_db
+class TestStockService:
+    """Tests for receipts and FEFO issues."""
+
+    def test_receive_creates_lot(self, antibiotic_lots):
+        inventory = antibiotic_lots.inventory
+        inventory.refresh_from_db()
+
+        assert remaining(antibiotic_lots) == {'A': Decimal('5'), 'B': Decimal('10'), 'C': Decimal('8')}
+        assert inventory.expiration_date == date.today() + timedelta(days=10)
+        assert inventory.logs.filter(operation_type=InventoryOperationType.INBOUND).count() == 3
+
+    def test_issue_consumes_earliest_expiring_first(self, antibiotic_lots, employee_user):
+        antibiotic_lots.inventory.refresh_from_db()
+        before = antibiotic_lots.inventory.current_quantity
+        inventory, taken = stock.issue(antibiotic_lots, Decimal('7'), performed_by=employee_user)
+
+        assert [(lot.lot_number, quantity) for lot, quantity in taken] == [('A', Decimal('5')), ('B', Decimal('2'))]
+        assert remaining(antibiotic_lots) == {'A': Decimal('0'), 'B': Decimal('8'), 'C': Decimal('8')}
+        assert inventory.current_quantity == before - 7
+        assert inventory.expiration_date == date.today() + timedelta(days=60)
+
+    def test_stock_without_lot_is_used_last(self, supply_item_dog_food, employee_user):
+        stock.receive(supply_item_dog_food, Decimal('10'), expiration_date=date.today() + timedelta(days=5))
+        inventory, taken = stock.issue(supply_item_dog_food, Decimal('12'))
+
+        assert [quantity for _, quantity in taken] == [Decimal('10')]
+        assert inventory.current_quantity == Decimal('33.00')
+
+    def test_insufficient_stock(self, antibiotic_lots):
+        with pytest.raises(stock.InsufficientStock):
+            stock.issue(antibiotic_lots, Decimal('1000'))
+        assert not InventoryLog.objects.filter(operation_type=InventoryOperationType.OUTBOUND).exists()
+
+    def test_expiring_lots(self, antibiotic_lots):
+        assert [lot.lot_number for lot in stock.expiring_lots(days=60)] == ['A', 'B']
+        stock.issue(antibiotic_lots, Decimal('5'))
+        assert [lot.lot_number for lot in stock.expiring_lots(days=60)] == ['B']
+
+
+@pytest.mark.django_db
+class TestLotEndpoints:
+    """Tests for lot-aware inventory endpoints."""
+
+    def test_update_inventory_in_with_lot(self, authenticated_employee, supply_item_antibiotics):
+        url = reverse('supplies:supply-item-update-inventory', kwargs={'pk': supply_item_antibiotics.pk})
+        response = authenticated_employee.post(url, {
+            'change_type': 'in', 'quantity_change': '4', 'expiration_date': '2030-01-31', 'lot_number': 'X1',
+        }, format='json')
+
+        assert response.status_code == 200
+        assert response.data['lots'][0]['lot_number'] == 'X1'
+        assert InventoryLot.objects.get(lot_number='X1').expiration_date == date(2030, 1, 31)
+
+    def test_update_inventory_out_fefo(self, authenticated_employee, antibiotic_lots):
+        url = reverse('supplies:supply-item-update-inventory', kwargs={'pk': antibiotic_lots.pk})
+        response = authenticated_employee.post(url, {'change_type': 'out', 'quantity_change': '6'}, format='json')
+
+        assert response.status_code == 200
+        assert [lot['lot_number'] for lot in response.data['lots']] == ['A', 'B']
+
+    def test_update_inventory_out_insufficient(self, authenticated_employee, antibiotic_lots):
+        url = reverse('supplies:supply-item-update-inventory', kwargs={'pk': antibiotic_lots.pk})
+        response = authenticated_employee.post(url, {'change_type': 'out', 'quantity_change': '999'}, format='json')
+
+        assert response.status_code == 400
+
+    def test_expiring_endpoint(self, authenticated_employee, antibiotic_lots):
+        response = authenticated_employee.get(reverse('supplies:inventory-lot-expiring'), {'days': 30})
+
+        assert response.status_code == 200
+        assert [lot['lot_number'] for lot in response.data['results']] == ['A']
+        assert response.data['results'][0]['supply_item_name'] == 'Antybiotyki'
+
+    def test_item_lots(self, authenticated_employee, antibiotic_lots):
+        url = reverse('supplies:supply-item-lots', kwargs={'pk': antibiotic_lots.pk})
+        response = authenticated_employee.get(url)
+
+        assert [lot['lot_number'] for lot in response.data] == ['A', 'B', 'C']
@@ -0,0 +1,153 @@
+"""
+Tests for stocktake sessions and bulk stock adjustments.
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from apps.supplies.models import (
+    InventoryLog, InventoryLot, InventoryOperationType, Stocktake, StocktakeStatus, SupplyItem,
+)
+from apps.supplies.services import stock, stocktake
+
+
+@pytest.fixture
+def session(employee_user):
+    return Stocktake.objects.create(opened_by=employee_user)
+
+
+def adjustments():
+    return dict(
+        InventoryLog.objects.filter(operation_type=InventoryOperationType.ADJUSTMENT)
+        .values_list('inventory__supply_item__name', 'quantity')
+    )
+
+
+@pytest.mark.django_db
+class TestStocktakeService:
+    """Tests for recording counts and committing them."""
+
+    def test_counts_overwrite(self, session, supply_item_dog_food):
+        stocktake.record_counts(session, {supply_item_dog_food.pk: Decimal('30')})
+        stocktake.record_counts(session, {supply_item_dog_food.pk: Decimal('31')})
+
+        assert list(session.lines.values_list('counted_quantity', flat=True)) == [Decimal('31')]
+
+    def test_unknown_item_and_negative_count(self, session, supply_item_dog_food):
+        with pytest.raises(ValidationError):
+            stocktake.record_counts(session, {999999: Decimal('1')})
+        with pytest.raises(ValidationError):
+            stocktake.record_counts(session, {supply_item_dog_food.pk: Decimal('-1')})
+
+    def test_differences(self, session, supply_items):
+        dog_food, cat_food, antibiotics = supply_items
+        stocktake.record_counts(session, {dog_food.pk: Decimal('30'), antibiotics.pk: Decimal('5')})
+
+        lines = {line.supply_item.name: line.difference for line in stocktake.lines_with_differences(session)}
+        assert lines == {'Karma sucha dla psów': Decimal('-5'), 'Antybiotyki': Decimal('0')}
+
+    def test_commit(self, session, supply_items, employee_user):
+        dog_food, cat_food, antibiotics = supply_items
+        stocktake.record_counts(session, {
+            dog_food.pk: Decimal('30'), cat_food.pk: Decimal('130'), antibiotics.pk: Decimal('5'),
+        })
+
+        adjusted = stocktake.commit(session, employee_user)
+
+        assert adjusted == 2
+        assert adjustments() == {'Karma sucha dla psów': Decimal('-5'), 'Karma mokra dla kotów': Decimal('10')}
+        dog_food.inventory.refresh_from_db()
+        assert dog_food.inventory.current_quantity == Decimal('30')
+        session.refresh_from_db()
+        assert session.status == StocktakeStatus.COMMITTED
+        assert session.lines.get(supply_item=dog_food).expected_quantity == Decimal('35.00')
+
+    def test_commit_trims_lots_and_sharded_stock(self, session, supply_item_antibiotics, supply_item_dog_food):
+        today = date.today()
+        stock.receive(supply_item_antibiotics, Decimal('4'), lot_number='A', expiration_date=today + timedelta(days=5))
+        stock.receive(supply_item_antibiotics, Decimal('6'), lot_number='B', expiration_date=today + timedelta(days=50))
+        stock.set_shard_count(supply_item_dog_food, 4)
+        stocktake.record_counts(session, {supply_item_antibiotics.pk: Decimal('8'), supply_item_dog_food.pk: Decimal('20')})
+
+        stocktake.commit(session)
+
+        lots = dict(InventoryLot.objects.filter(inventory__supply_item=supply_item_antibiotics)
+                    .values_list('lot_number', 'quantity'))
+        assert lots == {'A': Decimal('2'), 'B': Decimal('6')}
+        assert SupplyItem.objects.get(pk=supply_item_dog_food.pk).current_quantity == Decimal('20')
+
+    def test_item_without_inventory(self, session, category_food, unit_kg):
+        item = SupplyItem.objects.create(name='Żwirek', category=category_food, unit=unit_kg)
+        stocktake.record_counts(session, {item.pk: Decimal('12')})
+        stocktake.commit(session)
+
+        assert SupplyItem.objects.get(pk=item.pk).current_quantity == Decimal('12')
+
+    def test_closed_session_rejects_changes(self, session, supply_item_dog_food):
+        stocktake.cancel(session)
+        with pytest.raises(ValidationError):
+            stocktake.record_counts(session, {supply_item_dog_food.pk: Decimal('1')})
+        with pytest.raises(ValidationError):
+            stocktake.commit(session)
+
+    def test_commit_query_count_independent_of_items(
+        self, session, category_food, unit_kg, django_assert_max_num_queries,
+    ):
+        items = SupplyItem.objects.bulk_create(
+            SupplyItem(name=f'Pozycja {i}', category=category_food, unit=unit_kg) for i in range(300)
+        )
+        stocktake.record_counts(session, {item.pk: Decimal(i) for i, item in enumerate(items)})
+
+        # constant apart from batching (SQLite limits parameters per statement)
+        with django_assert_max_num_queries(20):
+            adjusted = stocktake.commit(session)
+
+        assert adjusted == 299
+        assert InventoryLog.objects.filter(operation_type=InventoryOperationType.ADJUSTMENT).count() == 299
+
+
+@pytest.mark.django_db
+class TestStocktakeEndpoints:
+    """Tests for the stocktake API."""
+
+    def test_full_session(self, authenticated_employee, supply_items):
+        dog_food, cat_food, antibiotics = supply_items
+        response = authenticated_employee.post(reverse('supplies:stocktake-list'), {'notes': 'Q4'}, format='json')
+        assert response.status_code == 201
+        pk = response.data['id']
+
+        response = authenticated_employee.post(
+            reverse('supplies:stocktake-counts', kwargs={'pk': pk}),
+            {'counts': [
+                {'supply_item': dog_food.pk, 'counted_quantity': '33'},
+                {'supply_item': antibiotics.pk, 'counted_quantity': '5'},
+            ]}, format='json',
+        )
+        assert response.data == {'recorded': 2}
+
+        response = authenticated_employee.get(
+            reverse('supplies:stocktake-lines', kwargs={'pk': pk}), {'differences': 'true'},
+        )
+        assert [(line['supply_item_name'], line['difference']) for line in response.data['results']] == [
+            ('Karma sucha dla psów', '-2.00'),
+        ]
+
+        response = authenticated_employee.post(reverse('supplies:stocktake-commit', kwargs={'pk': pk}))
+        assert response.status_code == 200
+        assert (response.data['status'], response.data['adjusted'], response.data['line_count']) == (
+            StocktakeStatus.COMMITTED, 1, 2,
+        )
+
+        response = authenticated_employee.post(reverse('supplies:stocktake-commit', kwargs={'pk': pk}))
+        assert response.status_code == 400
+
+    def test_invalid_counts(self, authenticated_employee, session):
+        url = reverse('supplies:stocktake-counts', kwargs={'pk': session.pk})
+        response = authenticated_employee.post(url, {'counts': [{'supply_item': 1, 'counted_quantity': '-3'}]},
+                                               format='json')
+        assert response.status_code == 400
+
+    def test_volunteer_forbidden(self, authenticated_volunteer):
+        response = authenticated_volunteer.get(reverse('supplies:stocktake-list'))
+        assert response.status_code == 403
@@ -3,14 +3,20 @@ URL configuration for supplies app.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import SupplyItemViewSet, SupplyCategoryViewSet
+from .views import (
+    SupplyItemViewSet, SupplyCategoryViewSet, SupplyCategoryListView, InventoryLotViewSet,
+    StocktakeViewSet,
+)
 
 app_name = 'supplies'
 
 router = DefaultRouter()
 router.register(r'items', SupplyItemViewSet, basename='supply-item')
 router.register(r'categories', SupplyCategoryViewSet, basename='supply-category')
+router.register(r'lots', InventoryLotViewSet, basename='inventory-lot')
+router.register(r'stocktakes', StocktakeViewSet, basename='stocktake')
 
 urlpatterns = [
+    path('categories/', SupplyCategoryListView.as_view(), name='supply-category-list'),
     path('', include(router.urls)),
 ]
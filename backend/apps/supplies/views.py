@@ -1,29 +1,46 @@
 """
 Views for supplies app.
 """
-from rest_framework import viewsets, filters, status
+from rest_framework import mixins, viewsets, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db import transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count, F, OuterRef, Prefetch
+from datetime import date
 from decimal import Decimal, InvalidOperation
 from apps.accounts.permissions import IsEmployee
-from .models import SupplyItem, SupplyCategory, Inventory, InventoryLog, InventoryOperationType
+from apps.core.async_views import AsyncViewSetView
+from apps.core.replicas import ReplicaReadMixin
+from apps.shelters.tenancy import ShelterScopedMixin
+from .models import (
+    SupplyItem, SupplyCategory, Inventory, InventoryLot, SupplyOrderLine,
+    SupplyOrderStatus, Stocktake,
+)
 from .serializers import (
     SupplyItemListSerializer,
     SupplyItemDetailSerializer,
     SupplyCategorySerializer,
     InventoryLogSerializer,
+    InventoryLotSerializer,
+    StocktakeSerializer,
+    StocktakeLineSerializer,
+    StocktakeCountSerializer,
 )
 from .filters import SupplyItemFilter
+from .services import stock, stocktake
 
 
-class SupplyItemViewSet(viewsets.ReadOnlyModelViewSet):
+class SupplyItemViewSet(ShelterScopedMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing supply items.
 
     list: Get all supply items with optional filtering and search.
     retrieve: Get detailed information about a single supply item.
+
+    list and retrieve read from the replica when one is configured;
+    update_inventory always uses the primary.
     """
     permission_classes = [IsEmployee]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -35,10 +52,25 @@ class SupplyItemViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         """
         Get queryset with optimized joins.
+
+        The list view prefetches pending order lines in one query, so
+        next_delivery does not cost a query per item. The stock of sharded
+        inventories is summed in the same query.
         """
-        return SupplyItem.objects.select_related(
+        queryset = SupplyItem.objects.select_related(
             'category', 'unit', 'inventory'
-        ).all()
+        ).annotate(sharded_quantity=stock.shard_total(OuterRef('inventory')))
+        if self.action == 'list':
+            queryset = queryset.prefetch_related(Prefetch(
+                'order_lines',
+                queryset=SupplyOrderLine.objects.filter(
+                    order__status=SupplyOrderStatus.IN_PROGRESS
+                ).select_related('order', 'order__supplier').order_by(
+                    'order__expected_delivery_date'
+                ),
+                to_attr='pending_order_lines',
+            ))
+        return queryset
 
     def get_serializer_class(self):
         """
@@ -91,35 +123,141 @@ class SupplyItemViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        with transaction.atomic():
-            # Get or create inventory
-            inventory, _ = Inventory.objects.get_or_create(supply_item=supply_item)
-
-            # Calculate new quantity
-            if change_type == 'in':
-                inventory.current_quantity += quantity_change
-                operation_type = InventoryOperationType.INBOUND
-            else:
-                if inventory.current_quantity < quantity_change:
+        if change_type == 'in':
+            expiration_date = request.data.get('expiration_date') or None
+            if expiration_date is not None:
+                try:
+                    expiration_date = date.fromisoformat(str(expiration_date))
+                except ValueError:
                     return Response(
-                        {'error': 'Insufficient stock'},
+                        {'error': 'expiration_date must be a date (YYYY-MM-DD)'},
                         status=status.HTTP_400_BAD_REQUEST
                     )
-                inventory.current_quantity -= quantity_change
-                operation_type = InventoryOperationType.OUTBOUND
-
-            inventory.save()
-
-            # Create log entry
-            InventoryLog.objects.create(
-                inventory=inventory,
-                operation_type=operation_type,
-                quantity=quantity_change,
-                comment=reason,
-                performed_by=request.user,
+            inventory, lot = stock.receive(
+                supply_item, quantity_change, performed_by=request.user, comment=reason,
+                expiration_date=expiration_date, lot_number=request.data.get('lot_number', ''),
             )
+            lots = [(lot, quantity_change)]
+        else:
+            try:
+                inventory, lots = stock.issue(
+                    supply_item, quantity_change, performed_by=request.user, comment=reason,
+                )
+            except stock.InsufficientStock:
+                return Response(
+                    {'error': 'Insufficient stock'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        return Response({
+            'status': 'ok',
+            'new_quantity': inventory.current_quantity,
+            'lots': [
+                {'id': lot.id, 'lot_number': lot.lot_number, 'expiration_date': lot.expiration_date,
+                 'quantity': quantity, 'remaining': lot.quantity}
+                for lot, quantity in lots
+            ],
+        })
 
-        return Response({'status': 'ok', 'new_quantity': inventory.current_quantity})
+    @action(detail=True, methods=['get'])
+    def lots(self, request, pk=None):
+        """Lots of a supply item with stock left, in FEFO order."""
+        supply_item = self.get_object()
+        lots = InventoryLot.objects.filter(
+            inventory__supply_item=supply_item, quantity__gt=0,
+        ).select_related('inventory__supply_item__unit').order_by(
+            F('expiration_date').asc(nulls_last=True), 'received_at'
+        )
+        return Response(InventoryLotSerializer(lots, many=True).data)
+
+
+class InventoryLotViewSet(ShelterScopedMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for viewing lots with stock left.
+
+    expiring: Lots expiring within ?days= (default 30), expired ones included.
+    """
+    queryset = InventoryLot.objects.filter(quantity__gt=0).select_related('inventory__supply_item__unit')
+    serializer_class = InventoryLotSerializer
+    permission_classes = [IsEmployee]
+    shelter_field = 'inventory__supply_item__shelter'
+
+    @action(detail=False, methods=['get'])
+    def expiring(self, request):
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            days = -1
+        if days < 0:
+            return Response(
+                {'error': 'days must be a non-negative integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        lots = self.scope(stock.expiring_lots(days))
+        page = self.paginate_queryset(lots)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(lots, many=True).data)
+
+
+class StocktakeViewSet(ShelterScopedMixin, mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for stocktake (inventory count) sessions.
+
+    create: Open a session.
+    counts: Submit a batch of counted quantities ({"counts": [...]}).
+    lines: Counted items with the stock in the system and the difference.
+    commit: Set the stock of all counted items to the counts (ADJ log rows).
+    cancel: Close the session without changing the stock.
+    """
+    queryset = Stocktake.objects.select_related('opened_by', 'closed_by').annotate(line_count=Count('lines'))
+    serializer_class = StocktakeSerializer
+    permission_classes = [IsEmployee]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status']
+
+    def perform_create(self, serializer):
+        serializer.save(opened_by=self.request.user, **self.shelter_kwargs())
+        serializer.instance.line_count = 0
+
+    def _run(self, operation, *args):
+        try:
+            return operation(*args)
+        except DjangoValidationError as exc:
+            raise ValidationError({'detail': exc.messages})
+
+    @action(detail=True, methods=['post'])
+    def counts(self, request, pk=None):
+        session = self.get_object()
+        counts = request.data.get('counts') if isinstance(request.data, dict) else None
+        if not isinstance(counts, list) or not counts:
+            raise ValidationError({'counts': 'Expected a non-empty list.'})
+        serializer = StocktakeCountSerializer(data=counts, many=True)
+        serializer.is_valid(raise_exception=True)
+        recorded = self._run(stocktake.record_counts, session, {
+            count['supply_item']: count['counted_quantity'] for count in serializer.validated_data
+        })
+        return Response({'recorded': recorded})
+
+    @action(detail=True, methods=['get'])
+    def lines(self, request, pk=None):
+        lines = stocktake.lines_with_differences(self.get_object())
+        if request.query_params.get('differences') in ('1', 'true'):
+            lines = lines.exclude(difference=0)
+        page = self.paginate_queryset(lines)
+        if page is not None:
+            return self.get_paginated_response(StocktakeLineSerializer(page, many=True).data)
+        return Response(StocktakeLineSerializer(lines, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def commit(self, request, pk=None):
+        adjusted = self._run(stocktake.commit, self.get_object(), request.user)
+        return Response({**self.get_serializer(self.get_object()).data, 'adjusted': adjusted})
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        self._run(stocktake.cancel, self.get_object(), request.user)
+        return Response(self.get_serializer(self.get_object()).data)
 
 
 class SupplyCategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -130,3 +268,10 @@ class SupplyCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = SupplyCategorySerializer
     permission_classes = [IsEmployee]
     pagination_class = None
+
+
+class SupplyCategoryListView(AsyncViewSetView):
+    """Supply category list served asynchronously."""
+    viewset_class = SupplyCategoryViewSet
+    basename = 'supply-category'
+    actions = {'get': 'list'}
@@ -0,0 +1,19 @@
+"""
+Admin configuration for sync app.
+"""
+from django.contrib import admin
+from .models import Tombstone
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ['feed', 'object_id', 'shelter', 'deleted_at']
+    list_filter = ['feed', 'shelter']
+    search_fields = ['object_id']
+    date_hierarchy = 'deleted_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
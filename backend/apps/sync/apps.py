@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.sync'
+    verbose_name = 'Synchronizacja'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from apps.animals.models import Animal
+        from .models import record_deletion, record_move
+        from .services.changes import FEED_OF_MODEL
+
+        for model in FEED_OF_MODEL:
+            post_delete.connect(record_deletion, sender=model, dispatch_uid=f'sync_tombstone_{model.__name__}')
+        post_save.connect(record_move, sender=Animal, dispatch_uid='sync_tombstone_move')
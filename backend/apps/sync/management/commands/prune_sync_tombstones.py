@@ -0,0 +1,24 @@
+"""
+Management command to delete old delta-sync tombstones.
+
+Deletions older than SYNC['TOMBSTONE_RETENTION_DAYS'] are no longer needed:
+clients whose token is that old get a full sync. Run it daily:
+
+    python manage.py prune_sync_tombstones
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete delta-sync tombstones older than the retention period"
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.SYNC["TOMBSTONE_RETENTION_DAYS"])
+        count, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {count} tombstones older than {cutoff:%Y-%m-%d %H:%M}"))
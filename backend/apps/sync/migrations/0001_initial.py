@@ -0,0 +1,58 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:49
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "feed",
+                    models.CharField(
+                        choices=[
+                            ("animals", "Zwierzęta"),
+                            ("medications", "Leki"),
+                            ("vaccinations", "Szczepienia"),
+                            ("tasks", "Zadania wolontariuszy"),
+                            ("supply_items", "Zasoby magazynowe"),
+                        ],
+                        max_length=20,
+                        verbose_name="Rodzaj danych",
+                    ),
+                ),
+                ("object_id", models.BigIntegerField(verbose_name="Identyfikator")),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Usunięto"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Usunięty rekord",
+                "verbose_name_plural": "Usunięte rekordy",
+                "ordering": ["-deleted_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["deleted_at"], name="sync_tombstone_deleted_idx"
+                    )
+                ],
+            },
+        ),
+    ]
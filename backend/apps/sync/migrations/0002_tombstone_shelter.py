@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-19 06:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shelters", "0002_assign_existing_data"),
+        ("sync", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tombstone",
+            name="shelter",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="shelters.shelter",
+                verbose_name="Schronisko",
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+"""
+Models for sync app - the deletion log behind delta sync.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class SyncFeed(models.TextChoices):
+    """Kinds of records tablets keep offline (apps.sync.services.changes)."""
+    ANIMALS = 'animals', 'Zwierzęta'
+    MEDICATIONS = 'medications', 'Leki'
+    VACCINATIONS = 'vaccinations', 'Szczepienia'
+    TASKS = 'tasks', 'Zadania wolontariuszy'
+    SUPPLY_ITEMS = 'supply_items', 'Zasoby magazynowe'
+
+
+class Tombstone(models.Model):
+    """
+    A deleted record, kept so that clients syncing later can drop their copy.
+
+    Written by ``record_deletion`` in the deleting transaction and pruned
+    after ``SYNC['TOMBSTONE_RETENTION_DAYS']``. Primary keys are never reused,
+    so deletions carry no shelter: a client ignores ids it does not hold.
+    When an animal moves to another shelter (``record_move``), the animal
+    and its medications and vaccinations are tombstoned for the shelter it
+    left only; the new shelter gets them as upserts.
+    """
+    feed = models.CharField(
+        verbose_name='Rodzaj danych',
+        max_length=20,
+        choices=SyncFeed.choices,
+    )
+    object_id = models.BigIntegerField(
+        verbose_name='Identyfikator',
+    )
+    deleted_at = models.DateTimeField(
+        verbose_name='Usunięto',
+        default=timezone.now,
+    )
+    shelter = models.ForeignKey(
+        'shelters.Shelter',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Schronisko',
+        # read together with the deleted_at range, which the index serves
+        db_index=False,
+    )
+
+    class Meta:
+        verbose_name = 'Usunięty rekord'
+        verbose_name_plural = 'Usunięte rekordy'
+        ordering = ['-deleted_at']
+        indexes = [
+            # deletions since a sync token, and pruning of old ones
+            models.Index(fields=['deleted_at'], name='sync_tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.feed} #{self.object_id}'
+
+
+def record_deletion(sender, instance, **kwargs):
+    """post_delete receiver for the synced models (connected in SyncConfig.ready)."""
+    from apps.sync.services.changes import FEED_OF_MODEL
+    Tombstone.objects.using(kwargs.get('using')).create(
+        feed=FEED_OF_MODEL[sender], object_id=instance.pk,
+    )
+
+
+def record_move(sender, instance, created, update_fields=None, **kwargs):
+    """
+    post_save receiver for Animal: when the animal left its shelter,
+    tombstone it and its medications and vaccinations for the old shelter
+    and touch the medications and vaccinations so the new one syncs them.
+    Moves by queryset.update() are not seen.
+    """
+    from apps.animals.models import Medication, Vaccination
+    from apps.sync.services.changes import FEED_OF_MODEL
+    previous = getattr(instance, '_recorded_shelter_id', None)
+    instance._recorded_shelter_id = instance.shelter_id
+    moved = (
+        not created and previous is not None and previous != instance.shelter_id
+        and (update_fields is None or 'shelter' in update_fields)
+    )
+    if not moved:
+        return
+    db = kwargs.get('using')
+    now = timezone.now()
+    tombstones = [Tombstone(feed=FEED_OF_MODEL[sender], object_id=instance.pk, shelter_id=previous)]
+    for model in (Medication, Vaccination):
+        related = model.objects.using(db).filter(animal=instance)
+        tombstones.extend(
+            Tombstone(feed=FEED_OF_MODEL[model], object_id=pk, shelter_id=previous)
+            for pk in related.values_list('pk', flat=True)
+        )
+        related.update(updated_at=now)
+    Tombstone.objects.using(db).bulk_create(tombstones)
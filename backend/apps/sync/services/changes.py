@@ -0,0 +1,219 @@
+"""
+Delta sync: what changed since a client's last sync.
+
+A sync token is the server time of a sync in microseconds since the epoch.
+Given a token, every feed returns the rows saved since then (``upserts``,
+found on the table's ``updated_at`` index) and the ids deleted since then
+(``deleted``, from the tombstone log), so a reconnecting tablet downloads
+only what changed. Without a token, or with one older than the tombstone
+retention, the client gets a full sync: every row and ``full`` set, meaning
+it should replace what it holds.
+
+A full sync is paged by ``SYNC['PAGE_SIZE']`` rows, feed after feed in
+primary key order. Each page but the last has a ``next`` cursor (the start
+of the sync, the feed and the last id sent) and no token; the last page
+carries the token of the moment the full sync started, so whatever changed
+while the client was paging comes with its next delta sync.
+
+Rows are read from ``SYNC['OVERLAP_SECONDS']`` before the token: a row saved
+by a transaction that committed after the previous sync read the table has
+an ``updated_at`` before that token. Re-sent rows are harmless upserts.
+
+Supply item quantities change through stock movements, which do not touch
+the item row; an item also counts as changed when its inventory log has a
+row since the token (one probe of the log's ``(inventory, timestamp)``
+index per item).
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Case, DecimalField, Exists, OuterRef, Q, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.accounts.models import Role
+from apps.animals.models import Animal, Medication, Vaccination
+from apps.shelters.tenancy import scope, shelter_of
+from apps.supplies.models import InventoryLog, SupplyItem
+from apps.supplies.services import stock
+from apps.sync.models import SyncFeed, Tombstone
+from apps.volunteers.models import Task
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class InvalidToken(ValueError):
+    """Raised for a sync token or cursor that is malformed or in the future."""
+
+
+# feed: (model, lookup from the model to its shelter, fields sent)
+FEEDS = {
+    SyncFeed.ANIMALS: (Animal, 'shelter', (
+        'id', 'animal_id', 'name', 'species', 'breed', 'sex', 'birth_date', 'coat_color',
+        'weight', 'identifying_marks', 'transponder_number', 'status', 'intake_date',
+        'identification_photo', 'shelter', 'updated_at',
+    )),
+    SyncFeed.MEDICATIONS: (Medication, 'animal__shelter', (
+        'id', 'animal', 'medication_name', 'dosage', 'frequency', 'interval_hours',
+        'first_dose_time', 'start_date', 'end_date', 'reason', 'notes', 'updated_at',
+    )),
+    SyncFeed.VACCINATIONS: (Vaccination, 'animal__shelter', (
+        'id', 'animal', 'vaccine_name', 'vaccine_for', 'vaccine_batch_number',
+        'vaccination_date', 'expiration_date', 'next_due_date', 'updated_at',
+    )),
+    SyncFeed.TASKS: (Task, 'schedule__shelter', (
+        'id', 'task_id', 'name', 'description', 'datetime', 'duration_in_minutes',
+        'maxVolunteers', 'schedule', 'status', 'updated_at',
+    )),
+    SyncFeed.SUPPLY_ITEMS: (SupplyItem, 'shelter', (
+        'id', 'name', 'description', 'min_stock', 'category', 'unit', 'shelter',
+        'current_quantity', 'updated_at',
+    )),
+}
+FEED_OF_MODEL = {model: feed for feed, (model, _, _) in FEEDS.items()}
+VOLUNTEER_FEEDS = (SyncFeed.TASKS,)
+
+
+def to_token(moment):
+    return (moment - EPOCH) // MICROSECOND
+
+
+def from_token(token, now=None):
+    """The moment of ``token`` (a string or int); raise InvalidToken if it is not one."""
+    try:
+        moment = EPOCH + int(token) * MICROSECOND
+    except (TypeError, ValueError, OverflowError):
+        raise InvalidToken('Nieprawidłowy token synchronizacji.')
+    if moment > (now or timezone.now()):
+        raise InvalidToken('Token synchronizacji pochodzi z przyszłości.')
+    return moment
+
+
+def feeds_for(user):
+    """Feeds ``user`` may sync: all for employees, tasks for volunteers."""
+    return tuple(FEEDS) if user.role == Role.EMPLOYEE else VOLUNTEER_FEEDS
+
+
+def to_cursor(started, feed, after):
+    return f'{to_token(started)}:{feed}:{after}'
+
+
+def from_cursor(cursor, feeds, now=None):
+    """``(start of the full sync, feed, last id sent)`` of ``cursor``; raise InvalidToken if it is not one."""
+    try:
+        token, feed, after = cursor.split(':')
+        after = int(after)
+    except ValueError:
+        raise InvalidToken('Nieprawidłowy kursor synchronizacji.')
+    if feed not in feeds:
+        raise InvalidToken('Nieprawidłowy kursor synchronizacji.')
+    return from_token(token, now), feed, after
+
+
+def _rows(feed, user, since, after=None, limit=None):
+    model, shelter_field, fields = FEEDS[feed]
+    queryset = scope(model.objects.order_by('pk'), user, shelter_field)
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    if feed == SyncFeed.SUPPLY_ITEMS:
+        queryset = queryset.annotate(current_quantity=Case(
+            When(inventory__shard_count__gt=0, then=Coalesce(
+                stock.shard_total(OuterRef('inventory')), Value(Decimal('0')),
+            )),
+            default=Coalesce('inventory__current_quantity', Value(Decimal('0'))),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        ))
+        if since is not None:
+            moved = InventoryLog.objects.filter(inventory=OuterRef('inventory'), timestamp__gte=since)
+            queryset = queryset.filter(Q(updated_at__gte=since) | Exists(moved))
+    elif since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    rows = queryset.values(*fields)
+    rows = list(rows if limit is None else rows[:limit])
+
+    if feed == SyncFeed.TASKS and rows:
+        volunteers = {row['id']: [] for row in rows}
+        signups = Task.volunteers.through.objects.filter(
+            task__in=list(volunteers),
+        ).order_by('user_id').values_list('task_id', 'user_id')
+        for task_id, user_id in signups:
+            volunteers[task_id].append(user_id)
+        for row in rows:
+            row['volunteers'] = volunteers[row['id']]
+    return rows
+
+
+def _full_page(user, feeds, feed, after):
+    """
+    Up to ``SYNC['PAGE_SIZE']`` rows from ``feed`` after id ``after`` on;
+    return the rows per feed and ``(feed, last id)`` to continue from, None
+    after the last row.
+    """
+    remaining = settings.SYNC['PAGE_SIZE']
+    result = {}
+    for current in feeds[feeds.index(feed):]:
+        if remaining == 0:
+            return result, (current, 0)
+        # one row more tells whether the feed goes on
+        rows = _rows(current, user, None, after=after, limit=remaining + 1)
+        if len(rows) > remaining:
+            result[current] = rows[:remaining]
+            return result, (current, rows[remaining - 1]['id'])
+        result[current] = rows
+        remaining -= len(rows)
+        after = 0
+    return result, None
+
+
+def _deleted(user, feeds, since):
+    """Tombstones since ``since``: deletions, and moves out of the user's shelter."""
+    shelter_id = shelter_of(user)
+    moved_out = Q(shelter__isnull=True)
+    if shelter_id is not None:
+        moved_out |= Q(shelter=shelter_id)
+    return Tombstone.objects.filter(
+        moved_out, deleted_at__gte=since, feed__in=feeds,
+    ).order_by('object_id').values_list('feed', 'object_id').distinct()
+
+
+def changes(user, token=None, now=None, cursor=None):
+    """
+    Changes visible to ``user`` since ``token`` (None: full sync), or the
+    full sync page after ``cursor``.
+
+    Return ``{'token', 'full', 'next', 'changes': {feed: {'upserts',
+    'deleted'}}}``, leaving out feeds without changes. Raise InvalidToken
+    for a bad token or cursor.
+    """
+    now = now or timezone.now()
+    feeds = feeds_for(user)
+    since = None
+    if cursor is not None:
+        started, feed, after = from_cursor(cursor, feeds, now)
+    else:
+        started, feed, after = now, feeds[0], 0
+        if token is not None:
+            since = from_token(token, now) - timedelta(seconds=settings.SYNC['OVERLAP_SECONDS'])
+            if since < now - timedelta(days=settings.SYNC['TOMBSTONE_RETENTION_DAYS']):
+                # deletions before the retention period are gone
+                since = None
+
+    following = None
+    if since is None:
+        upserts, following = _full_page(user, feeds, feed, after)
+        result = {feed: {'upserts': rows, 'deleted': []} for feed, rows in upserts.items()}
+    else:
+        result = {feed: {'upserts': _rows(feed, user, since), 'deleted': []} for feed in feeds}
+        for feed, object_id in _deleted(user, feeds, since):
+            result[feed]['deleted'].append(object_id)
+    return {
+        # a full sync is complete, and its token usable, on the last page only
+        'token': to_token(started) if following is None else None,
+        'full': since is None,
+        'next': to_cursor(started, *following) if following else None,
+        'changes': {
+            str(feed): change for feed, change in result.items() if change['upserts'] or change['deleted']
+        },
+    }
@@ -0,0 +1,99 @@
+"""
+Pytest fixtures for sync app tests.
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.accounts.models import User, Role
+from apps.animals.models import Animal, AnimalSpecies, Medication, Vaccination
+from apps.shelters.models import Shelter
+from apps.supplies.models import Inventory, SupplyCategory, SupplyItem, UnitOfMeasure
+from apps.volunteers.models import Schedule, Task, TaskStatus
+
+
+@pytest.fixture
+def api_client():
+    """Return an unauthenticated API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def krakow(db):
+    return Shelter.objects.create(code='krakow', name='Schronisko Kraków', city='Kraków')
+
+
+@pytest.fixture
+def gdansk(db):
+    return Shelter.objects.create(code='gdansk', name='Schronisko Gdańsk', city='Gdańsk')
+
+
+@pytest.fixture
+def employee_user(krakow):
+    """Employee of the Kraków shelter."""
+    return User.objects.create_user(
+        email='pracownik@schronisko.pl', password='haslo123', first_name='Jan',
+        last_name='Kowalski', role=Role.EMPLOYEE, shelter=krakow,
+    )
+
+
+@pytest.fixture
+def volunteer_user(krakow):
+    """Volunteer of the Kraków shelter."""
+    return User.objects.create_user(
+        email='wolontariusz@schronisko.pl', password='haslo123', first_name='Anna',
+        last_name='Nowak', role=Role.VOLUNTEER, shelter=krakow,
+    )
+
+
+@pytest.fixture
+def authenticated_employee(api_client, employee_user):
+    api_client.force_authenticate(user=employee_user)
+    return api_client
+
+
+@pytest.fixture
+def authenticated_volunteer(api_client, volunteer_user):
+    api_client.force_authenticate(user=volunteer_user)
+    return api_client
+
+
+@pytest.fixture
+def records(krakow, gdansk):
+    """
+    One record of every synced kind in each shelter, all last saved two
+    hours ago (before any token the tests use).
+    """
+    category = SupplyCategory.objects.create(name='Żywność')
+    unit = UnitOfMeasure.objects.create(name='kilogram', abbreviation='kg')
+    records = {}
+    for shelter, name in ((krakow, 'Burek'), (gdansk, 'Azor')):
+        animal = Animal.objects.create(name=name, species=AnimalSpecies.DOG, shelter=shelter)
+        schedule = Schedule.objects.create(
+            name='Grafik', start_date=date.today(), end_date=date.today(), shelter=shelter,
+        )
+        item = SupplyItem.objects.create(
+            name='Karma sucha dla psów', min_stock=Decimal('20'), category=category, unit=unit, shelter=shelter,
+        )
+        Inventory.objects.create(supply_item=item, current_quantity=Decimal('40'))
+        records[shelter.code] = {
+            'animal': animal,
+            'medication': Medication.objects.create(
+                animal=animal, medication_name='Amoxicillin', dosage='250mg', frequency='2x dziennie',
+                start_date=date.today(), reason='Infekcja',
+            ),
+            'vaccination': Vaccination.objects.create(
+                animal=animal, vaccine_name='Nobivac', vaccine_for='Wścieklizna', vaccine_batch_number='B1',
+                vaccination_date=date.today(), expiration_date=date.today() + timedelta(days=365),
+            ),
+            'task': Task.objects.create(
+                name='Spacer', datetime=timezone.now() + timedelta(hours=2), duration_in_minutes=60,
+                maxVolunteers=2, schedule=schedule, status=TaskStatus.AVAILABLE,
+            ),
+            'item': item,
+        }
+    two_hours_ago = timezone.now() - timedelta(hours=2)
+    for model in (Animal, Medication, Vaccination, Task, SupplyItem):
+        model.objects.update(updated_at=two_hours_ago)
+    return records
@@ -0,0 +1,205 @@
+"""
+Tests for the delta sync endpoint.
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from apps.accounts.models import Role, User
+from apps.animals.models import Animal, AnimalSpecies, AnimalStatus
+from apps.supplies.services import stock
+from apps.sync.models import SyncFeed, Tombstone
+from apps.sync.services.changes import to_token
+
+URL = reverse('sync')
+
+
+def _since(**delta):
+    return {'since': to_token(timezone.now() - timedelta(**delta))}
+
+
+@pytest.mark.django_db
+class TestSync:
+
+    def test_full_sync_without_token(self, authenticated_employee, records):
+        response = authenticated_employee.get(URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['full'] is True
+        assert isinstance(response.data['token'], int)
+        changes = response.data['changes']
+        assert set(changes) == {feed.value for feed in SyncFeed}
+        # only the user's shelter
+        assert [row['id'] for row in changes['animals']['upserts']] == [records['krakow']['animal'].pk]
+        assert changes['supply_items']['upserts'][0]['current_quantity'] == Decimal('40')
+
+    def test_delta_returns_only_changes(self, authenticated_employee, records):
+        medication = records['krakow']['medication']
+        medication.dosage = '500mg'
+        medication.save()
+
+        response = authenticated_employee.get(URL, _since(hours=1))
+
+        assert response.data['full'] is False
+        assert set(response.data['changes']) == {'medications'}
+        [row] = response.data['changes']['medications']['upserts']
+        assert (row['id'], row['dosage']) == (medication.pk, '500mg')
+
+    def test_nothing_changed(self, authenticated_employee, records):
+        response = authenticated_employee.get(URL, _since(hours=1))
+
+        assert response.data['changes'] == {}
+
+    def test_bulk_status_update_is_synced(self, authenticated_employee, records):
+        Animal.objects.filter(pk=records['krakow']['animal'].pk).update(status=AnimalStatus.ADOPTED)
+
+        response = authenticated_employee.get(URL, _since(hours=1))
+
+        [animal] = response.data['changes']['animals']['upserts']
+        assert animal['status'] == AnimalStatus.ADOPTED
+
+    def test_deletions_are_tombstoned(self, authenticated_employee, records):
+        animal = records['krakow']['animal']
+        deleted = {
+            'animals': [animal.pk],
+            'medications': [records['krakow']['medication'].pk],
+            'vaccinations': [records['krakow']['vaccination'].pk],
+        }
+        animal.delete()
+
+        response = authenticated_employee.get(URL, _since(hours=1))
+
+        assert {feed: change['deleted'] for feed, change in response.data['changes'].items()} == deleted
+        assert Tombstone.objects.count() == 3
+
+    def test_move_tombstoned_for_old_shelter(self, authenticated_employee, records, gdansk):
+        animal = Animal.objects.get(pk=records['krakow']['animal'].pk)
+        animal.shelter = gdansk
+        animal.save()
+
+        response = authenticated_employee.get(URL, _since(hours=1))
+
+        assert {feed: change['deleted'] for feed, change in response.data['changes'].items()} == {
+            'animals': [animal.pk],
+            'medications': [records['krakow']['medication'].pk],
+            'vaccinations': [records['krakow']['vaccination'].pk],
+        }
+        assert not any(change['upserts'] for change in response.data['changes'].values())
+
+    def test_moved_animal_synced_to_new_shelter(self, api_client, records, gdansk):
+        user = User.objects.create_user(
+            email='gdansk@schronisko.pl', password='haslo123', first_name='Ewa', last_name='Nowak',
+            role=Role.EMPLOYEE, shelter=gdansk,
+        )
+        api_client.force_authenticate(user=user)
+        animal = Animal.objects.get(pk=records['krakow']['animal'].pk)
+        animal.shelter = gdansk
+        animal.save()
+
+        changes = api_client.get(URL, _since(hours=1)).data['changes']
+
+        assert [row['id'] for row in changes['animals']['upserts']] == [animal.pk]
+        assert [row['id'] for row in changes['medications']['upserts']] == [records['krakow']['medication'].pk]
+        assert not any(change['deleted'] for change in changes.values())
+
+    def test_full_sync_is_paged(self, authenticated_employee, records, settings):
+        settings.SYNC = {**settings.SYNC, 'PAGE_SIZE': 2}
+        pages = []
+        response = authenticated_employee.get(URL)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(response.data)
+            if response.data['next'] is None:
+                break
+            Animal.objects.create(name='Nowy', species=AnimalSpecies.DOG, shelter=records['krakow']['animal'].shelter)
+            response = authenticated_employee.get(URL, {'cursor': response.data['next']})
+
+        # five feeds of one row each
+        assert len(pages) == 3
+        assert all(page['full'] and page['token'] is None for page in pages[:-1])
+        synced = [(feed, row['id']) for page in pages for feed, change in page['changes'].items()
+                  for row in change['upserts']]
+        assert [feed for feed, _ in synced] == [feed.value for feed in SyncFeed]
+        # the token is the start of the full sync, so rows added while paging come next
+        delta = authenticated_employee.get(URL, {'since': pages[-1]['token']}).data
+        assert [row['name'] for row in delta['changes']['animals']['upserts']][-2:] == ['Nowy', 'Nowy']
+
+    def test_page_ends_inside_feed(self, authenticated_employee, records, settings):
+        settings.SYNC = {**settings.SYNC, 'PAGE_SIZE': 1}
+        second = Animal.objects.create(name='Reks', species=AnimalSpecies.DOG, shelter=records['krakow']['animal'].shelter)
+
+        first = authenticated_employee.get(URL).data
+        following = authenticated_employee.get(URL, {'cursor': first['next']}).data
+
+        assert [row['id'] for row in first['changes']['animals']['upserts']] == [records['krakow']['animal'].pk]
+        assert [row['id'] for row in following['changes']['animals']['upserts']] == [second.pk]
+
+    @pytest.mark.parametrize('cursor', ['abc', '1:animals:x', '1:unknown:0'])
+    def test_invalid_cursor(self, authenticated_employee, cursor):
+        response = authenticated_employee.get(URL, {'cursor': cursor})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'cursor' in response.data
+
+    def test_stock_movement_marks_item_changed(self, authenticated_employee, records, employee_user):
+        stock.issue(records['krakow']['item'], Decimal('15'), performed_by=employee_user)
+
+        response = authenticated_employee.get(URL, _since(hours=1))
+
+        [item] = response.data['changes']['supply_items']['upserts']
+        assert item['current_quantity'] == Decimal('25')
+
+    def test_signup_marks_task_changed(self, authenticated_employee, records, volunteer_user):
+        task = records['krakow']['task']
+        task.add_volunteer(volunteer_user)
+
+        response = authenticated_employee.get(URL, _since(hours=1))
+
+        [row] = response.data['changes']['tasks']['upserts']
+        assert row['volunteers'] == [volunteer_user.pk]
+
+    def test_volunteer_syncs_tasks_only(self, authenticated_volunteer, records):
+        response = authenticated_volunteer.get(URL)
+
+        assert set(response.data['changes']) == {'tasks'}
+        assert [row['id'] for row in response.data['changes']['tasks']['upserts']] == [records['krakow']['task'].pk]
+
+    def test_token_older_than_retention_gets_full_sync(self, authenticated_employee, records, settings):
+        response = authenticated_employee.get(
+            URL, _since(days=settings.SYNC['TOMBSTONE_RETENTION_DAYS'] + 1),
+        )
+
+        assert response.data['full'] is True
+        assert 'animals' in response.data['changes']
+
+    @pytest.mark.parametrize('token', ['abc', str(10 ** 30)])
+    def test_invalid_token(self, authenticated_employee, token):
+        response = authenticated_employee.get(URL, {'since': token})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'since' in response.data
+
+    def test_future_token(self, authenticated_employee):
+        response = authenticated_employee.get(URL, _since(hours=-1))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_authentication(self, api_client):
+        response = api_client.get(URL)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_prune_sync_tombstones(settings):
+    old = timezone.now() - timedelta(days=settings.SYNC['TOMBSTONE_RETENTION_DAYS'] + 1)
+    Tombstone.objects.create(feed=SyncFeed.ANIMALS, object_id=1, deleted_at=old)
+    recent = Tombstone.objects.create(feed=SyncFeed.ANIMALS, object_id=2)
+
+    call_command('prune_sync_tombstones', stdout=StringIO())
+
+    assert list(Tombstone.objects.all()) == [recent]
@@ -0,0 +1,29 @@
+"""
+Views for sync app.
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.accounts.permissions import IsEmployeeOrVolunteer
+from .services import changes
+
+
+class SyncView(APIView):
+    """
+    Delta sync for offline tablets.
+
+    GET ?since=<token from the previous response>: rows saved and ids deleted
+    since then, per feed (animals, medications, vaccinations, supply items
+    for employees; tasks for everyone). Without ``since``, or when it is too
+    old, the response is a full sync (``full``: true), paged: request
+    ?cursor=<next> until ``next`` is null, the last page has the token.
+    """
+    permission_classes = [IsEmployeeOrVolunteer]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            return Response(changes.changes(request.user, params.get('since'), cursor=params.get('cursor')))
+        except changes.InvalidToken as e:
+            raise ValidationError({'cursor' if 'cursor' in params else 'since': str(e)})
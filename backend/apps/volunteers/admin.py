@@ -43,5 +43,6 @@ class TaskAdmin(admin.ModelAdmin):
 
 @admin.register(Schedule)
 class ScheduleAdmin(admin.ModelAdmin):
-    list_display = ('name', 'start_date', 'end_date')
+    list_display = ('name', 'shelter', 'start_date', 'end_date')
+    list_filter = ('shelter',)
     search_fields = ('name',)
\ No newline at end of file
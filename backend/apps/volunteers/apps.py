@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class VolunteersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.volunteers"
+
+    def ready(self):
+        from django.db.models.signals import m2m_changed
+        from .models import Task, touch_tasks_on_signup
+
+        m2m_changed.connect(touch_tasks_on_signup, sender=Task.volunteers.through)
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-19 05:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shelters", "0001_initial"),
+        ("volunteers", "0003_alter_task_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="schedule",
+            name="shelter",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="schedules",
+                to="shelters.shelter",
+                verbose_name="Shelter",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="schedule",
+            index=models.Index(
+                fields=["shelter", "-start_date"], name="schedule_shelter_start_idx"
+            ),
+        ),
+    ]
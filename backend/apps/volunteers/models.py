@@ -1,8 +1,10 @@
 import uuid
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 from apps.accounts.models import User
+from apps.core import events
 
 class TaskStatus(models.TextChoices):
     AVAILABLE = 'AVAILABLE', 'Available'
@@ -38,6 +40,17 @@ class Schedule(models.Model):
     )
 
 
+    shelter = models.ForeignKey(
+        'shelters.Shelter',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='schedules',
+        verbose_name='Shelter',
+        # indexed as the leading column of the model's composite indexes
+        db_index=False,
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -45,6 +58,9 @@ class Schedule(models.Model):
         verbose_name = 'Schedule'
         verbose_name_plural = 'Schedules'
         ordering = ['-start_date', '-end_date']
+        indexes = [
+            models.Index(fields=['shelter', '-start_date'], name='schedule_shelter_start_idx'),
+        ]
 
     def __str__(self):
         return f'{self.name} {self.start_date} - {self.end_date}'
@@ -117,6 +133,9 @@ class Task(models.Model):
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
         ordering = ['-datetime']
+        indexes = [
+            models.Index(fields=['updated_at'], name='task_updated_idx'),
+        ]
 
     def __str__(self):
         return f'{self.name} {self.datetime}'
@@ -132,7 +151,8 @@ class Task(models.Model):
         self.volunteers.add(user)
         if self.is_full():
             self.status = TaskStatus.PERSON_LIMIT_REACHED
-            self.save(update_fields=['status'])
+            self.save(update_fields=['status', 'updated_at'])
+        self.publish_signups()
 
     def remove_volunteer(self, user: User):
         if self.status == TaskStatus.COMPLETED or self.status == TaskStatus.UNCOMPLETED:
@@ -140,12 +160,36 @@ class Task(models.Model):
         if user in self.volunteers.all():
             if self.is_full():
                 self.status = TaskStatus.AVAILABLE
-                self.save(update_fields=['status'])
+                self.save(update_fields=['status', 'updated_at'])
             self.volunteers.remove(user)
         else:
             raise ValidationError("User is not signed up for this task.")
+        self.publish_signups()
+
+    def publish_signups(self):
+        """Send the signup count to live clients (apps.core.events) after the commit."""
+        tasks = Task.objects.filter(pk=self.pk)
+        events.publish('tasks', lambda: list(
+            tasks.values('id', 'task_id', 'status', 'maxVolunteers', shelter=models.F('schedule__shelter'))
+            .annotate(volunteers=models.Count('volunteers'))
+        ))
 
     def is_full(self) -> bool:
         """Check if the task has reached max volunteers."""
         return self.volunteers.count() >= self.maxVolunteers
 
+
+
+def touch_tasks_on_signup(sender, instance, action, reverse, pk_set, **kwargs):
+    """Bump ``updated_at`` of tasks whose volunteers changed (for delta sync)."""
+    if not reverse:
+        tasks = Task.objects.filter(pk=instance.pk) if action.startswith('post_') else None
+    elif action in ('post_add', 'post_remove'):
+        tasks = Task.objects.filter(pk__in=pk_set)
+    elif action == 'pre_clear':
+        # the user's tasks cannot be found any more after the clear
+        tasks = Task.objects.filter(volunteers=instance)
+    else:
+        tasks = None
+    if tasks is not None:
+        tasks.update(updated_at=timezone.now())
@@ -33,6 +33,7 @@ class ScheduleSerializer(serializers.ModelSerializer):
             'name',
             'start_date',
             'end_date',
+            'shelter',
             'tasks',
         ]
 
@@ -1,5 +1,5 @@
 from django.urls import path, include
-from apps.volunteers.views import ScheduleViewSet, TaskViewSet
+from apps.volunteers.views import MyTasksView, ScheduleViewSet, TaskViewSet
 from rest_framework.routers import DefaultRouter
 
 
@@ -11,5 +11,6 @@ router.register(r'tasks', TaskViewSet, basename='task')
 
 
 urlpatterns = [
+    path('tasks/my/', MyTasksView.as_view(), name='task-my-tasks'),
     path('', include(router.urls)),
 ]
@@ -7,20 +7,24 @@ from rest_framework import viewsets
 from .models import Schedule, Task
 from .serializers import ScheduleSerializer, TaskRemoveVolunteerSerializer, TaskSerializer, TaskSignUpSerializer
 from rest_framework.response import Response
+from apps.core.async_views import AsyncAPIView
+from apps.core.replicas import ReplicaReadMixin
+from apps.shelters.tenancy import ShelterScopedMixin
 
 permission_classes = [IsEmployeeOrVolunteer]
-class ScheduleViewSet(viewsets.ReadOnlyModelViewSet):
+class ScheduleViewSet(ShelterScopedMixin, ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Schedule.objects.prefetch_related('tasks__volunteers').all()
     serializer_class = ScheduleSerializer
 
 
 
 permission_classes = [IsEmployeeOrVolunteer]
-class TaskViewSet(viewsets.ReadOnlyModelViewSet):
+class TaskViewSet(ShelterScopedMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Task.objects.prefetch_related('volunteers').all()
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'task_id'
+    shelter_field = 'schedule__shelter'
 
     @action(detail=True, methods=['post'], url_path='signup')
     def signup(self, request, *args, **kwargs):
@@ -44,18 +48,19 @@ class TaskViewSet(viewsets.ReadOnlyModelViewSet):
             'message': 'User removed successfully',
             'volunteers_count': task.volunteers.count()
         })
-    
-    
-    @action(detail=False, methods=["get"], url_path="my")
-    def my_tasks(self, request):
-        user = request.user
 
-        task_ids = (
-            Task.objects
-            .filter(volunteers=user)
-            .values_list("task_id", flat=True)
-        )
 
-        return Response({
-            "task_ids": list(task_ids)
-        })
\ No newline at end of file
+class MyTasksView(AsyncAPIView):
+    """Ids of tasks the current user signed up for, served asynchronously."""
+    viewset_class = TaskViewSet
+    basename = 'task'
+    actions = {'get': 'my_tasks'}
+
+    async def get(self, request):
+        task_ids = Task.objects.filter(
+            volunteers=self.drf_request.user
+        ).values_list("task_id", flat=True)
+
+        return self.respond({
+            "task_ids": [task_id async for task_id in task_ids]
+        })
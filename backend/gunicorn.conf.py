@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration.
+
+SERVER_MODE selects the deployment mode:
+
+- ``wsgi`` (default): sync workers running shelter_project.wsgi
+- ``asgi``: uvicorn workers running shelter_project.asgi, so async views
+  (health check, animal list/detail, veterinarians, supply categories,
+  my tasks) do not hold a worker thread while waiting on the database; the
+  event stream (/api/events/) needs this mode. The settings then leave
+  WhiteNoise out of MIDDLEWARE and shelter_project.asgi serves /static/
+"""
+import os
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '2'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+accesslog = '-'
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'shelter_project.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+elif SERVER_MODE == 'wsgi':
+    wsgi_app = 'shelter_project.wsgi:application'
+    worker_class = 'sync'
+else:
+    raise RuntimeError(f"SERVER_MODE must be 'wsgi' or 'asgi', got {SERVER_MODE!r}")
@@ -0,0 +1,49 @@
+"""
+ASGI config for shelter_project.
+
+When the settings leave WhiteNoise out of MIDDLEWARE (SERVER_MODE=asgi),
+requests under STATIC_URL are answered by WhiteNoise here, before Django, so
+the middleware chain stays async and API requests do not move to a thread.
+Only static file requests run in a thread (WhiteNoise is a WSGI app).
+"""
+import os
+
+from asgiref.wsgi import WsgiToAsgi
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from whitenoise import WhiteNoise
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'shelter_project.settings')
+
+WHITENOISE_MIDDLEWARE = 'whitenoise.middleware.WhiteNoiseMiddleware'
+# ManifestStaticFilesStorage adds a 12 character hash to file names
+HASHED_FILE = r'\.[0-9a-f]{12}\.\w+$'
+
+
+def _not_found(environ, start_response):
+    start_response('404 Not Found', [('Content-Type', 'text/plain')])
+    return [b'Not Found']
+
+
+def with_static_files(application):
+    """Serve STATIC_URL from STATIC_ROOT with WhiteNoise, the rest with ``application``."""
+    static = WsgiToAsgi(WhiteNoise(
+        _not_found, root=settings.STATIC_ROOT, prefix=settings.STATIC_URL,
+        max_age=0 if settings.DEBUG else 60, immutable_file_test=HASHED_FILE,
+    ))
+
+    async def app(scope, receive, send):
+        if scope['type'] == 'http' and scope['path'].startswith(settings.STATIC_URL):
+            await static(scope, receive, send)
+        else:
+            await application(scope, receive, send)
+
+    return app
+
+
+django_application = get_asgi_application()
+
+if WHITENOISE_MIDDLEWARE in settings.MIDDLEWARE:
+    application = django_application
+else:
+    application = with_static_files(django_application)
@@ -1,6 +1,7 @@
 """
 Base Django settings for shelter_project.
 """
+import json
 import os
 from pathlib import Path
 from datetime import timedelta
@@ -8,6 +9,65 @@ from datetime import timedelta
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
+
+def _env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ['1', 'true', 'yes', 'on']
+
+
+# Postgres connection handling, shared by development and production.
+# DB_POOL_MODE:
+#   persistent - each worker reuses its connection for DB_CONN_MAX_AGE seconds
+#   pgbouncer  - connect through an external transaction-pooling PgBouncer at
+#                DB_POOLER_HOST:DB_POOLER_PORT (pool size and timeouts are
+#                configured on the pooler, see docker-compose.yml)
+#   none       - open a new connection for every request
+# Django < 5.1 has no built-in psycopg pool, so pooling is done externally.
+# Under SERVER_MODE=asgi use pgbouncer with DB_CONN_MAX_AGE=0: persistent
+# connections are per thread and are not reused across async requests.
+DB_POOL_MODES = ('persistent', 'pgbouncer', 'none')
+DB_POOL_MODE = 'none'
+
+
+def _db_connection_settings():
+    mode = os.getenv('DB_POOL_MODE', 'persistent').strip().lower()
+    if mode not in DB_POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE must be one of {', '.join(DB_POOL_MODES)}, got {mode!r}")
+
+    conn_max_age = 0 if mode == 'none' else int(os.getenv('DB_CONN_MAX_AGE', '60'))
+    config = {
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': _env_bool('DB_CONN_HEALTH_CHECKS', default=conn_max_age != 0),
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        },
+    }
+    if mode == 'pgbouncer':
+        config['HOST'] = os.getenv('DB_POOLER_HOST', 'localhost')
+        config['PORT'] = os.getenv('DB_POOLER_PORT', '6432')
+        # Server-side cursors do not survive transaction pooling.
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return mode, config
+
+
+def _replica_database(default):
+    """Settings of the 'replica' alias: ``default`` pointed at DB_REPLICA_HOST, or None."""
+    host = os.getenv('DB_REPLICA_HOST')
+    if not host:
+        return None
+    return {
+        **default,
+        'HOST': host,
+        'PORT': os.getenv('DB_REPLICA_PORT', default.get('PORT', '5432')),
+        'USER': os.getenv('DB_REPLICA_USER', default.get('USER')),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', default.get('PASSWORD')),
+        # the replica never runs migrations or test database setup of its own
+        'TEST': {'MIRROR': 'default'},
+    }
+
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'dev-secret-key-change-in-production')
 
@@ -26,14 +86,20 @@ INSTALLED_APPS = [
     'django_filters',
     # Local apps
     'apps.accounts',
+    'apps.shelters',
     'apps.animals',
     'apps.supplies',
     'apps.core',
     'apps.parties',
     'apps.volunteers',
+    'apps.dashboard',
+    'apps.sync',
+    'apps.jobs',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.RequestMetricsMiddleware',
+    'apps.core.replicas.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -45,6 +111,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Application server mode (gunicorn.conf.py). WhiteNoise's middleware is
+# sync-only, and one sync middleware makes Django run every request in a
+# thread under ASGI, so in asgi mode shelter_project.asgi serves the static
+# files in front of Django instead and every middleware left is async-capable.
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi').strip().lower()
+if SERVER_MODE == 'asgi':
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
 ROOT_URLCONF = 'shelter_project.urls'
 
 TEMPLATES = [
@@ -94,13 +168,158 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Uploaded media. Animal photos go to the 'photos' storage; point
+# PHOTO_STORAGE_BACKEND at another backend (e.g. S3 behind a CDN, with
+# PHOTO_STORAGE_OPTIONS as JSON) to move them off the local filesystem.
+MEDIA_URL = '/media/'
+MEDIA_ROOT = Path(os.getenv('MEDIA_ROOT', BASE_DIR / 'media'))
+
+PHOTO_STORAGE_BACKEND = os.getenv('PHOTO_STORAGE_BACKEND', 'django.core.files.storage.FileSystemStorage')
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    'photos': {
+        'BACKEND': PHOTO_STORAGE_BACKEND,
+        'OPTIONS': json.loads(os.getenv('PHOTO_STORAGE_OPTIONS', '{}')) or {
+            'location': MEDIA_ROOT / 'photos',
+            'base_url': os.getenv('PHOTO_BASE_URL', MEDIA_URL + 'photos/'),
+        },
+    },
+}
+
+# Photo pipeline (apps.animals.services.photo_pipeline)
+PHOTOS = {
+    # name -> longest edge in pixels
+    'VARIANTS': {'thumb': 200, 'medium': 800, 'large': 1600},
+    'JPEG_QUALITY': 85,
+    'MAX_UPLOAD_BYTES': int(os.getenv('PHOTO_MAX_UPLOAD_BYTES', 15 * 1024 * 1024)),
+    # thread: resize in a background thread after commit
+    # sync: resize right after commit in the request
+    # worker: leave pending for `manage.py process_photos`
+    # queue: enqueue an apps.jobs job for `manage.py run_jobs`
+    'PROCESSING': os.getenv('PHOTO_PROCESSING', 'thread'),
+    # Photo files are content addressed and never change
+    'CACHE_MAX_AGE': 365 * 24 * 3600,
+}
+
+# Director's dashboard (apps.dashboard). Past days come from daily census
+# snapshots (`manage.py take_census_snapshot`); today's numbers are a live
+# aggregate cached for LIVE_CACHE_TTL seconds.
+DASHBOARD = {
+    'LIVE_CACHE_TTL': int(os.getenv('DASHBOARD_LIVE_CACHE_TTL', '30')),
+    'DEFAULT_WEEKS': 12,
+    'MAX_WEEKS': 260,
+}
+
+# Monthly partitions of the inventory log (PostgreSQL, `manage.py
+# inventory_log_partitions`): months created ahead of time and months kept
+# before archival to ARCHIVE_DIR.
+INVENTORY_LOG_PARTITIONS = {
+    'MONTHS_AHEAD': 3,
+    'RETENTION_MONTHS': int(os.getenv('INVENTORY_LOG_RETENTION_MONTHS', '24')),
+    'ARCHIVE_DIR': os.getenv('INVENTORY_LOG_ARCHIVE_DIR', str(BASE_DIR / 'archive' / 'inventory_log')),
+}
+
+# Read replica (apps.core.replicas). Settings modules that configure a
+# 'replica' database (DB_REPLICA_HOST) set ALIAS; safe requests of the views
+# that opt in then read from it. A user who wrote reads from the primary for
+# STICKY_SECONDS afterwards, tracked in CACHE (use a cache shared by workers).
+DATABASE_ROUTERS = ['apps.core.replicas.ReplicaRouter']
+READ_REPLICA = {
+    'ALIAS': None,
+    'STICKY_SECONDS': int(os.getenv('DB_REPLICA_STICKY_SECONDS', '5')),
+    'CACHE': 'default',
+}
+
+# Delta sync for offline tablets (apps.sync). Changes are read from
+# OVERLAP_SECONDS before the client's token, so rows saved by transactions
+# still running at the previous sync are not missed. Deletions are kept for
+# TOMBSTONE_RETENTION_DAYS (`manage.py prune_sync_tombstones`); older tokens
+# get a full sync, sent in pages of PAGE_SIZE rows.
+SYNC = {
+    'OVERLAP_SECONDS': int(os.getenv('SYNC_OVERLAP_SECONDS', '60')),
+    'TOMBSTONE_RETENTION_DAYS': int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '30')),
+    'PAGE_SIZE': int(os.getenv('SYNC_PAGE_SIZE', '500')),
+}
+
+# Server-sent event streams (apps.core.events, GET /api/events/; needs
+# SERVER_MODE=asgi). BACKEND 'local' reaches the streams of one process,
+# 'postgres' fans events out to all workers with LISTEN/NOTIFY. A stream
+# ends after STREAM_SECONDS and the browser reconnects.
+EVENTS = {
+    'BACKEND': os.getenv('EVENTS_BACKEND', 'local').strip().lower(),
+    'HEARTBEAT_SECONDS': int(os.getenv('EVENTS_HEARTBEAT_SECONDS', '15')),
+    'STREAM_SECONDS': int(os.getenv('EVENTS_STREAM_SECONDS', '300')),
+    'QUEUE_SIZE': 100,
+    'LISTEN_HOST': os.getenv('EVENTS_LISTEN_HOST') or None,
+    'LISTEN_PORT': os.getenv('EVENTS_LISTEN_PORT', '5432'),
+}
+if EVENTS['BACKEND'] not in ('local', 'postgres'):
+    raise ValueError(f"EVENTS_BACKEND must be 'local' or 'postgres', got {EVENTS['BACKEND']!r}")
+
+# Background job queue (apps.jobs, worker: `manage.py run_jobs`). A failed
+# job is retried after BACKOFF_SECONDS, doubling per attempt up to
+# MAX_BACKOFF_SECONDS; a job whose worker stopped is claimed again after
+# LEASE_SECONDS.
+JOBS = {
+    'MAX_ATTEMPTS': int(os.getenv('JOBS_MAX_ATTEMPTS', '5')),
+    'BACKOFF_SECONDS': int(os.getenv('JOBS_BACKOFF_SECONDS', '10')),
+    'MAX_BACKOFF_SECONDS': int(os.getenv('JOBS_MAX_BACKOFF_SECONDS', '3600')),
+    'LEASE_SECONDS': int(os.getenv('JOBS_LEASE_SECONDS', '600')),
+    'CONCURRENCY': int(os.getenv('JOBS_CONCURRENCY', '4')),
+    'POLL_SECONDS': float(os.getenv('JOBS_POLL_SECONDS', '1')),
+}
+
+# Outgoing e-mail (reminder digests). For local testing run an SMTP
+# stand-in, e.g. `docker compose --profile mail up mailpit` with
+# EMAIL_PORT=1025 (messages at http://localhost:8025).
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = _env_bool('EMAIL_USE_TLS')
+EMAIL_TIMEOUT = 30
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'schronisko@localhost')
+
+# Daily reminder digests (apps.animals.services.reminders, `manage.py
+# send_reminders`): vaccinations and medication ends due within DAYS_AHEAD.
+REMINDERS = {
+    'DAYS_AHEAD': int(os.getenv('REMINDERS_DAYS_AHEAD', '7')),
+}
+
+# Bearer token for calls to the parties API made outside a request (jobs of
+# apps.animals.services.intake_source_service)
+INTERNAL_SERVICE_TOKEN = os.getenv('INTERNAL_SERVICE_TOKEN', '')
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Caches. 'oauth_tokens' holds validated access tokens
+# (apps.accounts.authentication.CachedOAuth2Authentication); it is bounded by
+# MAX_ENTRIES and entries live at most OAUTH_TOKEN_CACHE_TTL seconds.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'oauth_tokens': {
+        'BACKEND': os.getenv('OAUTH_TOKEN_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('OAUTH_TOKEN_CACHE_LOCATION', 'oauth-tokens'),
+        'TIMEOUT': int(os.getenv('OAUTH_TOKEN_CACHE_TTL', '60')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('OAUTH_TOKEN_CACHE_MAX_ENTRIES', '10000')),
+        },
+    },
+}
+
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
+        'apps.accounts.authentication.CachedOAuth2Authentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -125,3 +344,14 @@ OAUTH2_PROVIDER = {
     },
 }
 
+
+# Request instrumentation (apps.core.middleware.RequestMetricsMiddleware)
+REQUEST_METRICS = {
+    'ENABLED': _env_bool('REQUEST_METRICS_ENABLED', default=True),
+    'SERVER_TIMING': _env_bool('REQUEST_METRICS_SERVER_TIMING', default=True),
+    # Log a warning for requests running more SQL queries than this (unset = off)
+    'QUERY_BUDGET': int(os.getenv('REQUEST_QUERY_BUDGET')) if os.getenv('REQUEST_QUERY_BUDGET') else None,
+    # /api/metrics/ is served to "Authorization: Bearer <token>" and to admin
+    # staff; left empty, only staff get it
+    'METRICS_TOKEN': os.getenv('METRICS_TOKEN', ''),
+}
@@ -3,6 +3,7 @@ Development Django settings.
 """
 import os
 from .base import *
+from .base import _db_connection_settings, _replica_database
 
 DEBUG = True
 
@@ -19,6 +20,11 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT', '5432'),
     }
 }
+DB_POOL_MODE, _db_connection = _db_connection_settings()
+DATABASES['default'].update(_db_connection)
+if _replica := _replica_database(DATABASES['default']):
+    DATABASES['replica'] = _replica
+    READ_REPLICA = {**READ_REPLICA, 'ALIAS': 'replica'}
 
 # CORS settings for development
 CORS_ALLOWED_ORIGINS = [
@@ -34,7 +40,7 @@ CORS_ALLOW_CREDENTIALS = True
 REST_FRAMEWORK = {
     **REST_FRAMEWORK,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
+        'apps.accounts.authentication.CachedOAuth2Authentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
 }
@@ -3,6 +3,7 @@ Production Django settings.
 """
 import os
 from .base import *
+from .base import _db_connection_settings, _replica_database, _env_bool
 
 DEBUG = False
 
@@ -19,6 +20,11 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT', '5432'),
     }
 }
+DB_POOL_MODE, _db_connection = _db_connection_settings()
+DATABASES['default'].update(_db_connection)
+if _replica := _replica_database(DATABASES['default']):
+    DATABASES['replica'] = _replica
+    READ_REPLICA = {**READ_REPLICA, 'ALIAS': 'replica'}
 
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
@@ -26,13 +32,6 @@ SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
 
 
-def _env_bool(name, default=False):
-    value = os.getenv(name)
-    if value is None:
-        return default
-    return value.strip().lower() in ['1', 'true', 'yes', 'on']
-
-
 SECURE_SSL_REDIRECT = _env_bool('SECURE_SSL_REDIRECT', default=True)
 SESSION_COOKIE_SECURE = _env_bool('SESSION_COOKIE_SECURE', default=True)
 CSRF_COOKIE_SECURE = _env_bool('CSRF_COOKIE_SECURE', default=True)
@@ -49,6 +48,7 @@ SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 USE_X_FORWARDED_HOST = True
 # Static files via WhiteNoise (Django 5 STORAGES setting)
 STORAGES = {
+    **STORAGES,
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
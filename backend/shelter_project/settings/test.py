@@ -10,7 +10,14 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
-    }
+    },
+    # Stand-in for the read replica: a separate database rather than a test
+    # mirror, so tests can tell which alias served a read. Routing to it is
+    # off unless a test sets READ_REPLICA['ALIAS'].
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
 }
 
 # Faster password hashing for tests
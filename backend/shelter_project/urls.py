@@ -1,8 +1,10 @@
 """
 URL configuration for shelter_project.
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+from apps.animals.views import photo_file
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,4 +15,14 @@ urlpatterns = [
     path('api/parties/', include('apps.parties.urls')),
     path('o/', include('oauth2_provider.urls', namespace='oauth2_provider')),
     path('api/volunteers/', include('apps.volunteers.urls')),
+    path('api/dashboard/', include('apps.dashboard.urls')),
+    path('api/shelters/', include('apps.shelters.urls')),
+    path('api/sync/', include('apps.sync.urls')),
 ]
+
+# Photos on the local filesystem are served by Django; other storage
+# backends (S3, CDN) return absolute URLs and serve them themselves.
+if settings.PHOTO_STORAGE_BACKEND == 'django.core.files.storage.FileSystemStorage':
+    urlpatterns.append(
+        re_path(r'^%sphotos/(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), photo_file, name='photo-file')
+    )
@@ -0,0 +1,56 @@
+#!/bin/bash
+set -e
+
+# Compare WSGI and ASGI deployment modes on the same database.
+# Starts gunicorn in each SERVER_MODE, runs benchmark_endpoints over HTTP
+# against it and prints requests/s per endpoint side by side.
+#
+# Usage: ./benchmark-asgi.sh <access token> [requests] [concurrency]
+# Expects a populated database (see generate_synthetic_data) and the
+# backend virtualenv to be active.
+
+TOKEN=${1:?access token required}
+REQUESTS=${2:-500}
+CONCURRENCY=${3:-32}
+PORT=${PORT:-8765}
+ENDPOINTS=${ENDPOINTS:-health,animal-list,animal-detail,veterinarian-list,my-tasks,supply-item-list}
+SCRIPT_DIR=$(cd "$(dirname "$0")" && pwd)
+BACKEND_DIR=$(cd "$SCRIPT_DIR/../../backend" && pwd)
+OUT_DIR=${OUT_DIR:-$(mktemp -d)}
+
+cd "$BACKEND_DIR"
+
+for MODE in wsgi asgi; do
+    echo "=== $MODE ==="
+    SERVER_MODE=$MODE GUNICORN_BIND="127.0.0.1:$PORT" gunicorn -c gunicorn.conf.py \
+        --access-logfile /dev/null --pid "$OUT_DIR/$MODE.pid" --daemon
+
+    until curl -sf "http://127.0.0.1:$PORT/api/health/" > /dev/null; do
+        sleep 0.5
+    done
+
+    python manage.py benchmark_endpoints \
+        --base-url "http://127.0.0.1:$PORT" --token "$TOKEN" \
+        --endpoints "$ENDPOINTS" --requests "$REQUESTS" --concurrency "$CONCURRENCY" \
+        --output "$OUT_DIR/$MODE.json"
+
+    kill "$(cat "$OUT_DIR/$MODE.pid")"
+    while kill -0 "$(cat "$OUT_DIR/$MODE.pid" 2>/dev/null)" 2>/dev/null; do
+        sleep 0.5
+    done
+done
+
+python - "$OUT_DIR/wsgi.json" "$OUT_DIR/asgi.json" <<'PY'
+import json
+import sys
+
+wsgi, asgi = (json.load(open(path))['endpoints'] for path in sys.argv[1:])
+print(f"{'endpoint':<22}{'wsgi req/s':>12}{'asgi req/s':>12}{'wsgi p95':>10}{'asgi p95':>10}")
+for name in wsgi:
+    w, a = wsgi[name], asgi.get(name, {})
+    print(f"{name:<22}{w['throughput_rps']:>12}{a.get('throughput_rps', '-'):>12}"
+          f"{w['p95_ms']:>10}{a.get('p95_ms', '-'):>10}")
+PY
+
+echo ""
+echo "Reports: $OUT_DIR"